@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from translationzed_py.core.tm_store import (
+    TMMatch,
+    TMStore,
+    _normalize,
+    _query_tokens,
+    _score_candidate,
+    _scored_rank_key,
+)
+
+_SOURCE_LOCALE = "EN"
+_TARGET_LOCALE = "BE"
+_QUERY_KINDS = ("short", "long", "multi_token", "exact", "miss")
+_IMPORT_TM_NAMES = ("community_pack", "legacy_41", "steam_workshop")
+_PROJECT_SHARE = 0.2
+_BATCH = 20_000
+
+_NOUNS = (
+    "Axe",
+    "Hammer",
+    "Generator",
+    "Canned Beans",
+    "Baseball Bat",
+    "Shotgun Shells",
+    "Water Bottle",
+    "Bandage",
+    "Sheet Rope",
+    "Nails",
+    "Plank",
+    "Propane Tank",
+    "Gas Can",
+    "Frying Pan",
+    "Crowbar",
+    "Radio",
+    "Walkie Talkie",
+    "Duffel Bag",
+    "Hiking Bag",
+    "Car Battery",
+    "Spark Plug",
+    "Tire",
+    "Sledgehammer",
+    "Saucepan",
+    "Rain Collector Barrel",
+    "Campfire",
+    "Fishing Rod",
+    "Trap",
+    "Seed Packet",
+    "Sack of Potatoes",
+    "Skill Book",
+    "Magazine",
+    "Lighter",
+    "Matches",
+    "Pistol",
+    "Hunting Knife",
+    "Machete",
+    "Screwdriver",
+    "Wrench",
+    "Blowtorch",
+    "Welder Mask",
+    "Garden Hoe",
+    "Trowel",
+    "Wooden Crate",
+    "Metal Sheet",
+    "Door",
+    "Window",
+    "Barricade",
+    "Stove",
+    "Fridge",
+    "Sink",
+    "Toilet",
+    "Bed",
+    "Sofa",
+    "Wall",
+)
+_VERBS = (
+    "Equip",
+    "Unequip",
+    "Drop",
+    "Craft",
+    "Repair",
+    "Dismantle",
+    "Read",
+    "Open",
+    "Close",
+    "Fill",
+    "Empty",
+    "Take",
+    "Place",
+    "Rotate",
+    "Pick up",
+    "Add",
+    "Remove",
+    "Eat",
+    "Drink",
+    "Cook",
+    "Cut",
+    "Chop",
+    "Build",
+    "Barricade",
+    "Lock",
+    "Unlock",
+    "Turn on",
+    "Turn off",
+    "Refuel",
+    "Siphon",
+    "Install",
+    "Uninstall",
+    "Wash",
+    "Disinfect",
+    "Apply",
+    "Inspect",
+    "Rename",
+    "Transfer",
+    "Sit on",
+    "Sleep in",
+)
+_ADJECTIVES = (
+    "Rotten",
+    "Fresh",
+    "Stale",
+    "Broken",
+    "Heavy",
+    "Light",
+    "Wet",
+    "Dry",
+    "Burnt",
+    "Cooked",
+    "Raw",
+    "Dirty",
+    "Clean",
+    "Bloody",
+    "Rusty",
+    "Sharp",
+    "Dull",
+    "Empty",
+    "Full",
+    "Small",
+    "Large",
+    "Old",
+    "New",
+    "Damaged",
+    "Repaired",
+)
+_TEMPLATES_SHORT = ("{verb}", "{noun}", "{adj}")
+_TEMPLATES = (
+    "{verb} {noun}",
+    "{verb} all {noun}",
+    "{verb} one {noun}",
+    "{adj} {noun}",
+    "Requires {noun}",
+    "{noun} ({n} uses left)",
+    "{verb} {adj} {noun}",
+    "You need a {noun} to {verb_l} this {noun2}.",
+    "Cannot {verb_l} the {noun} while it is {adj_l}.",
+    "{noun}: <RGB:1,0,0> {adj} <RGB:1,1,1> condition {n}%",
+    "The {adj_l} {noun_l} has been left near the {noun2_l} for {n} days. "
+    "Check your inventory before you {verb_l} it again.",
+    "Right-click the {noun_l} and choose {verb} to use it with the {noun2_l}. "
+    "Higher skill levels reduce the chance of failure by {n} percent.",
+)
+
+
+def _pseudo_translate(text: str) -> str:
+    # Deterministic, length-preserving-ish target side; keeps markup intact.
+    out: list[str] = []
+    for word in text.split(" "):
+        if not word.isalpha():
+            out.append(word)
+            continue
+        mangled = word[::-1].lower()
+        out.append(mangled.capitalize() if word[:1].isupper() else mangled)
+    return " ".join(out)
+
+
+def _synthetic_source(rng: random.Random) -> str:
+    templates = _TEMPLATES_SHORT if rng.random() < 0.08 else _TEMPLATES
+    noun = rng.choice(_NOUNS)
+    noun2 = rng.choice(_NOUNS)
+    verb = rng.choice(_VERBS)
+    adj = rng.choice(_ADJECTIVES)
+    return rng.choice(templates).format(
+        noun=noun,
+        noun2=noun2,
+        noun_l=noun.lower(),
+        noun2_l=noun2.lower(),
+        verb=verb,
+        verb_l=verb.lower(),
+        adj=adj,
+        adj_l=adj.lower(),
+        n=rng.randint(1, 999),
+    )
+
+
+def _iter_corpus(size: int, seed: int) -> Iterator[tuple[bool, str, str, str]]:
+    # Yields (is_project, key_or_tm_name, source, target).
+    rng = random.Random(seed)
+    for idx in range(size):
+        source = _synthetic_source(rng)
+        target = _pseudo_translate(source)
+        if rng.random() < _PROJECT_SHARE:
+            yield True, f"UI_Bench_{idx}", source, target
+        else:
+            tm_name = _IMPORT_TM_NAMES[idx % len(_IMPORT_TM_NAMES)]
+            yield False, tm_name, source, f"{target} {idx}"
+
+
+def _count_rows(store: TMStore) -> int:
+    row = store._conn.execute(
+        "SELECT COUNT(*) FROM tm_entries WHERE source_locale = ? AND target_locale = ?",
+        (_SOURCE_LOCALE, _TARGET_LOCALE),
+    ).fetchone()
+    return int(row[0])
+
+
+def _build_store(root: Path, size: int, seed: int) -> tuple[TMStore, float, bool]:
+    root.mkdir(parents=True, exist_ok=True)
+    store = TMStore(root)
+    store._conn.execute(
+        "CREATE TABLE IF NOT EXISTS bench_meta (name TEXT PRIMARY KEY, value TEXT)"
+    )
+    meta = store._conn.execute(
+        "SELECT value FROM bench_meta WHERE name = 'size_seed'"
+    ).fetchone()
+    if meta is not None and meta[0] == f"{size}:{seed}" and _count_rows(store):
+        return store, 0.0, True
+    store._conn.execute("DELETE FROM tm_entries")
+    store._conn.commit()
+    start = time.perf_counter()
+    project: list[tuple[str, str, str]] = []
+    imports: dict[str, list[tuple[str, str]]] = {}
+    for is_project, name, source, target in _iter_corpus(size, seed):
+        if is_project:
+            project.append((name, source, target))
+        else:
+            imports.setdefault(name, []).append((source, target))
+        if len(project) + sum(len(v) for v in imports.values()) >= _BATCH:
+            _flush(store, project, imports)
+    _flush(store, project, imports)
+    store._conn.execute("ANALYZE")
+    store._conn.execute(
+        "INSERT OR REPLACE INTO bench_meta VALUES ('size_seed', ?)",
+        (f"{size}:{seed}",),
+    )
+    store._conn.commit()
+    return store, time.perf_counter() - start, False
+
+
+def _flush(
+    store: TMStore,
+    project: list[tuple[str, str, str]],
+    imports: dict[str, list[tuple[str, str]]],
+) -> None:
+    if project:
+        store.upsert_project_entries(
+            project,
+            source_locale=_SOURCE_LOCALE,
+            target_locale=_TARGET_LOCALE,
+            file_path="BE/bench_ui.txt",
+        )
+        project.clear()
+    for tm_name, pairs in imports.items():
+        store.insert_import_pairs(
+            pairs,
+            source_locale=_SOURCE_LOCALE,
+            target_locale=_TARGET_LOCALE,
+            tm_name=tm_name,
+        )
+    imports.clear()
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    if len(text) < 4:
+        return text
+    pos = rng.randrange(1, len(text) - 1)
+    return text[:pos] + text[pos + 1] + text[pos] + text[pos + 2 :]
+
+
+def _build_queries(store: TMStore, count: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed + 1)
+    # Sampled in Python (not `ORDER BY random()`) so a seed always yields the
+    # same queries for the same corpus, keeping before/after runs comparable.
+    texts = [
+        row[0]
+        for row in store._conn.execute(
+            """
+            SELECT source_text FROM tm_entries
+            WHERE source_locale = ? AND target_locale = ?
+            ORDER BY id
+            """,
+            (_SOURCE_LOCALE, _TARGET_LOCALE),
+        )
+    ]
+    sample = rng.sample(texts, min(len(texts), max(count * 4, 100)))
+    long_pool = [text for text in sample if len(text) >= 40] or sample
+    multi_pool = [text for text in sample if 2 <= len(text.split()) <= 5] or sample
+    queries: list[tuple[str, str]] = []
+    for idx in range(count):
+        kind = _QUERY_KINDS[idx % len(_QUERY_KINDS)]
+        if kind == "short":
+            text = rng.choice(
+                (rng.choice(_VERBS), rng.choice(_NOUNS), rng.choice(_ADJECTIVES))
+            ).split()[0]
+        elif kind == "long":
+            words = rng.choice(long_pool).split()
+            words[rng.randrange(len(words))] = rng.choice(_NOUNS).lower()
+            text = " ".join(words)
+        elif kind == "multi_token":
+            text = _typo(rng, rng.choice(multi_pool))
+        elif kind == "exact":
+            text = rng.choice(sample)
+        else:
+            text = " ".join(
+                "".join(rng.choice("qxzjvkw") for _ in range(rng.randint(4, 8)))
+                for _ in range(rng.randint(1, 3))
+            )
+        queries.append((kind, text))
+    return queries
+
+
+def _fuzzy_recall(
+    conn: sqlite3.Connection,
+    text: str,
+    matches: list[TMMatch],
+    *,
+    limit: int,
+    min_score: int,
+) -> float | None:
+    # Recall of the fuzzy slots against scoring every row in the locale pair.
+    # Candidates tied with the last truth slot are interchangeable.
+    norm = _normalize(text)
+    query_tokens = set(_query_tokens(norm))
+    multi_token = len(query_tokens) > 1
+    use_en_stemming = _SOURCE_LOCALE == "EN"
+
+    def rank_key(source_norm: str, origin: str, updated_at: int) -> tuple | None:
+        result = _score_candidate(
+            norm, query_tokens, source_norm, use_en_stemming=use_en_stemming
+        )
+        if result is None or result[0] < min_score:
+            return None
+        row = {"source_norm": source_norm, "origin": origin, "updated_at": updated_at}
+        return _scored_rank_key(
+            (row, *result), length=len(norm), multi_token=multi_token
+        )
+
+    fuzzy = [m for m in matches if _normalize(m.source_text) != norm]
+    slots = limit - (len(matches) - len(fuzzy))
+    if slots <= 0:
+        return None
+    truth: list[tuple[tuple, tuple]] = []
+    seen: set[tuple] = set()
+    cursor = conn.execute(
+        """
+        SELECT source_text, source_norm, target_text, origin, tm_name, updated_at
+        FROM tm_entries
+        WHERE source_locale = ? AND target_locale = ? AND source_norm != ?
+        """,
+        (_SOURCE_LOCALE, _TARGET_LOCALE, norm),
+    )
+    for row in cursor:
+        ident = (row["source_text"], row["target_text"], row["origin"], row["tm_name"])
+        if ident in seen:
+            continue
+        key = rank_key(row["source_norm"], row["origin"], row["updated_at"])
+        if key is None:
+            continue
+        seen.add(ident)
+        truth.append((key, ident))
+    truth.sort()
+    truth = truth[:slots]
+    if not truth:
+        return 1.0 if not fuzzy else None
+    cutoff = truth[-1][0]
+    got = {(m.source_text, m.target_text, m.origin, m.tm_name) for m in fuzzy}
+    above = [ident for key, ident in truth if key < cutoff]
+    tied_slots = len(truth) - len(above)
+    tied_returned = sum(
+        1
+        for m in fuzzy
+        if rank_key(_normalize(m.source_text), m.origin, m.updated_at) == cutoff
+    )
+    hits = sum(1 for ident in above if ident in got) + min(tied_slots, tied_returned)
+    return hits / len(truth)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile.
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _summarize(samples: list[dict]) -> dict:
+    latencies = [item["ms"] for item in samples]
+    candidates = [float(item["candidates"]) for item in samples]
+    recalls = [item["recall"] for item in samples if item["recall"] is not None]
+    return {
+        "queries": len(samples),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "max": round(max(latencies, default=0.0), 3),
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        },
+        "candidates": {
+            "p50": _percentile(candidates, 50),
+            "p95": _percentile(candidates, 95),
+            "max": max(candidates, default=0.0),
+        },
+        "results_mean": (
+            round(sum(item["results"] for item in samples) / len(samples), 2)
+            if samples
+            else 0.0
+        ),
+        "recall_queries": len(recalls),
+        "recall_mean": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        "recall_min": round(min(recalls), 4) if recalls else None,
+    }
+
+
+def _run_size(args: argparse.Namespace, root: Path, size: int) -> dict:
+    store, build_seconds, reused = _build_store(root, size, args.seed)
+    try:
+        rows = _count_rows(store)
+        queries = _build_queries(store, args.queries, args.seed)
+        memory_load_seconds = None
+        if args.memory:
+            start = time.perf_counter()
+            TMStore.load_memory_index(
+                store.db_path,
+                source_locale=_SOURCE_LOCALE,
+                target_locale=_TARGET_LOCALE,
+            )
+            memory_load_seconds = round(time.perf_counter() - start, 3)
+        for _kind, text in queries[: min(len(queries), 5)]:
+            store.query(
+                text,
+                source_locale=_SOURCE_LOCALE,
+                target_locale=_TARGET_LOCALE,
+                limit=args.limit,
+                min_score=args.min_score,
+            )
+        # Spread the brute-force checks evenly over the query kinds.
+        recall_left = {
+            kind: args.recall_queries // len(_QUERY_KINDS)
+            + (1 if idx < args.recall_queries % len(_QUERY_KINDS) else 0)
+            for idx, kind in enumerate(_QUERY_KINDS)
+        }
+        samples: dict[str, list[dict]] = {kind: [] for kind in _QUERY_KINDS}
+        for kind, text in queries:
+            if not args.memo:
+                TMStore.clear_query_memos()
+            start = time.perf_counter()
+            matches = store.query(
+                text,
+                source_locale=_SOURCE_LOCALE,
+                target_locale=_TARGET_LOCALE,
+                limit=args.limit,
+                min_score=args.min_score,
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            candidates = len(
+                TMStore._fuzzy_candidate_rows(
+                    store._conn,
+                    _normalize(text),
+                    _SOURCE_LOCALE,
+                    _TARGET_LOCALE,
+                    ("project", "import"),
+                )
+            )
+            recall = None
+            if recall_left[kind] > 0:
+                recall_left[kind] -= 1
+                recall = _fuzzy_recall(
+                    store._conn,
+                    text,
+                    matches,
+                    limit=args.limit,
+                    min_score=args.min_score,
+                )
+            samples[kind].append(
+                {
+                    "ms": elapsed_ms,
+                    "candidates": candidates,
+                    "results": len(matches),
+                    "recall": recall,
+                }
+            )
+        everything = [item for kind in _QUERY_KINDS for item in samples[kind]]
+        return {
+            "size": size,
+            "rows": rows,
+            "db_bytes": store.db_path.stat().st_size,
+            "build_seconds": round(build_seconds, 3),
+            "reused_db": reused,
+            "memory_load_seconds": memory_load_seconds,
+            "kinds": {kind: _summarize(samples[kind]) for kind in _QUERY_KINDS},
+            "overall": _summarize(everything),
+        }
+    finally:
+        TMStore.unload_memory_index(store.db_path)
+        store.close()
+
+
+def _print_run(run: dict) -> None:
+    build = "reused" if run["reused_db"] else f"built in {run['build_seconds']:.1f}s"
+    if run["memory_load_seconds"] is not None:
+        build += f", memory index loaded in {run['memory_load_seconds']:.2f}s"
+    print(f"size={run['size']} rows={run['rows']} ({build})")
+    for name, stats in (*run["kinds"].items(), ("overall", run["overall"])):
+        lat = stats["latency_ms"]
+        recall = stats["recall_mean"]
+        recall_text = "n/a" if recall is None else f"{recall:.3f}"
+        print(
+            f"  {name:<12} p50={lat['p50']:8.2f}ms p95={lat['p95']:8.2f}ms "
+            f"p99={lat['p99']:8.2f}ms cand_p95={stats['candidates']['p95']:6.0f} "
+            f"recall={recall_text}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="tm_bench",
+        description=(
+            "Benchmark TMStore.query on synthetic PZ-like translation memories "
+            "(offline, local SQLite only)."
+        ),
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000",
+        help="Comma-separated TM sizes in segments (default: 10000,100000).",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Queries per size (default: 200)."
+    )
+    parser.add_argument(
+        "--recall-queries",
+        type=int,
+        default=10,
+        help=(
+            "Queries per size checked against brute-force scoring of every row "
+            "(cost grows with TM size; 0 disables, default: 10)."
+        ),
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Query limit.")
+    parser.add_argument("--min-score", type=int, default=50, help="Query min score.")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus/query seed.")
+    parser.add_argument(
+        "--work-dir",
+        default="",
+        help=(
+            "Directory for generated TM databases; an existing DB with the same "
+            "size and seed is reused (default: temporary directory)."
+        ),
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Serve fuzzy retrieval from the in-memory index for the locale pair.",
+    )
+    parser.add_argument(
+        "--memo",
+        action="store_true",
+        help=(
+            "Keep the score/result memos warm across queries (default: cleared "
+            "before each timed query, so every query pays full scoring)."
+        ),
+    )
+    parser.add_argument("--output", default="", help="Write JSON results to this path.")
+    args = parser.parse_args(argv)
+    try:
+        sizes = [int(part) for part in args.sizes.split(",") if part.strip()]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    if not sizes or any(size <= 0 for size in sizes):
+        parser.error("--sizes must be positive")
+
+    with tempfile.TemporaryDirectory(prefix="tzp-tm-bench-") as tmp:
+        base = (
+            Path(args.work_dir).expanduser().resolve() if args.work_dir else Path(tmp)
+        )
+        runs = []
+        for size in sizes:
+            run = _run_size(args, base / f"tm_{size}", size)
+            _print_run(run)
+            runs.append(run)
+    report = {
+        "generated_at": int(time.time()),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": {
+            "queries": args.queries,
+            "recall_queries": args.recall_queries,
+            "limit": args.limit,
+            "min_score": args.min_score,
+            "seed": args.seed,
+            "memory": args.memory,
+            "memo": args.memo,
+        },
+        "runs": runs,
+    }
+    if args.output:
+        out = Path(args.output).expanduser()
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
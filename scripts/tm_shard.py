@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from translationzed_py.core.tm_store import TMStore
+
+
+def _size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    if path.is_dir():
+        return sum(item.stat().st_size for item in path.glob("*.sqlite"))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="tm_shard",
+        description=(
+            "Move a project's TM entries into per-locale-pair shard files next "
+            "to tm.sqlite, or back (run with the app closed)."
+        ),
+    )
+    parser.add_argument("root", help="Project root whose TM should be migrated.")
+    parser.add_argument(
+        "--unshard",
+        action="store_true",
+        help="Merge shard files back into tm.sqlite.",
+    )
+    args = parser.parse_args(argv)
+    root = Path(args.root).expanduser().resolve()
+    if not root.is_dir():
+        print(f"Not a directory: {root}", file=sys.stderr)
+        return 2
+    store = TMStore(root)
+    try:
+        moved = store.migrate_layout(sharded=not args.unshard)
+        db_path = store.db_path
+        layout = "sharded" if store.sharded else "single"
+    finally:
+        store.close()
+    shard_dir = db_path.parent / "tm_shards"
+    print(f"layout={layout} moved={moved}")
+    print(f"  {db_path.name}: {_size(db_path)} bytes")
+    for shard in sorted(shard_dir.glob("*.sqlite")):
+        print(f"  {shard_dir.name}/{shard.name}: {_size(shard)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
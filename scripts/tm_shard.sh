@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+source "$(dirname "${BASH_SOURCE[0]}")/_common.sh"
+ensure_venv
+
+"$VENV_PY" scripts/tm_shard.py "$@"
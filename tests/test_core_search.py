@@ -1,6 +1,12 @@
 from pathlib import Path
 
-from translationzed_py.core.search import SearchField, SearchRow, search
+from translationzed_py.core.search import (
+    SearchField,
+    SearchRow,
+    SearchRowColumns,
+    refines_literal_query,
+    search,
+)
 
 
 def test_search_plain_text():
@@ -56,3 +62,50 @@ def test_search_preview_is_one_line_and_present_for_literal_match():
     assert len(matches) == 1
     assert "Needle" in matches[0].preview
     assert "\n" not in matches[0].preview
+
+
+def test_refines_literal_query_only_when_matches_shrink():
+    assert refines_literal_query("zomb", "zombie")
+    assert refines_literal_query("ombi", "zombie")
+    assert refines_literal_query("drop al", "drop all")
+    assert not refines_literal_query("zombie", "zomb")
+    assert not refines_literal_query("", "zomb")
+    # "a b" has no phrase mode, "a bcd" does: extending it can widen matches.
+    assert not refines_literal_query("a b", "a bcd")
+    assert not refines_literal_query("op al", "drop all")
+
+    rows = [
+        SearchRow(Path("A.txt"), idx, f"K{idx}", "", text)
+        for idx, text in enumerate(
+            ["drop it all", "drop all", "a xbcd", "zombies", "zombi"]
+        )
+    ]
+    for previous, query in (("drop a", "drop all"), ("zomb", "zombie")):
+        assert refines_literal_query(previous, query)
+        wide = {m.row for m in search(rows, previous, SearchField.TRANSLATION, False)}
+        narrow = {m.row for m in search(rows, query, SearchField.TRANSLATION, False)}
+        assert narrow <= wide
+
+
+def test_search_row_columns_match_like_plain_rows():
+    path = Path("A.txt")
+    rows = [
+        SearchRow(path, 3, "KEY_ONE", "Source", "Value ÄPFEL One"),
+        SearchRow(path, 7, "KEY_TWO", "Other", "value äpfel two"),
+        SearchRow(path, 9, "KEY_THREE", "", ""),
+    ]
+    columns = SearchRowColumns.from_rows(path, rows)
+    assert list(columns) == rows
+    assert columns[1] == rows[1]
+    assert columns.nbytes > 0
+    for query, field, use_regex, case_sensitive in (
+        ("äpfel", SearchField.TRANSLATION, False, False),
+        ("ÄPFEL", SearchField.TRANSLATION, False, True),
+        ("value two", SearchField.TRANSLATION, False, False),
+        ("key_t", SearchField.KEY, False, False),
+        (r"KEY_T\w+", SearchField.KEY, True, True),
+        ("other", SearchField.SOURCE, False, False),
+    ):
+        expected = search(rows, query, field, use_regex, case_sensitive=case_sensitive)
+        got = search(columns, query, field, use_regex, case_sensitive=case_sensitive)
+        assert got == expected, query
@@ -2,9 +2,25 @@ import pytest
 
 pytest.importorskip("PySide6")
 
-from PySide6.QtGui import QColor, QPalette
+import io
 
-from translationzed_py.gui.delegates import _build_visual_formats, _palette_cache_key
+from PySide6.QtGui import (
+    QColor,
+    QPalette,
+    QStandardItem,
+    QStandardItemModel,
+    QTextDocument,
+)
+from PySide6.QtWidgets import QTableView
+
+from translationzed_py.gui import delegates
+from translationzed_py.gui.delegates import (
+    TextDocumentCache,
+    VisualTextDelegate,
+    _build_visual_formats,
+    _palette_cache_key,
+)
+from translationzed_py.gui.perf_trace import PerfTrace
 
 
 def _dark_palette() -> QPalette:
@@ -37,3 +53,67 @@ def test_palette_cache_key_changes_when_palette_changes() -> None:
     palette_b = _dark_palette()
     palette_b.setColor(QPalette.Highlight, QColor(110, 80, 40))
     assert _palette_cache_key(palette_a) != _palette_cache_key(palette_b)
+
+
+def _doc_key(text: str, *, font_key: str = "f", view_palette=(1,)) -> tuple:
+    return TextDocumentCache.key(
+        text,
+        100,
+        font_key=font_key,
+        view_palette=view_palette,
+        palette=(1,),
+        flags=(False, True, False),
+    )
+
+
+def test_text_document_cache_is_bounded_by_characters() -> None:
+    cache = TextDocumentCache(max_chars=3 * (1000 + 256))
+    texts = [f"{idx}" * 1000 for idx in range(4)]
+    for text in texts:
+        cache.put(_doc_key(text), QTextDocument(), len(text))
+    assert len(cache) == 3
+    assert cache.chars <= cache.max_chars
+    assert cache.get(_doc_key(texts[0])) is None
+    assert cache.get(_doc_key(texts[3])) is not None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_text_document_cache_retains_current_font_and_palette() -> None:
+    cache = TextDocumentCache()
+    cache.put(_doc_key("a"), QTextDocument(), 1)
+    cache.put(_doc_key("b", font_key="g"), QTextDocument(), 1)
+    cache.put(_doc_key("c", view_palette=(2,)), QTextDocument(), 1)
+    cache.retain(font_key="f", view_palette=(1,))
+    assert len(cache) == 1
+    assert cache.get(_doc_key("a")) is not None
+
+
+def test_visual_delegates_share_one_document_cache(qtbot, monkeypatch) -> None:
+    out = io.StringIO()
+    monkeypatch.setattr(delegates, "PERF_TRACE", PerfTrace({"paint"}, out=out))
+    cache = TextDocumentCache()
+    model = QStandardItemModel(1, 2)
+    model.setItem(0, 0, QStandardItem("Hello <LINE> world"))
+    model.setItem(0, 1, QStandardItem("Hello <LINE> world"))
+    view = QTableView()
+    qtbot.addWidget(view)
+    view.setModel(model)
+    for column in (0, 1):
+        view.setItemDelegateForColumn(
+            column,
+            VisualTextDelegate(
+                view, options_provider=lambda: (True, True, False), doc_cache=cache
+            ),
+        )
+        view.setColumnWidth(column, 200)
+    view.resize(500, 100)
+    view.grab()
+    assert len(cache) == 1
+    assert cache.hits >= 1 and cache.misses == 1
+    delegates.PERF_TRACE._flush(0.0)
+    assert "perf paint:doc_cache:" in out.getvalue()
+
+    font = view.font()
+    font.setPointSize(font.pointSize() + 3)
+    view.setFont(font)
+    assert len(cache) == 0
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from translationzed_py.core import draft_manifest
+from translationzed_py.core.draft_manifest import DraftManifest
+
+
+def _cache_file(tmp_path: Path) -> Path:
+    path = tmp_path / "cache" / "BE" / "ui.bin"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"cache-v1")
+    return path
+
+
+def test_draft_manifest_reads_header_only_when_cache_file_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    cache = _cache_file(tmp_path)
+    reads: list[Path] = []
+
+    def fake_read(path: Path) -> bool:
+        reads.append(path)
+        return path.read_bytes().endswith(b"v1")
+
+    monkeypatch.setattr(draft_manifest, "read_has_drafts_from_path", fake_read)
+    manifest = DraftManifest(tmp_path / "drafts_manifest.json")
+    assert manifest.has_drafts(cache) is True
+    assert manifest.has_drafts(cache) is True
+    assert len(reads) == 1
+
+    cache.write_bytes(b"cache-v2!")
+    assert manifest.has_drafts(cache) is False
+    assert len(reads) == 2
+    assert manifest.has_drafts(tmp_path / "missing.bin") is False
+
+
+def test_draft_manifest_persists_flags_across_sessions(
+    tmp_path: Path, monkeypatch
+) -> None:
+    cache = _cache_file(tmp_path)
+    manifest_path = tmp_path / "drafts_manifest.json"
+    monkeypatch.setattr(draft_manifest, "read_has_drafts_from_path", lambda _p: True)
+    manifest = DraftManifest(manifest_path)
+    assert manifest.has_drafts(cache) is True
+    manifest.flush()
+
+    def fail_read(_path: Path) -> bool:
+        raise AssertionError("header read")
+
+    monkeypatch.setattr(draft_manifest, "read_has_drafts_from_path", fail_read)
+    assert DraftManifest(manifest_path).has_drafts(cache) is True
+
+    manifest_path.write_text("{not json", encoding="utf-8")
+    monkeypatch.setattr(draft_manifest, "read_has_drafts_from_path", lambda _p: False)
+    assert DraftManifest(manifest_path).has_drafts(cache) is False
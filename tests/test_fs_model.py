@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTreeView
+
+from translationzed_py.core.project_scanner import LocaleMeta
+from translationzed_py.gui.fs_model import FsModel
+
+
+def _locales(tmp_path: Path, count: int = 30) -> tuple[Path, list[LocaleMeta]]:
+    root = tmp_path / "proj"
+    metas = []
+    for code in ("BE", "RU"):
+        locale = root / code
+        (locale / "sub").mkdir(parents=True)
+        for idx in range(count):
+            (locale / f"f{idx:03d}.txt").write_text("x", encoding="utf-8")
+        (locale / "sub" / "nested.txt").write_text("x", encoding="utf-8")
+        metas.append(LocaleMeta(code, locale, code, "UTF-8"))
+    return root, metas
+
+
+def test_fs_model_loads_expanded_locale_in_background_chunks(
+    qtbot, tmp_path: Path, monkeypatch
+) -> None:
+    root, metas = _locales(tmp_path)
+    monkeypatch.setattr("translationzed_py.gui.fs_model._INSERT_CHUNK", 7)
+    drafts = [root / "BE" / "f001.txt"]
+    model = FsModel(root, metas, lazy=True, draft_files=lambda code: drafts)
+    view = QTreeView()
+    qtbot.addWidget(view)
+    view.setModel(model)
+    view.show()
+    be = model.index(0, 0)
+    assert model.rowCount(be) == 0 and model.hasChildren(be)
+    inserts: list[int] = []
+    model.rowsInserted.connect(lambda _p, first, last: inserts.append(last - first))
+
+    view.expand(be)
+    qtbot.waitUntil(lambda: not model.is_loading(), timeout=5000)
+    assert model.rowCount(be) == 31
+    assert len(inserts) == 5
+    assert model.rowCount(model.index(1, 0)) == 0
+
+    labels = [model.index(row, 0, be).data() for row in range(3)]
+    assert labels[:2] == ["f000.txt", "● f001.txt"]
+    nested = model.index_for_path(root / "BE" / "sub" / "nested.txt")
+    assert nested.data(Qt.UserRole) == str(root / "BE" / "sub" / "nested.txt")
+    assert nested.parent() == be
+    model.shutdown()
+
+
+def test_fs_model_index_for_path_and_dirty_marks_before_load(
+    qtbot, tmp_path: Path
+) -> None:
+    root, metas = _locales(tmp_path, count=3)
+    model = FsModel(root, metas, lazy=True)
+    target = root / "RU" / "f002.txt"
+    model.set_dirty(target, True)
+
+    index = model.index_for_path(target)
+    assert index.isValid()
+    assert index.data() == "● f002.txt"
+    changed: list[int] = []
+    model.dataChanged.connect(lambda first, _last, _roles: changed.append(first.row()))
+    model.set_dirty(target, False)
+    assert index.data() == "f002.txt"
+    assert changed == [index.row()]
+    assert not model.index_for_path(root / "RU" / "missing.txt").isValid()
+    # Marks absorbed by a listing are not kept around for later reloads.
+    assert model._pending_dirty == {}
+    model.shutdown()
@@ -278,3 +278,67 @@ def test_source_reference_switch_is_budgeted(
         f"rows={rows}",
     )
     assert elapsed_ms <= budget_ms
+
+
+def test_row_heights_are_estimated_then_refined_and_persisted(
+    qtbot, tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    root = _make_perf_project(tmp_path, files=("SurvivalGuide_BE.txt",))
+
+    def _open_wrapped() -> MainWindow:
+        win = MainWindow(str(root), selected_locales=["BE"])
+        qtbot.addWidget(win)
+        win.show()
+        _open_file(win, root / "BE" / "SurvivalGuide_BE.txt")
+        win._wrap_text_user = True
+        win._apply_wrap_mode()
+        win._row_resize_timer.stop()
+        win._row_refine_timer.stop()
+        win._clear_row_height_cache()
+        win._pending_row_span = (0, 30)
+        win._row_resize_cursor = None
+        win._resize_visible_rows()
+        return win
+
+    win = _open_wrapped()
+    assert win._row_refine_rows
+    qtbot.waitUntil(lambda: not win._row_refine_rows, timeout=5000)
+    span = win._visible_row_span()
+    assert span is not None
+    for row in range(span[0], min(span[1], 30) + 1):
+        assert win.table.rowHeight(row) == win.table.sizeHintForRow(row)
+    assert len(win._row_height_store) > 0
+    win.close()
+
+    reopened = _open_wrapped()
+    assert not reopened._row_refine_rows
+    assert reopened._row_height_cache
+
+
+def test_large_file_opens_in_background_then_fills_source(
+    qtbot, tmp_path: Path, monkeypatch
+) -> None:
+    from translationzed_py.gui import file_open_async
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(file_open_async, "ASYNC_OPEN_MIN_BYTES", 0)
+    root = _make_perf_project(tmp_path, files=("SurvivalGuide_BE.txt", "News_BE.txt"))
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win.show()
+
+    first = root / "BE" / "SurvivalGuide_BE.txt"
+    second = root / "BE" / "News_BE.txt"
+    win._file_activated(win.fs_model.index_for_path(first))
+    assert win._file_open_job is not None
+    win._file_activated(win.fs_model.index_for_path(second))
+
+    qtbot.waitUntil(lambda: win._file_open_job is None, timeout=10000)
+    assert win._current_pf is not None
+    assert win._current_pf.path == second
+    assert win._open_flow_depth == 0
+    model = win.table.model()
+    assert model.rowCount() > 0
+    assert model.index(0, 1).data()
+    win.close()
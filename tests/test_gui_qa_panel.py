@@ -10,7 +10,7 @@ from PySide6.QtCore import Qt
 
 from translationzed_py.core.model import Status
 from translationzed_py.core.qa_service import QAFinding
-from translationzed_py.gui import MainWindow
+from translationzed_py.gui import MainWindow, qa_async
 
 
 def test_qa_side_panel_lists_findings_and_navigates(qtbot, tmp_path: Path) -> None:
@@ -277,3 +277,76 @@ def test_qa_refresh_does_not_mutate_file_bytes_without_save(
     win._refresh_qa_for_current_file()
 
     assert be_path.read_bytes() == before
+
+
+def test_qa_locale_scan_lists_findings_from_unopened_files(
+    qtbot, tmp_path: Path
+) -> None:
+    root = tmp_path / "proj"
+    root.mkdir()
+    for loc in ("EN", "BE"):
+        (root / loc).mkdir()
+        (root / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n",
+            encoding="utf-8",
+        )
+    for name in ("first.txt", "second.txt", "third.txt"):
+        (root / "EN" / name).write_text('UI_KEY = "Done."\n', encoding="utf-8")
+        (root / "BE" / name).write_text('UI_KEY = "Gatova"\n', encoding="utf-8")
+
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win._qa_project_scanner._max_workers = 1
+    win._file_chosen(win.fs_model.index_for_path(root / "BE" / "first.txt"))
+    win._left_qa_btn.click()
+
+    win._qa_project_btn.click()
+    qtbot.waitUntil(lambda: not win._qa_project_timer.isActive(), timeout=10000)
+    qtbot.waitUntil(lambda: win._qa_scan_future is None, timeout=5000)
+
+    files = {finding.file.name for finding in win._qa_findings}
+    assert files == {"first.txt", "second.txt", "third.txt"}
+    assert win._qa_results_list.count() == 3
+    assert win._qa_project_btn.text() == "Scan Locales"
+
+
+def test_qa_auto_refresh_rechecks_only_edited_rows(
+    qtbot, tmp_path: Path, monkeypatch
+) -> None:
+    root = tmp_path / "proj"
+    root.mkdir()
+    for loc in ("EN", "BE"):
+        (root / loc).mkdir()
+        (root / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n",
+            encoding="utf-8",
+        )
+    (root / "EN" / "qa.txt").write_text(
+        'L1 = "Hello."\nL2 = "Bye."\nL3 = "Yes."\n', encoding="utf-8"
+    )
+    (root / "BE" / "qa.txt").write_text(
+        'L1 = "Privet"\nL2 = "Bywaj"\nL3 = "Tak."\n', encoding="utf-8"
+    )
+
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win._qa_auto_mark_for_review = False
+    win._qa_auto_refresh = True
+    win._qa_refresh_delay_ms = 0
+    win._file_chosen(win.fs_model.index_for_path(root / "BE" / "qa.txt"))
+    win._left_qa_btn.click()
+    qtbot.waitUntil(lambda: len(win._qa_findings) == 2, timeout=2000)
+    qtbot.waitUntil(lambda: win._qa_scan_future is None, timeout=2000)
+
+    full_scans: list[object] = []
+    monkeypatch.setattr(qa_async, "start_scan", full_scans.append)
+    model = win._current_model
+    assert model is not None
+    model.setData(model.index(0, 2), "Privet.")
+    qtbot.waitUntil(lambda: len(win._qa_findings) == 1, timeout=2000)
+    assert [finding.row for finding in win._qa_findings] == [1]
+
+    model.setData(model.index(2, 2), "Tak")
+    qtbot.waitUntil(lambda: len(win._qa_findings) == 2, timeout=2000)
+    assert [finding.row for finding in win._qa_findings] == [1, 2]
+    assert full_scans == []
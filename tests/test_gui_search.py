@@ -6,7 +6,10 @@ pytest.importorskip("PySide6")
 
 from PySide6.QtCore import Qt
 
+from translationzed_py.core.search import SearchField
 from translationzed_py.gui import MainWindow
+from translationzed_py.gui.search_index_sync import search_rows_stamp
+from translationzed_py.gui.search_rows_loader import RowsLoader
 
 
 def test_search_selects_first_match(qtbot, tmp_path: Path):
@@ -158,6 +161,49 @@ def test_search_side_panel_lists_results_and_navigates(qtbot, tmp_path: Path):
     assert ix_second.isValid()
 
 
+def test_search_panel_refines_extended_query_and_rescans_changed_files(
+    qtbot, tmp_path: Path
+):
+    dst = tmp_path / "proj"
+    dst.mkdir()
+    for loc in ("EN", "BE"):
+        (dst / loc).mkdir()
+        (dst / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n", encoding="utf-8"
+        )
+    (dst / "BE" / "first.txt").write_text('UI_FIRST = "Zombie"\n')
+    (dst / "BE" / "second.txt").write_text('UI_A = "Zombies"\nUI_B = "Zone"\n')
+    win = MainWindow(str(dst), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win._file_chosen(win.fs_model.index_for_path(dst / "BE" / "first.txt"))
+    win._search_scope = "POOL"
+    win.search_mode.setCurrentIndex(win.search_mode.findData(2))  # Translation
+
+    def _panel(query: str) -> list[str]:
+        win.search_edit.setText(query)
+        win._refresh_search_panel_results()
+        qtbot.waitUntil(lambda: win._search_executor.current.done, timeout=2000)
+        win._poll_search_panel()
+        return [
+            win._search_results_list.item(idx).text().split(" ·")[0]
+            for idx in range(win._search_results_list.count())
+        ]
+
+    assert _panel("zo") == ["BE/first.txt:1", "BE/second.txt:1", "BE/second.txt:2"]
+    second = dst / "BE" / "second.txt"
+    assert win._search_refinement.rows(
+        second,
+        query="zom",
+        field=SearchField.TRANSLATION,
+        case_sensitive=False,
+        stamp=search_rows_stamp(win, second),
+    )
+    assert _panel("zombies") == ["BE/second.txt:1"]
+
+    second.write_text('UI_A = "Zombie"\nUI_B = "Zombies!"\n')
+    assert _panel("zombies!") == ["BE/second.txt:2"]
+
+
 def test_search_source_mode_switch_changes_source_matches(qtbot, tmp_path: Path):
     dst = tmp_path / "proj"
     dst.mkdir()
@@ -212,7 +258,10 @@ def test_search_source_mode_switch_invalidates_rows_cache(qtbot, tmp_path: Path)
     win.search_mode.setCurrentIndex(1)  # Source
     win.search_edit.setText("Alpha")
     assert win._search_from_anchor(direction=1, anchor_row=-1, wrap=False) is True
-    assert len(win._search_rows_cache) > 0
+    # The results panel indexes the other files on its search worker.
+    qtbot.waitUntil(lambda: win._search_executor.current.done, timeout=2000)
+    assert win._search_index is not None
+    assert win._search_index.rows(dst / "RU" / "ui.txt") is not None
 
     ru_idx = win.source_ref_combo.findData("RU")
     assert ru_idx >= 0
@@ -220,3 +269,61 @@ def test_search_source_mode_switch_invalidates_rows_cache(qtbot, tmp_path: Path)
     assert len(win._search_rows_cache) == 0
     win.search_edit.setText("Бэта")
     assert win._search_from_anchor(direction=1, anchor_row=-1, wrap=False) is True
+
+
+def test_search_panel_flags_regex_that_times_out(qtbot, tmp_path: Path):
+    from translationzed_py.core.regex_guard import RegexBudget, RegexGuard
+
+    dst = tmp_path / "proj"
+    dst.mkdir()
+    for loc in ("EN", "BE"):
+        (dst / loc).mkdir()
+        (dst / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n", encoding="utf-8"
+        )
+    (dst / "BE" / "ui.txt").write_text(
+        'UI_OK = "aa"\nUI_SLOW = "' + "a" * 64 + '!"\n', encoding="utf-8"
+    )
+    win = MainWindow(str(dst), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win._regex_guard.shutdown()
+    win._regex_guard = RegexGuard(RegexBudget(deadline_s=5.0, row_s=0.3))
+    win._file_chosen(win.fs_model.index_for_path(dst / "BE" / "ui.txt"))
+    win.search_mode.setCurrentIndex(win.search_mode.findData(2))  # Translation
+    win.regex_check.setChecked(True)
+    win.search_edit.setText("(a+)+$")
+    assert win._search_from_anchor(direction=1, anchor_row=-1) is False
+    assert "Regex timed out" in win.search_edit.toolTip()
+    qtbot.waitUntil(lambda: win._search_executor.current.done, timeout=10000)
+    qtbot.waitUntil(
+        lambda: "Regex timed out" in win._search_status_label.text(), timeout=2000
+    )
+    win.search_edit.setText("a+")
+    assert win.search_edit.toolTip() == ""
+    assert win._search_from_anchor(direction=1, anchor_row=-1) is True
+
+
+def test_rows_loader_uses_only_state_captured_on_gui_thread(qtbot, tmp_path: Path):
+    dst = tmp_path / "proj"
+    dst.mkdir()
+    for loc in ("EN", "BE"):
+        (dst / loc).mkdir()
+        (dst / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n", encoding="utf-8"
+        )
+    (dst / "EN" / "ui.txt").write_text('UI_KEY = "Source"\n')
+    (dst / "BE" / "ui.txt").write_text('UI_KEY = "Value"\n')
+    win = MainWindow(str(dst), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    target = dst / "BE" / "ui.txt"
+    loader = RowsLoader.capture(win, [target])
+
+    # Later GUI-side changes must not leak into a running search.
+    win._locales = {}
+    win._source_reference_mode = "BE"
+    rows = list(loader.cached_rows(target, include_source=True, include_value=True))
+    assert [(row.key, row.source, row.value) for row in rows] == [
+        ("UI_KEY", "Source", "Value")
+    ]
+    assert loader.stamp(target) is not None
+    assert dst / "EN" / "ui.txt" in win._en_cache
@@ -13,9 +13,9 @@ from translationzed_py.core.conflict_service import (
     ConflictResolution,
 )
 from translationzed_py.core.save_exit_flow import SaveBatchOutcome
-from translationzed_py.core.search import Match
+from translationzed_py.core.search import Match, SearchRowColumns
 from translationzed_py.core.search_replace_service import (
-    ReplaceAllFileApplyResult,
+    ReplaceAllFileDiff,
     ReplaceAllRowsApplyResult,
     ReplaceRequest,
     SearchMatchApplyPlan,
@@ -31,7 +31,7 @@ from translationzed_py.core.search_replace_service import (
 from translationzed_py.core.tm_import_sync import TMImportSyncReport
 from translationzed_py.core.tm_preferences import TMPreferencesApplyReport
 from translationzed_py.core.tm_rebuild import TMRebuildResult
-from translationzed_py.gui import MainWindow
+from translationzed_py.gui import MainWindow, replace_all_batch
 from translationzed_py.gui import main_window as mw
 
 
@@ -1071,6 +1071,7 @@ def test_find_match_in_rows_delegates_to_search_replace_service(
             start_row,
             direction,
             case_sensitive,
+            regex_guard,
         ):  # type: ignore[no-untyped-def]
             calls.append(
                 {
@@ -1081,6 +1082,7 @@ def test_find_match_in_rows_delegates_to_search_replace_service(
                     "start_row": start_row,
                     "direction": direction,
                     "case_sensitive": case_sensitive,
+                    "regex_guard": regex_guard,
                 }
             )
             return None
@@ -1099,6 +1101,7 @@ def test_find_match_in_rows_delegates_to_search_replace_service(
         is None
     )
     assert calls and calls[0]["query"] == "needle"
+    assert calls[0]["regex_guard"] is win._regex_guard
 
 
 def test_refresh_search_panel_delegates_search_spec_to_service(
@@ -1128,7 +1131,7 @@ def test_refresh_search_panel_delegates_search_spec_to_service(
     assert calls
 
 
-def test_replace_all_count_in_file_delegates_to_search_replace_service(
+def test_replace_all_plan_file_delegates_to_search_replace_service(
     qtbot, tmp_path, monkeypatch
 ):
     root = _make_project(tmp_path)
@@ -1138,25 +1141,36 @@ def test_replace_all_count_in_file_delegates_to_search_replace_service(
 
     calls: list[Path] = []
     delegate = win._search_replace_service
+    planned = ReplaceAllFileDiff(
+        path=target,
+        count=7,
+        entries=(),
+        changed_keys=frozenset(),
+        original_values={},
+        samples=(),
+    )
 
     class _SpyService:
         def __getattr__(self, name: str):
             return getattr(delegate, name)
 
-        def count_replace_all_in_file(self, path: Path, **_kwargs) -> int:  # type: ignore[no-untyped-def]
+        def plan_replace_all_in_file(self, path: Path, **_kwargs):  # type: ignore[no-untyped-def]
             calls.append(path)
-            return 7
+            return planned
 
     monkeypatch.setattr(win, "_search_replace_service", _SpyService())
-    count = win._replace_all_count_in_file(
+    diff = replace_all_batch.plan_file(
+        win,
         target,
-        pattern=re.compile("UI"),
-        replacement="ZZ",
-        use_regex=False,
-        matches_empty=False,
-        has_group_ref=False,
+        ReplaceRequest(
+            pattern=re.compile("UI"),
+            replacement="ZZ",
+            use_regex=False,
+            matches_empty=False,
+            has_group_ref=False,
+        ),
     )
-    assert count == 7
+    assert diff is planned
     assert calls == [target]
 
 
@@ -1192,15 +1206,17 @@ def test_replace_all_count_in_model_delegates_to_search_replace_service(
     assert calls
 
 
-def test_replace_all_in_file_delegates_to_search_replace_service(
+def test_replace_all_commits_planned_batch_and_marks_files_dirty(
     qtbot, tmp_path, monkeypatch
 ):
     root = _make_project(tmp_path)
-    win = MainWindow(str(root), selected_locales=["BE"])
+    win = MainWindow(str(root), selected_locales=["BE", "RU"])
     qtbot.addWidget(win)
-    target = root / "BE" / "ui.txt"
+    win._file_chosen(win.fs_model.index_for_path(root / "BE" / "ui.txt"))
+    target = root / "RU" / "ui.txt"
 
-    calls: list[Path] = []
+    planned: list[Path] = []
+    committed: list[tuple[Path, ...]] = []
     dirty_calls: list[tuple[Path, bool]] = []
     delegate = win._search_replace_service
 
@@ -1208,31 +1224,85 @@ def test_replace_all_in_file_delegates_to_search_replace_service(
         def __getattr__(self, name: str):
             return getattr(delegate, name)
 
-        def apply_replace_all_in_file(
-            self, path: Path, **_kwargs
-        ) -> ReplaceAllFileApplyResult:  # type: ignore[no-untyped-def]
-            calls.append(path)
-            return ReplaceAllFileApplyResult(changed_keys={"UI_OK"}, changed_any=True)
+        def plan_replace_all_batch(self, files, plan_file, **kwargs):  # type: ignore[no-untyped-def]
+            planned.extend(files)
+            return delegate.plan_replace_all_batch(files, plan_file, **kwargs)
+
+        def commit_replace_all_batch(self, diffs, **_kwargs):  # type: ignore[no-untyped-def]
+            committed.append(tuple(diff.path for diff in diffs))
+
+    class _Confirm:
+        def __init__(self, *_args, **_kwargs) -> None:
+            pass
+
+        def exec(self) -> int:
+            return 1
+
+        def confirmed(self) -> bool:
+            return True
 
     monkeypatch.setattr(win, "_search_replace_service", _SpyService())
+    monkeypatch.setattr(replace_all_batch, "ReplaceFilesDialog", _Confirm)
     monkeypatch.setattr(
         win.fs_model,
         "set_dirty",
         lambda path, dirty: dirty_calls.append((path, dirty)),
     )
-    ok = win._replace_all_in_file(
-        target,
-        pattern=re.compile("UI"),
-        replacement="ZZ",
-        use_regex=False,
-        matches_empty=False,
-        has_group_ref=False,
-    )
-    assert ok is True
-    assert calls == [target]
+    win._replace_scope = "POOL"
+    win.search_edit.setText("Хорошо")
+    win.replace_edit.setText("Добра")
+    win._replace_all()
+    assert planned == [target]
+    assert committed == [(target,)]
     assert dirty_calls == [(target, True)]
 
 
+def test_replace_all_reports_any_commit_failure(qtbot, tmp_path, monkeypatch):
+    root = _make_project(tmp_path)
+    win = MainWindow(str(root), selected_locales=["BE", "RU"])
+    qtbot.addWidget(win)
+    win._file_chosen(win.fs_model.index_for_path(root / "BE" / "ui.txt"))
+    delegate = win._search_replace_service
+    warnings: list[str] = []
+    refreshed: list[str] = []
+
+    class _FailingService:
+        def __getattr__(self, name: str):
+            return getattr(delegate, name)
+
+        def commit_replace_all_batch(self, _diffs, **_kwargs):  # type: ignore[no-untyped-def]
+            raise ValueError("corrupt cache")
+
+    class _Confirm:
+        def __init__(self, *_args, **_kwargs) -> None:
+            pass
+
+        def exec(self) -> int:
+            return 1
+
+        def confirmed(self) -> bool:
+            return True
+
+    monkeypatch.setattr(win, "_search_replace_service", _FailingService())
+    monkeypatch.setattr(replace_all_batch, "ReplaceFilesDialog", _Confirm)
+    monkeypatch.setattr(
+        replace_all_batch.QMessageBox,
+        "warning",
+        lambda _parent, _title, text: warnings.append(text),
+    )
+    monkeypatch.setattr(
+        win, "_update_tm_locale_variants", lambda: refreshed.append("variants")
+    )
+    win._replace_scope = "POOL"
+    win.search_edit.setText("Хорошо")
+    win.replace_edit.setText("Добра")
+    win._replace_all()
+    assert warnings and "corrupt cache" in warnings[0]
+    assert refreshed == ["variants"]
+    assert win._current_model is not None
+    assert not win._current_model.changed_keys()
+
+
 def test_replace_all_in_model_delegates_to_search_replace_service(
     qtbot, tmp_path, monkeypatch
 ):
@@ -1319,7 +1389,9 @@ def test_cached_rows_from_file_delegates_cache_plans(qtbot, tmp_path, monkeypatc
     cached_rows = [mw._SearchRow(file=target, row=0, key="K", source="", value="V")]
     stamp = SearchRowsCacheStamp(file_mtime_ns=1, cache_mtime_ns=0, source_mtime_ns=0)
     key = (target, False, False)
-    win._search_rows_cache[key] = (stamp, cached_rows)
+    win._search_rows_cache.put(
+        key, stamp, SearchRowColumns.from_rows(target, cached_rows)
+    )
 
     calls: list[str] = []
     delegate = win._search_replace_service
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+
+from translationzed_py.core.tm_store import TMConcordanceHit
+from translationzed_py.gui import MainWindow
+from translationzed_py.gui.tm_concordance import (
+    PAGE_SIZE,
+    TMConcordancePanel,
+    highlight_html,
+)
+
+
+def _hit(idx: int) -> TMConcordanceHit:
+    return TMConcordanceHit(
+        source_text=f"Fuel {idx}",
+        target_text=f"Paliva {idx}",
+        origin="import",
+        tm_name="pack",
+        tm_path="pack.tmx",
+        file_path=None,
+        key=None,
+        updated_at=0,
+        source_spans=((0, 4),),
+    )
+
+
+def test_concordance_highlight_html_escapes_and_marks_spans() -> None:
+    rendered = highlight_html("a <b> fuel", ((6, 10),))
+    assert rendered.startswith("a &lt;b&gt; <span")
+    assert ">fuel</span>" in rendered
+
+
+def test_concordance_panel_pages_with_lookahead_row(qtbot) -> None:
+    calls: list[tuple[str, str, int, int]] = []
+
+    def search(text: str, side: str, offset: int, limit: int):
+        calls.append((text, side, offset, limit))
+        total = PAGE_SIZE + 3
+        return [_hit(idx) for idx in range(offset, min(total, offset + limit))]
+
+    panel = TMConcordancePanel(search)
+    qtbot.addWidget(panel)
+    panel.query_edit.setText(" fuel ")
+    panel.run_search()
+    assert calls[-1] == ("fuel", "source", 0, PAGE_SIZE + 1)
+    assert panel.results_list.count() == PAGE_SIZE
+    assert panel.next_btn.isEnabled() and not panel.prev_btn.isEnabled()
+
+    panel.next_page()
+    assert calls[-1][2] == PAGE_SIZE
+    assert panel.results_list.count() == 3
+    assert not panel.next_btn.isEnabled() and panel.prev_btn.isEnabled()
+
+    panel.side_combo.setCurrentIndex(1)
+    assert calls[-1] == ("fuel", "target", 0, PAGE_SIZE + 1)
+
+
+def test_concordance_side_panel_searches_current_locale_tm(
+    qtbot, tmp_path: Path
+) -> None:
+    root = tmp_path / "proj"
+    root.mkdir()
+    for loc in ("EN", "BE"):
+        (root / loc).mkdir()
+        (root / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n",
+            encoding="utf-8",
+        )
+    (root / "EN" / "ui.txt").write_text('UI_FUEL = "Fuel"\n', encoding="utf-8")
+    (root / "BE" / "ui.txt").write_text('UI_FUEL = "Paliva"\n', encoding="utf-8")
+
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    win._left_concordance_btn.click()
+    panel = win._concordance_panel
+    assert win._left_stack.currentWidget() is panel
+    panel.query_edit.setText("generator")
+    panel.run_search()
+    assert panel.results_list.count() == 0
+    assert "Open a file" in panel.status_label.text()
+
+    win._file_chosen(win.fs_model.index_for_path(root / "BE" / "ui.txt"))
+    assert win._ensure_tm_store()
+    assert win._tm_store is not None
+    win._tm_store.insert_import_pairs(
+        [("Generator fuel", "Paliva generatara"), ("Door", "Dzviery")],
+        source_locale="EN",
+        target_locale="BE",
+        tm_name="pack",
+    )
+    panel.run_search()
+    assert panel.results_list.count() == 1
+    hit = panel.results_list.item(0).data(Qt.UserRole)
+    assert hit.target_text == "Paliva generatara"
+    # The first search started the pair's index build in the background.
+    qtbot.waitUntil(lambda: win._tm_index_future is None, timeout=5000)
+    assert win._tm_store.concordance_ready(source_locale="EN", target_locale="BE")
+    panel.run_search()
+    assert panel.results_list.count() == 1
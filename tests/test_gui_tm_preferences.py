@@ -558,6 +558,16 @@ def test_tm_panel_shows_cross_locale_variants_in_session_order(
     assert win._tm_variants_list.item(0).text().startswith("RU ·")
     assert win._tm_variants_list.item(1).text().startswith("KO ·")
 
+    # Same answer once the background cross-locale index is ready.
+    win._locale_variants.refresh_async(win._locales, win._selected_locales).result(
+        timeout=10
+    )
+    assert win._locale_variants.is_ready(["RU", "KO"])
+    win._update_tm_suggestions()
+    assert win._tm_variants_list.count() == 2
+    assert win._tm_variants_list.item(0).text().startswith("RU ·")
+    assert win._tm_variants_list.item(1).text().startswith("KO ·")
+
 
 def test_tm_bootstrap_rebuild_runs_even_when_store_has_entries(
     tmp_path, qtbot, monkeypatch
@@ -969,3 +979,54 @@ def test_preferences_tm_list_shows_segment_count_and_zero_warning(
     banner_text = dialog._tm_zero_segment_banner.text()
     assert "0 segments" in banner_text
     assert "will not contribute suggestions" in banner_text
+
+
+def test_tm_maintenance_runs_on_worker_thread(tmp_path, qtbot, monkeypatch):
+    import threading
+
+    from translationzed_py.gui import tm_maintenance
+
+    root = _make_project(tmp_path)
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    assert win._ensure_tm_store()
+
+    threads: list[str] = []
+    original = tm_maintenance._maintain_project_tm
+
+    def _maintain(project_root: Path):
+        threads.append(threading.current_thread().name)
+        return original(project_root)
+
+    reports: list[str] = []
+    monkeypatch.setattr(tm_maintenance, "_maintain_project_tm", _maintain)
+    monkeypatch.setattr(
+        QMessageBox, "information", lambda _p, _t, text: reports.append(text)
+    )
+    tm_maintenance.start_tm_maintenance(win)
+    assert win._tm_maintain_timer.isActive()
+    qtbot.waitUntil(lambda: win._tm_maintain_future is None, timeout=10000)
+
+    assert threads and threads[0].startswith("tzp-tm-maintain")
+    assert reports and reports[0].startswith("Size:")
+    assert not win._tm_maintain_timer.isActive()
+
+
+def test_tm_token_backfill_runs_after_store_init(tmp_path, qtbot):
+    from translationzed_py.core.tm_store import TMStore
+
+    root = _make_project(tmp_path)
+    store = TMStore(root)
+    store.insert_import_pairs(
+        [("Drop one", "Skinuć adno")], source_locale="EN", target_locale="BE"
+    )
+    store._conn.execute("DROP TABLE tm_tokens")
+    store._conn.commit()
+    store.close()
+
+    win = MainWindow(str(root), selected_locales=["BE"])
+    qtbot.addWidget(win)
+    assert win._ensure_tm_store()
+    assert win._tm_index_future is not None
+    qtbot.waitUntil(lambda: win._tm_index_future is None, timeout=10000)
+    assert not win._tm_store.token_backfill_pending()
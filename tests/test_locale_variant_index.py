@@ -0,0 +1,121 @@
+from pathlib import Path
+
+from translationzed_py.core import parse
+from translationzed_py.core.locale_variant_index import (
+    LocaleVariantIndex,
+    variant_file_id,
+    variant_path_for_locale,
+)
+from translationzed_py.core.model import Status
+from translationzed_py.core.project_scanner import scan_root
+from translationzed_py.core.status_cache import restore, snapshot, write
+
+
+def _make_project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    values = {"EN": "Drop one", "BE": "Скінуць шт.", "RU": "Сбросить шт."}
+    for loc, value in values.items():
+        (root / loc).mkdir(parents=True, exist_ok=True)
+        (root / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n", encoding="utf-8"
+        )
+        (root / loc / "ui.txt").write_text(f'UI_KEY = "{value}"\n', encoding="utf-8")
+        (root / loc / f"IG_UI_{loc}.txt").write_text(
+            f'IGUI_KEY = "{loc}"\n', encoding="utf-8"
+        )
+    return root
+
+
+def test_variant_file_id_strips_locale_suffix() -> None:
+    assert variant_file_id("IG_UI_BE.txt", "BE") == "IG_UI_{locale}.txt"
+    assert variant_file_id("sub/IG_UI_PT_BR.txt", "PT BR") == "sub/IG_UI_{locale}.txt"
+    assert variant_file_id("ui.txt", "BE") == "ui.txt"
+
+
+def test_variant_path_for_locale_swaps_suffix(tmp_path: Path) -> None:
+    root = _make_project(tmp_path)
+    assert variant_path_for_locale(
+        root, root / "BE" / "IG_UI_BE.txt", from_locale="BE", to_locale="RU"
+    ) == (root / "RU" / "IG_UI_RU.txt")
+    assert (
+        variant_path_for_locale(
+            root, root / "BE" / "missing.txt", from_locale="BE", to_locale="RU"
+        )
+        is None
+    )
+
+
+def test_index_lookup_overlays_cache_and_persists(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    root = _make_project(tmp_path)
+    ru_path = root / "RU" / "ui.txt"
+    pf = parse(ru_path)
+    object.__setattr__(pf.entries[0], "value", "Сбросить одну")
+    object.__setattr__(pf.entries[0], "status", Status.PROOFREAD)
+    write(root, ru_path, pf.entries, changed_keys={"UI_KEY"})
+    locales = scan_root(root)
+
+    index = LocaleVariantIndex(root)
+    assert index.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) is None
+    assert index.refresh({code: locales[code] for code in ("BE", "RU")}) == 4
+    assert index.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) == [
+        ("RU", "Сбросить одну", int(Status.PROOFREAD))
+    ]
+    assert index.lookup(root / "BE" / "IG_UI_BE.txt", "IGUI_KEY", ["RU"]) == [
+        ("RU", "RU", int(Status.UNTOUCHED))
+    ]
+    index.close()
+    assert index.path.exists()
+
+    reloaded = LocaleVariantIndex(root)
+    assert reloaded.refresh({code: locales[code] for code in ("BE", "RU")}) == 0
+    assert reloaded.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) == [
+        ("RU", "Сбросить одну", int(Status.PROOFREAD))
+    ]
+    reloaded.close()
+
+
+def test_index_follows_status_cache_writes(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    root = _make_project(tmp_path)
+    locales = scan_root(root)
+    index = LocaleVariantIndex(root)
+    index.refresh({code: locales[code] for code in ("BE", "RU")})
+
+    ru_path = root / "RU" / "ui.txt"
+    pf = parse(ru_path)
+    object.__setattr__(pf.entries[0], "value", "Черновик")
+    object.__setattr__(pf.entries[0], "status", Status.FOR_REVIEW)
+    write(root, ru_path, pf.entries, changed_keys={"UI_KEY"})
+
+    assert index.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) == [
+        ("RU", "Черновик", int(Status.FOR_REVIEW))
+    ]
+    index.close()
+    # The write refreshed the stored stamps, so nothing needs re-parsing.
+    reloaded = LocaleVariantIndex(root)
+    assert reloaded.refresh({code: locales[code] for code in ("BE", "RU")}) == 0
+    reloaded.close()
+
+
+def test_index_forgets_restored_caches(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    root = _make_project(tmp_path)
+    locales = scan_root(root)
+    index = LocaleVariantIndex(root)
+    index.refresh({code: locales[code] for code in ("BE", "RU")})
+
+    ru_path = root / "RU" / "ui.txt"
+    saved = snapshot(root, ru_path)
+    pf = parse(ru_path)
+    object.__setattr__(pf.entries[0], "value", "Черновик")
+    write(root, ru_path, pf.entries, changed_keys={"UI_KEY"})
+    restore(saved)
+
+    # Lookups fall back to the disk until the file is re-indexed.
+    assert index.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) is None
+    assert index.refresh({code: locales[code] for code in ("BE", "RU")}) == 1
+    assert index.lookup(root / "BE" / "ui.txt", "UI_KEY", ["RU"]) == [
+        ("RU", "Сбросить шт.", int(Status.UNTOUCHED))
+    ]
+    index.close()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -8,6 +9,7 @@ from translationzed_py.core import (
     scan_root,
     scan_root_with_errors,
 )
+from translationzed_py.core.project_scanner import ProjectFileSnapshot
 
 
 def test_scan_root_discovers_locales(tmp_path: Path) -> None:
@@ -83,3 +85,27 @@ def test_list_translatable_files_ignores_tvradio(prod_like_root: Path) -> None:
     root = prod_like_root
     locales = scan_root(root)
     assert "_TVRADIO_TRANSLATIONS" not in locales
+
+
+def test_project_file_snapshot_reuses_listing_until_dirs_change(
+    tmp_path: Path,
+) -> None:
+    locale = tmp_path / "BE"
+    (locale / "sub").mkdir(parents=True)
+    (locale / "language.txt").write_text("charset = UTF-8,\n", encoding="utf-8")
+    (locale / "ui.txt").write_text("x", encoding="utf-8")
+    (locale / "sub" / "items.txt").write_text("x", encoding="utf-8")
+    snapshot = ProjectFileSnapshot()
+
+    first = snapshot.files(locale)
+    assert first == tuple(list_translatable_files(locale))
+    assert snapshot.files(locale) is first
+
+    sub = locale / "sub"
+    (sub / "more.txt").write_text("x", encoding="utf-8")
+    mtime = sub.stat().st_mtime_ns + 1_000_000_000
+    os.utime(sub, ns=(mtime, mtime))
+    assert sub / "more.txt" in snapshot.files(locale)
+
+    snapshot.invalidate(locale)
+    assert snapshot.files(locale) is not first
@@ -49,3 +49,14 @@ def test_newline_mismatch_normalizes_crlf() -> None:
 def test_same_as_source_requires_exact_match() -> None:
     assert same_as_source("Text", "Text") is True
     assert same_as_source("Text", "text") is False
+
+
+def test_protected_tokens_come_from_one_pass_in_text_order() -> None:
+    assert extract_protected_tokens("\\t%s [IMG=x] <BR>") == (
+        "\\t",
+        "%s",
+        "[IMG=x]",
+        "<BR>",
+    )
+    assert missing_protected_tokens("Plain text.", "<LINE>") == ()
+    assert missing_protected_tokens("<LINE> %1", "%1") == ("<LINE>",)
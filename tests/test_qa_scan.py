@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from translationzed_py.core import parse, qa_scan
+from translationzed_py.core.qa_scan import (
+    QAFileJob,
+    QAFindingsCache,
+    QAProjectScanner,
+    QARuleSet,
+    qa_file_stamp,
+    scan_qa_file,
+)
+from translationzed_py.core.qa_service import QA_CODE_TRAILING
+from translationzed_py.core.status_cache import write as write_status_cache
+
+_RULES = QARuleSet(
+    check_trailing=True,
+    check_newlines=True,
+    check_tokens=False,
+    check_same_as_source=False,
+)
+
+
+def _project(tmp_path: Path, count: int = 3) -> tuple[Path, list[QAFileJob]]:
+    root = tmp_path / "proj"
+    jobs: list[QAFileJob] = []
+    for loc in ("EN", "BE"):
+        (root / loc).mkdir(parents=True)
+    for idx in range(count):
+        name = f"ui{idx}.txt"
+        (root / "EN" / name).write_text(f'UI_{idx} = "Done."\n', encoding="utf-8")
+        (root / "BE" / name).write_text(f'UI_{idx} = "Gatova"\n', encoding="utf-8")
+        jobs.append(
+            QAFileJob(
+                root=root,
+                path=root / "BE" / name,
+                encoding="utf-8",
+                source_path=root / "EN" / name,
+            )
+        )
+    return root, jobs
+
+
+def test_scan_qa_file_checks_cached_values_against_source(tmp_path: Path) -> None:
+    root, jobs = _project(tmp_path, count=1)
+    job = jobs[0]
+    findings = scan_qa_file(job, _RULES)
+    assert [(f.row, f.code) for f in findings] == [(0, QA_CODE_TRAILING)]
+
+    entries = list(parse(job.path, encoding="utf-8").entries)
+    entries[0] = replace(entries[0], value="Gatova.")
+    write_status_cache(root, job.path, entries, changed_keys={entries[0].key})
+    assert scan_qa_file(job, _RULES) == ()
+
+
+def test_project_scan_answers_unchanged_files_from_cache(tmp_path: Path) -> None:
+    root, jobs = _project(tmp_path)
+    scanner = QAProjectScanner(root, max_workers=1)
+    try:
+        run = scanner.start(jobs, _RULES, synchronous=True)
+        first = dict(run.take())
+        assert run.done and run.error() is None
+        assert run.files_done == 3 and run.cached_files == 0
+        assert all(len(findings) == 1 for findings in first.values())
+
+        again = scanner.start(jobs, _RULES, synchronous=True)
+        assert again.cached_files == 3
+        assert dict(again.take()) == first
+
+        jobs[0].path.write_text('UI_0 = "Gatova."\n', encoding="utf-8")
+        changed = scanner.start(jobs, _RULES, synchronous=True)
+        assert changed.cached_files == 2
+        assert dict(changed.take())[jobs[0].path] == ()
+
+        other_rules = QARuleSet(False, True, False, False)
+        assert scanner.start(jobs, other_rules, synchronous=True).cached_files == 0
+    finally:
+        scanner.shutdown()
+
+
+def test_project_scan_stamp_tracks_source_file(tmp_path: Path) -> None:
+    _root, jobs = _project(tmp_path, count=1)
+    job = jobs[0]
+    before = qa_file_stamp(job)
+    assert job.source_path is not None
+    job.source_path.write_text('UI_0 = "Done!"\n', encoding="utf-8")
+    assert qa_file_stamp(job) != before
+    missing = QAFileJob(root=job.root, path=job.root / "BE" / "nope.txt", encoding="")
+    assert qa_file_stamp(missing) is None
+
+
+def test_findings_cache_rehashes_only_changed_files(
+    tmp_path: Path, monkeypatch
+) -> None:
+    root, jobs = _project(tmp_path, count=2)
+    hashed: list[str] = []
+    content_hash = qa_scan._content_hash
+
+    def _counting_hash(path: Path) -> str:
+        hashed.append(path.name)
+        return content_hash(path)
+
+    monkeypatch.setattr(qa_scan, "_content_hash", _counting_hash)
+    scanner = QAProjectScanner(root, max_workers=1)
+    try:
+        scanner.start(jobs, _RULES, synchronous=True)
+        assert len(hashed) == 4
+        hashed.clear()
+        assert scanner.start(jobs, _RULES, synchronous=True).cached_files == 2
+        assert hashed == []
+        jobs[0].path.write_text('UI_0 = "Gatova!"\n', encoding="utf-8")
+        assert scanner.start(jobs, _RULES, synchronous=True).cached_files == 1
+        assert hashed == ["ui0.txt"]
+    finally:
+        scanner.shutdown()
+
+    hashed.clear()
+    reopened = QAFindingsCache(root)
+    try:
+        # Remembered hashes survive a restart.
+        assert qa_file_stamp(jobs[1], content_hash=reopened.content_hash)
+        assert hashed == []
+    finally:
+        reopened.close()
+
+
+def test_project_scan_reports_failures_and_keeps_going(tmp_path: Path) -> None:
+    root, jobs = _project(tmp_path, count=2)
+    broken = root / "BE" / "broken.txt"
+    broken.write_bytes(b'UI_X = "\xff\xfe"\n')
+    jobs.insert(0, QAFileJob(root=root, path=broken, encoding="ascii"))
+    scanner = QAProjectScanner(root, max_workers=1)
+    try:
+        run = scanner.start(jobs, _RULES, synchronous=True)
+        assert [path for path, _message in run.failures] == [broken]
+        assert run.files_done == 3
+        assert {path for path, _findings in run.take()} == {
+            jobs[1].path,
+            jobs[2].path,
+        }
+    finally:
+        scanner.shutdown()
+
+
+def test_project_scan_streams_results_from_process_pool(tmp_path: Path) -> None:
+    root, jobs = _project(tmp_path, count=4)
+    scanner = QAProjectScanner(root, max_workers=2)
+    try:
+        run = scanner.start(jobs, _RULES)
+        results: dict[Path, tuple] = {}
+        deadline = time.monotonic() + 60
+        while not run.done and time.monotonic() < deadline:
+            results.update(run.take())
+            time.sleep(0.05)
+        results.update(run.take())
+        assert run.error() is None
+        assert set(results) == {job.path for job in jobs}
+        assert all(f[0].code == QA_CODE_TRAILING for f in results.values())
+        assert scanner.cache().path.name == "qa_findings.sqlite"
+        assert scanner.start(jobs, _RULES, synchronous=True).cached_files == 4
+    finally:
+        scanner.shutdown()
+
+
+def test_project_scan_shuts_down_broken_pool(tmp_path: Path) -> None:
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    class _BrokenPool:
+        def __init__(self) -> None:
+            self.shutdowns = 0
+
+        def submit(self, *_args, **_kwargs) -> Future:
+            future: Future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, **_kwargs) -> None:
+            self.shutdowns += 1
+
+    root, jobs = _project(tmp_path, count=3)
+    scanner = QAProjectScanner(root, max_workers=2)
+    broken = _BrokenPool()
+    scanner._pool = broken  # type: ignore[assignment]
+    try:
+        run = scanner.start(jobs, _RULES, synchronous=True)
+        assert len(run.failures) == 3
+        assert broken.shutdowns == 1
+        assert scanner._pool is None
+    finally:
+        scanner.shutdown()
+    # Pool size follows the machine (capped), not one scan's backlog.
+    assert 1 <= QAProjectScanner(root)._pool_size() <= 8
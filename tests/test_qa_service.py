@@ -3,15 +3,21 @@ from __future__ import annotations
 from pathlib import Path
 
 from translationzed_py.core.qa_service import (
+    _QA_RULES,
     QA_CODE_NEWLINES,
     QA_CODE_SAME_AS_SOURCE,
     QA_CODE_TOKENS,
     QA_CODE_TRAILING,
     QAFinding,
     QAInputRow,
+    QARowFindings,
+    QARule,
     QAService,
     build_qa_panel_plan,
     qa_finding_label,
+    register_qa_rule,
+    registered_qa_rules,
+    scan_qa_rows,
 )
 
 
@@ -193,3 +199,84 @@ def test_qa_service_navigation_plan_moves_and_wraps() -> None:
     )
     assert prev_wrap_plan.finding is not None
     assert prev_wrap_plan.finding.row == 3
+
+
+def test_qa_project_findings_merge_by_path_and_report_progress() -> None:
+    service = QAService()
+    root = Path("/tmp/proj")
+    first = QAFinding(file=root / "BE" / "a.txt", row=2, code="qa.trailing", excerpt="")
+    second = QAFinding(file=root / "BE" / "b.txt", row=0, code="qa.tokens", excerpt="")
+    merged = service.merge_file_findings(
+        {second.file: (second,), first.file: (first,), root / "BE" / "c.txt": ()}
+    )
+    assert merged == (first, second)
+    assert service.project_status_message(
+        files_done=3, files_total=10, cached_files=2, findings=5, running=True
+    ) == ("Scanning locales: 3/10 files (2 cached) · 5 QA findings...")
+    assert service.project_status_message(
+        files_done=10, files_total=10, cached_files=2, findings=5, failures=1
+    ) == ("Locales scanned: 10/10 files (2 cached) · 5 QA findings · 1 failed.")
+
+
+def test_qa_row_findings_rescan_replaces_only_touched_rows() -> None:
+    service = QAService()
+    path = Path("/tmp/proj/BE/ui.txt")
+    rows = [
+        QAInputRow(row=0, source_text="Hello.", target_text="Privet"),
+        QAInputRow(row=1, source_text="Bye.", target_text="Bywaj."),
+        QAInputRow(row=2, source_text="Yes.", target_text="Tak"),
+    ]
+    index = QARowFindings()
+    index.reset(
+        path,
+        "stamp",
+        service.scan_rows(
+            file=path, rows=rows, check_trailing=True, check_newlines=False
+        ),
+    )
+    assert index.matches(path, "stamp")
+    assert not index.matches(path, "other")
+    assert [finding.row for finding in index.findings()] == [0, 2]
+
+    fresh = service.rescan_rows(
+        index,
+        rows=[
+            QAInputRow(row=0, source_text="Hello.", target_text="Privet."),
+            QAInputRow(row=1, source_text="Bye.", target_text="Bywaj"),
+        ],
+        check_trailing=True,
+        check_newlines=False,
+    )
+    assert [finding.row for finding in fresh] == [1]
+    assert [finding.row for finding in index.findings()] == [1, 2]
+
+
+def test_registered_qa_rule_runs_with_builtins_and_reports_timings() -> None:
+    rule = QARule(
+        "qa.test_double_space",
+        lambda _source, target: "Double space" if "  " in target else None,
+        group="content",
+    )
+    register_qa_rule(rule)
+    try:
+        assert rule in registered_qa_rules()
+        timings: list[tuple[str, int, int]] = []
+        findings = scan_qa_rows(
+            file=Path("/tmp/proj/BE/ui.txt"),
+            rows=[
+                QAInputRow(row=0, source_text="Hi.", target_text="Pry  vet"),
+                QAInputRow(row=1, source_text="Yes", target_text="Tak"),
+            ],
+            check_trailing=True,
+            check_newlines=False,
+            check_tokens=False,
+            check_same_as_source=False,
+            on_rule=lambda code, _ms, rows, hits: timings.append((code, rows, hits)),
+        )
+    finally:
+        _QA_RULES.pop(rule.code)
+    assert [(f.row, f.code, f.group) for f in findings] == [
+        (0, QA_CODE_TRAILING, "format"),
+        (0, "qa.test_double_space", "content"),
+    ]
+    assert timings == [(QA_CODE_TRAILING, 2, 1), ("qa.test_double_space", 2, 1)]
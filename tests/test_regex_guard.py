@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from translationzed_py.core.regex_guard import (
+    RegexBudget,
+    RegexGuard,
+    RegexTimeoutError,
+)
+from translationzed_py.core.search import SearchField, SearchRow, search
+
+_CATASTROPHIC = "(a+)+$"
+
+
+@pytest.fixture
+def guard():
+    guard = RegexGuard(RegexBudget(deadline_s=5.0, row_s=0.3))
+    yield guard
+    guard.shutdown()
+
+
+def _rows(values: list[str]) -> list[SearchRow]:
+    return [
+        SearchRow(Path("a.txt"), row, f"K{row}", "", value)
+        for row, value in enumerate(values)
+    ]
+
+
+def test_guarded_regex_search_matches_in_process_search(guard) -> None:
+    rows = _rows(["Alpha beta", "gamma", "BETA delta", ""])
+    for query in (r"beta\b", r"^g", r"(?m)delta$"):
+        expected = search(
+            rows, query, SearchField.TRANSLATION, True, include_preview=True
+        )
+        got = search(
+            rows,
+            query,
+            SearchField.TRANSLATION,
+            True,
+            include_preview=True,
+            regex_guard=guard,
+        )
+        assert got == expected
+
+
+def test_catastrophic_regex_times_out_with_partial_matches(guard) -> None:
+    rows = _rows(["aaa"] * 300 + ["a" * 64 + "!", "aa"])
+    with pytest.raises(RegexTimeoutError) as caught:
+        list(
+            search(
+                rows, _CATASTROPHIC, SearchField.TRANSLATION, True, regex_guard=guard
+            )
+        )
+    error = caught.value
+    assert error.reason == "row"
+    assert error.done >= 256
+    assert [index for index, _span in error.partial] == list(range(error.done))
+    # The killed worker is replaced on the next call.
+    assert [
+        m.row
+        for m in search(
+            rows[:2], "a+", SearchField.TRANSLATION, True, regex_guard=guard
+        )
+    ] == [0, 1]
+
+
+def test_query_view_gives_each_call_a_deadline_under_a_total_cap() -> None:
+    guard = RegexGuard(RegexBudget(deadline_s=0.3, row_s=0.3, total_s=0.5))
+    try:
+        view = guard.for_query()
+        slow = _rows(["a" * 64 + "!"])
+        with pytest.raises(RegexTimeoutError) as first:
+            search(slow, _CATASTROPHIC, SearchField.TRANSLATION, True, regex_guard=view)
+        assert first.value.reason == "deadline"
+        # The next file gets its own deadline.
+        quick = search(
+            _rows(["a"]), "a", SearchField.TRANSLATION, True, regex_guard=view
+        )
+        assert [m.row for m in quick] == [0]
+        with pytest.raises(RegexTimeoutError) as capped:
+            search(slow, _CATASTROPHIC, SearchField.TRANSLATION, True, regex_guard=view)
+        assert capped.value.reason == "total"
+        with pytest.raises(RegexTimeoutError) as spent:
+            search(_rows(["a"]), "a", SearchField.TRANSLATION, True, regex_guard=view)
+        assert spent.value.reason == "total"
+        assert spent.value.partial == []
+        fresh = search(
+            _rows(["a"]), "a", SearchField.TRANSLATION, True, regex_guard=guard
+        )
+        assert [m.row for m in fresh] == [0]
+    finally:
+        guard.shutdown()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from translationzed_py.core.row_height_store import (
+    WIDTH_STEP,
+    RowHeightStore,
+    width_bucket,
+)
+
+
+def test_width_bucket_rounds_down_to_step() -> None:
+    assert width_bucket(-5) == 0
+    assert width_bucket(WIDTH_STEP * 10 + WIDTH_STEP - 1) == WIDTH_STEP * 10
+
+
+def test_row_height_store_round_trips_per_layout(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "row_heights.bin"
+    store = RowHeightStore(path)
+    store.put("Sans,10|ws=0", "Hello world", 200, 34)
+    store.put("Sans,12|ws=0", "Hello world", 200, 40)
+    assert store.get("Sans,10|ws=0", "Hello world", 200) == 34
+    assert store.get("Sans,10|ws=0", "Hello world", 208) is None
+    assert store.get("Sans,10|ws=1", "Hello world", 200) is None
+    store.flush()
+
+    reloaded = RowHeightStore(path)
+    assert len(reloaded) == 2
+    assert reloaded.get("Sans,12|ws=0", "Hello world", 200) == 40
+
+
+def test_row_height_store_drops_oldest_past_limit(tmp_path: Path) -> None:
+    store = RowHeightStore(tmp_path / "heights.bin", max_entries=2)
+    for idx in range(3):
+        store.put("font", f"text {idx}", 100, 20 + idx)
+    assert len(store) == 2
+    assert store.get("font", "text 0", 100) is None
+    assert store.get("font", "text 2", 100) == 22
+
+    # An updated entry counts as recent again.
+    store.put("font", "text 1", 100, 30)
+    store.put("font", "text 3", 100, 23)
+    assert len(store) == 2
+    assert store.get("font", "text 1", 100) == 30
+    assert store.get("font", "text 2", 100) is None
+
+
+def test_row_height_store_ignores_corrupt_file(tmp_path: Path) -> None:
+    path = tmp_path / "heights.bin"
+    path.write_bytes(b"RHC1\x05\x00\x00\x00garbage")
+    store = RowHeightStore(path)
+    assert len(store) == 0
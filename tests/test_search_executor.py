@@ -0,0 +1,78 @@
+import threading
+from pathlib import Path
+
+from translationzed_py.core.search import Match
+from translationzed_py.core.search_executor import SearchExecutor
+
+
+def _drain(run) -> list[tuple[str, int]]:
+    out: list[tuple[str, int]] = []
+    while True:
+        finished = run.done
+        out.extend((match.file.name, match.row) for match in run.take())
+        if finished:
+            return out
+
+
+def test_search_executor_streams_matches_in_file_order() -> None:
+    files = [Path("a.txt"), Path("b.txt"), Path("c.txt")]
+    executor = SearchExecutor()
+    try:
+        run = executor.start(
+            files,
+            lambda path: (
+                [Match(path, 0), Match(path, 1)] if path.name != "b.txt" else []
+            ),
+            limit=10,
+        )
+        assert _drain(run) == [("a.txt", 0), ("a.txt", 1), ("c.txt", 0), ("c.txt", 1)]
+        assert run.count == 4
+        assert run.truncated is False
+        assert run.error() is None
+    finally:
+        executor.shutdown()
+
+
+def test_search_executor_stops_at_limit_and_reports_errors() -> None:
+    files = [Path("a.txt"), Path("b.txt")]
+    seen: list[Path] = []
+
+    def _matches(path: Path):
+        seen.append(path)
+        return (Match(path, row) for row in range(3))
+
+    executor = SearchExecutor()
+    run = executor.start(files, _matches, limit=2, synchronous=True)
+    assert run.done
+    assert [match.row for match in run.take()] == [0, 1]
+    assert run.truncated is True
+    assert seen == [files[0]]
+
+    def _broken(_path: Path):
+        raise OSError("boom")
+
+    failed = executor.start(files, _broken, limit=2, synchronous=True)
+    assert isinstance(failed.error(), OSError)
+    assert failed.take() == []
+
+
+def test_search_executor_cancels_previous_run_on_start() -> None:
+    release = threading.Event()
+    files = [Path("a.txt"), Path("b.txt")]
+
+    def _slow(path: Path):
+        yield Match(path, 0)
+        release.wait(timeout=5)
+        yield Match(path, 1)
+
+    executor = SearchExecutor()
+    try:
+        first = executor.start(files, _slow, limit=10)
+        second = executor.start(files, lambda path: [Match(path, 7)], limit=10)
+        assert first.cancelled
+        assert executor.current is second
+        release.set()
+        assert _drain(second) == [("a.txt", 7), ("b.txt", 7)]
+        assert len(_drain(first)) <= 1
+    finally:
+        executor.shutdown()
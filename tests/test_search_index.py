@@ -0,0 +1,196 @@
+import threading
+from pathlib import Path
+
+from translationzed_py.core import parse
+from translationzed_py.core.search import SearchField, SearchRow, iter_matches
+from translationzed_py.core.search_index import SearchIndex, _regex_literals
+from translationzed_py.core.status_cache import write
+
+
+def _make_project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    for loc in ("EN", "BE"):
+        (root / loc).mkdir(parents=True, exist_ok=True)
+        (root / loc / "language.txt").write_text(
+            f"text = {loc},\ncharset = UTF-8,\n", encoding="utf-8"
+        )
+    (root / "EN" / "ui.txt").write_text(
+        'UI_DROP = "Drop all items"\nUI_ZOMBIE = "Zombie horde"\n', encoding="utf-8"
+    )
+    (root / "BE" / "ui.txt").write_text(
+        'UI_DROP = "Скінуць усё"\nUI_ZOMBIE = "Орда зомбі"\n', encoding="utf-8"
+    )
+    (root / "BE" / "misc.txt").write_text('MISC_ZOMBIE = "Зомбі"\n', encoding="utf-8")
+    return root
+
+
+def _rows_loader(root: Path, loads: list[Path]):
+    def _load(path: Path) -> list[SearchRow]:
+        loads.append(path)
+        source = {
+            entry.key: entry.value for entry in parse(root / "EN" / "ui.txt").entries
+        }
+        return [
+            SearchRow(path, idx, entry.key, source.get(entry.key, ""), entry.value)
+            for idx, entry in enumerate(parse(path).entries)
+        ]
+
+    return _load
+
+
+def _matches(index: SearchIndex, files, query, field, use_regex=False):
+    rows_for = index.lookup(files, query=query, field=field, use_regex=use_regex)
+    return [
+        (match.file.name, match.row)
+        for path in files
+        for match in iter_matches(rows_for(path) or (), query, field, use_regex)
+    ]
+
+
+def test_regex_literals_keep_only_required_runs() -> None:
+    assert _regex_literals(r"zomb(ie)?s") == ["zomb", "s"]
+    assert _regex_literals(r"dro+p\s+all") == ["dro", "p", "all"]
+    assert _regex_literals(r"ab?cde[\]xyz]fgh{2}") == ["a", "cde", "fg"]
+    assert _regex_literals(r"one|two") == []
+    assert _regex_literals(r"(?i)zombie") == []
+
+
+def test_search_index_syncs_queries_and_tracks_cache_writes(tmp_path: Path) -> None:
+    root = _make_project(tmp_path)
+    files = [root / "BE" / "ui.txt", root / "BE" / "misc.txt"]
+    loads: list[Path] = []
+    load = _rows_loader(root, loads)
+
+    def source_for(_path: Path) -> Path:
+        return root / "EN" / "ui.txt"
+
+    index = SearchIndex(root)
+    try:
+        assert index.sync(files, source_for=source_for, load_rows=load) == 2
+        assert index.sync(files, source_for=source_for, load_rows=load) == 0
+        assert index.is_current(files[0], source_for(files[0]))
+        assert _matches(index, files, "зомбі", SearchField.TRANSLATION) == [
+            ("ui.txt", 1),
+            ("misc.txt", 0),
+        ]
+        assert _matches(index, files, "horde", SearchField.SOURCE) == [("ui.txt", 1)]
+        assert _matches(index, files, "ui_", SearchField.KEY) == [
+            ("ui.txt", 0),
+            ("ui.txt", 1),
+        ]
+        # Short queries skip the prefilter and scan the indexed rows.
+        assert _matches(index, files, "ё", SearchField.TRANSLATION) == [("ui.txt", 0)]
+        assert _matches(
+            index, files, r"зомб(і)?$", SearchField.TRANSLATION, use_regex=True
+        ) == [("ui.txt", 1), ("misc.txt", 0)]
+
+        # Cache writes update translations without a re-parse.
+        pf = parse(files[1])
+        object.__setattr__(pf.entries[0], "value", "Мерцвякі")
+        write(root, files[1], pf.entries, changed_keys={"MISC_ZOMBIE"})
+        assert _matches(index, files, "зомбі", SearchField.TRANSLATION) == [
+            ("ui.txt", 1)
+        ]
+        assert _matches(index, files, "мерцв", SearchField.TRANSLATION) == [
+            ("misc.txt", 0)
+        ]
+        loads.clear()
+        assert index.sync(files, source_for=source_for, load_rows=load) == 0
+
+        # File edits and reference changes re-index on the next sync.
+        files[0].write_text('UI_DROP = "Кінуць"\n', encoding="utf-8")
+        assert index.sync(files, source_for=source_for, load_rows=load) == 1
+        assert loads == [files[0]]
+        assert index.sync(files, source_for=lambda _p: None, load_rows=load) == 2
+    finally:
+        index.close()
+
+    reopened = SearchIndex(root)
+    try:
+        assert reopened.sync(files, source_for=lambda _p: None, load_rows=load) == 0
+        assert _matches(reopened, files, "кінуць", SearchField.TRANSLATION) == [
+            ("ui.txt", 0)
+        ]
+        assert (
+            reopened.lookup(
+                [root / "BE" / "new.txt"],
+                query="кінуць",
+                field=SearchField.TRANSLATION,
+                use_regex=False,
+            )(root / "BE" / "new.txt")
+            is None
+        )
+    finally:
+        reopened.close()
+
+
+def test_fresh_rows_never_syncs_or_waits(tmp_path: Path) -> None:
+    root = _make_project(tmp_path)
+    path = root / "BE" / "ui.txt"
+    source = root / "EN" / "ui.txt"
+    loads: list[Path] = []
+    index = SearchIndex(root)
+    try:
+
+        def _fresh() -> list[int] | None:
+            rows = index.fresh_rows(
+                path,
+                source,
+                query="зомбі",
+                field=SearchField.TRANSLATION,
+                use_regex=False,
+            )
+            return None if rows is None else [row.row for row in rows]
+
+        assert _fresh() is None
+        assert loads == []
+        index.sync(
+            [path], source_for=lambda _p: source, load_rows=_rows_loader(root, loads)
+        )
+        assert _fresh() == [1]
+
+        held = threading.Event()
+        release = threading.Event()
+
+        def _hold() -> None:
+            with index._lock:
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=_hold)
+        holder.start()
+        held.wait(5)
+        try:
+            assert _fresh() is None
+        finally:
+            release.set()
+            holder.join()
+
+        path.write_text('UI_ZOMBIE = "Зомбі"\n', encoding="utf-8")
+        assert _fresh() is None
+        assert loads == [path]
+    finally:
+        index.close()
+
+
+def test_lookup_skips_files_reindexed_after_it_was_taken(tmp_path: Path) -> None:
+    root = _make_project(tmp_path)
+    files = [root / "BE" / "ui.txt", root / "BE" / "misc.txt"]
+    load = _rows_loader(root, [])
+    index = SearchIndex(root)
+    try:
+        index.sync(files[:1], source_for=lambda _p: None, load_rows=load)
+        stale = index.lookup(
+            files, query="зомбі", field=SearchField.TRANSLATION, use_regex=False
+        )
+        assert stale(files[1]) is None
+        files[0].write_text('UI_ZOMBIE = "Зомбі зноў"\n', encoding="utf-8")
+        index.sync(files, source_for=lambda _p: None, load_rows=load)
+        assert stale(files[0]) is None
+        assert stale(files[1]) is None
+        assert _matches(index, files, "зомбі", SearchField.TRANSLATION) == [
+            ("ui.txt", 0),
+            ("misc.txt", 0),
+        ]
+    finally:
+        index.close()
@@ -6,8 +6,14 @@ from pathlib import Path
 import pytest
 
 from translationzed_py.core.model import Entry, ParsedFile, Status
+from translationzed_py.core.regex_guard import (
+    RegexBudget,
+    RegexGuard,
+    RegexTimeoutError,
+)
 from translationzed_py.core.search import Match, SearchField, SearchRow
 from translationzed_py.core.search_replace_service import (
+    ReplaceAllBatchCallbacks,
     ReplaceAllFileApplyCallbacks,
     ReplaceAllFileApplyResult,
     ReplaceAllFileCountCallbacks,
@@ -19,6 +25,7 @@ from translationzed_py.core.search_replace_service import (
     ReplaceRequestError,
     SearchMatchApplyPlan,
     SearchMatchOpenPlan,
+    SearchRefinementMemo,
     SearchReplaceService,
     SearchRowsBuildResult,
     SearchRowsCacheStamp,
@@ -46,6 +53,7 @@ from translationzed_py.core.search_replace_service import (
     find_match_in_rows,
     load_search_rows_from_file,
     prioritize_current_file,
+    regex_timeout_message,
     replace_text,
     scope_files,
     scope_label,
@@ -633,6 +641,62 @@ def test_apply_replace_all_in_file_marks_translated_and_writes_cache() -> None:
     assert written_entry.status == Status.TRANSLATED
 
 
+def test_replace_all_batch_plans_once_and_commits_all_or_nothing() -> None:
+    files = [Path("BE/a.txt"), Path("BE/b.txt"), Path("BE/c.txt")]
+    parsed = {
+        files[0]: ParsedFile(files[0], [_entry("A", "Drop one")], b""),
+        files[1]: ParsedFile(files[1], [_entry("B", "Keep")], b""),
+        files[2]: ParsedFile(
+            files[2], [_entry("C", "Drop\ntwo"), _entry("D", "Drop")], b""
+        ),
+    }
+    parses: list[Path] = []
+    service = SearchReplaceService()
+
+    def _plan(path: Path):  # type: ignore[no-untyped-def]
+        return service.plan_replace_all_in_file(
+            path,
+            pattern=re.compile("Drop"),
+            replacement="Use",
+            use_regex=False,
+            matches_empty=False,
+            has_group_ref=False,
+            callbacks=ReplaceAllFileCountCallbacks(
+                parse_file=lambda file_path: parses.append(file_path)
+                or parsed[file_path],
+                read_cache=lambda _path: CacheMap(hash_bits=64),
+            ),
+            hash_for_entry=lambda _entry, _cache: 1,
+        )
+
+    diffs = service.plan_replace_all_batch(files, _plan, max_workers=2)
+    assert sorted(parses) == sorted(files)
+    assert [(diff.path, diff.count) for diff in diffs] == [(files[0], 1), (files[2], 2)]
+    assert service.replace_all_preview_lines(diffs[1]) == (
+        "C: Drop two → Use two",
+        "D: Drop → Use",
+    )
+
+    disk = {files[0]: "old-a", files[2]: "old-c"}
+
+    def _write(path: Path, entries, _changed, _originals) -> None:  # type: ignore[no-untyped-def]
+        if path == files[2]:
+            raise OSError("disk full")
+        disk[path] = ",".join(entry.value for entry in entries)
+
+    callbacks = ReplaceAllBatchCallbacks(
+        write_cache=_write,
+        snapshot=lambda path: (path, disk[path]),
+        restore=lambda saved: disk.__setitem__(*saved),  # type: ignore[misc]
+    )
+    with pytest.raises(OSError):
+        service.commit_replace_all_batch(diffs, callbacks=callbacks)
+    assert disk == {files[0]: "old-a", files[2]: "old-c"}
+
+    service.commit_replace_all_batch(diffs[:1], callbacks=callbacks)
+    assert disk[files[0]] == "Use one"
+
+
 def test_count_replace_all_in_file_wraps_parse_error() -> None:
     path = Path("BE/ui.txt")
     callbacks = ReplaceAllFileCountCallbacks(
@@ -678,6 +742,45 @@ def test_count_replace_all_in_rows_counts_changed_rows() -> None:
     assert count == 2
 
 
+def test_apply_replace_all_in_rows_through_regex_guard_is_all_or_nothing() -> None:
+    rows = ["Drop one", "Rest", "Drop all"]
+    writes: list[tuple[int, str]] = []
+    callbacks = ReplaceAllRowsCallbacks(
+        row_count=lambda: len(rows),
+        read_text=lambda row: rows[row],
+        write_text=lambda row, text: writes.append((row, text)),
+    )
+    guard = RegexGuard(RegexBudget(deadline_s=5.0, row_s=0.3))
+    try:
+        result = apply_replace_all_in_rows(
+            pattern=re.compile(r"Drop (\w+)"),
+            replacement="Use $1",
+            use_regex=True,
+            matches_empty=False,
+            has_group_ref=True,
+            callbacks=callbacks,
+            regex_guard=guard,
+        )
+        assert result == ReplaceAllRowsApplyResult(changed_rows=2)
+        assert writes == [(0, "Use one"), (2, "Use all")]
+
+        writes.clear()
+        rows[1] = "a" * 64 + "!"
+        with pytest.raises(RegexTimeoutError):
+            apply_replace_all_in_rows(
+                pattern=re.compile("(a+)+$"),
+                replacement="x",
+                use_regex=True,
+                matches_empty=False,
+                has_group_ref=False,
+                callbacks=callbacks,
+                regex_guard=guard,
+            )
+        assert writes == []
+    finally:
+        guard.shutdown()
+
+
 def test_apply_replace_all_in_rows_updates_rows_via_callback() -> None:
     rows = ["Drop one", "Rest", "Drop all"]
     callbacks = ReplaceAllRowsCallbacks(
@@ -855,25 +958,13 @@ def test_search_replace_service_wraps_collect_rows_cache_stamp() -> None:
     )
 
 
-def test_build_rows_cache_store_plan_requires_materialized_and_limit() -> None:
-    store = build_rows_cache_store_plan(
-        rows_materialized=True,
-        entry_count=100,
-        cache_row_limit=1000,
-    )
-    too_large = build_rows_cache_store_plan(
-        rows_materialized=True,
-        entry_count=2000,
-        cache_row_limit=1000,
-    )
-    not_materialized = build_rows_cache_store_plan(
-        rows_materialized=False,
-        entry_count=100,
-        cache_row_limit=1000,
-    )
+def test_build_rows_cache_store_plan_uses_byte_budget() -> None:
+    store = build_rows_cache_store_plan(row_bytes=100, max_bytes=1000)
+    exact = build_rows_cache_store_plan(row_bytes=1000, max_bytes=1000)
+    too_large = build_rows_cache_store_plan(row_bytes=2000, max_bytes=1000)
     assert store.should_store_rows is True
+    assert exact.should_store_rows is True
     assert too_large.should_store_rows is False
-    assert not_materialized.should_store_rows is False
 
 
 def test_search_replace_service_wraps_rows_cache_helpers() -> None:
@@ -892,11 +983,7 @@ def test_search_replace_service_wraps_rows_cache_helpers() -> None:
         source_mtime_ns=3,
         cached_stamp=cached,
     )
-    store = service.build_rows_cache_store_plan(
-        rows_materialized=True,
-        entry_count=10,
-        cache_row_limit=100,
-    )
+    store = service.build_rows_cache_store_plan(row_bytes=10, max_bytes=100)
     assert lookup.use_cached_rows is True
     assert store.should_store_rows is True
 
@@ -1164,3 +1251,94 @@ def test_search_replace_service_wraps_match_selection_plans() -> None:
     )
     assert open_plan.open_target_file is True
     assert apply_plan.select_in_table is True
+
+
+def test_search_panel_status_message_covers_running_and_final_states() -> None:
+    service = SearchReplaceService()
+    message = service.search_panel_status_message
+    assert message(count=3, limit=200, truncated=False, running=True) == (
+        "Searching… 3 matches so far."
+    )
+    assert message(count=0, limit=200, truncated=False) == (
+        "No matches in current scope."
+    )
+    assert message(count=200, limit=200, truncated=True) == (
+        "Showing first 200 matches (limit 200)."
+    )
+    assert message(count=5, limit=200, truncated=False) == "5 matches in current scope."
+
+
+def test_search_refinement_memo_rechecks_previous_matches_only() -> None:
+    path = Path("BE/ui.txt")
+    rows = [
+        SearchRow(path, 0, "A", "", "Zombie horde"),
+        SearchRow(path, 1, "B", "", "Zombies"),
+        SearchRow(path, 2, "C", "", "Drop all"),
+    ]
+    service = SearchReplaceService()
+    memo = SearchRefinementMemo()
+    spec = {"field": SearchField.TRANSLATION, "use_regex": False}
+
+    def _run(query: str, source, stamp=1):  # type: ignore[no-untyped-def]
+        return [
+            match.row
+            for match in service.iter_refining_matches(
+                memo,
+                source,
+                path=path,
+                query=query,
+                case_sensitive=False,
+                stamp=stamp,
+                **spec,
+            )
+        ]
+
+    def _refined(query: str, stamp=1):  # type: ignore[no-untyped-def]
+        return service.refined_search_rows(
+            memo, path, query=query, case_sensitive=False, stamp=stamp, **spec
+        )
+
+    assert _run("zomb", rows) == [0, 1]
+    refined = _refined("ZOMBIES")
+    assert refined is not None and [row.row for row in refined] == [0, 1]
+    assert _run("zombies", refined) == [1]
+    assert [row.row for row in _refined("zombies") or ()] == [1]
+    # Shrinking or changing the query, a new stamp, or regex mode rescan.
+    assert _refined("zomb") is None
+    assert _refined("drop") is None
+    assert _refined("zombies", stamp=2) is None
+    assert (
+        service.refined_search_rows(
+            memo,
+            path,
+            query="zombies",
+            field=SearchField.TRANSLATION,
+            use_regex=True,
+            case_sensitive=False,
+            stamp=1,
+        )
+        is None
+    )
+    # Partially consumed scans keep the previous entry.
+    next(
+        iter(
+            service.iter_refining_matches(
+                memo, rows, path=path, query="o", case_sensitive=False, stamp=1, **spec
+            )
+        )
+    )
+    assert [row.row for row in _refined("zombies") or ()] == [1]
+    memo.clear()
+    assert _refined("zombies") is None
+
+
+def test_regex_timeout_message_names_the_budget_and_truncation() -> None:
+    def _message(reason, count: int) -> str:  # type: ignore[no-untyped-def]
+        error = RegexTimeoutError("x", reason=reason, partial=[], done=0)
+        return regex_timeout_message(error, count=count)
+
+    assert "one file took too long" in _message("deadline", 3)
+    assert "results truncated to 3 matches" in _message("deadline", 3)
+    assert "total time cap" in _message("total", 0)
+    assert "no matches so far" in _message("total", 0)
+    assert "catastrophic backtracking" in _message("row", 1)
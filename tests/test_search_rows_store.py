@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from translationzed_py.core.search import SearchRow, SearchRowColumns
+from translationzed_py.core.search_rows_store import SearchRowsStore
+
+
+def _columns(name: str, count: int) -> SearchRowColumns:
+    path = Path(name)
+    return SearchRowColumns.from_rows(
+        path,
+        (SearchRow(path, row, f"K{row}", "", f"value {row}") for row in range(count)),
+    )
+
+
+def test_search_rows_store_evicts_least_recent_to_fit_budget() -> None:
+    a, b, c = _columns("a.txt", 50), _columns("b.txt", 50), _columns("c.txt", 50)
+    store = SearchRowsStore(max_bytes=a.nbytes + b.nbytes + c.nbytes // 2)
+    assert store.put("a", 1, a)
+    assert store.put("b", 2, b)
+    assert store.get("a") == (1, a)
+    assert store.put("c", 3, c)
+    assert store.get("b") is None
+    assert store.get("a") == (1, a)
+    assert store.get("c") == (3, c)
+    assert store.nbytes == a.nbytes + c.nbytes
+    assert len(store) == 2
+
+
+def test_search_rows_store_refuses_entries_over_budget_and_replaces() -> None:
+    small, large = _columns("a.txt", 5), _columns("a.txt", 500)
+    store = SearchRowsStore(max_bytes=small.nbytes)
+    assert store.put("a", 1, small)
+    assert not store.put("a", 2, large)
+    assert store.get("a") is None
+    assert store.nbytes == 0
+    assert store.put("a", 3, small)
+    assert store.put("a", 4, small)
+    assert store.get("a") == (4, small)
+    assert store.nbytes == small.nbytes
+    store.clear()
+    assert len(store) == 0
+    assert store.nbytes == 0
@@ -4,6 +4,7 @@ from pathlib import Path
 
 from translationzed_py.core.model import Entry, ParsedFile, Status
 from translationzed_py.core.source_reference_service import (
+    ParsedFileCache,
     build_source_lookup_materialized,
     dump_source_reference_file_overrides,
     load_reference_lookup,
@@ -197,3 +198,21 @@ def test_resolve_source_reference_mode_for_path_uses_override(tmp_path: Path) ->
         overrides={"BE/ui.txt": "RU"},
     )
     assert mode == "RU"
+
+
+def test_parsed_file_cache_is_shared_across_threads(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ParsedFileCache()
+    paths = [tmp_path / f"f{idx}.txt" for idx in range(200)]
+
+    def _fill(path: Path) -> None:
+        cache[path] = ParsedFile(path, [], b"")
+        assert path in cache
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_fill, paths))
+    assert len(cache) == 200
+    assert set(cache) == set(paths)
+    del cache[paths[0]]
+    assert cache.get(paths[0]) is None
@@ -4,13 +4,17 @@ from pathlib import Path
 
 import xxhash
 
-from translationzed_py.core import parse
+from translationzed_py.core import parse, status_cache
 from translationzed_py.core.model import Status
 from translationzed_py.core.status_cache import (
     CacheEntry,
+    add_write_listener,
     migrate_all,
     read,
     read_last_opened_from_path,
+    remove_write_listener,
+    restore,
+    snapshot,
     write,
 )
 
@@ -164,3 +168,76 @@ def test_migrate_all_upgrades_u16_cache(tmp_path):
     assert migrated == 1
     data = cache_path.read_bytes()
     assert data.startswith(b"TZC5")
+
+
+def _key_hash(key: str) -> int:
+    return int(xxhash.xxh64(key.encode("utf-8")).intdigest())
+
+
+def test_snapshot_restore_puts_cache_back(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    (root / "BE").mkdir(parents=True)
+    path = root / "BE" / "ui.txt"
+    path.write_text('UI_A = "One"\nUI_B = "Two"\n', encoding="utf-8")
+    pf = parse(path)
+
+    empty = snapshot(root, path)
+    write(root, path, pf.entries, changed_keys={"UI_A"})
+    saved = snapshot(root, path)
+    object.__setattr__(pf.entries[1], "value", "Draft")
+    write(root, path, pf.entries, changed_keys={"UI_A", "UI_B"})
+    assert read(root, path)[_key_hash("UI_B")].value == "Draft"
+
+    notified: list[tuple[Path, object]] = []
+
+    def _on_write(_root: Path, file_path: Path, entries) -> None:
+        notified.append((file_path, entries))
+
+    listeners = list(status_cache._WRITE_LISTENERS)
+    add_write_listener(_on_write)
+    try:
+        restore(saved)
+        assert _key_hash("UI_B") not in read(root, path)
+        assert read(root, path)[_key_hash("UI_A")].value == "One"
+        restore(empty)
+        assert not read(root, path)
+    finally:
+        status_cache._WRITE_LISTENERS[:] = listeners
+    # Listeners drop what they derived from the overwritten cache.
+    assert notified == [(path, None), (path, None)]
+
+
+def test_write_listeners_accept_functions_and_hold_methods_weakly(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    path = root / "EN" / "ui.txt"
+    path.parent.mkdir(parents=True)
+    path.write_text('GREETING = "Hi"\n', encoding="utf-8")
+    entries = parse(path).entries
+    calls: list[str] = []
+
+    class _Index:
+        def on_write(self, _root: Path, _path: Path, _entries) -> None:
+            calls.append("method")
+
+    def _on_write(_root: Path, _path: Path, _entries) -> None:
+        calls.append("function")
+
+    saved = list(status_cache._WRITE_LISTENERS)
+    index = _Index()
+    add_write_listener(index.on_write)
+    add_write_listener(_on_write)
+    add_write_listener(lambda *_args: calls.append("lambda"))
+    try:
+        write(root, path, entries)
+        assert sorted(calls) == ["function", "lambda", "method"]
+
+        calls.clear()
+        del index
+        remove_write_listener(_on_write)
+        write(root, path, entries)
+        # The method died with its owner; the lambda is held until removed.
+        assert calls == ["lambda"]
+    finally:
+        status_cache._WRITE_LISTENERS[:] = saved
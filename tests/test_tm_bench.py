@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+
+def _load_tm_bench_module():
+    path = Path("scripts/tm_bench.py").resolve()
+    spec = importlib.util.spec_from_file_location("tm_bench_module", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_tm_bench_writes_percentiles_and_recall_json(tmp_path: Path) -> None:
+    module = _load_tm_bench_module()
+    out = tmp_path / "bench.json"
+    work = tmp_path / "work"
+    args = [
+        "--sizes",
+        "300",
+        "--queries",
+        "10",
+        "--recall-queries",
+        "5",
+        "--work-dir",
+        str(work),
+        "--output",
+        str(out),
+    ]
+    assert module.main(args) == 0
+    report = json.loads(out.read_text(encoding="utf-8"))
+    (run,) = report["runs"]
+    assert run["size"] == 300
+    assert run["rows"] == 300
+    assert run["reused_db"] is False
+    assert set(run["kinds"]) == {"short", "long", "multi_token", "exact", "miss"}
+    overall = run["overall"]
+    assert overall["queries"] == 10
+    latency = overall["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert overall["recall_queries"] >= 1
+    assert 0.0 <= overall["recall_mean"] <= 1.0
+
+    assert module.main(args) == 0
+    rerun = json.loads(out.read_text(encoding="utf-8"))["runs"][0]
+    assert rerun["reused_db"] is True
+
+
+def test_tm_bench_percentile_uses_nearest_rank() -> None:
+    module = _load_tm_bench_module()
+    values = [float(v) for v in range(1, 101)]
+    assert module._percentile(values, 50) == 50.0
+    assert module._percentile(values, 95) == 95.0
+    assert module._percentile(values, 99) == 99.0
+    assert module._percentile([], 50) == 0.0
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from translationzed_py.core.tm_import_sync import sync_import_folder
+from translationzed_py.core.tm_snapshot import write_tm_snapshot
 from translationzed_py.core.tm_store import TMStore
 
 
@@ -129,6 +131,36 @@ def test_sync_import_folder_imports_xliff_file(tmp_path: Path) -> None:
     store.close()
 
 
+def test_sync_import_folder_imports_snapshot_file(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    tm_dir = root / ".tzp" / "tms"
+    tm_dir.mkdir(parents=True)
+    write_tm_snapshot(
+        tm_dir / "team_ru.tzptm",
+        [("Hello world", "Privet mir")],
+        source_locale="EN",
+        target_locale="RU",
+    )
+    store = TMStore(root)
+
+    report = sync_import_folder(
+        store,
+        tm_dir,
+        resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+    )
+
+    assert report.imported_files == ("team_ru.tzptm (1 segment(s))",)
+    assert report.failures == ()
+    assert store.query(
+        "Hello world",
+        source_locale="EN",
+        target_locale="RU",
+        origins=["import"],
+    )
+    store.close()
+
+
 def test_sync_import_folder_imports_po_file(tmp_path: Path) -> None:
     root = tmp_path / "root"
     root.mkdir()
@@ -314,3 +346,160 @@ def test_sync_import_folder_processes_supported_aliases_and_ignores_unsupported(
     assert records[0].tm_path.endswith("ignored.xlf")
     assert records[0].segment_count == 0
     store.close()
+
+
+def test_sync_import_folder_parses_changed_files_in_worker_processes(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    tm_dir = root / ".tzp" / "tms"
+    _write_tmx(tm_dir / "one.tmx")
+    _write_xliff(tm_dir / "two.xliff")
+    (tm_dir / "broken.tmx").write_text("<tmx><body><tu>", encoding="utf-8")
+    store = TMStore(root)
+
+    report = sync_import_folder(
+        store,
+        tm_dir,
+        resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+        max_workers=2,
+    )
+
+    assert report.imported_segments == 2
+    assert report.imported_files == (
+        "one.tmx (1 segment(s))",
+        "two.xliff (1 segment(s))",
+    )
+    assert len(report.failures) == 1
+    assert report.failures[0].startswith("broken.tmx: ")
+    statuses = {Path(rec.tm_path).name: rec.status for rec in store.list_import_files()}
+    assert statuses == {"broken.tmx": "error", "one.tmx": "ready", "two.xliff": "ready"}
+    store.close()
+
+
+def _write_tmx_pairs(path: Path, pairs: list[tuple[str, str]]) -> None:
+    units = "".join(
+        f'<tu><tuv xml:lang="EN"><seg>{source}</seg></tuv>'
+        f'<tuv xml:lang="RU"><seg>{target}</seg></tuv></tu>\n'
+        for source, target in pairs
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4"><body>\n{units}'
+        "</body></tmx>\n",
+        encoding="utf-8",
+    )
+
+
+def test_sync_import_folder_streams_large_files_from_bounded_workers(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    tm_dir = root / ".tzp" / "tms"
+    sizes = {"a.tmx": 4500, "b.tmx": 10, "c.tmx": 2001}
+    for name, size in sizes.items():
+        _write_tmx_pairs(
+            tm_dir / name, [(f"{name} src {idx}", f"trg {idx}") for idx in range(size)]
+        )
+    store = TMStore(root)
+
+    report = sync_import_folder(
+        store,
+        tm_dir,
+        resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+        max_workers=2,
+    )
+
+    assert report.failures == ()
+    assert report.imported_segments == sum(sizes.values())
+    assert report.imported_files == tuple(
+        f"{name} ({size} segment(s))" for name, size in sizes.items()
+    )
+    store.close()
+
+
+def test_sync_import_folder_applies_segment_delta_for_changed_file(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    tm_dir = root / ".tzp" / "tms"
+    tmx_path = tm_dir / "pack_ru.tmx"
+    pairs = [(f"Source {idx}", f"Target {idx}") for idx in range(20)]
+    _write_tmx_pairs(tmx_path, pairs)
+    store = TMStore(root)
+
+    def _sync() -> object:
+        return sync_import_folder(
+            store,
+            tm_dir,
+            resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+        )
+
+    _sync()
+    ids_before = {
+        row[0]: row[1]
+        for row in store._conn.execute(
+            "SELECT source_text, id FROM tm_entries WHERE tm_path = ?",
+            (str(tmx_path.resolve()),),
+        )
+    }
+
+    pairs[3] = ("Source 3", "Edited 3")
+    # Same normalized source as the removed "Source 5": must replace it.
+    pairs[5] = ("source 5", "Target 5")
+    pairs.append(("Fresh source", "Fresh target"))
+    pairs.append(pairs[10])
+    del pairs[0]
+    _write_tmx_pairs(tmx_path, pairs)
+    report = _sync()
+
+    assert report.imported_files == ("pack_ru.tmx (20 segment(s))",)
+    rows = {
+        row[0]: (row[1], row[2])
+        for row in store._conn.execute(
+            "SELECT source_text, target_text, id FROM tm_entries WHERE tm_path = ?",
+            (str(tmx_path.resolve()),),
+        )
+    }
+    assert len(rows) == 20
+    assert "Source 0" not in rows
+    assert "Source 5" not in rows
+    assert rows["source 5"][0] == "Target 5"
+    assert rows["Source 3"][0] == "Edited 3"
+    assert rows["Fresh source"][0] == "Fresh target"
+    # Untouched pairs keep their rows instead of being deleted and re-inserted.
+    assert rows["Source 7"][1] == ids_before["Source 7"]
+    assert store.list_import_files()[0].segment_count == 20
+    store.close()
+
+
+def test_sync_import_folder_skips_touched_identical_file(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    tm_dir = root / ".tzp" / "tms"
+    tmx_path = tm_dir / "pack_ru.tmx"
+    _write_tmx(tmx_path)
+    store = TMStore(root)
+    sync_import_folder(
+        store,
+        tm_dir,
+        resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+    )
+    stat = tmx_path.stat()
+    os.utime(tmx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    report = sync_import_folder(
+        store,
+        tm_dir,
+        resolve_locales=lambda _path, _langs: (("EN", "RU"), False),
+    )
+
+    assert report.changed is False
+    assert report.imported_files == ()
+    record = store.list_import_files()[0]
+    assert record.mtime_ns == tmx_path.stat().st_mtime_ns
+    assert record.content_hash
+    store.close()
@@ -0,0 +1,111 @@
+from translationzed_py.core.tm_memory import MemoryQuery, MemoryRow, TMMemoryIndex
+
+
+def _query(index: TMMemoryIndex, length: int, **kwargs) -> MemoryQuery:
+    return MemoryQuery(
+        index.snapshot(),
+        length=length,
+        min_len=kwargs.pop("min_len", 1),
+        max_len=kwargs.pop("max_len", 40),
+        origins=kwargs.pop("origins", ("project", "import")),
+        hidden_tm_paths=kwargs.pop("hidden_tm_paths", ()),
+    )
+
+
+def _ids(lookup: MemoryQuery, positions: list[int]) -> list[int]:
+    return [lookup.state.entry_id(pos) for pos in positions]
+
+
+def test_memory_index_buckets_follow_length_and_recency() -> None:
+    index = TMMemoryIndex("EN", "BE")
+    assert not index.ready
+    index.load(
+        [
+            MemoryRow(1, "drop all", "project", None, 10),
+            MemoryRow(2, "drop one", "import", "a.tmx", 20),
+            MemoryRow(3, "drop everything", "import", "b.tmx", 30),
+            MemoryRow(4, "uninstall", "project", None, 40),
+            MemoryRow(5, "drop", "project", None, 50),
+        ]
+    )
+    assert index.ready and len(index) == 5
+    lookup = _query(index, 8)
+    assert _ids(lookup, lookup.length_bucket(10)) == [2, 1, 4, 5, 3]
+    assert _ids(lookup, lookup.prefix_bucket("drop", 10)) == [5]
+    assert _ids(lookup, lookup.prefix_bucket("drop eve", 10)) == [3]
+    assert _ids(lookup, lookup.token_bucket("drop", 10)) == [5, 2, 1, 3]
+    assert _ids(lookup, lookup.token_bucket("install", 10, extra_ids=[5])) == [4, 5]
+
+    hidden = _query(index, 8, hidden_tm_paths=["a.tmx"], max_len=9)
+    assert _ids(hidden, hidden.length_bucket(10)) == [1, 4, 5]
+    projects = _query(index, 8, origins=("project",))
+    assert _ids(projects, projects.token_bucket("drop", 10)) == [5, 1]
+
+
+def test_memory_index_merges_queued_changes() -> None:
+    index = TMMemoryIndex("EN", "BE")
+    index.apply(upserted=[MemoryRow(9, "early write", "project", None, 1)])
+    index.load(
+        [
+            MemoryRow(1, "alpha", "project", None, 1),
+            MemoryRow(2, "bravo", "import", "a.tmx", 2),
+            MemoryRow(3, "charlie", "import", "b.tmx", 3),
+        ]
+    )
+    index.apply(
+        upserted=[
+            MemoryRow(1, "alpha beta", "project", None, 5),
+            MemoryRow(4, "delta", "import", "c.tmx", 4),
+        ],
+        removed_ids=[3],
+        removed_tm_paths=["a.tmx"],
+    )
+    state = index.snapshot()
+    rows = [(state.entry_id(pos), state.norm(pos)) for pos in state.positions()]
+    assert rows == [(4, "delta"), (1, "alpha beta"), (9, "early write")]
+    assert state.norm(state.position(9)) == "early write"
+    assert state.position(3) is None
+    assert len(index) == 3
+
+
+def test_memory_index_searches_delta_alongside_base(monkeypatch) -> None:
+    from translationzed_py.core import tm_memory
+
+    index = TMMemoryIndex("EN", "BE")
+    index.load(
+        [
+            MemoryRow(1, "drop all", "project", None, 10),
+            MemoryRow(2, "drop one", "import", "a.tmx", 20),
+            MemoryRow(3, "open door", "project", None, 30),
+        ]
+    )
+    base = index.snapshot().base
+    index.apply(
+        upserted=[
+            MemoryRow(1, "drop all", "project", None, 50),
+            MemoryRow(4, "drop two", "import", "b.tmx", 40),
+        ],
+        removed_ids=[3],
+    )
+    lookup = _query(index, 8)
+    # Writes land in the delta; the base is not rebuilt.
+    assert lookup.state.base is base
+    assert _ids(lookup, lookup.length_bucket(10)) == [1, 4, 2]
+    assert _ids(lookup, lookup.token_bucket("drop", 10)) == [1, 4, 2]
+    assert _ids(lookup, lookup.prefix_bucket("drop all", 10)) == [1]
+    assert not lookup.token_bucket("door", 10)
+    assert _ids(lookup, lookup.token_bucket("zzz", 10, extra_ids=[4, 3])) == [4]
+    hidden = _query(index, 8, hidden_tm_paths=["b.tmx"])
+    assert _ids(hidden, hidden.length_bucket(10)) == [1, 2]
+
+    monkeypatch.setattr(tm_memory, "_DELTA_LIMIT", 2)
+    index.apply(upserted=[MemoryRow(5, "drop three", "project", None, 60)])
+    compacted = index.snapshot()
+    assert len(compacted.delta) == 0 and not compacted.masked
+    assert [compacted.entry_id(pos) for pos in compacted.positions()] == [1, 4, 2, 5]
+
+    index.apply(upserted=[MemoryRow(6, "drop four", "import", "b.tmx", 70)])
+    index.snapshot()
+    index.apply(removed_tm_paths=["b.tmx"])
+    state = index.snapshot()
+    assert [state.entry_id(pos) for pos in state.positions()] == [1, 2, 5]
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from translationzed_py.core import tm_snapshot
+from translationzed_py.core.tm_snapshot import (
+    iter_tm_snapshot_pairs,
+    read_tm_snapshot_header,
+    write_tm_snapshot,
+)
+
+_PAIRS = [(f"Drop {i} items", f"Skinuć {i} rečaŭ ✓") for i in range(10)]
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_snapshot_roundtrip_across_blocks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, codec: str
+) -> None:
+    monkeypatch.setattr(tm_snapshot, "_BLOCK_PAIRS", 4)
+    path = tmp_path / "pack.tzptm"
+    progress: list[int] = []
+    count = write_tm_snapshot(
+        path,
+        iter([*_PAIRS, ("", "skipped")]),
+        source_locale="EN",
+        target_locale="be-BY",
+        codec=codec,
+        progress=progress.append,
+    )
+    assert count == 10
+    assert progress == [4, 8, 10]
+    header = read_tm_snapshot_header(path)
+    assert (header.codec, header.source_locale, header.target_locale) == (
+        codec,
+        "EN",
+        "be-BY",
+    )
+    assert list(iter_tm_snapshot_pairs(path)) == _PAIRS
+
+
+def test_snapshot_rejects_truncated_and_foreign_files(tmp_path: Path) -> None:
+    path = tmp_path / "pack.tzptm"
+    write_tm_snapshot(path, _PAIRS, source_locale="EN", target_locale="BE")
+    path.write_bytes(path.read_bytes()[:-20])
+    with pytest.raises(ValueError, match="Truncated"):
+        list(iter_tm_snapshot_pairs(path))
+    path.write_bytes(b"<?xml version='1.0'?><tmx/>")
+    with pytest.raises(ValueError, match="Not a TM snapshot"):
+        read_tm_snapshot_header(path)
+
+
+def test_snapshot_zstd_requires_codec_module(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _missing(name: str) -> None:
+        raise ImportError(name)
+
+    monkeypatch.setattr(tm_snapshot.importlib, "import_module", _missing)
+    with pytest.raises(ValueError, match="zstd"):
+        write_tm_snapshot(
+            tmp_path / "pack.tzptm",
+            _PAIRS,
+            source_locale="EN",
+            target_locale="BE",
+            codec="zstd",
+        )
@@ -1,6 +1,12 @@
+import gzip
+import sqlite3
 from pathlib import Path
 
-from translationzed_py.core.tm_store import TMStore
+import pytest
+
+from translationzed_py.core import tm_store
+from translationzed_py.core.tm_store import TMStore, format_maintenance_report
+from translationzed_py.core.tmx_io import iter_tmx_pairs
 
 
 def test_tm_store_exact_and_fuzzy(tmp_path: Path) -> None:
@@ -603,6 +609,84 @@ def test_tm_store_fuzzy_prefix_lookup_handles_dense_prefix_sets(tmp_path: Path)
     store.close()
 
 
+def test_tm_store_export_tmx_streams_with_dedupe_and_progress(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    store.upsert_project_entries(
+        [("key1", "Hello world", "Privet mir"), ("key2", "Bye", "Poka")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(root / "BE" / "ui.txt"),
+        updated_at=10,
+    )
+    store.insert_import_pairs(
+        [("hello   WORLD", "Import mir"), ("Zombie", "Zombi")],
+        source_locale="EN",
+        target_locale="BE",
+        tm_name="pack",
+        updated_at=20,
+    )
+
+    store.upsert_project_entries(
+        [("key3", "Untranslated", "")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(root / "BE" / "ui.txt"),
+        updated_at=30,
+    )
+
+    full_path = tmp_path / "full.tmx"
+    full_progress: list[tuple[int, int]] = []
+    assert (
+        store.export_tmx(
+            full_path,
+            source_locale="EN",
+            target_locale="BE",
+            progress=lambda done, total: full_progress.append((done, total)),
+        )
+        == 4
+    )
+    assert full_progress[-1] == (4, 4)
+    assert [source for source, _target in iter_tmx_pairs(full_path, "EN", "BE")] == [
+        "Hello world",
+        "Bye",
+        "hello   WORLD",
+        "Zombie",
+    ]
+
+    progress: list[tuple[int, int]] = []
+    deduped_path = tmp_path / "deduped.tmx.gz"
+    count = store.export_tmx(
+        deduped_path,
+        source_locale="en",
+        target_locale="be",
+        dedupe=True,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert count == 3
+    assert progress[-1] == (3, 3)
+    assert gzip.decompress(deduped_path.read_bytes()).startswith(b"<?xml")
+    pairs = set(iter_tmx_pairs(deduped_path, "EN", "BE"))
+    assert pairs == {
+        ("Hello world", "Privet mir"),
+        ("Bye", "Poka"),
+        ("Zombie", "Zombi"),
+    }
+
+    project_only = tmp_path / "project.tmx"
+    assert (
+        store.export_tmx(
+            project_only,
+            source_locale="EN",
+            target_locale="BE",
+            include_imported=False,
+        )
+        == 2
+    )
+    store.close()
+
+
 def test_tm_import_file_registry_and_replace(tmp_path: Path) -> None:
     root = tmp_path / "root"
     root.mkdir()
@@ -809,3 +893,702 @@ msgstr "Privet mir"
     assert records[0].source_locale_raw == "en"
     assert records[0].target_locale_raw == "ru"
     store.close()
+
+
+def test_tm_store_concordance_tracks_writes_and_pages(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    file_path = str(root / "BE" / "ui.txt")
+    store.upsert_project_entries(
+        [
+            ("k1", "Fuel the Generator", "Zapraŭ generatar"),
+            ("k2", "Open door", "Adčyni dzviery"),
+        ],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    store.insert_import_pairs(
+        [(f"Generator fuel {idx}", f"Paliva {idx}") for idx in range(5)],
+        source_locale="EN",
+        target_locale="BE",
+        tm_name="pack",
+        tm_path=str(root / "imports" / "pack.tmx"),
+    )
+    store.insert_import_pairs(
+        [("Generator", "Générateur")],
+        source_locale="EN",
+        target_locale="FR",
+    )
+    assert not store.concordance_ready(source_locale="EN", target_locale="BE")
+    assert store.build_concordance_index(source_locale="EN", target_locale="BE")
+    assert store.concordance_ready(source_locale="EN", target_locale="BE")
+
+    hits = store.concordance("generator", source_locale="EN", target_locale="BE")
+    assert len(hits) == 6
+    project = next(hit for hit in hits if hit.origin == "project")
+    assert project.key == "k1"
+    assert project.source_spans == ((9, 18),)
+    assert project.target_spans == ()
+
+    first = store.concordance(
+        "generator", source_locale="EN", target_locale="BE", limit=4
+    )
+    second = store.concordance(
+        "generator", source_locale="EN", target_locale="BE", limit=4, offset=4
+    )
+    assert len(first) == 4 and len(second) == 2
+    assert {h.source_text for h in first}.isdisjoint(h.source_text for h in second)
+
+    target = store.concordance(
+        "dzviery", source_locale="EN", target_locale="BE", side="target"
+    )
+    assert [hit.key for hit in target] == ["k2"]
+    assert target[0].target_spans == ((7, 14),)
+    assert not store.concordance("dzviery", source_locale="EN", target_locale="BE")
+    assert store.concordance(
+        "dzviery", source_locale="EN", target_locale="BE", side="both"
+    )
+    imported = store.concordance(
+        "fuel", source_locale="EN", target_locale="BE", origins=["import"]
+    )
+    assert len(imported) == 5
+    # Two-character needles fall back to a scan instead of the trigram index.
+    assert store.concordance("el", source_locale="EN", target_locale="BE")
+
+    store.upsert_project_entries(
+        [("k2", "Close window", "Začyni akno")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    assert not store.concordance("door", source_locale="EN", target_locale="BE")
+    store.delete_import_file(str(root / "imports" / "pack.tmx"))
+    offthread = TMStore.concordance_path(
+        store.db_path, "generator", source_locale="EN", target_locale="BE"
+    )
+    assert [hit.origin for hit in offthread] == ["project"]
+    store.close()
+
+
+def test_tm_store_concordance_is_scoped_to_pair_and_casefolds(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    store.insert_import_pairs(
+        [("Ящик генератора", "Skrynia"), ("Öl", "Alej")],
+        source_locale="RU",
+        target_locale="BE",
+    )
+    store.insert_import_pairs(
+        [("Ящик генератора", "Skrzynia")],
+        source_locale="XRU",
+        target_locale="BE",
+    )
+    assert store.build_concordance_index(source_locale="RU", target_locale="BE")
+    plan = " ".join(
+        str(row[3])
+        for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT rowid FROM tm_concordance "
+            "WHERE tm_concordance MATCH 'locale_pair : \"|RU|BE|\"'"
+        )
+    )
+    assert "VIRTUAL TABLE INDEX" in plan
+
+    hits = store.concordance("ЯЩИК", source_locale="RU", target_locale="BE")
+    assert [hit.target_text for hit in hits] == ["Skrynia"]
+    assert not store.concordance("|RU|", source_locale="RU", target_locale="BE")
+    # Short needles scan, with the same casefolding as the trigram index.
+    assert [
+        hit.target_text
+        for hit in store.concordance("яЩ", source_locale="RU", target_locale="BE")
+    ] == ["Skrynia"]
+    assert [
+        hit.target_text
+        for hit in store.concordance("öL", source_locale="RU", target_locale="BE")
+    ] == ["Alej"]
+    store.close()
+
+    # Indexes built before the pair column are dropped on open, answered by
+    # the scan meanwhile, and rebuilt on the next build.
+    conn = sqlite3.connect(store.db_path)
+    for trigger in ("tm_concordance_ai", "tm_concordance_ad", "tm_concordance_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE tm_concordance")
+    conn.execute(
+        "CREATE VIRTUAL TABLE tm_concordance USING fts5(source_text, target_text, "
+        "content='tm_entries', content_rowid='id', tokenize='trigram')"
+    )
+    conn.commit()
+    conn.close()
+    reopened = TMStore(root)
+    assert not reopened.concordance_ready(source_locale="XRU", target_locale="BE")
+    hits = reopened.concordance("генератор", source_locale="XRU", target_locale="BE")
+    assert [hit.target_text for hit in hits] == ["Skrzynia"]
+    assert reopened.build_concordance_index(source_locale="XRU", target_locale="BE")
+    hits = reopened.concordance("генератор", source_locale="XRU", target_locale="BE")
+    assert [hit.target_text for hit in hits] == ["Skrzynia"]
+    reopened.close()
+
+
+def test_tm_store_concordance_index_builds_in_resumable_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    file_path = str(root / "BE" / "ui.txt")
+    store.upsert_project_entries(
+        [(f"k{idx}", f"Generator part {idx}", f"Častka {idx}") for idx in range(10)],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    tables = {row[0] for row in store._conn.execute("SELECT name FROM sqlite_master")}
+    # Opening a store never creates (or fills) the trigram index.
+    assert "tm_concordance" not in tables
+    monkeypatch.setattr(tm_store, "_CONCORDANCE_BUILD_ROWS", 4)
+    batches: list[int] = []
+
+    def _stop_after_first_batch() -> bool:
+        batches.append(1)
+        return len(batches) > 1
+
+    assert not store.build_concordance_index(
+        source_locale="EN", target_locale="BE", should_stop=_stop_after_first_batch
+    )
+    assert not store.concordance_ready(source_locale="EN", target_locale="BE")
+    # Writes to indexed rows, rows the paused build has not reached yet, and
+    # new rows.
+    store.upsert_project_entries(
+        [
+            ("k0", "Lamp", "Lampa"),
+            ("k8", "Battery part", "Batareja"),
+            ("k10", "Generator cover", "Viečka"),
+        ],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    store._conn.execute("DELETE FROM tm_entries WHERE key = 'k9'")
+    store._conn.commit()
+    scanned = store.concordance("generator", source_locale="EN", target_locale="BE")
+
+    reopened = TMStore(root)
+    assert reopened.build_concordance_index(source_locale="EN", target_locale="BE")
+    assert reopened.concordance_ready(source_locale="EN", target_locale="BE")
+    indexed = reopened.concordance("generator", source_locale="EN", target_locale="BE")
+    assert sorted(hit.key for hit in indexed) == sorted(hit.key for hit in scanned)
+    assert {hit.key for hit in indexed} == {
+        f"k{idx}" for idx in (1, 2, 3, 4, 5, 6, 7, 10)
+    }
+    integrity = reopened._conn.execute(
+        "INSERT INTO tm_concordance(tm_concordance, rank) VALUES('integrity-check', 1)"
+    )
+    assert integrity is not None
+    reopened.close()
+    store.close()
+
+
+def test_tm_store_token_index_tracks_writes_and_migrates(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    file_path = str(root / "BE" / "ui.txt")
+    store.upsert_project_entries(
+        [("k1", "Dropping the Axe", "Kinuć sakieru")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+
+    def _tokens() -> list[tuple[str, str]]:
+        return [
+            (row["token"], row["stem"])
+            for row in store._conn.execute(
+                "SELECT token, stem FROM tm_tokens ORDER BY entry_id, pos"
+            )
+        ]
+
+    assert _tokens() == [("dropping", "drop"), ("the", "the"), ("axe", "axe")]
+    store.upsert_project_entries(
+        [("k1", "Open door", "Adčyni dzviery")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    assert _tokens() == [("open", "open"), ("door", "door")]
+    # Scoring reads the stored tokens and stems.
+    matches = store.query(
+        "doors opened", source_locale="EN", target_locale="BE", min_score=5
+    )
+    assert [match.source_text for match in matches] == ["Open door"]
+
+    # A database created before the token index is not tokenised on open;
+    # queries tokenise its rows on the fly until `backfill_tokens` runs.
+    store._conn.execute("DROP TABLE tm_tokens")
+    store._conn.execute("DROP TABLE tm_tokens_pending")
+    store._conn.commit()
+    store.close()
+    reopened = TMStore(root)
+    assert reopened.token_backfill_pending()
+    assert reopened._conn.execute("SELECT COUNT(*) FROM tm_tokens").fetchone()[0] == 0
+    matches = reopened.query(
+        "doors opened", source_locale="EN", target_locale="BE", min_score=5
+    )
+    assert [match.source_text for match in matches] == ["Open door"]
+    assert not reopened.backfill_tokens(should_stop=lambda: True)
+    assert reopened.backfill_tokens()
+    assert not reopened.token_backfill_pending()
+    rows = reopened._conn.execute("SELECT token FROM tm_tokens ORDER BY pos")
+    assert [row["token"] for row in rows] == ["open", "door"]
+    reopened.close()
+
+
+def test_tm_store_token_backfill_is_batched_and_resumable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    store.insert_import_pairs(
+        [(f"Uninstall generator {idx}", f"Zniać {idx}") for idx in range(10)],
+        source_locale="EN",
+        target_locale="BE",
+    )
+    store._conn.execute("DROP TABLE tm_tokens")
+    store._conn.commit()
+    store.close()
+
+    store = TMStore(root)
+    # Rows without tokens are still found and scored while pending.
+    pending = store.query(
+        "uninstall the generator 3", source_locale="EN", target_locale="BE"
+    )
+    assert pending
+    monkeypatch.setattr(tm_store, "_TOKEN_INDEX_BATCH", 4)
+    calls: list[int] = []
+
+    def _stop_after_first_batch() -> bool:
+        calls.append(1)
+        return len(calls) > 1
+
+    assert not store.backfill_tokens(should_stop=_stop_after_first_batch)
+    indexed = store._conn.execute(
+        "SELECT COUNT(DISTINCT entry_id) FROM tm_tokens"
+    ).fetchone()[0]
+    assert indexed == 4
+    store.close()
+
+    store = TMStore(root)
+    assert store.backfill_tokens()
+    assert not store.token_backfill_pending()
+    indexed = store._conn.execute(
+        "SELECT COUNT(DISTINCT entry_id) FROM tm_tokens"
+    ).fetchone()[0]
+    assert indexed == 10
+    TMStore.clear_query_memos()
+    assert [
+        match.source_text
+        for match in store.query(
+            "uninstall the generator 3", source_locale="EN", target_locale="BE"
+        )
+    ] == [match.source_text for match in pending]
+    store.close()
+
+
+def test_tm_store_memory_index_matches_sql_and_tracks_writes(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    file_path = str(root / "BE" / "ui.txt")
+    store.upsert_project_entries(
+        [
+            ("k1", "Drop all items", "Skinuć usio"),
+            ("k2", "Drop one", "Skinuć adno"),
+            ("k3", "Uninstall generator", "Zniać hieneratar"),
+        ],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    tm_path = root / "imports" / "pack.tmx"
+    tm_path.parent.mkdir()
+    store.insert_import_pairs(
+        [("Drop everything", "Skinuć usio"), ("Install generator", "Ustalavać")],
+        source_locale="EN",
+        target_locale="BE",
+        tm_name="pack",
+        tm_path=str(tm_path),
+    )
+    store.insert_import_pairs(
+        [("Drop one", "Ruski")],
+        source_locale="EN",
+        target_locale="RU",
+    )
+    queries = ("drop one", "drop", "install generators", "drop al items")
+
+    def _results() -> list[list[tuple[str, str, int]]]:
+        return [
+            [
+                (match.source_text, match.target_text, match.score)
+                for match in store.query(
+                    text, source_locale="EN", target_locale="BE", min_score=5
+                )
+            ]
+            for text in queries
+        ]
+
+    expected = _results()
+    index = TMStore.load_memory_index(
+        store.db_path, source_locale="en", target_locale="be"
+    )
+    try:
+        assert len(index) == 5
+        assert _results() == expected
+        path_results = [
+            TMStore.query_path(
+                store.db_path,
+                text,
+                source_locale="EN",
+                target_locale="BE",
+                min_score=5,
+            )
+            for text in queries
+        ]
+        assert [
+            [(m.source_text, m.target_text, m.score) for m in matches]
+            for matches in path_results
+        ] == expected
+
+        # Writes reach the index: changed sources, new rows, removed imports.
+        store.upsert_project_entries(
+            [("k2", "Drop two", "Skinuć dva")],
+            source_locale="EN",
+            target_locale="BE",
+            file_path=file_path,
+        )
+        store.insert_import_pairs(
+            [("Drop ones", "Skinuć adny")],
+            source_locale="EN",
+            target_locale="BE",
+        )
+        store.delete_import_file(str(tm_path))
+        updated = store.query(
+            "drop one", source_locale="EN", target_locale="BE", min_score=5
+        )
+        assert len(index) == 4
+        TMStore.unload_memory_index(store.db_path)
+        assert [(m.source_text, m.score) for m in updated] == [
+            (m.source_text, m.score)
+            for m in store.query(
+                "drop one", source_locale="EN", target_locale="BE", min_score=5
+            )
+        ]
+        assert "Drop ones" in {m.source_text for m in updated}
+        assert "Drop everything" not in {m.source_text for m in updated}
+
+        # Upserts that only refresh recency reach the index too.
+        index = TMStore.load_memory_index(
+            store.db_path, source_locale="EN", target_locale="BE"
+        )
+        store.upsert_project_entries(
+            [("k1", "Drop all items", "Skinuć usio rechy")],
+            source_locale="EN",
+            target_locale="BE",
+            file_path=file_path,
+            updated_at=2_000_000_000,
+        )
+        state = index.snapshot()
+        newest = max(state.positions(), key=state.updated_at)
+        assert state.norm(newest) == "drop all items"
+        assert state.updated_at(newest) == 2_000_000_000
+        assert not store._conn.execute("SELECT 1 FROM tm_memory_pending").fetchall()
+    finally:
+        TMStore.unload_memory_index(store.db_path)
+        store.close()
+
+
+def test_tm_store_query_memos_share_scores_and_track_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    store.insert_import_pairs(
+        [("Drop all items", "Skinuć usio"), ("Drop one", "Skinuć adno")],
+        source_locale="EN",
+        target_locale="BE",
+    )
+    calls: list[str] = []
+    score = tm_store._score_candidate
+
+    def _counting(*args: object, **kwargs: object) -> object:
+        calls.append(str(args[2]))
+        return score(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(tm_store, "_score_candidate", _counting)
+    TMStore.clear_query_memos()
+    try:
+        first = store.query("drop al items", source_locale="EN", target_locale="BE")
+        assert calls
+        scored = len(calls)
+        # Repeats hit the result memo; the path-based API shares it.
+        assert (
+            store.query("drop al items", source_locale="EN", target_locale="BE")
+            == first
+        )
+        assert (
+            TMStore.query_path(
+                store.db_path, "drop al items", source_locale="EN", target_locale="BE"
+            )
+            == first
+        )
+        assert len(calls) == scored
+
+        # A write drops cached results, but unchanged candidates keep their scores.
+        store.insert_import_pairs(
+            [("Drop all the items", "Skinuć usie")],
+            source_locale="EN",
+            target_locale="BE",
+        )
+        updated = store.query("drop al items", source_locale="EN", target_locale="BE")
+        assert "Drop all the items" in {match.source_text for match in updated}
+        assert calls[scored:] == ["drop all the items"]
+    finally:
+        TMStore.clear_query_memos()
+        store.close()
+
+
+def test_tm_store_sharded_layout_routes_pairs_and_round_trips(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    file_path = str(root / "BE" / "ui.txt")
+    store.upsert_project_entries(
+        [("k1", "Drop one", "Skinuć adno"), ("k2", "Drop all", "Skinuć usio")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=file_path,
+    )
+    store.insert_import_pairs(
+        [("Drop one", "Sbrosit odin")], source_locale="EN", target_locale="RU"
+    )
+    tmx_path = root / "imports" / "pack.tmx"
+    tmx_path.parent.mkdir()
+    tmx_path.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+<tmx version="1.4">
+  <header srclang="EN" />
+  <body>
+    <tu>
+      <tuv xml:lang="EN"><seg>Drop ones</seg></tuv>
+      <tuv xml:lang="BE"><seg>Skinuć adny</seg></tuv>
+    </tu>
+  </body>
+</tmx>
+""",
+        encoding="utf-8",
+    )
+    store.replace_import_tmx(tmx_path, source_locale="EN", target_locale="BE")
+
+    def _sources(target_locale: str) -> list[str]:
+        return [
+            match.source_text
+            for match in store.query(
+                "drop one", source_locale="EN", target_locale=target_locale
+            )
+        ]
+
+    expected = _sources("BE")
+    assert store.migrate_layout(sharded=True) == 4
+    assert store.sharded
+    shard_dir = store.db_path.parent / "tm_shards"
+    assert sorted(path.name for path in shard_dir.glob("*.sqlite")) == [
+        "EN__BE.sqlite",
+        "EN__RU.sqlite",
+    ]
+    assert _sources("BE") == expected
+    assert _sources("RU") == ["Drop one"]
+    assert [
+        match.source_text
+        for match in TMStore.query_path(
+            store.db_path, "drop one", source_locale="EN", target_locale="BE"
+        )
+    ] == expected
+    assert _sources("DE") == []
+    assert not (shard_dir / "EN__DE.sqlite").exists()
+    assert store.concordance("ones", source_locale="EN", target_locale="BE")
+    store.close()
+
+    # Registry reads (import state) and pair writes keep working after reopen.
+    store = TMStore(root)
+    assert store.sharded
+    assert store.has_import_entries(str(tmx_path))
+    store.set_import_enabled(str(tmx_path), False)
+    assert "Drop ones" not in _sources("BE")
+    store.set_import_enabled(str(tmx_path), True)
+    tmx_path.write_text(
+        tmx_path.read_text(encoding="utf-8").replace('"BE"', '"RU"'),
+        encoding="utf-8",
+    )
+    store.replace_import_tmx(tmx_path, source_locale="EN", target_locale="RU")
+    assert "Drop ones" not in _sources("BE")
+    assert "Drop ones" in _sources("RU")
+    store.delete_import_file(str(tmx_path))
+    assert not store.has_import_entries(str(tmx_path))
+
+    assert store.migrate_layout(sharded=False) == 3
+    assert not store.sharded
+    assert not shard_dir.exists()
+    assert _sources("BE") == ["Drop one", "Drop all"]
+    assert _sources("RU") == ["Drop one"]
+    store.close()
+
+
+def test_tm_store_maintain_dedupes_prunes_and_reports(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    (root / "BE").mkdir(parents=True)
+    kept = root / "BE" / "ui.txt"
+    kept.write_text("", encoding="utf-8")
+    store = TMStore(root)
+    store.upsert_project_entries(
+        [("k1", "Drop one", "Skinuć adno")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(kept),
+    )
+    store.upsert_project_entries(
+        [("k1", "Drop all", "Skinuć usio")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(root / "BE" / "deleted.txt"),
+    )
+    for name in ("pack_a", "pack_b"):
+        tm_path = str(root / "imports" / f"{name}.tmx")
+        store.insert_import_pairs(
+            [("Drop one", "Skinuć adno"), ("Hello", f"Pryvitańnie {name}")],
+            source_locale="EN",
+            target_locale="BE",
+            tm_name=name,
+            tm_path=tm_path,
+        )
+    store.insert_import_pairs(
+        [("Hello", "Privet"), ("Hello", "Privet")],
+        source_locale="EN",
+        target_locale="RU",
+        tm_name="ru",
+        tm_path=str(root / "imports" / "ru.tmx"),
+    )
+
+    report = store.maintain()
+    pairs = {(p.source_locale, p.target_locale): p for p in report.pairs}
+    assert pairs[("EN", "BE")].rows_before == 6
+    assert pairs[("EN", "BE")].deduped == 2
+    assert pairs[("EN", "BE")].pruned == 1
+    assert pairs[("EN", "BE")].rows_after == 3
+    assert pairs[("EN", "RU")].rows_before == pairs[("EN", "RU")].rows_after == 1
+    assert report.bytes_after > 0
+    assert "EN->BE: 6 -> 3 rows (deduped 2, pruned 1)" in format_maintenance_report(
+        report
+    )
+    matches = store.query("Drop one", source_locale="EN", target_locale="BE")
+    assert [(m.origin, m.source_text) for m in matches] == [("project", "Drop one")]
+    hello = store.query("Hello", source_locale="EN", target_locale="BE")
+    assert sorted(m.target_text for m in hello) == [
+        "Pryvitańnie pack_a",
+        "Pryvitańnie pack_b",
+    ]
+    # Nothing left to remove on a second pass.
+    again = store.maintain()
+    assert all(p.deduped == p.pruned == 0 for p in again.pairs)
+    store.close()
+
+
+def test_tm_store_snapshot_export_imports_back(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    store = TMStore(root)
+    store.upsert_project_entries(
+        [("k1", "Drop one", "Skinuć adno"), ("k2", "Drop all", "Skinuć usio")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(root / "BE" / "ui.txt"),
+    )
+    snapshot = tmp_path / "team.tzptm"
+    progress: list[tuple[int, int]] = []
+    assert (
+        store.export_snapshot(
+            snapshot,
+            source_locale="EN",
+            target_locale="BE",
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        == 2
+    )
+    assert progress[-1] == (2, 2)
+    store.close()
+
+    other = tmp_path / "other"
+    other.mkdir()
+    peer = TMStore(other)
+    assert peer.import_tm(snapshot, source_locale="EN", target_locale="BE") == 2
+    matches = peer.query("Drop one", source_locale="EN", target_locale="BE")
+    assert (matches[0].origin, matches[0].target_text) == ("import", "Skinuć adno")
+    peer.close()
+
+
+def test_tm_store_snapshot_import_bulk_loads_indexes(tmp_path: Path) -> None:
+    from translationzed_py.core.tm_snapshot import write_tm_snapshot
+
+    root = tmp_path / "root"
+    root.mkdir()
+    snapshot = tmp_path / "team.tzptm"
+    write_tm_snapshot(
+        snapshot,
+        [("Drop one", "Skinuć adno"), ("Drop all", "Skinuć usio")],
+        source_locale="EN",
+        target_locale="BE",
+    )
+    store = TMStore(root)
+    assert store.build_concordance_index(source_locale="EN", target_locale="BE")
+    assert (
+        store.replace_import_tm(snapshot, source_locale="EN", target_locale="BE") == 2
+    )
+
+    conn = store._conn
+    triggers = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    }
+    assert {"tm_concordance_ai", "tm_tokens_ai", "tm_tokens_ad"} <= triggers
+    assert conn.execute("SELECT COUNT(*) FROM tm_tokens_pending").fetchone()[0] == 0
+    assert (
+        conn.execute("SELECT COUNT(DISTINCT entry_id) FROM tm_tokens").fetchone()[0]
+        == 2
+    )
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM tm_import_segments WHERE tm_path = ?",
+            (str(snapshot),),
+        ).fetchone()[0]
+        == 2
+    )
+    hits = store.concordance(
+        "adno", source_locale="EN", target_locale="BE", side="target"
+    )
+    assert [hit.target_text for hit in hits] == ["Skinuć adno"]
+
+    # Later project writes still go through the restored triggers.
+    store.upsert_project_entries(
+        [("k1", "Pick up", "Padniać")],
+        source_locale="EN",
+        target_locale="BE",
+        file_path=str(root / "BE" / "ui.txt"),
+    )
+    hits = store.concordance("Pick", source_locale="EN", target_locale="BE")
+    assert [hit.source_text for hit in hits] == ["Pick up"]
+    store.close()
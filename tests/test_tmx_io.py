@@ -1,14 +1,19 @@
+import gzip
 import struct
 import zipfile
 from pathlib import Path
 from xml.sax.saxutils import escape
 
+import pytest
+
+from translationzed_py.core.tm_snapshot import write_tm_snapshot
 from translationzed_py.core.tmx_io import (
     detect_tm_languages,
     detect_tmx_languages,
     iter_tm_pairs,
     iter_tmx_pairs,
     supported_tm_import_suffixes,
+    tm_import_suffix,
     write_tmx,
 )
 
@@ -24,6 +29,27 @@ def test_tmx_roundtrip(tmp_path: Path) -> None:
     assert "BE" in langs
 
 
+def test_write_tmx_streams_gzip_and_reports_progress(tmp_path: Path) -> None:
+    path = tmp_path / "sample.tmx.gz"
+    pairs = [(f"Source {idx}", f"Target {idx}") for idx in range(5)]
+    seen: list[int] = []
+    count = write_tmx(
+        path,
+        iter(pairs),
+        source_locale="EN",
+        target_locale="BE",
+        progress=seen.append,
+        progress_every=2,
+    )
+    assert count == 5
+    assert seen == [2, 4, 5]
+    plain = tmp_path / "sample.tmx"
+    plain.write_bytes(gzip.decompress(path.read_bytes()))
+    assert list(iter_tmx_pairs(plain, "EN", "BE")) == pairs
+    assert list(iter_tm_pairs(path, "EN", "BE")) == pairs
+    assert detect_tm_languages(path) == {"EN", "BE"}
+
+
 def test_iter_tmx_pairs_matches_bcp47_region_variants(tmp_path: Path) -> None:
     path = tmp_path / "variants.tmx"
     path.write_text(
@@ -95,9 +121,33 @@ msgstr "Прывітанне свет"
     assert "be" in langs
 
 
+def test_iter_xliff_pairs_keeps_inline_markup_text(tmp_path: Path) -> None:
+    path = tmp_path / "inline.xliff"
+    path.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" version="2.0"
+  srcLang="en-US" trgLang="be-BY">
+  <file id="f1">
+    <unit id="u1">
+      <segment>
+        <source>Drop <pc id="1">all</pc> items</source>
+        <target>Skinuc <pc id="1">usio</pc> rechy</target>
+      </segment>
+    </unit>
+  </file>
+</xliff>
+""",
+        encoding="utf-8",
+    )
+    assert list(iter_tm_pairs(path, "EN", "BE")) == [
+        ("Drop all items", "Skinuc usio rechy")
+    ]
+
+
 def test_supported_tm_import_suffixes() -> None:
     assert supported_tm_import_suffixes() == (
         ".tmx",
+        ".tmx.gz",
         ".xliff",
         ".xlf",
         ".po",
@@ -106,9 +156,21 @@ def test_supported_tm_import_suffixes() -> None:
         ".mo",
         ".xml",
         ".xlsx",
+        ".tzptm",
     )
 
 
+def test_only_tmx_gz_names_are_gzip_tmx(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt.gz"
+    path.write_bytes(gzip.compress(b"not a tmx"))
+    assert tm_import_suffix(tmp_path / "Sample.TMX.GZ") == ".tmx.gz"
+    assert tm_import_suffix(path) == ".gz"
+    assert tm_import_suffix(tmp_path / "backup.xliff.gz") == ".gz"
+    assert detect_tm_languages(path) == set()
+    with pytest.raises(ValueError):
+        list(iter_tm_pairs(path, "EN", "BE"))
+
+
 def test_iter_tm_pairs_xlf_alias(tmp_path: Path) -> None:
     path = tmp_path / "sample.xlf"
     path.write_text(
@@ -387,3 +449,13 @@ def _xlsx_col_ref(col_idx: int) -> str:
         value, remainder = divmod(value - 1, 26)
         letters = chr(65 + remainder) + letters
     return letters
+
+
+def test_iter_tm_pairs_snapshot_matches_header_locales(tmp_path: Path) -> None:
+    path = tmp_path / "pack.tzptm"
+    write_tm_snapshot(
+        path, [("Hello world", "Privet mir")], source_locale="en-US", target_locale="ru"
+    )
+    assert list(iter_tm_pairs(path, "EN", "RU")) == [("Hello world", "Privet mir")]
+    assert list(iter_tm_pairs(path, "EN", "BE")) == []
+    assert detect_tm_languages(path) == {"en-US", "ru"}
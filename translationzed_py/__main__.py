@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -67,9 +68,8 @@ def _configure_qt_env() -> None:
 
 
 def main(argv: list[str] | None = None) -> None:
-    _configure_qt_env()
-    from translationzed_py.gui import launch
-
+    # Frozen bundles re-enter here in spawned TM import workers.
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(
         prog="translationzed-py",
         description="Open the TranslationZed-Py GUI, optionally pointing at a project root.",
@@ -85,10 +85,31 @@ def main(argv: list[str] | None = None) -> None:
         action="version",
         version=f"%(prog)s {__version__}",
     )
+    parser.add_argument(
+        "--tm-maintain",
+        action="store_true",
+        help="dedupe, prune and compact the project TM, print a report and exit",
+    )
 
     args = parser.parse_args(argv)
+    if args.tm_maintain:
+        _maintain_tm(args.project or Path.cwd())
+        return
+    _configure_qt_env()
+    from translationzed_py.gui import launch
+
     launch(str(args.project) if args.project else None)
 
 
+def _maintain_tm(root: Path) -> None:
+    from translationzed_py.core.tm_store import TMStore, format_maintenance_report
+
+    store = TMStore(root.resolve())
+    try:
+        print(format_maintenance_report(store.maintain()))
+    finally:
+        store.close()
+
+
 if __name__ == "__main__":
     main()
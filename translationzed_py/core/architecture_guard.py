@@ -19,16 +19,25 @@ DEFAULT_RULES: dict[str, BoundaryRule] = {
                 "translationzed_py.core",
                 "translationzed_py.core.app_config",
                 "translationzed_py.core.conflict_service",
+                "translationzed_py.core.draft_manifest",
                 "translationzed_py.core.en_hash_cache",
                 "translationzed_py.core.file_workflow",
+                "translationzed_py.core.locale_variant_index",
                 "translationzed_py.core.model",
                 "translationzed_py.core.preferences_service",
+                "translationzed_py.core.project_scanner",
                 "translationzed_py.core.project_session",
+                "translationzed_py.core.qa_scan",
                 "translationzed_py.core.qa_service",
+                "translationzed_py.core.regex_guard",
                 "translationzed_py.core.render_workflow_service",
+                "translationzed_py.core.row_height_store",
                 "translationzed_py.core.save_exit_flow",
                 "translationzed_py.core.saver",
                 "translationzed_py.core.search",
+                "translationzed_py.core.search_executor",
+                "translationzed_py.core.search_index",
+                "translationzed_py.core.search_rows_store",
                 "translationzed_py.core.search_replace_service",
                 "translationzed_py.core.source_reference_service",
                 "translationzed_py.core.status_cache",
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from .app_config import load as _load_app_config
+from .atomic_io import write_bytes_atomic
+from .status_cache import read_has_drafts_from_path
+
+_FILENAME = "drafts_manifest.json"
+_VERSION = 1
+
+# (inode, size, mtime_ns, has_drafts)
+_Record = tuple[int, int, int, bool]
+
+
+class DraftManifest:
+    """Has-drafts flags of status-cache files, persisted under the cache dir.
+
+    A flag is reused while the cache file's inode, size and mtime match the
+    recorded ones, so draft scans stat cache files instead of reading their
+    headers. `has_drafts` can stand in for `read_has_drafts_from_path`.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._records: dict[str, _Record] = {}
+        self._dirty = False
+        if path is not None:
+            self._load(path)
+
+    @classmethod
+    def for_root(cls, root: Path) -> DraftManifest:
+        cfg = _load_app_config(root)
+        return cls(root / cfg.cache_dir / _FILENAME)
+
+    def has_drafts(self, cache_path: Path) -> bool:
+        try:
+            stat = cache_path.stat()
+        except OSError:
+            return False
+        key = str(cache_path)
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            record = self._records.get(key)
+        if record is not None and record[:3] == stamp:
+            return record[3]
+        flag = read_has_drafts_from_path(cache_path)
+        with self._lock:
+            self._records[key] = (*stamp, flag)
+            self._dirty = True
+        return flag
+
+    def flush(self) -> None:
+        """Write the manifest back, dropping records of removed cache files."""
+        if self._path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            records = dict(self._records)
+        records = {key: rec for key, rec in records.items() if os.path.exists(key)}
+        payload = {"version": _VERSION, "files": records}
+        try:
+            write_bytes_atomic(self._path, json.dumps(payload).encode("utf-8"))
+        except OSError:
+            return
+        with self._lock:
+            self._dirty = False
+
+    def _load(self, path: Path) -> None:
+        try:
+            payload = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != _VERSION:
+            return
+        files = payload.get("files")
+        if not isinstance(files, dict):
+            return
+        for key, record in files.items():
+            with contextlib.suppress(TypeError, ValueError):
+                ino, size, mtime, flag = record
+                self._records[str(key)] = (int(ino), int(size), int(mtime), bool(flag))
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import xxhash
+
+from translationzed_py.core.app_config import load as _load_app_config
+from translationzed_py.core.model import Entry
+from translationzed_py.core.parser import parse
+from translationzed_py.core.project_scanner import LocaleMeta, list_translatable_files
+from translationzed_py.core.status_cache import (
+    add_write_listener,
+    cache_path,
+    read,
+    remove_write_listener,
+)
+
+_DB_FILENAME = "locale_variants.sqlite"
+_SCHEMA_VERSION = 1
+_LOCALE_TOKEN = "{locale}"
+
+# (source mtime_ns, source size, status-cache mtime_ns or 0)
+_Stamp = tuple[int, int, int]
+_Rows = dict[str, tuple[str, int]]
+
+
+def variant_file_id(rel: str | Path, locale: str) -> str:
+    """Locale-independent id for a file path relative to its locale dir."""
+    rel_path = Path(rel)
+    stem = rel_path.stem
+    for token in dict.fromkeys((locale, locale.replace(" ", "_"))):
+        suffix = f"_{token}"
+        if stem.endswith(suffix):
+            stem = f"{stem[: -len(suffix)]}_{_LOCALE_TOKEN}"
+            break
+    return rel_path.with_name(f"{stem}{rel_path.suffix}").as_posix()
+
+
+def variant_path_for_locale(
+    root: Path, path: Path, *, from_locale: str, to_locale: str
+) -> Path | None:
+    locale_root = root / from_locale
+    try:
+        rel = path.relative_to(locale_root)
+    except ValueError:
+        try:
+            rel_full = path.relative_to(root)
+            if rel_full.parts and rel_full.parts[0] == from_locale:
+                rel = Path(*rel_full.parts[1:])
+            else:
+                return None
+        except ValueError:
+            return None
+    candidate = root / to_locale / rel
+    if candidate.exists():
+        return candidate
+    stem = rel.stem
+    from_tokens = (from_locale, from_locale.replace(" ", "_"))
+    to_tokens = (to_locale, to_locale.replace(" ", "_"))
+    for from_token in from_tokens:
+        suffix = f"_{from_token}"
+        if not stem.endswith(suffix):
+            continue
+        stem_prefix = stem[: -len(suffix)]
+        for to_token in to_tokens:
+            alt = rel.with_name(f"{stem_prefix}_{to_token}{rel.suffix}")
+            alt_path = root / to_locale / alt
+            if alt_path.exists():
+                return alt_path
+    return None
+
+
+def _key_hash(entry: Entry, bits: int) -> int:
+    digest = entry.key_hash
+    if digest is None:
+        digest = int(xxhash.xxh64(entry.key.encode("utf-8")).intdigest())
+    return digest & 0xFFFF if bits == 16 else digest & 0xFFFFFFFFFFFFFFFF
+
+
+def _stamp(root: Path, path: Path) -> _Stamp | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    try:
+        cache_mtime = cache_path(root, path).stat().st_mtime_ns
+    except OSError:
+        cache_mtime = 0
+    return (stat.st_mtime_ns, stat.st_size, cache_mtime)
+
+
+class LocaleVariantIndex:
+    """(file, key) -> per-locale value/status, persisted under the cache dir.
+
+    The index is filled on a background thread and kept current from
+    status-cache writes, so locale-variant lookups never touch the disk.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        cfg = _load_app_config(root)
+        self._path = root / cfg.cache_dir / _DB_FILENAME
+        self._lock = threading.Lock()
+        self._rows: dict[tuple[str, str], _Rows] = {}
+        self._stamps: dict[tuple[str, str], _Stamp] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self._ready: frozenset[str] = frozenset()
+        self._tracked: frozenset[str] = frozenset()
+        self._pool: ThreadPoolExecutor | None = None
+        self._future: Future[int] | None = None
+        self._closing = threading.Event()
+        add_write_listener(self.on_cache_write)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def is_ready(self, locales: Iterable[str]) -> bool:
+        ready = self._ready
+        return all(locale in ready for locale in locales)
+
+    def lookup(
+        self, file_path: Path, key: str, locales: Sequence[str]
+    ) -> list[tuple[str, str, int]] | None:
+        """Return (locale, value, status) for *key* in each locale's variant of
+        *file_path*, or None while any requested locale is still indexing."""
+        if not self.is_ready(locales):
+            return None
+        located = self._locate(file_path)
+        if located is None:
+            return None
+        from_locale, rel = located
+        out: list[tuple[str, str, int]] = []
+        with self._lock:
+            for locale in locales:
+                # Same relative path first, then the `_{LOCALE}` suffix swap.
+                rows = self._rows.get((locale, variant_file_id(rel, locale)))
+                if rows is None:
+                    rows = self._rows.get((locale, variant_file_id(rel, from_locale)))
+                hit = rows.get(key) if rows is not None else None
+                if hit is not None:
+                    out.append((locale, hit[0], hit[1]))
+        return out
+
+    def refresh_async(
+        self, locales: Mapping[str, LocaleMeta], selected: Sequence[str]
+    ) -> Future[int]:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tzp-variants"
+            )
+        codes = tuple(code for code in selected if code in locales and code != "EN")
+        metas = {code: locales[code] for code in codes}
+        self._future = self._pool.submit(self.refresh, metas)
+        return self._future
+
+    def refresh(self, locales: Mapping[str, LocaleMeta]) -> int:
+        """Load persisted rows, re-index files whose stamps changed, persist.
+
+        Returns the number of files that had to be parsed.
+        """
+        wanted = set(locales)
+        with self._lock:
+            self._ready = frozenset(self._ready & wanted)
+            self._tracked = frozenset(wanted)
+            missing = wanted - {locale for locale, _ in self._stamps}
+        if missing:
+            self._load(missing)
+        parsed = 0
+        for code, meta in locales.items():
+            seen: set[str] = set()
+            for path in list_translatable_files(meta.path):
+                if self._closing.is_set():
+                    self.flush()
+                    return parsed
+                rel = path.relative_to(meta.path)
+                file_id = variant_file_id(rel, code)
+                seen.add(file_id)
+                stamp = _stamp(self._root, path)
+                if stamp is None:
+                    continue
+                with self._lock:
+                    known = self._stamps.get((code, file_id))
+                if known == stamp:
+                    continue
+                rows = self._index_file(path, meta.charset)
+                parsed += 1
+                with self._lock:
+                    # A cache write that landed while parsing is newer; keep it.
+                    if self._stamps.get((code, file_id)) != known:
+                        continue
+                    self._rows[(code, file_id)] = rows
+                    self._stamps[(code, file_id)] = stamp
+                    self._dirty.add((code, file_id))
+            with self._lock:
+                for stale in [
+                    item
+                    for item in self._stamps
+                    if item[0] == code and item[1] not in seen
+                ]:
+                    self._rows.pop(stale, None)
+                    self._stamps.pop(stale, None)
+                    self._dirty.add(stale)
+                self._ready = self._ready | {code}
+        self.flush()
+        return parsed
+
+    def on_cache_write(
+        self, root: Path, file_path: Path, entries: Sequence[Entry] | None
+    ) -> None:
+        if root != self._root:
+            return
+        located = self._locate(file_path)
+        if located is None:
+            return
+        locale, rel = located
+        item = (locale, variant_file_id(rel, locale))
+        if entries is None:
+            # The cache was restored; lookups read the disk for this locale
+            # until the next refresh re-indexes the file.
+            with self._lock:
+                self._rows.pop(item, None)
+                self._stamps.pop(item, None)
+                self._dirty.add(item)
+                self._ready = self._ready - {locale}
+            return
+        stamp = _stamp(self._root, file_path)
+        if locale not in self._tracked or stamp is None:
+            # Not tracked; the next refresh sees the new stamps.
+            return
+        rows = {entry.key: (entry.value or "", int(entry.status)) for entry in entries}
+        with self._lock:
+            self._rows[item] = rows
+            self._stamps[item] = stamp
+            self._dirty.add(item)
+
+    def flush(self) -> None:
+        with self._lock:
+            dirty = {
+                item: (self._stamps.get(item), dict(self._rows.get(item, {})))
+                for item in self._dirty
+            }
+            self._dirty.clear()
+        if not dirty:
+            return
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return
+        try:
+            with conn:
+                for (locale, file_id), (stamp, rows) in dirty.items():
+                    conn.execute(
+                        "DELETE FROM variants WHERE locale = ? AND file_id = ?",
+                        (locale, file_id),
+                    )
+                    conn.execute(
+                        "DELETE FROM files WHERE locale = ? AND file_id = ?",
+                        (locale, file_id),
+                    )
+                    if stamp is None:
+                        continue
+                    conn.execute(
+                        "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                        (locale, file_id, *stamp),
+                    )
+                    conn.executemany(
+                        "INSERT INTO variants VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (locale, file_id, key, value, status)
+                            for key, (value, status) in rows.items()
+                        ],
+                    )
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        remove_write_listener(self.on_cache_write)
+        self._closing.set()
+        if self._future is not None:
+            self._future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self.flush()
+
+    def _locate(self, file_path: Path) -> tuple[str, Path] | None:
+        try:
+            rel = file_path.relative_to(self._root)
+        except ValueError:
+            return None
+        if len(rel.parts) < 2:
+            return None
+        return rel.parts[0], Path(*rel.parts[1:])
+
+    def _index_file(self, path: Path, encoding: str) -> _Rows:
+        try:
+            entries = parse(path, encoding=encoding).entries
+        except Exception:
+            return {}
+        cache_map = read(self._root, path)
+        bits = getattr(cache_map, "hash_bits", 64)
+        rows: _Rows = {}
+        for entry in entries:
+            value = entry.value or ""
+            status = int(entry.status)
+            rec = cache_map.get(_key_hash(entry, bits)) if cache_map else None
+            if rec is not None:
+                if rec.value is not None:
+                    value = rec.value
+                status = int(rec.status)
+            rows[entry.key] = (value, status)
+        return rows
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute("DROP TABLE IF EXISTS variants")
+                conn.execute("""
+                    CREATE TABLE files (
+                        locale TEXT NOT NULL,
+                        file_id TEXT NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        cache_mtime_ns INTEGER NOT NULL,
+                        PRIMARY KEY (locale, file_id)
+                    ) WITHOUT ROWID
+                    """)
+                conn.execute("""
+                    CREATE TABLE variants (
+                        locale TEXT NOT NULL,
+                        file_id TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        status INTEGER NOT NULL,
+                        PRIMARY KEY (locale, file_id, key)
+                    ) WITHOUT ROWID
+                    """)
+                conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        return conn
+
+    def _load(self, locales: set[str]) -> None:
+        if not self._path.exists():
+            return
+        loaded_rows: dict[tuple[str, str], _Rows] = {}
+        loaded_stamps: dict[tuple[str, str], _Stamp] = {}
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return
+        try:
+            for locale in sorted(locales):
+                for file_id, mtime_ns, size, cache_mtime in conn.execute(
+                    "SELECT file_id, mtime_ns, size, cache_mtime_ns FROM files "
+                    "WHERE locale = ?",
+                    (locale,),
+                ):
+                    loaded_stamps[(locale, file_id)] = (mtime_ns, size, cache_mtime)
+                    loaded_rows[(locale, file_id)] = {}
+                for file_id, key, value, status in conn.execute(
+                    "SELECT file_id, key, value, status FROM variants "
+                    "WHERE locale = ?",
+                    (locale,),
+                ):
+                    rows = loaded_rows.get((locale, file_id))
+                    if rows is not None:
+                        rows[key] = (value, status)
+        except sqlite3.Error:
+            return
+        finally:
+            conn.close()
+        with self._lock:
+            for item, stamp in loaded_stamps.items():
+                # Never clobber state a cache write produced during the load.
+                if item in self._stamps:
+                    continue
+                self._stamps[item] = stamp
+                self._rows[item] = loaded_rows[item]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -8,6 +10,9 @@ from translationzed_py.core.app_config import load as _load_app_config
 _IGNORE_DIRS = {"_TVRADIO_TRANSLATIONS", ".git", ".vscode"}
 _IGNORE_FILES = {"language.txt", "credits.txt"}
 
+# (files, (dir, mtime_ns) per directory the listing covers)
+_Listing = tuple[tuple[Path, ...], tuple[tuple[str, int], ...]]
+
 
 class LanguageFileError(ValueError):
     pass
@@ -67,6 +72,63 @@ def list_translatable_files(locale_path: Path) -> list[Path]:
     return sorted(files)
 
 
+def _dir_stamps(locale_path: Path, files: list[Path]) -> tuple[tuple[str, int], ...]:
+    dirs = {str(locale_path)}
+    for path in files:
+        parent = path.parent
+        while parent != locale_path and str(parent) not in dirs:
+            dirs.add(str(parent))
+            parent = parent.parent
+    stamps = []
+    for name in sorted(dirs):
+        try:
+            stamps.append((name, os.stat(name).st_mtime_ns))
+        except OSError:
+            stamps.append((name, -1))
+    return tuple(stamps)
+
+
+def _stamps_valid(stamps: tuple[tuple[str, int], ...]) -> bool:
+    for name, mtime in stamps:
+        try:
+            if os.stat(name).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class ProjectFileSnapshot:
+    """Translatable-file listings per locale dir, shared by the file tree and
+    project-wide features and safe to read from worker threads.
+
+    A listing is reused while the mtimes of the directories it covers are
+    unchanged, so adding or removing files triggers a rescan.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listings: dict[Path, _Listing] = {}
+
+    def files(self, locale_path: Path) -> tuple[Path, ...]:
+        with self._lock:
+            cached = self._listings.get(locale_path)
+        if cached is not None and _stamps_valid(cached[1]):
+            return cached[0]
+        files = list_translatable_files(locale_path)
+        listing = (tuple(files), _dir_stamps(locale_path, files))
+        with self._lock:
+            self._listings[locale_path] = listing
+        return listing[0]
+
+    def invalidate(self, locale_path: Path | None = None) -> None:
+        with self._lock:
+            if locale_path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(locale_path, None)
+
+
 def scan_root(root: Path) -> dict[str, LocaleMeta]:
     """Return mapping {locale_code: LocaleMeta} for locale dirs in *root*."""
     locales, errors = _scan_root_collect(root)
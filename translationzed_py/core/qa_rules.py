@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from functools import lru_cache
 
 TAG_TOKEN_RE = re.compile(r"<[A-Z][A-Z0-9_]*(?::[^>\r\n]+)?>")
 BRACKET_TAG_TOKEN_RE = re.compile(r"\[[Ii][Mm][Gg]=[^\]\r\n]+\]")
@@ -15,6 +16,10 @@ _PROTECTED_TOKEN_REGEXES = (
     PLACEHOLDER_TOKEN_RE,
     ESCAPE_TOKEN_RE,
 )
+# One pass per text instead of one per token kind; earlier kinds win overlaps.
+PROTECTED_TOKEN_RE = re.compile(
+    "|".join(f"(?:{regex.pattern})" for regex in _PROTECTED_TOKEN_REGEXES)
+)
 
 
 def trailing_fragment(text: str) -> str:
@@ -55,22 +60,25 @@ def extract_protected_tokens(text: str) -> tuple[str, ...]:
     """
     Return code-like tokens to preserve across translation.
     """
-    spans: list[tuple[int, int, str]] = []
-    for regex in _PROTECTED_TOKEN_REGEXES:
-        for match in regex.finditer(text):
-            spans.append((match.start(), match.end(), match.group(0)))
-    spans.sort(key=lambda item: (item[0], item[1]))
-    return tuple(token for _start, _end, token in spans)
+    return tuple(match.group(0) for match in PROTECTED_TOKEN_RE.finditer(text))
+
+
+@lru_cache(maxsize=65536)
+def _source_token_counts(source_text: str) -> tuple[tuple[str, int], ...]:
+    # Source texts repeat across rows, rescans and locales; str keeps its hash.
+    return tuple(Counter(extract_protected_tokens(source_text)).items())
 
 
 def missing_protected_tokens(
     source_text: str,
     target_text: str,
 ) -> tuple[str, ...]:
-    source_counts = Counter(extract_protected_tokens(source_text))
+    source_counts = _source_token_counts(source_text)
+    if not source_counts:
+        return ()
     target_counts = Counter(extract_protected_tokens(target_text))
     missing: list[str] = []
-    for token, needed in source_counts.items():
+    for token, needed in source_counts:
         deficit = needed - target_counts.get(token, 0)
         if deficit > 0:
             missing.extend(token for _ in range(deficit))
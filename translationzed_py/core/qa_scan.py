@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import xxhash
+
+from .app_config import load as _load_app_config
+from .file_workflow import apply_cache_overlay
+from .parser import parse
+from .qa_service import (
+    QAFinding,
+    QAInputRow,
+    QARule,
+    compile_qa_rules,
+    run_qa_rules,
+)
+from .source_reference_service import build_source_lookup_materialized
+from .status_cache import cache_path, entry_key_hash
+from .status_cache import read as read_status_cache
+
+# Bump when a rule's logic changes so persisted findings are recomputed.
+QA_RULES_VERSION = 2
+_DB_FILENAME = "qa_findings.sqlite"
+_SCHEMA_VERSION = 2
+# Upper bound on spawned QA processes; each one re-imports the parser.
+_MAX_QA_WORKERS = 8
+
+# (mtime_ns, size, content hash)
+_HashRecord = tuple[int, int, str]
+
+
+@dataclass(frozen=True, slots=True)
+class QARuleSet:
+    check_trailing: bool
+    check_newlines: bool
+    check_tokens: bool
+    check_same_as_source: bool
+
+    @property
+    def key(self) -> str:
+        codes = (rule.code for rule in self.compile())
+        return f"v{QA_RULES_VERSION}:{','.join(codes)}"
+
+    def compile(self) -> tuple[QARule, ...]:
+        return compile_qa_rules(
+            check_trailing=self.check_trailing,
+            check_newlines=self.check_newlines,
+            check_tokens=self.check_tokens,
+            check_same_as_source=self.check_same_as_source,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class QAFileJob:
+    root: Path
+    path: Path
+    encoding: str
+    source_path: Path | None = None
+    source_encoding: str = "utf-8"
+
+
+def _content_hash(path: Path) -> str:
+    digest = xxhash.xxh64()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def qa_file_stamp(
+    job: QAFileJob, *, content_hash: Callable[[Path], str] = _content_hash
+) -> str | None:
+    """Content hash, status-cache mtime and source content hash of *job*;
+    None when the file cannot be read. *content_hash* may answer from
+    remembered hashes (`QAFindingsCache.content_hash`)."""
+    try:
+        content = content_hash(job.path)
+    except OSError:
+        return None
+    cache_mtime = 0
+    with contextlib.suppress(OSError):
+        cache_mtime = cache_path(job.root, job.path).stat().st_mtime_ns
+    source = ""
+    if job.source_path is not None:
+        with contextlib.suppress(OSError):
+            source = content_hash(job.source_path)
+    return f"{content}:{cache_mtime}:{source}"
+
+
+def scan_qa_file(job: QAFileJob, rules: QARuleSet) -> tuple[QAFinding, ...]:
+    """QA findings for one file as it would open: status-cache values over
+    the file, source text from the reference file."""
+    parsed = parse(job.path, encoding=job.encoding)
+    cache_map = read_status_cache(job.root, job.path)
+    entries = parsed.entries
+    apply_cache_overlay(
+        entries,
+        cache_map,
+        hash_for_entry=lambda entry: entry_key_hash(entry, cache_map),
+    )
+    by_row: Sequence[str] | None = None
+    by_key: dict[str, str] = {}
+    if job.source_path is not None:
+        with contextlib.suppress(OSError, UnicodeDecodeError, ValueError):
+            reference = parse(job.source_path, encoding=job.source_encoding)
+            lookup = build_source_lookup_materialized(
+                reference.entries, target_entries=entries, path_name=job.path.name
+            )
+            by_row = lookup.by_row_values
+            if by_row is None and lookup.by_row_entries is not None:
+                by_row = [entry.value for entry in lookup.by_row_entries]
+            by_key = lookup.by_key or {}
+    rows = []
+    for idx, entry in enumerate(entries):
+        if by_row is not None and idx < len(by_row):
+            source = by_row[idx]
+        else:
+            source = by_key.get(entry.key, "")
+        rows.append(QAInputRow(idx, str(source or ""), str(entry.value or "")))
+    return run_qa_rules(file=job.path, rows=rows, rules=rules.compile())
+
+
+class QAFindingsCache:
+    """Per-file QA findings persisted under the cache dir, valid for one
+    (file stamp, rule set) pair.
+
+    Content hashes for the stamps are remembered with each file's mtime and
+    size, so unchanged files are only stat'ed on the next scan.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        cfg = _load_app_config(root)
+        self._path = root / cfg.cache_dir / _DB_FILENAME
+        self._lock = threading.Lock()
+        self._hashes: dict[str, _HashRecord] | None = None
+        self._new_hashes: dict[str, _HashRecord] = {}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        with self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS files")
+                self._conn.execute("DROP TABLE IF EXISTS hashes")
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, stamp TEXT NOT NULL, rules TEXT NOT NULL, "
+                "findings TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, hash TEXT NOT NULL)"
+            )
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(
+        self, path: Path, *, stamp: str, rules: QARuleSet
+    ) -> tuple[QAFinding, ...] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT findings FROM files WHERE path = ? AND stamp = ? AND rules = ?",
+                (self._key(path), stamp, rules.key),
+            ).fetchone()
+        if row is None:
+            return None
+        return tuple(
+            QAFinding(
+                file=path,
+                row=int(item[0]),
+                code=str(item[1]),
+                excerpt=str(item[2]),
+                severity=str(item[3]),
+                group=str(item[4]),
+            )
+            for item in json.loads(row[0])
+        )
+
+    def put(
+        self,
+        path: Path,
+        *,
+        stamp: str,
+        rules: QARuleSet,
+        findings: Sequence[QAFinding],
+    ) -> None:
+        payload = json.dumps(
+            [(f.row, f.code, f.excerpt, f.severity, f.group) for f in findings],
+            ensure_ascii=False,
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, stamp, rules, findings) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(path), stamp, rules.key, payload),
+            )
+
+    def content_hash(self, path: Path) -> str:
+        """Content hash of *path*, re-read only when its mtime or size differ
+        from the remembered ones; call `flush` to persist new hashes."""
+        stat = path.stat()
+        key = self._key(path)
+        with self._lock:
+            if self._hashes is None:
+                self._hashes = {
+                    row[0]: (row[1], row[2], row[3])
+                    for row in self._conn.execute(
+                        "SELECT path, mtime_ns, size, hash FROM hashes"
+                    )
+                }
+            known = self._hashes.get(key)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        digest = _content_hash(path)
+        record = (stat.st_mtime_ns, stat.st_size, digest)
+        with self._lock:
+            self._hashes[key] = record
+            self._new_hashes[key] = record
+        return digest
+
+    def flush(self) -> None:
+        with self._lock:
+            new, self._new_hashes = self._new_hashes, {}
+            if not new:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes (path, mtime_ns, size, hash) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, *record) for key, record in new.items()],
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM hashes")
+            self._hashes = None
+            self._new_hashes = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self._root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+
+class QAProjectRun:
+    """Findings of one multi-file QA scan, streamed per file.
+
+    `take()` returns `(path, findings)` for files finished since the last
+    call; files that failed to scan are listed in `failures`.
+    """
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.files_done = 0
+        self.cached_files = 0
+        self.failures: list[tuple[Path, str]] = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: list[tuple[Path, tuple[QAFinding, ...]]] = []
+        self._future: Future[None] = Future()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def error(self) -> BaseException | None:
+        if not self._future.done() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+    def take(self) -> list[tuple[Path, tuple[QAFinding, ...]]]:
+        with self._lock:
+            out, self._pending = self._pending, []
+        return out
+
+    def _push(
+        self, path: Path, findings: tuple[QAFinding, ...], *, cached: bool = False
+    ) -> None:
+        with self._lock:
+            self._pending.append((path, findings))
+            self.files_done += 1
+            if cached:
+                self.cached_files += 1
+
+    def _fail(self, path: Path, exc: BaseException) -> None:
+        with self._lock:
+            self.failures.append((path, str(exc)))
+            self.files_done += 1
+
+
+class QAProjectScanner:
+    """Runs project QA scans: cached files are answered from
+    `QAFindingsCache`, the rest are parsed and checked across a spawned
+    process pool. One scan at a time; starting a new one cancels the last.
+    """
+
+    def __init__(self, root: Path, *, max_workers: int | None = None) -> None:
+        self._root = root
+        self._max_workers = max_workers
+        self._cache: QAFindingsCache | None = None
+        self._thread: ThreadPoolExecutor | None = None
+        self._pool: ProcessPoolExecutor | None = None
+        self._run: QAProjectRun | None = None
+
+    @property
+    def current(self) -> QAProjectRun | None:
+        return self._run
+
+    def cache(self) -> QAFindingsCache:
+        if self._cache is None:
+            self._cache = QAFindingsCache(self._root)
+        return self._cache
+
+    def start(
+        self,
+        jobs: Sequence[QAFileJob],
+        rules: QARuleSet,
+        *,
+        synchronous: bool = False,
+    ) -> QAProjectRun:
+        self.cancel()
+        run = QAProjectRun(len(jobs))
+        self._run = run
+        if synchronous:
+            self._execute(run, tuple(jobs), rules)
+            return run
+        if self._thread is None:
+            self._thread = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tzp-qa-project"
+            )
+        self._thread.submit(self._execute, run, tuple(jobs), rules)
+        return run
+
+    def cancel(self) -> None:
+        if self._run is not None:
+            self._run.cancel()
+            self._run = None
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._thread is not None:
+            self._thread.shutdown(wait=False, cancel_futures=True)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _execute(
+        self, run: QAProjectRun, jobs: tuple[QAFileJob, ...], rules: QARuleSet
+    ) -> None:
+        if not run._future.set_running_or_notify_cancel():
+            return
+        try:
+            self._scan(run, jobs, rules)
+        except BaseException as exc:
+            run._future.set_exception(exc)
+        else:
+            run._future.set_result(None)
+
+    def _scan(
+        self, run: QAProjectRun, jobs: tuple[QAFileJob, ...], rules: QARuleSet
+    ) -> None:
+        cache = self.cache()
+        pending: list[tuple[QAFileJob, str]] = []
+        try:
+            for job in jobs:
+                if run.cancelled:
+                    return
+                stamp = qa_file_stamp(job, content_hash=cache.content_hash)
+                if stamp is None:
+                    run._push(job.path, ())
+                    continue
+                cached = cache.get(job.path, stamp=stamp, rules=rules)
+                if cached is not None:
+                    run._push(job.path, cached, cached=True)
+                else:
+                    pending.append((job, stamp))
+        finally:
+            cache.flush()
+        if len(pending) < 2 or self._pool_size() <= 1:
+            for job, stamp in pending:
+                if run.cancelled:
+                    return
+                try:
+                    findings = scan_qa_file(job, rules)
+                except Exception as exc:
+                    run._fail(job.path, exc)
+                    continue
+                cache.put(job.path, stamp=stamp, rules=rules, findings=findings)
+                run._push(job.path, findings)
+            return
+        # The pool outlives this scan, so it is sized for the machine rather
+        # than for this scan's backlog.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        pool = self._pool
+        futures = {
+            pool.submit(scan_qa_file, job, rules): (job, stamp)
+            for job, stamp in pending
+        }
+        try:
+            remaining = set(futures)
+            while remaining:
+                finished, remaining = wait(
+                    remaining, timeout=0.1, return_when=FIRST_COMPLETED
+                )
+                if run.cancelled:
+                    return
+                for future in finished:
+                    job, stamp = futures[future]
+                    try:
+                        findings = future.result()
+                    except BrokenProcessPool as exc:
+                        if self._pool is pool:
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            self._pool = None
+                        run._fail(job.path, exc)
+                        continue
+                    except Exception as exc:
+                        run._fail(job.path, exc)
+                        continue
+                    cache.put(job.path, stamp=stamp, rules=rules, findings=findings)
+                    run._push(job.path, findings)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _pool_size(self) -> int:
+        workers = self._max_workers
+        if workers is None:
+            workers = min(os.cpu_count() or 1, _MAX_QA_WORKERS)
+        return max(1, int(workers))
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+import time
 from collections import Counter
-from collections.abc import Sequence
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
 from .qa_rules import (
     has_missing_trailing_fragment,
-    has_newline_mismatch,
     missing_protected_tokens,
     newline_count,
     same_as_source,
@@ -37,6 +37,60 @@ class QAFinding:
     group: str = "format"
 
 
+# (rule code, elapsed ms, rows checked, findings)
+QARuleTiming = Callable[[str, float, int, int], None]
+
+
+@dataclass(frozen=True, slots=True)
+class QARule:
+    """One QA check: `check(source, target)` returns the finding excerpt or
+    None. *flag* names the preference toggle that enables it (None: always
+    on)."""
+
+    code: str
+    check: Callable[[str, str], str | None]
+    flag: str | None = None
+    severity: str = "warning"
+    group: str = "format"
+
+
+_QA_RULES: dict[str, QARule] = {}
+
+
+def register_qa_rule(rule: QARule) -> QARule:
+    """Add *rule* to the registry (replacing one with the same code).
+
+    Register at import time of a module: project scans run in spawned worker
+    processes that only see rules registered on import.
+    """
+    _QA_RULES[rule.code] = rule
+    return rule
+
+
+def registered_qa_rules() -> tuple[QARule, ...]:
+    return tuple(_QA_RULES.values())
+
+
+def compile_qa_rules(
+    *,
+    check_trailing: bool,
+    check_newlines: bool,
+    check_tokens: bool,
+    check_same_as_source: bool,
+) -> tuple[QARule, ...]:
+    enabled = {
+        "trailing": check_trailing,
+        "newlines": check_newlines,
+        "tokens": check_tokens,
+        "same_source": check_same_as_source,
+    }
+    return tuple(
+        rule
+        for rule in _QA_RULES.values()
+        if rule.flag is None or enabled.get(rule.flag, False)
+    )
+
+
 @dataclass(frozen=True, slots=True)
 class QAPanelItem:
     finding: QAFinding
@@ -56,6 +110,51 @@ class QANavigationPlan:
     status_message: str
 
 
+class QARowFindings:
+    """Findings of one file held per row, so an edit re-checks only the rows
+    it touched. Valid for the `(file, stamp)` of the last full scan; the
+    caller's stamp covers whatever else the findings depend on."""
+
+    def __init__(self) -> None:
+        self.file: Path | None = None
+        self.stamp: Hashable = None
+        self._by_row: dict[int, tuple[QAFinding, ...]] = {}
+        self._flat: tuple[QAFinding, ...] | None = ()
+
+    def matches(self, file: Path | None, stamp: Hashable) -> bool:
+        return file is not None and file == self.file and stamp == self.stamp
+
+    def reset(
+        self, file: Path | None, stamp: Hashable, findings: Iterable[QAFinding]
+    ) -> None:
+        self.file = file
+        self.stamp = stamp
+        self._by_row = {}
+        for finding in findings:
+            self._by_row.setdefault(finding.row, ())
+            self._by_row[finding.row] += (finding,)
+        self._flat = None
+
+    def clear(self) -> None:
+        self.reset(None, None, ())
+
+    def replace_rows(self, rows: Iterable[int], findings: Iterable[QAFinding]) -> None:
+        """Drop the findings of *rows* and store *findings* (for those rows)."""
+        for row in rows:
+            self._by_row.pop(row, None)
+        for finding in findings:
+            self._by_row.setdefault(finding.row, ())
+            self._by_row[finding.row] += (finding,)
+        self._flat = None
+
+    def findings(self) -> tuple[QAFinding, ...]:
+        if self._flat is None:
+            self._flat = tuple(
+                finding for row in sorted(self._by_row) for finding in self._by_row[row]
+            )
+        return self._flat
+
+
 @dataclass(frozen=True, slots=True)
 class QAService:
     def finding_label(self, *, finding: QAFinding, root: Path) -> str:
@@ -83,6 +182,7 @@ class QAService:
         check_newlines: bool,
         check_tokens: bool = False,
         check_same_as_source: bool = False,
+        on_rule: QARuleTiming | None = None,
     ) -> tuple[QAFinding, ...]:
         return scan_qa_rows(
             file=file,
@@ -91,11 +191,57 @@ class QAService:
             check_newlines=check_newlines,
             check_tokens=check_tokens,
             check_same_as_source=check_same_as_source,
+            on_rule=on_rule,
+        )
+
+    def rescan_rows(
+        self,
+        findings: QARowFindings,
+        *,
+        rows: Sequence[QAInputRow],
+        check_trailing: bool,
+        check_newlines: bool,
+        check_tokens: bool = False,
+        check_same_as_source: bool = False,
+        on_rule: QARuleTiming | None = None,
+    ) -> tuple[QAFinding, ...]:
+        return rescan_qa_rows(
+            findings,
+            rows=rows,
+            check_trailing=check_trailing,
+            check_newlines=check_newlines,
+            check_tokens=check_tokens,
+            check_same_as_source=check_same_as_source,
+            on_rule=on_rule,
         )
 
     def auto_mark_rows(self, findings: Sequence[QAFinding]) -> tuple[int, ...]:
         return build_auto_mark_rows(findings)
 
+    def merge_file_findings(
+        self, findings_by_file: Mapping[Path, Sequence[QAFinding]]
+    ) -> tuple[QAFinding, ...]:
+        return merge_qa_file_findings(findings_by_file)
+
+    def project_status_message(
+        self,
+        *,
+        files_done: int,
+        files_total: int,
+        cached_files: int,
+        findings: int,
+        failures: int = 0,
+        running: bool = False,
+    ) -> str:
+        return qa_project_status_message(
+            files_done=files_done,
+            files_total=files_total,
+            cached_files=cached_files,
+            findings=findings,
+            failures=failures,
+            running=running,
+        )
+
     def build_navigation_plan(
         self,
         *,
@@ -175,69 +321,83 @@ def scan_qa_rows(
     check_newlines: bool,
     check_tokens: bool,
     check_same_as_source: bool,
+    on_rule: QARuleTiming | None = None,
 ) -> tuple[QAFinding, ...]:
+    return run_qa_rules(
+        file=file,
+        rows=rows,
+        rules=compile_qa_rules(
+            check_trailing=check_trailing,
+            check_newlines=check_newlines,
+            check_tokens=check_tokens,
+            check_same_as_source=check_same_as_source,
+        ),
+        on_rule=on_rule,
+    )
+
+
+def run_qa_rules(
+    *,
+    file: Path,
+    rows: Sequence[QAInputRow],
+    rules: Sequence[QARule],
+    on_rule: QARuleTiming | None = None,
+) -> tuple[QAFinding, ...]:
+    """Apply *rules* rule by rule over *rows*; findings come back ordered by
+    row, then by rule registration order."""
     findings: list[QAFinding] = []
-    for row in rows:
-        if check_trailing and has_missing_trailing_fragment(
-            row.source_text,
-            row.target_text,
-        ):
-            findings.append(
-                QAFinding(
-                    file=file,
-                    row=row.row,
-                    code=QA_CODE_TRAILING,
-                    excerpt=_trailing_excerpt(row.source_text, row.target_text),
-                    severity="warning",
-                    group="format",
-                )
-            )
-        if check_newlines and has_newline_mismatch(row.source_text, row.target_text):
+    for rule in rules:
+        started = time.perf_counter() if on_rule is not None else 0.0
+        check = rule.check
+        hits = 0
+        for row in rows:
+            excerpt = check(row.source_text, row.target_text)
+            if excerpt is None:
+                continue
+            hits += 1
             findings.append(
                 QAFinding(
                     file=file,
                     row=row.row,
-                    code=QA_CODE_NEWLINES,
-                    excerpt=_newline_excerpt(row.source_text, row.target_text),
-                    severity="warning",
-                    group="format",
-                )
-            )
-        if check_tokens:
-            missing_tokens = missing_protected_tokens(
-                row.source_text,
-                row.target_text,
-            )
-            if missing_tokens:
-                findings.append(
-                    QAFinding(
-                        file=file,
-                        row=row.row,
-                        code=QA_CODE_TOKENS,
-                        excerpt=_tokens_excerpt(missing_tokens),
-                        severity="warning",
-                        group="format",
-                    )
-                )
-        if (
-            check_same_as_source
-            and row.source_text
-            and row.target_text
-            and same_as_source(row.source_text, row.target_text)
-        ):
-            findings.append(
-                QAFinding(
-                    file=file,
-                    row=row.row,
-                    code=QA_CODE_SAME_AS_SOURCE,
-                    excerpt="Translation equals source",
-                    severity="warning",
-                    group="content",
+                    code=rule.code,
+                    excerpt=excerpt,
+                    severity=rule.severity,
+                    group=rule.group,
                 )
             )
+        if on_rule is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            on_rule(rule.code, elapsed_ms, len(rows), hits)
+    findings.sort(key=lambda finding: finding.row)
     return tuple(findings)
 
 
+def rescan_qa_rows(
+    findings: QARowFindings,
+    *,
+    rows: Sequence[QAInputRow],
+    check_trailing: bool,
+    check_newlines: bool,
+    check_tokens: bool = False,
+    check_same_as_source: bool = False,
+    on_rule: QARuleTiming | None = None,
+) -> tuple[QAFinding, ...]:
+    """Re-check *rows* in place; returns the new findings of those rows."""
+    if findings.file is None:
+        return ()
+    fresh = scan_qa_rows(
+        file=findings.file,
+        rows=rows,
+        check_trailing=check_trailing,
+        check_newlines=check_newlines,
+        check_tokens=check_tokens,
+        check_same_as_source=check_same_as_source,
+        on_rule=on_rule,
+    )
+    findings.replace_rows((row.row for row in rows), fresh)
+    return fresh
+
+
 def build_auto_mark_rows(findings: Sequence[QAFinding]) -> tuple[int, ...]:
     rows: set[int] = set()
     for finding in findings:
@@ -247,6 +407,34 @@ def build_auto_mark_rows(findings: Sequence[QAFinding]) -> tuple[int, ...]:
     return tuple(sorted(rows))
 
 
+def merge_qa_file_findings(
+    findings_by_file: Mapping[Path, Sequence[QAFinding]],
+) -> tuple[QAFinding, ...]:
+    merged: list[QAFinding] = []
+    for path in sorted(findings_by_file, key=lambda item: item.as_posix()):
+        merged.extend(findings_by_file[path])
+    return tuple(merged)
+
+
+def qa_project_status_message(
+    *,
+    files_done: int,
+    files_total: int,
+    cached_files: int,
+    findings: int,
+    failures: int = 0,
+    running: bool = False,
+) -> str:
+    prefix = "Scanning locales" if running else "Locales scanned"
+    message = (
+        f"{prefix}: {files_done}/{files_total} files "
+        f"({cached_files} cached) · {findings} QA findings"
+    )
+    if failures:
+        message += f" · {failures} failed"
+    return message + ("..." if running else ".")
+
+
 def build_qa_navigation_plan(
     *,
     findings: Sequence[QAFinding],
@@ -300,12 +488,6 @@ def _trailing_excerpt(source_text: str, target_text: str) -> str:
     return f"S:{source_tail!r} T:{target_tail!r}"
 
 
-def _newline_excerpt(source_text: str, target_text: str) -> str:
-    source_nl = newline_count(source_text)
-    target_nl = newline_count(target_text)
-    return f"S newlines={source_nl}, T newlines={target_nl}"
-
-
 def _tokens_excerpt(tokens: Sequence[str]) -> str:
     counts = Counter(tokens)
     parts: list[str] = []
@@ -323,3 +505,41 @@ def _finding_sort_key(finding: QAFinding) -> tuple[str, int, str]:
         finding.row,
         finding.code,
     )
+
+
+def _check_trailing(source_text: str, target_text: str) -> str | None:
+    if not has_missing_trailing_fragment(source_text, target_text):
+        return None
+    return _trailing_excerpt(source_text, target_text)
+
+
+def _check_newlines(source_text: str, target_text: str) -> str | None:
+    source_nl = newline_count(source_text)
+    target_nl = newline_count(target_text)
+    if source_nl == target_nl:
+        return None
+    return f"S newlines={source_nl}, T newlines={target_nl}"
+
+
+def _check_tokens(source_text: str, target_text: str) -> str | None:
+    missing = missing_protected_tokens(source_text, target_text)
+    return _tokens_excerpt(missing) if missing else None
+
+
+def _check_same_as_source(source_text: str, target_text: str) -> str | None:
+    if source_text and target_text and same_as_source(source_text, target_text):
+        return "Translation equals source"
+    return None
+
+
+register_qa_rule(QARule(QA_CODE_TRAILING, _check_trailing, flag="trailing"))
+register_qa_rule(QARule(QA_CODE_NEWLINES, _check_newlines, flag="newlines"))
+register_qa_rule(QARule(QA_CODE_TOKENS, _check_tokens, flag="tokens"))
+register_qa_rule(
+    QARule(
+        QA_CODE_SAME_AS_SOURCE,
+        _check_same_as_source,
+        flag="same_source",
+        group="content",
+    )
+)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Literal
+
+# How often the worker reports progress; a row that runs longer than the
+# row budget shows up as silence on the pipe.
+_FLUSH_S = 0.05
+_FLUSH_ROWS = 256
+_START_TIMEOUT_S = 15.0
+
+
+@dataclass(frozen=True, slots=True)
+class RegexBudget:
+    # Per `run` call, i.e. per file for searches; a `for_query` view also
+    # stops once all of its calls together pass `total_s` (runaway patterns).
+    deadline_s: float = 2.0
+    row_s: float = 0.5
+    total_s: float = 30.0
+
+
+TimeoutReason = Literal["deadline", "row", "total"]
+_LIMITS: dict[str, str] = {
+    "row": "a single row",
+    "deadline": "the per-file deadline",
+    "total": "the search's total time cap",
+}
+
+
+class RegexTimeoutError(RuntimeError):
+    """A user regex ran out of budget; `partial` holds the results produced
+    before the worker was killed."""
+
+    def __init__(
+        self,
+        query: str,
+        *,
+        reason: TimeoutReason,
+        partial: list[tuple[int, Any]],
+        done: int,
+    ) -> None:
+        super().__init__(f"Regex {query!r} timed out ({_LIMITS[reason]} was exceeded).")
+        self.query = query
+        self.reason = reason
+        self.partial = partial
+        self.done = done
+
+
+def _serve(conn: Connection) -> None:
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        func, texts, kwargs = job
+        conn.send(("started", 0, []))
+        hits: list[tuple[int, Any]] = []
+        last = time.monotonic()
+        try:
+            for index, text in enumerate(texts):
+                result = func(text, **kwargs)
+                if result is not None:
+                    hits.append((index, result))
+                now = time.monotonic()
+                if now - last >= _FLUSH_S or (index + 1) % _FLUSH_ROWS == 0:
+                    conn.send(("rows", index + 1, hits))
+                    hits = []
+                    last = now
+        except Exception as exc:
+            conn.send(("error", 0, RuntimeError(f"{type(exc).__name__}: {exc}")))
+            continue
+        conn.send(("done", len(texts), hits))
+
+
+class _Worker:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._process: Any = None
+        self._conn: Connection | None = None
+
+    def connect(self) -> Connection:
+        if self._conn is not None and self._process.is_alive():
+            return self._conn
+        self.kill()
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=_serve, args=(child,), name="tzp-regex", daemon=True
+        )
+        process.start()
+        child.close()
+        self._process, self._conn = process, parent
+        return parent
+
+    def kill(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(timeout=1.0)
+            self._process = None
+
+    def stop(self) -> None:
+        if self._conn is not None:
+            with contextlib.suppress(OSError):
+                self._conn.send(None)
+            if self._process is not None:
+                self._process.join(timeout=0.5)
+        self.kill()
+
+
+class RegexGuard:
+    """Runs user regex work in a worker process that is killed once it runs
+    past its budget, so a catastrophically backtracking pattern cannot hang
+    the caller.
+
+    Each `run` call gets the full per-call deadline; a view from `for_query`
+    also caps the time of all its calls together, so a search over many
+    files is not cut short by its scope while a runaway pattern still stops.
+    Only time spent matching counts, not worker start-up or transfer.
+    """
+
+    def __init__(self, budget: RegexBudget | None = None) -> None:
+        self.budget = budget or RegexBudget()
+        self._worker = _Worker()
+        self._spent: float | None = None
+
+    def for_query(self) -> RegexGuard:
+        view = RegexGuard.__new__(RegexGuard)
+        view.budget = self.budget
+        view._worker = self._worker
+        view._spent = 0.0
+        return view
+
+    def run(
+        self,
+        query: str,
+        func: Callable[..., Any],
+        texts: Sequence[str],
+        /,
+        **kwargs: Any,
+    ) -> list[tuple[int, Any]]:
+        """`func(text, **kwargs)` for every text in the worker; returns
+        `(index, result)` for results that are not None.
+
+        *func* must be a module-level function. Raises `RegexTimeoutError`
+        when the budget runs out and re-raises errors from *func* as
+        `RuntimeError`.
+        """
+        if not texts:
+            return []
+        with self._worker.lock:
+            allowance = self.budget.deadline_s
+            capped = False
+            if self._spent is not None:
+                left = self.budget.total_s - self._spent
+                if left <= 0:
+                    raise RegexTimeoutError(query, reason="total", partial=[], done=0)
+                capped = left < allowance
+                allowance = min(allowance, left)
+            conn = self._worker.connect()
+            try:
+                conn.send((func, list(texts), kwargs))
+                if not conn.poll(_START_TIMEOUT_S):
+                    raise TimeoutError("regex worker did not start")
+                conn.recv()
+            except BaseException:
+                self._worker.kill()
+                raise
+            started = time.monotonic()
+            hits: list[tuple[int, Any]] = []
+            done = 0
+            try:
+                while True:
+                    remaining = started + allowance - time.monotonic()
+                    wait = min(remaining, self.budget.row_s)
+                    if wait <= 0 or not conn.poll(wait):
+                        self._worker.kill()
+                        reason: TimeoutReason = "row"
+                        if remaining <= self.budget.row_s:
+                            reason = "total" if capped else "deadline"
+                        raise RegexTimeoutError(
+                            query, reason=reason, partial=hits, done=done
+                        )
+                    kind, done, payload = conn.recv()
+                    if kind == "error":
+                        raise payload
+                    hits.extend(payload)
+                    if kind == "done":
+                        return hits
+            except (EOFError, OSError):
+                self._worker.kill()
+                raise
+            finally:
+                if self._spent is not None:
+                    self._spent += time.monotonic() - started
+
+    def shutdown(self) -> None:
+        with self._worker.lock:
+            self._worker.stop()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import xxhash
+
+from .app_config import load as _load_app_config
+from .atomic_io import write_bytes_atomic
+
+_FILENAME = "row_heights.bin"
+_MAGIC = b"RHC1"
+_HEADER = struct.Struct("<4sI")
+_LAYOUT = struct.Struct("<HI")
+_RECORD = struct.Struct("<QHH")
+# Heights are measured at the bucket's lower edge, so a cached height never
+# has fewer lines than the exact width would need.
+WIDTH_STEP = 8
+_MAX_HEIGHT = 0xFFFF
+
+
+def width_bucket(width: int) -> int:
+    return max(0, int(width)) // WIDTH_STEP * WIDTH_STEP
+
+
+def text_hash(text: str) -> int:
+    return int(xxhash.xxh64_intdigest(text.encode("utf-8", "surrogatepass")))
+
+
+class RowHeightStore:
+    """Measured text heights keyed by (text hash, width bucket) per layout key
+    (font and layout-affecting options), kept across files and sessions.
+
+    Least recently stored entries are dropped past *max_entries*; `flush`
+    writes the store back when it changed.
+    """
+
+    def __init__(self, path: Path | None, *, max_entries: int = 200_000) -> None:
+        self._path = path
+        self.max_entries = max(1, int(max_entries))
+        self._layouts: dict[str, dict[tuple[int, int], int]] = {}
+        self._count = 0
+        self._dirty = False
+        if path is not None:
+            self._load(path)
+
+    @classmethod
+    def for_root(cls, root: Path, *, max_entries: int = 200_000) -> RowHeightStore:
+        cfg = _load_app_config(root)
+        return cls(root / cfg.cache_dir / _FILENAME, max_entries=max_entries)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, layout: str, text: str, bucket: int) -> int | None:
+        heights = self._layouts.get(layout)
+        if heights is None:
+            return None
+        return heights.get((text_hash(text), bucket))
+
+    def put(self, layout: str, text: str, bucket: int, height: int) -> None:
+        heights = self._layouts.setdefault(layout, {})
+        key = (text_hash(text), bucket)
+        # Re-inserted so dict order stays least recently stored first.
+        if heights.pop(key, None) is None:
+            self._count += 1
+        heights[key] = max(0, min(_MAX_HEIGHT, int(height)))
+        self._dirty = True
+        while self._count > self.max_entries:
+            self._evict_oldest()
+
+    def clear(self) -> None:
+        self._layouts.clear()
+        self._count = 0
+        self._dirty = True
+
+    def flush(self) -> None:
+        if not self._dirty or self._path is None:
+            return
+        parts = [_HEADER.pack(_MAGIC, len(self._layouts))]
+        for layout, heights in self._layouts.items():
+            name = layout.encode("utf-8")
+            parts.append(_LAYOUT.pack(len(name), len(heights)))
+            parts.append(name)
+            parts.extend(
+                _RECORD.pack(digest, bucket, height)
+                for (digest, bucket), height in heights.items()
+            )
+        try:
+            write_bytes_atomic(self._path, b"".join(parts))
+        except OSError:
+            return
+        self._dirty = False
+
+    def _evict_oldest(self) -> None:
+        # Layouts are few; the first one's first key is the oldest of it.
+        for layout, heights in self._layouts.items():
+            if heights:
+                heights.pop(next(iter(heights)))
+                self._count -= 1
+            if not heights:
+                del self._layouts[layout]
+            return
+
+    def _load(self, path: Path) -> None:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return
+        try:
+            magic, layouts = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC:
+                return
+            offset = _HEADER.size
+            loaded: dict[str, dict[tuple[int, int], int]] = {}
+            for _ in range(layouts):
+                name_len, count = _LAYOUT.unpack_from(data, offset)
+                offset += _LAYOUT.size
+                layout = data[offset : offset + name_len].decode("utf-8")
+                offset += name_len
+                heights = loaded.setdefault(layout, {})
+                for digest, bucket, height in _RECORD.iter_unpack(
+                    data[offset : offset + count * _RECORD.size]
+                ):
+                    heights[(digest, bucket)] = height
+                offset += count * _RECORD.size
+        except (struct.error, UnicodeDecodeError):
+            return
+        self._layouts = loaded
+        self._count = sum(len(heights) for heights in loaded.values())
+        while self._count > self.max_entries:
+            self._evict_oldest()
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import enum
 import re
-from collections.abc import Iterable
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
+from .regex_guard import RegexGuard, RegexTimeoutError
+
 
 class SearchField(enum.IntEnum):
     KEY = 0
@@ -29,6 +33,85 @@ class Match:
     preview: str = ""
 
 
+class SearchRowColumns:
+    """One file's search rows stored column-wise.
+
+    The file path is kept once instead of per row, and lower-cased shadows of
+    a column are built on first case-insensitive use, so repeated scans skip
+    `str.lower()` per row. Iterating yields plain `SearchRow`s.
+    """
+
+    __slots__ = ("path", "rows", "keys", "sources", "values", "nbytes", "_lowered")
+
+    def __init__(
+        self,
+        path: Path,
+        rows: Iterable[int],
+        keys: list[str],
+        sources: list[str],
+        values: list[str],
+    ) -> None:
+        self.path = path
+        self.rows = array("q", rows)
+        self.keys = keys
+        self.sources = sources
+        self.values = values
+        self._lowered: dict[SearchField, list[str]] = {}
+        text_bytes = sum(
+            sys.getsizeof(text) for column in (keys, sources, values) for text in column
+        )
+        # Budget for the text, the lists and worst-case lower-cased shadows.
+        self.nbytes = (
+            2 * text_bytes + 4 * 8 * len(keys) + self.rows.itemsize * len(self.rows)
+        )
+
+    @classmethod
+    def from_rows(cls, path: Path, rows: Iterable[SearchRow]) -> SearchRowColumns:
+        ids: list[int] = []
+        keys: list[str] = []
+        sources: list[str] = []
+        values: list[str] = []
+        for row in rows:
+            ids.append(row.row)
+            keys.append(row.key)
+            sources.append(row.source)
+            values.append(row.value)
+        return cls(path, ids, keys, sources, values)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[SearchRow]:
+        for position in range(len(self.keys)):
+            yield self.row_at(position)
+
+    def __getitem__(self, position: int) -> SearchRow:
+        return self.row_at(position)
+
+    def row_at(self, position: int) -> SearchRow:
+        return SearchRow(
+            self.path,
+            self.rows[position],
+            self.keys[position],
+            self.sources[position],
+            self.values[position],
+        )
+
+    def column(self, field: SearchField) -> list[str]:
+        if field is SearchField.KEY:
+            return self.keys
+        if field is SearchField.SOURCE:
+            return self.sources
+        return self.values
+
+    def lowered(self, field: SearchField) -> list[str]:
+        shadow = self._lowered.get(field)
+        if shadow is None:
+            shadow = [(text or "").lower() for text in self.column(field)]
+            self._lowered[field] = shadow
+        return shadow
+
+
 def _matches_literal(text: str, query: str) -> bool:
     if query in text:
         return True
@@ -46,6 +129,25 @@ def _matches_literal(text: str, query: str) -> bool:
     return True
 
 
+def refines_literal_query(previous: str, query: str) -> bool:
+    """True when every text matching literal *query* also matches *previous*.
+
+    Both queries are compared as `iter_matches` sees them (lower-cased unless
+    case-sensitive). Whitespace in *previous* enables phrase mode, so only a
+    plain extension of it keeps the subset guarantee.
+    """
+    if not previous or previous not in query:
+        return False
+    parts = previous.split()
+    if parts == [previous]:
+        return True
+    return (
+        query.startswith(previous)
+        and len(parts) >= 2
+        and sum(len(part) for part in parts) >= 4
+    )
+
+
 def _find_literal_span(text: str, query: str) -> tuple[int, int]:
     if not text:
         return (0, 0)
@@ -102,7 +204,37 @@ def iter_matches(
     case_sensitive: bool = False,
     include_preview: bool = False,
     preview_chars: int = 96,
+    regex_guard: RegexGuard | None = None,
 ) -> Iterable[Match]:
+    for _position, match in iter_match_positions(
+        rows,
+        query,
+        field,
+        is_regex,
+        case_sensitive=case_sensitive,
+        include_preview=include_preview,
+        preview_chars=preview_chars,
+        regex_guard=regex_guard,
+    ):
+        yield match
+
+
+def iter_match_positions(
+    rows: Iterable[SearchRow],
+    query: str,
+    field: SearchField,
+    is_regex: bool,
+    *,
+    case_sensitive: bool = False,
+    include_preview: bool = False,
+    preview_chars: int = 96,
+    regex_guard: RegexGuard | None = None,
+) -> Iterator[tuple[int, Match]]:
+    """`iter_matches` that also yields each match's position in *rows*.
+
+    With *regex_guard*, regex queries run in its worker; on timeout the
+    matches found so far are yielded before `RegexTimeoutError` is raised.
+    """
     if not query:
         return
     if is_regex:
@@ -120,7 +252,51 @@ def iter_matches(
         if not case_sensitive:
             query_text = query.lower()
 
-    for row in rows:
+    if matcher is not None and regex_guard is not None:
+        yield from _iter_guarded_positions(
+            rows,
+            query,
+            field,
+            matcher,
+            regex_guard,
+            include_preview=include_preview,
+            preview_chars=preview_chars,
+        )
+        return
+
+    if isinstance(rows, SearchRowColumns):
+        texts = rows.column(field)
+        targets = texts if matcher or case_sensitive else rows.lowered(field)
+        path = rows.path
+        ids = rows.rows
+        for position, text in enumerate(texts):
+            text = text or ""
+            if matcher:
+                hit = matcher.search(text)
+                if not hit:
+                    continue
+                preview = ""
+                if include_preview:
+                    preview = _build_preview(
+                        text,
+                        start=hit.start(),
+                        length=max(1, hit.end() - hit.start()),
+                        width=preview_chars,
+                    )
+                yield position, Match(path, ids[position], preview)
+                continue
+            target = targets[position]
+            if _matches_literal(target, query_text):
+                preview = ""
+                if include_preview:
+                    start, length = _find_literal_span(target, query_text)
+                    preview = _build_preview(
+                        text, start=start, length=length, width=preview_chars
+                    )
+                yield position, Match(path, ids[position], preview)
+        return
+
+    for position, row in enumerate(rows):
         if field is SearchField.KEY:
             text = row.key
         elif field is SearchField.SOURCE:
@@ -139,7 +315,7 @@ def iter_matches(
                         length=max(1, hit.end() - hit.start()),
                         width=preview_chars,
                     )
-                yield Match(row.file, row.row, preview)
+                yield position, Match(row.file, row.row, preview)
         else:
             target = text if case_sensitive else text.lower()
             if _matches_literal(target, query_text):
@@ -152,7 +328,56 @@ def iter_matches(
                         length=length,
                         width=preview_chars,
                     )
-                yield Match(row.file, row.row, preview)
+                yield position, Match(row.file, row.row, preview)
+
+
+def _regex_span(text: str, *, matcher: re.Pattern[str]) -> tuple[int, int] | None:
+    hit = matcher.search(text or "")
+    return hit.span() if hit else None
+
+
+def _iter_guarded_positions(
+    rows: Iterable[SearchRow],
+    query: str,
+    field: SearchField,
+    matcher: re.Pattern[str],
+    regex_guard: RegexGuard,
+    *,
+    include_preview: bool,
+    preview_chars: int,
+) -> Iterator[tuple[int, Match]]:
+    indexed: SearchRowColumns | list[SearchRow]
+    if isinstance(rows, SearchRowColumns):
+        indexed = rows
+        texts = rows.column(field)
+    else:
+        indexed = list(rows)
+        texts = [
+            (
+                row.key
+                if field is SearchField.KEY
+                else row.source if field is SearchField.SOURCE else row.value
+            )
+            for row in indexed
+        ]
+    timeout: RegexTimeoutError | None = None
+    try:
+        hits = regex_guard.run(query, _regex_span, texts, matcher=matcher)
+    except RegexTimeoutError as exc:
+        hits, timeout = exc.partial, exc
+    for position, (start, end) in hits:
+        row = indexed[position]
+        preview = ""
+        if include_preview:
+            preview = _build_preview(
+                texts[position] or "",
+                start=start,
+                length=max(1, end - start),
+                width=preview_chars,
+            )
+        yield position, Match(row.file, row.row, preview)
+    if timeout is not None:
+        raise timeout
 
 
 def search(
@@ -164,6 +389,7 @@ def search(
     case_sensitive: bool = False,
     include_preview: bool = False,
     preview_chars: int = 96,
+    regex_guard: RegexGuard | None = None,
 ) -> list[Match]:
     return list(
         iter_matches(
@@ -174,5 +400,6 @@ def search(
             case_sensitive=case_sensitive,
             include_preview=include_preview,
             preview_chars=preview_chars,
+            regex_guard=regex_guard,
         )
     )
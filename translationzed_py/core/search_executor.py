@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .search import Match
+
+
+class SearchRun:
+    """Matches of one multi-file search, produced on a worker thread.
+
+    The owner drains `take()` from its own thread; the worker stops when the
+    run is cancelled or `limit` matches are in.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self.count = 0
+        self.truncated = False
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: list[Match] = []
+        self._future: Future[None] = Future()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def error(self) -> BaseException | None:
+        if not self._future.done() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+    def take(self) -> list[Match]:
+        with self._lock:
+            out, self._pending = self._pending, []
+        return out
+
+    def _run(
+        self,
+        files: Sequence[Path],
+        iter_matches_for_file: Callable[[Path], Iterable[Match]],
+    ) -> None:
+        for path in files:
+            if self._cancel.is_set():
+                return
+            for match in iter_matches_for_file(path):
+                if self._cancel.is_set():
+                    return
+                with self._lock:
+                    self._pending.append(match)
+                    self.count += 1
+                if self.count >= self.limit:
+                    self.truncated = True
+                    return
+
+    def _execute(
+        self,
+        files: Sequence[Path],
+        iter_matches_for_file: Callable[[Path], Iterable[Match]],
+    ) -> None:
+        if not self._future.set_running_or_notify_cancel():
+            return
+        try:
+            self._run(files, iter_matches_for_file)
+        except BaseException as exc:
+            self._future.set_exception(exc)
+        else:
+            self._future.set_result(None)
+
+
+class SearchExecutor:
+    """Runs one search at a time off the caller's thread; starting a new run
+    cancels the previous one."""
+
+    def __init__(self) -> None:
+        self._pool: ThreadPoolExecutor | None = None
+        self._run: SearchRun | None = None
+
+    @property
+    def current(self) -> SearchRun | None:
+        return self._run
+
+    def start(
+        self,
+        files: Sequence[Path],
+        iter_matches_for_file: Callable[[Path], Iterable[Match]],
+        *,
+        limit: int,
+        synchronous: bool = False,
+    ) -> SearchRun:
+        self.cancel()
+        run = SearchRun(limit)
+        self._run = run
+        if synchronous:
+            run._execute(tuple(files), iter_matches_for_file)
+            return run
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tzp-search"
+            )
+        self._pool.submit(run._execute, tuple(files), iter_matches_for_file)
+        return run
+
+    def cancel(self) -> None:
+        if self._run is not None:
+            self._run.cancel()
+            self._run = None
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
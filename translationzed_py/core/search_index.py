@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+
+from translationzed_py.core.app_config import load as _load_app_config
+from translationzed_py.core.model import Entry
+from translationzed_py.core.search import SearchField, SearchRow
+from translationzed_py.core.status_cache import (
+    add_write_listener,
+    cache_path,
+    remove_write_listener,
+)
+
+_DB_FILENAME = "search_index.sqlite"
+_SCHEMA_VERSION = 1
+# FTS5 trigram phrases shorter than this never match.
+_TRIGRAM_MIN_LEN = 3
+_FIELD_COLUMNS = {
+    SearchField.KEY: "key",
+    SearchField.SOURCE: "source",
+    SearchField.TRANSLATION: "value",
+}
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+# (file mtime_ns, file size, status-cache mtime_ns or 0, source path, source mtime_ns)
+_Stamp = tuple[int, int, int, str, int]
+
+
+def _mtime_ns(path: Path | None) -> int:
+    if path is None:
+        return 0
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _stamp(root: Path, path: Path, source_path: Path | None) -> _Stamp | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (
+        stat.st_mtime_ns,
+        stat.st_size,
+        _mtime_ns(cache_path(root, path)),
+        "" if source_path is None else str(source_path),
+        _mtime_ns(source_path),
+    )
+
+
+def _regex_literals(pattern: str) -> list[str]:
+    """Literal runs every match of *pattern* must contain; empty when unsure."""
+    if "|" in pattern or "(?" in pattern:
+        return []
+    runs: list[str] = []
+    run: list[str] = []
+    depth = 0
+    pos = 0
+
+    def _flush() -> None:
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    while pos < len(pattern):
+        ch = pattern[pos]
+        if ch not in _REGEX_META:
+            if depth == 0:
+                run.append(ch)
+            else:
+                _flush()
+            pos += 1
+            continue
+        if ch in "*?{" and run:
+            # The quantified character is optional.
+            run.pop()
+        _flush()
+        if ch == "\\":
+            pos += 2
+        elif ch == "[":
+            pos += 2 if pattern[pos + 1 : pos + 2] == "^" else 1
+            # The first member may be a literal "]".
+            pos += 2 if pattern[pos : pos + 1] == "\\" else 1
+            while pos < len(pattern) and pattern[pos] != "]":
+                pos += 2 if pattern[pos] == "\\" else 1
+            pos += 1
+        elif ch == "{":
+            end = pattern.find("}", pos)
+            pos = len(pattern) if end < 0 else end + 1
+        else:
+            depth += 1 if ch == "(" else -1 if ch == ")" else 0
+            pos += 1
+    _flush()
+    return runs
+
+
+def _query_terms(query: str, use_regex: bool) -> list[str]:
+    terms = _regex_literals(query) if use_regex else query.split()
+    return [term for term in terms if len(term) >= _TRIGRAM_MIN_LEN]
+
+
+class SearchIndex:
+    """Key/source/translation rows of project files, persisted under the cache dir.
+
+    Files are re-indexed when their stamps (file, status cache, source file)
+    change; status-cache writes update translations in place. Queries use a
+    trigram prefilter and return candidate rows that callers still verify.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        cfg = _load_app_config(root)
+        self._path = root / cfg.cache_dir / _DB_FILENAME
+        self._lock = threading.RLock()
+        # Panel workers and F3 navigation may sync concurrently; one at a time
+        # so a file is parsed once.
+        self._sync_lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._fts = False
+        self._configure()
+        self._files: dict[str, tuple[int, _Stamp]] = {}
+        for file_id, path, *stamp in self._conn.execute(
+            "SELECT id, path, mtime_ns, size, cache_mtime_ns, source_path, "
+            "source_mtime_ns FROM files"
+        ):
+            self._files[path] = (file_id, tuple(stamp))
+        add_write_listener(self.on_cache_write)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        remove_write_listener(self.on_cache_write)
+        with self._lock:
+            self._conn.close()
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM files")
+        self._files.clear()
+
+    def is_current(self, path: Path, source_path: Path | None) -> bool:
+        known = self._files.get(self._key(path))
+        return known is not None and known[1] == _stamp(self._root, path, source_path)
+
+    def sync(
+        self,
+        files: Iterable[Path],
+        *,
+        source_for: Callable[[Path], Path | None],
+        load_rows: Callable[[Path], Iterable[SearchRow]],
+    ) -> int:
+        """Re-index files whose stamps changed; returns the number re-indexed."""
+        indexed = 0
+        with self._sync_lock:
+            for path in files:
+                source_path = source_for(path)
+                stamp = _stamp(self._root, path, source_path)
+                key = self._key(path)
+                known = self._files.get(key)
+                if stamp is None:
+                    if known is not None:
+                        self._replace(key, None, ())
+                    continue
+                if known is not None and known[1] == stamp:
+                    continue
+                self._replace(key, stamp, load_rows(path))
+                indexed += 1
+        return indexed
+
+    def rows(self, path: Path) -> list[SearchRow] | None:
+        known = self._files.get(self._key(path))
+        if known is None:
+            return None
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT position, key, source, value FROM entries "
+                "WHERE file_id = ? ORDER BY position",
+                (known[0],),
+            ).fetchall()
+        return [
+            SearchRow(path, row, key, source, value)
+            for row, key, source, value in found
+        ]
+
+    def lookup(
+        self,
+        files: Sequence[Path],
+        *,
+        query: str,
+        field: SearchField,
+        use_regex: bool,
+    ) -> Callable[[Path], Sequence[SearchRow] | None]:
+        """Per-file candidate rows for *query*; None for files not indexed,
+        or re-indexed or updated since the lookup was taken.
+
+        Candidates are a superset of the matches (trigram prefilter), so
+        callers verify them with `search.iter_matches`.
+        """
+        with self._lock:
+            # Ids are reused after a re-index, so staleness compares id and stamp.
+            taken = {key: self._files.get(key) for key in map(self._key, files)}
+            candidates = self._candidates(files, query, field, use_regex)
+
+        def _rows_for(path: Path) -> Sequence[SearchRow] | None:
+            key = self._key(path)
+            known = self._files.get(key)
+            if known is None or known != taken.get(key):
+                return None
+            if candidates is None:
+                return self.rows(path)
+            return candidates.get(path, ())
+
+        return _rows_for
+
+    def fresh_rows(
+        self,
+        path: Path,
+        source_path: Path | None,
+        *,
+        query: str,
+        field: SearchField,
+        use_regex: bool,
+    ) -> Sequence[SearchRow] | None:
+        """Candidate rows of one file without waiting or syncing.
+
+        None when the file is not indexed, its stamp is stale, or a sync
+        holds the index; callers then read the file themselves.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if not self.is_current(path, source_path):
+                return None
+            candidates = self._candidates((path,), query, field, use_regex)
+            if candidates is None:
+                return self.rows(path)
+            return candidates.get(path, ())
+        finally:
+            self._lock.release()
+
+    def on_cache_write(
+        self, root: Path, file_path: Path, entries: Sequence[Entry] | None
+    ) -> None:
+        if root != self._root:
+            return
+        key = self._key(file_path)
+        known = self._files.get(key)
+        if known is None:
+            return
+        if entries is None:
+            # The cache was restored; the next sync re-indexes the file.
+            self._replace(key, None, ())
+            return
+        file_id, old = known
+        stamp = _stamp(self._root, file_path, Path(old[3]) if old[3] else None)
+        with self._lock:
+            current = self._conn.execute(
+                "SELECT id, value FROM entries WHERE file_id = ? ORDER BY position",
+                (file_id,),
+            ).fetchall()
+        if stamp is None or len(current) != len(entries):
+            # Rows no longer line up with the file; the next sync re-indexes it.
+            self._replace(key, None, ())
+            return
+        changed = [
+            (entry.value or "", row_id)
+            for (row_id, value), entry in zip(current, entries, strict=True)
+            if (entry.value or "") != value
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE entries SET value = ? WHERE id = ?", changed)
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, cache_mtime_ns = ? "
+                "WHERE id = ?",
+                (*stamp[:3], file_id),
+            )
+        self._files[key] = (file_id, stamp)
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self._root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _candidates(
+        self,
+        files: Sequence[Path],
+        query: str,
+        field: SearchField,
+        use_regex: bool,
+    ) -> dict[Path, list[SearchRow]] | None:
+        terms = _query_terms(query, use_regex)
+        if not (terms and self._fts):
+            return None
+        column = _FIELD_COLUMNS[field]
+        match = " AND ".join(
+            f'{column} : "{term.replace(chr(34), chr(34) * 2)}"' for term in terms
+        )
+        scoped = {self._key(path): path for path in files}
+        # One-file lookups filter in SQL instead of reading every file's hits.
+        only_file = "AND files.path = ?" if len(scoped) == 1 else ""
+        params = (match, *scoped) if only_file else (match,)
+        out: dict[Path, list[SearchRow]] = {}
+        with self._lock:
+            try:
+                found = self._conn.execute(
+                    f"""
+                    SELECT files.path, entries.position, entries.key, entries.source, entries.value
+                    FROM entries_fts
+                    JOIN entries ON entries.id = entries_fts.rowid
+                    JOIN files ON files.id = entries.file_id
+                    WHERE entries_fts MATCH ? {only_file}
+                    ORDER BY entries.file_id, entries.position
+                    """,
+                    params,
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return None
+        for key, row, row_key, source, value in found:
+            path = scoped.get(key)
+            if path is not None:
+                out.setdefault(path, []).append(
+                    SearchRow(path, row, row_key, source, value)
+                )
+        return out
+
+    def _replace(
+        self, key: str, stamp: _Stamp | None, rows: Iterable[SearchRow]
+    ) -> None:
+        # Rows are materialized first so the lock is not held while parsing.
+        values = [(row.row, row.key, row.source, row.value) for row in rows]
+        with self._lock:
+            known = self._files.pop(key, None)
+            with self._conn:
+                if known is not None:
+                    self._conn.execute(
+                        "DELETE FROM entries WHERE file_id = ?", (known[0],)
+                    )
+                    self._conn.execute("DELETE FROM files WHERE id = ?", (known[0],))
+                if stamp is None:
+                    return
+                file_id = self._conn.execute(
+                    "INSERT INTO files(path, mtime_ns, size, cache_mtime_ns, "
+                    "source_path, source_mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, *stamp),
+                ).lastrowid
+                assert file_id is not None
+                self._conn.executemany(
+                    "INSERT INTO entries(file_id, position, key, source, value) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ((file_id, *value) for value in values),
+                )
+            self._files[key] = (file_id, stamp)
+
+    def _configure(self) -> None:
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS entries_fts")
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute("""
+                    CREATE TABLE files (
+                        id INTEGER PRIMARY KEY,
+                        path TEXT NOT NULL UNIQUE,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        cache_mtime_ns INTEGER NOT NULL,
+                        source_path TEXT NOT NULL,
+                        source_mtime_ns INTEGER NOT NULL
+                    )
+                    """)
+                conn.execute("""
+                    CREATE TABLE entries (
+                        id INTEGER PRIMARY KEY,
+                        file_id INTEGER NOT NULL,
+                        position INTEGER NOT NULL,
+                        key TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        value TEXT NOT NULL
+                    )
+                    """)
+                conn.execute("CREATE INDEX entries_file ON entries(file_id, position)")
+                with contextlib.suppress(sqlite3.OperationalError):
+                    conn.execute("""
+                        CREATE VIRTUAL TABLE entries_fts USING fts5(
+                            key,
+                            source,
+                            value,
+                            content='entries',
+                            content_rowid='id',
+                            tokenize='trigram'
+                        )
+                        """)
+                conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self._fts = (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                ("entries_fts",),
+            ).fetchone()
+            is not None
+        )
+        if not self._fts:
+            return
+        # SQLite builds without FTS5/trigram keep the rows and scan them instead.
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_ai AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts(rowid, key, source, value)
+                VALUES (new.id, new.key, new.source, new.value);
+            END
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_ad AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, key, source, value)
+                VALUES ('delete', old.id, old.key, old.source, old.value);
+            END
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_au AFTER UPDATE OF value ON entries
+            BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, key, source, value)
+                VALUES ('delete', old.id, old.key, old.source, old.value);
+                INSERT INTO entries_fts(rowid, key, source, value)
+                VALUES (new.id, new.key, new.source, new.value);
+            END
+            """)
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import contextlib
 import re
 import sys
-from collections.abc import Callable, Iterable, Mapping, Sequence
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
 from .model import Entry, Status
-from .search import Match, SearchField, SearchRow, iter_matches
+from .regex_guard import RegexGuard, RegexTimeoutError
+from .search import (
+    Match,
+    SearchField,
+    SearchRow,
+    SearchRowColumns,
+    iter_match_positions,
+    iter_matches,
+    refines_literal_query,
+)
 from .status_cache import CacheEntry
 
 if TYPE_CHECKING:
@@ -57,6 +70,26 @@ class ReplaceAllFileApplyResult:
     changed_any: bool
 
 
+@dataclass(frozen=True, slots=True)
+class ReplaceAllFileDiff:
+    """Dry-run result of replace-all in one file: the rewritten entries plus
+    what changed, ready to be written as one cache update."""
+
+    path: Path
+    count: int
+    entries: tuple[Entry, ...]
+    changed_keys: frozenset[str]
+    original_values: Mapping[str, str]
+    samples: tuple[tuple[str, str, str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ReplaceAllBatchCallbacks:
+    write_cache: Callable[[Path, Iterable[Entry], set[str], Mapping[str, str]], object]
+    snapshot: Callable[[Path], object]
+    restore: Callable[[object], object]
+
+
 @dataclass(frozen=True, slots=True)
 class ReplaceAllRowsCallbacks:
     row_count: Callable[[], int]
@@ -182,6 +215,69 @@ class SearchMatchApplyPlan:
     target_column: int
 
 
+class SearchRefinementMemo:
+    """Rows matched by the last literal search, per file.
+
+    When the next query refines the previous one (`refines_literal_query`),
+    its matches are a subset of those rows, so only they are re-checked.
+    Entries are tied to a caller-provided stamp of the file's row data.
+    """
+
+    def __init__(self, *, max_files: int = 512, max_rows: int = 5000) -> None:
+        self._max_files = max(1, int(max_files))
+        self._max_rows = max(0, int(max_rows))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            Path, tuple[tuple[SearchField, bool, Hashable], str, tuple[SearchRow, ...]]
+        ] = OrderedDict()
+
+    def rows(
+        self,
+        path: Path,
+        *,
+        query: str,
+        field: SearchField,
+        case_sensitive: bool,
+        stamp: Hashable,
+    ) -> tuple[SearchRow, ...] | None:
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+        key, previous, rows = entry
+        if key != (field, case_sensitive, stamp):
+            return None
+        if not refines_literal_query(previous, _query_text(query, case_sensitive)):
+            return None
+        return rows
+
+    def store(
+        self,
+        path: Path,
+        rows: Sequence[SearchRow],
+        *,
+        query: str,
+        field: SearchField,
+        case_sensitive: bool,
+        stamp: Hashable,
+    ) -> None:
+        with self._lock:
+            self._entries.pop(path, None)
+            if len(rows) > self._max_rows:
+                return
+            self._entries[path] = (
+                (field, case_sensitive, stamp),
+                _query_text(query, case_sensitive),
+                tuple(rows),
+            )
+            while len(self._entries) > self._max_files:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 @dataclass(frozen=True, slots=True)
 class SearchReplaceService:
     def scope_files(
@@ -214,6 +310,7 @@ class SearchReplaceService:
         start_row: int,
         direction: int,
         case_sensitive: bool,
+        regex_guard: RegexGuard | None = None,
     ) -> Match | None:
         return find_match_in_rows(
             rows,
@@ -223,6 +320,57 @@ class SearchReplaceService:
             start_row=start_row,
             direction=direction,
             case_sensitive=case_sensitive,
+            regex_guard=regex_guard,
+        )
+
+    def refined_search_rows(
+        self,
+        memo: SearchRefinementMemo,
+        path: Path,
+        *,
+        query: str,
+        field: SearchField,
+        use_regex: bool,
+        case_sensitive: bool,
+        stamp: Hashable | None,
+    ) -> tuple[SearchRow, ...] | None:
+        return refined_search_rows(
+            memo,
+            path,
+            query=query,
+            field=field,
+            use_regex=use_regex,
+            case_sensitive=case_sensitive,
+            stamp=stamp,
+        )
+
+    def iter_refining_matches(
+        self,
+        memo: SearchRefinementMemo,
+        rows: Iterable[SearchRow],
+        *,
+        path: Path,
+        query: str,
+        field: SearchField,
+        use_regex: bool,
+        case_sensitive: bool,
+        stamp: Hashable | None,
+        include_preview: bool = False,
+        preview_chars: int = 96,
+        regex_guard: RegexGuard | None = None,
+    ) -> Iterator[Match]:
+        return iter_refining_matches(
+            memo,
+            rows,
+            path=path,
+            query=query,
+            field=field,
+            use_regex=use_regex,
+            case_sensitive=case_sensitive,
+            stamp=stamp,
+            include_preview=include_preview,
+            preview_chars=preview_chars,
+            regex_guard=regex_guard,
         )
 
     def search_across_files(
@@ -320,11 +468,13 @@ class SearchReplaceService:
         row: int,
         request: ReplaceRequest,
         callbacks: ReplaceCurrentRowCallbacks,
+        regex_guard: RegexGuard | None = None,
     ) -> bool:
         return apply_replace_in_row(
             row=row,
             request=request,
             callbacks=callbacks,
+            regex_guard=regex_guard,
         )
 
     def count_replace_all_in_file(
@@ -373,6 +523,51 @@ class SearchReplaceService:
             hash_for_entry=hash_for_entry,
         )
 
+    def plan_replace_all_in_file(
+        self,
+        path: Path,
+        *,
+        pattern: re.Pattern[str],
+        replacement: str,
+        use_regex: bool,
+        matches_empty: bool,
+        has_group_ref: bool,
+        callbacks: ReplaceAllFileCountCallbacks,
+        hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
+        regex_guard: RegexGuard | None = None,
+    ) -> ReplaceAllFileDiff:
+        return plan_replace_all_in_file(
+            path,
+            pattern=pattern,
+            replacement=replacement,
+            use_regex=use_regex,
+            matches_empty=matches_empty,
+            has_group_ref=has_group_ref,
+            callbacks=callbacks,
+            hash_for_entry=hash_for_entry,
+            regex_guard=regex_guard,
+        )
+
+    def plan_replace_all_batch(
+        self,
+        files: Sequence[Path],
+        plan_file: Callable[[Path], ReplaceAllFileDiff],
+        *,
+        max_workers: int = 4,
+    ) -> tuple[ReplaceAllFileDiff, ...]:
+        return plan_replace_all_batch(files, plan_file, max_workers=max_workers)
+
+    def commit_replace_all_batch(
+        self,
+        diffs: Sequence[ReplaceAllFileDiff],
+        *,
+        callbacks: ReplaceAllBatchCallbacks,
+    ) -> None:
+        commit_replace_all_batch(diffs, callbacks=callbacks)
+
+    def replace_all_preview_lines(self, diff: ReplaceAllFileDiff) -> tuple[str, ...]:
+        return replace_all_preview_lines(diff)
+
     def count_replace_all_in_rows(
         self,
         *,
@@ -382,6 +577,7 @@ class SearchReplaceService:
         matches_empty: bool,
         has_group_ref: bool,
         callbacks: ReplaceAllRowsCallbacks,
+        regex_guard: RegexGuard | None = None,
     ) -> int:
         return count_replace_all_in_rows(
             pattern=pattern,
@@ -390,6 +586,7 @@ class SearchReplaceService:
             matches_empty=matches_empty,
             has_group_ref=has_group_ref,
             callbacks=callbacks,
+            regex_guard=regex_guard,
         )
 
     def apply_replace_all_in_rows(
@@ -401,6 +598,7 @@ class SearchReplaceService:
         matches_empty: bool,
         has_group_ref: bool,
         callbacks: ReplaceAllRowsCallbacks,
+        regex_guard: RegexGuard | None = None,
     ) -> ReplaceAllRowsApplyResult:
         return apply_replace_all_in_rows(
             pattern=pattern,
@@ -409,6 +607,7 @@ class SearchReplaceService:
             matches_empty=matches_empty,
             has_group_ref=has_group_ref,
             callbacks=callbacks,
+            regex_guard=regex_guard,
         )
 
     def search_result_label(self, *, match: Match, root: Path) -> str:
@@ -429,6 +628,16 @@ class SearchReplaceService:
             iter_matches_for_file=iter_matches_for_file,
         )
 
+    def regex_timeout_message(self, error: RegexTimeoutError, *, count: int) -> str:
+        return regex_timeout_message(error, count=count)
+
+    def search_panel_status_message(
+        self, *, count: int, limit: int, truncated: bool, running: bool = False
+    ) -> str:
+        return search_panel_status_message(
+            count=count, limit=limit, truncated=truncated, running=running
+        )
+
     def build_search_run_plan(
         self,
         *,
@@ -489,15 +698,10 @@ class SearchReplaceService:
     def build_rows_cache_store_plan(
         self,
         *,
-        rows_materialized: bool,
-        entry_count: int,
-        cache_row_limit: int,
+        row_bytes: int,
+        max_bytes: int,
     ) -> SearchRowsCacheStorePlan:
-        return build_rows_cache_store_plan(
-            rows_materialized=rows_materialized,
-            entry_count=entry_count,
-            cache_row_limit=cache_row_limit,
-        )
+        return build_rows_cache_store_plan(row_bytes=row_bytes, max_bytes=max_bytes)
 
     def build_rows_source_plan(
         self,
@@ -655,25 +859,38 @@ def build_search_panel_plan(
                 break
         if truncated:
             break
-    if not items:
-        return SearchPanelPlan(
-            status_message="No matches in current scope.",
-            items=(),
-            truncated=False,
-        )
-    if truncated:
-        return SearchPanelPlan(
-            status_message=f"Showing first {len(items)} matches (limit {limit}).",
-            items=tuple(items),
-            truncated=True,
-        )
     return SearchPanelPlan(
-        status_message=f"{len(items)} matches in current scope.",
+        status_message=search_panel_status_message(
+            count=len(items), limit=limit, truncated=truncated
+        ),
         items=tuple(items),
-        truncated=False,
+        truncated=truncated,
     )
 
 
+def search_panel_status_message(
+    *, count: int, limit: int, truncated: bool, running: bool = False
+) -> str:
+    if running:
+        return f"Searching… {count} matches so far."
+    if not count:
+        return "No matches in current scope."
+    if truncated:
+        return f"Showing first {count} matches (limit {limit})."
+    return f"{count} matches in current scope."
+
+
+def regex_timeout_message(error: RegexTimeoutError, *, count: int) -> str:
+    if error.reason == "row":
+        cause = "one row took too long (likely catastrophic backtracking)"
+    elif error.reason == "deadline":
+        cause = "one file took too long"
+    else:
+        cause = "the search's total time cap was reached"
+    shown = f"results truncated to {count} matches" if count else "no matches so far"
+    return f"Regex timed out: {cause}; {shown}. Simplify the pattern."
+
+
 def build_search_run_plan(
     *,
     query_text: str,
@@ -775,13 +992,10 @@ def collect_rows_cache_stamp(
 
 def build_rows_cache_store_plan(
     *,
-    rows_materialized: bool,
-    entry_count: int,
-    cache_row_limit: int,
+    row_bytes: int,
+    max_bytes: int,
 ) -> SearchRowsCacheStorePlan:
-    return SearchRowsCacheStorePlan(
-        should_store_rows=rows_materialized and entry_count <= cache_row_limit
-    )
+    return SearchRowsCacheStorePlan(should_store_rows=0 <= row_bytes <= max_bytes)
 
 
 def build_rows_source_plan(
@@ -1020,21 +1234,23 @@ def apply_replace_in_row(
     row: int,
     request: ReplaceRequest,
     callbacks: ReplaceCurrentRowCallbacks,
+    regex_guard: RegexGuard | None = None,
 ) -> bool:
     text = callbacks.read_text(row)
     raw_text = "" if text is None else str(text)
-    changed, new_text = replace_text(
-        raw_text,
+    replaced = replace_texts(
+        [raw_text],
         pattern=request.pattern,
         replacement=request.replacement,
         use_regex=request.use_regex,
         matches_empty=request.matches_empty,
         has_group_ref=request.has_group_ref,
         mode="single",
+        regex_guard=regex_guard,
     )
-    if changed:
-        callbacks.write_text(row, new_text)
-    return changed
+    if 0 in replaced:
+        callbacks.write_text(row, replaced[0])
+    return 0 in replaced
 
 
 def prioritize_current_file(files: list[Path], current_file: Path | None) -> list[Path]:
@@ -1083,6 +1299,7 @@ def find_match_in_rows(
     start_row: int,
     direction: int,
     case_sensitive: bool = False,
+    regex_guard: RegexGuard | None = None,
 ) -> Match | None:
     if direction >= 0:
         for match in iter_matches(
@@ -1091,6 +1308,7 @@ def find_match_in_rows(
             field,
             use_regex,
             case_sensitive=case_sensitive,
+            regex_guard=regex_guard,
         ):
             if match.row > start_row:
                 return match
@@ -1102,6 +1320,7 @@ def find_match_in_rows(
         field,
         use_regex,
         case_sensitive=case_sensitive,
+        regex_guard=regex_guard,
     ):
         if match.row >= start_row:
             break
@@ -1109,6 +1328,79 @@ def find_match_in_rows(
     return last_match
 
 
+def _query_text(query: str, case_sensitive: bool) -> str:
+    return query if case_sensitive else query.lower()
+
+
+def refined_search_rows(
+    memo: SearchRefinementMemo,
+    path: Path,
+    *,
+    query: str,
+    field: SearchField,
+    use_regex: bool,
+    case_sensitive: bool,
+    stamp: Hashable | None,
+) -> tuple[SearchRow, ...] | None:
+    if use_regex or stamp is None:
+        return None
+    return memo.rows(
+        path, query=query, field=field, case_sensitive=case_sensitive, stamp=stamp
+    )
+
+
+def iter_refining_matches(
+    memo: SearchRefinementMemo,
+    rows: Iterable[SearchRow],
+    *,
+    path: Path,
+    query: str,
+    field: SearchField,
+    use_regex: bool,
+    case_sensitive: bool,
+    stamp: Hashable | None,
+    include_preview: bool = False,
+    preview_chars: int = 96,
+    regex_guard: RegexGuard | None = None,
+) -> Iterator[Match]:
+    """`iter_matches` over *rows* that remembers the matched rows in *memo*
+    once the file is fully scanned (literal queries with a stamp only)."""
+    if use_regex or stamp is None:
+        yield from iter_matches(
+            rows,
+            query,
+            field,
+            use_regex,
+            case_sensitive=case_sensitive,
+            include_preview=include_preview,
+            preview_chars=preview_chars,
+            regex_guard=regex_guard,
+        )
+        return
+    if not isinstance(rows, (list, tuple, SearchRowColumns)):
+        rows = list(rows)
+    matched: list[SearchRow] = []
+    for position, match in iter_match_positions(
+        rows,
+        query,
+        field,
+        False,
+        case_sensitive=case_sensitive,
+        include_preview=include_preview,
+        preview_chars=preview_chars,
+    ):
+        matched.append(rows[position])
+        yield match
+    memo.store(
+        path,
+        matched,
+        query=query,
+        field=field,
+        case_sensitive=case_sensitive,
+        stamp=stamp,
+    )
+
+
 def replace_text(
     text: str,
     *,
@@ -1138,6 +1430,75 @@ def replace_text(
     )
 
 
+def _replaced_text(
+    text: str,
+    *,
+    pattern: re.Pattern[str],
+    replacement: str,
+    use_regex: bool,
+    matches_empty: bool,
+    has_group_ref: bool,
+    mode: Literal["single", "all"],
+) -> str | None:
+    changed, new_text = replace_text(
+        text,
+        pattern=pattern,
+        replacement=replacement,
+        use_regex=use_regex,
+        matches_empty=matches_empty,
+        has_group_ref=has_group_ref,
+        mode=mode,
+    )
+    return new_text if changed else None
+
+
+def replace_texts(
+    texts: Sequence[str],
+    *,
+    pattern: re.Pattern[str],
+    replacement: str,
+    use_regex: bool,
+    matches_empty: bool,
+    has_group_ref: bool,
+    mode: Literal["single", "all"],
+    regex_guard: RegexGuard | None = None,
+) -> dict[int, str]:
+    """`replace_text` over *texts*; returns the changed ones by index.
+
+    Regex replacements run through *regex_guard* when given; a timeout
+    raises `RegexTimeoutError` and nothing is returned, so callers never
+    apply half a replace.
+    """
+    if use_regex and regex_guard is not None:
+        return dict(
+            regex_guard.run(
+                pattern.pattern,
+                _replaced_text,
+                texts,
+                pattern=pattern,
+                replacement=replacement,
+                use_regex=use_regex,
+                matches_empty=matches_empty,
+                has_group_ref=has_group_ref,
+                mode=mode,
+            )
+        )
+    replaced: dict[int, str] = {}
+    for index, text in enumerate(texts):
+        new_text = _replaced_text(
+            text,
+            pattern=pattern,
+            replacement=replacement,
+            use_regex=use_regex,
+            matches_empty=matches_empty,
+            has_group_ref=has_group_ref,
+            mode=mode,
+        )
+        if new_text is not None:
+            replaced[index] = new_text
+    return replaced
+
+
 def _replace_single(
     text: str,
     *,
@@ -1281,7 +1642,7 @@ def apply_replace_all(
     return True
 
 
-def count_replace_all_in_file(
+def plan_replace_all_in_file(
     path: Path,
     *,
     pattern: re.Pattern[str],
@@ -1291,69 +1652,49 @@ def count_replace_all_in_file(
     has_group_ref: bool,
     callbacks: ReplaceAllFileCountCallbacks,
     hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
-) -> int:
+    sample_limit: int = 3,
+    regex_guard: RegexGuard | None = None,
+) -> ReplaceAllFileDiff:
     parsed, cache_map = _load_replace_file(
         path, callbacks.parse_file, callbacks.read_cache
     )
-    count = 0
-    for entry in parsed.entries:
-        _, value, _status = _resolve_entry_overlay(
+    entries = list(parsed.entries)
+    texts: list[str] = []
+    statuses: list[Status] = []
+    for entry in entries:
+        _, value, status = _resolve_entry_overlay(
             entry=entry,
             cache_map=cache_map,
             hash_for_entry=hash_for_entry,
         )
-        text = "" if value is None else str(value)
-        changed, _new_text = replace_text(
-            text,
-            pattern=pattern,
-            replacement=replacement,
-            use_regex=use_regex,
-            matches_empty=matches_empty,
-            has_group_ref=has_group_ref,
-            mode="all",
-        )
-        if changed:
-            count += 1
-    return count
-
-
-def apply_replace_all_in_file(
-    path: Path,
-    *,
-    pattern: re.Pattern[str],
-    replacement: str,
-    use_regex: bool,
-    matches_empty: bool,
-    has_group_ref: bool,
-    callbacks: ReplaceAllFileApplyCallbacks,
-    hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
-) -> ReplaceAllFileApplyResult:
-    parsed, cache_map = _load_replace_file(
-        path, callbacks.parse_file, callbacks.read_cache
+        texts.append("" if value is None else str(value))
+        statuses.append(status)
+    replaced = replace_texts(
+        texts,
+        pattern=pattern,
+        replacement=replacement,
+        use_regex=use_regex,
+        matches_empty=matches_empty,
+        has_group_ref=has_group_ref,
+        mode="all",
+        regex_guard=regex_guard,
     )
+    count = 0
     changed_keys: set[str] = set()
     original_values: dict[str, str] = {}
+    samples: list[tuple[str, str, str]] = []
     new_entries: list[Entry] = []
-    for entry in parsed.entries:
-        _, value, status = _resolve_entry_overlay(
-            entry=entry,
-            cache_map=cache_map,
-            hash_for_entry=hash_for_entry,
-        )
-        text = "" if value is None else str(value)
-        changed, new_value = replace_text(
-            text,
-            pattern=pattern,
-            replacement=replacement,
-            use_regex=use_regex,
-            matches_empty=matches_empty,
-            has_group_ref=has_group_ref,
-            mode="all",
-        )
-        if changed:
+    for index, entry in enumerate(entries):
+        text = texts[index]
+        status = statuses[index]
+        new_value = replaced.get(index, text)
+        if index in replaced:
+            count += 1
             status = Status.TRANSLATED
             changed_keys.add(entry.key)
             original_values[entry.key] = text
+            if len(samples) < sample_limit:
+                samples.append((entry.key, text, new_value))
         if new_value != entry.value or status != entry.status:
             entry = type(entry)(
                 entry.key,
@@ -1366,13 +1707,129 @@ def apply_replace_all_in_file(
                 getattr(entry, "key_hash", None),
             )
         new_entries.append(entry)
-    callbacks.write_cache(path, new_entries, changed_keys, original_values)
+    return ReplaceAllFileDiff(
+        path=path,
+        count=count,
+        entries=tuple(new_entries),
+        changed_keys=frozenset(changed_keys),
+        original_values=original_values,
+        samples=tuple(samples),
+    )
+
+
+def count_replace_all_in_file(
+    path: Path,
+    *,
+    pattern: re.Pattern[str],
+    replacement: str,
+    use_regex: bool,
+    matches_empty: bool,
+    has_group_ref: bool,
+    callbacks: ReplaceAllFileCountCallbacks,
+    hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
+) -> int:
+    return plan_replace_all_in_file(
+        path,
+        pattern=pattern,
+        replacement=replacement,
+        use_regex=use_regex,
+        matches_empty=matches_empty,
+        has_group_ref=has_group_ref,
+        callbacks=callbacks,
+        hash_for_entry=hash_for_entry,
+        sample_limit=0,
+    ).count
+
+
+def apply_replace_all_in_file(
+    path: Path,
+    *,
+    pattern: re.Pattern[str],
+    replacement: str,
+    use_regex: bool,
+    matches_empty: bool,
+    has_group_ref: bool,
+    callbacks: ReplaceAllFileApplyCallbacks,
+    hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
+) -> ReplaceAllFileApplyResult:
+    diff = plan_replace_all_in_file(
+        path,
+        pattern=pattern,
+        replacement=replacement,
+        use_regex=use_regex,
+        matches_empty=matches_empty,
+        has_group_ref=has_group_ref,
+        callbacks=ReplaceAllFileCountCallbacks(
+            parse_file=callbacks.parse_file, read_cache=callbacks.read_cache
+        ),
+        hash_for_entry=hash_for_entry,
+        sample_limit=0,
+    )
+    changed_keys = set(diff.changed_keys)
+    callbacks.write_cache(path, diff.entries, changed_keys, diff.original_values)
     return ReplaceAllFileApplyResult(
         changed_keys=changed_keys,
         changed_any=bool(changed_keys),
     )
 
 
+def plan_replace_all_batch(
+    files: Sequence[Path],
+    plan_file: Callable[[Path], ReplaceAllFileDiff],
+    *,
+    max_workers: int = 4,
+) -> tuple[ReplaceAllFileDiff, ...]:
+    """Dry-run replace-all over *files* on a thread pool, keeping file order;
+    only files with changes are returned. The first failure in file order is
+    raised."""
+    if len(files) <= 1 or max_workers <= 1:
+        diffs = [plan_file(path) for path in files]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(files)),
+            thread_name_prefix="tzp-replace-plan",
+        ) as pool:
+            diffs = list(pool.map(plan_file, files))
+    return tuple(diff for diff in diffs if diff.count)
+
+
+def commit_replace_all_batch(
+    diffs: Sequence[ReplaceAllFileDiff],
+    *,
+    callbacks: ReplaceAllBatchCallbacks,
+) -> None:
+    """Write every diff's cache update; if a write fails, restore the caches
+    already written and re-raise, so the batch lands all or nothing."""
+    saved: list[object] = []
+    try:
+        for diff in diffs:
+            saved.append(callbacks.snapshot(diff.path))
+            callbacks.write_cache(
+                diff.path,
+                diff.entries,
+                set(diff.changed_keys),
+                diff.original_values,
+            )
+    except BaseException:
+        for snapshot in reversed(saved):
+            with contextlib.suppress(OSError):
+                callbacks.restore(snapshot)
+        raise
+
+
+def replace_all_preview_lines(
+    diff: ReplaceAllFileDiff, *, width: int = 48
+) -> tuple[str, ...]:
+    def _clip(text: str) -> str:
+        text = " ".join(text.split())
+        return text if len(text) <= width else text[: width - 1] + "…"
+
+    return tuple(
+        f"{key}: {_clip(before)} → {_clip(after)}"
+        for key, before, after in diff.samples
+    )
+
+
 def count_replace_all_in_rows(
     *,
     pattern: re.Pattern[str],
@@ -1381,23 +1838,20 @@ def count_replace_all_in_rows(
     matches_empty: bool,
     has_group_ref: bool,
     callbacks: ReplaceAllRowsCallbacks,
+    regex_guard: RegexGuard | None = None,
 ) -> int:
-    count = 0
-    for row in range(callbacks.row_count()):
-        text = callbacks.read_text(row)
-        raw_text = "" if text is None else str(text)
-        changed, _new_text = replace_text(
-            raw_text,
+    return len(
+        replace_texts(
+            _row_texts(callbacks),
             pattern=pattern,
             replacement=replacement,
             use_regex=use_regex,
             matches_empty=matches_empty,
             has_group_ref=has_group_ref,
             mode="all",
+            regex_guard=regex_guard,
         )
-        if changed:
-            count += 1
-    return count
+    )
 
 
 def apply_replace_all_in_rows(
@@ -1408,25 +1862,29 @@ def apply_replace_all_in_rows(
     matches_empty: bool,
     has_group_ref: bool,
     callbacks: ReplaceAllRowsCallbacks,
+    regex_guard: RegexGuard | None = None,
 ) -> ReplaceAllRowsApplyResult:
-    changed_rows = 0
+    replaced = replace_texts(
+        _row_texts(callbacks),
+        pattern=pattern,
+        replacement=replacement,
+        use_regex=use_regex,
+        matches_empty=matches_empty,
+        has_group_ref=has_group_ref,
+        mode="all",
+        regex_guard=regex_guard,
+    )
+    for row, new_text in replaced.items():
+        callbacks.write_text(row, new_text)
+    return ReplaceAllRowsApplyResult(changed_rows=len(replaced))
+
+
+def _row_texts(callbacks: ReplaceAllRowsCallbacks) -> list[str]:
+    texts: list[str] = []
     for row in range(callbacks.row_count()):
         text = callbacks.read_text(row)
-        raw_text = "" if text is None else str(text)
-        changed, new_text = replace_text(
-            raw_text,
-            pattern=pattern,
-            replacement=replacement,
-            use_regex=use_regex,
-            matches_empty=matches_empty,
-            has_group_ref=has_group_ref,
-            mode="all",
-        )
-        if not changed:
-            continue
-        callbacks.write_text(row, new_text)
-        changed_rows += 1
-    return ReplaceAllRowsApplyResult(changed_rows=changed_rows)
+        texts.append("" if text is None else str(text))
+    return texts
 
 
 def _load_replace_file(
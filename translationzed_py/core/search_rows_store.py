@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from .search import SearchRowColumns
+
+
+class SearchRowsStore:
+    """LRU of per-file `SearchRowColumns`, bounded by estimated bytes.
+
+    Each entry carries the caller's stamp of the data it was built from;
+    `get` hands it back so the caller decides whether it is still current.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Hashable, SearchRowColumns]] = (
+            OrderedDict()
+        )
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[Hashable, SearchRowColumns] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, stamp: Hashable, columns: SearchRowColumns) -> bool:
+        """Store *columns*, evicting least recently used files to fit; returns
+        False (and drops any old entry) when they exceed the whole budget."""
+        with self._lock:
+            self._drop(key)
+            if columns.nbytes > self.max_bytes:
+                return False
+            while self._entries and self._nbytes + columns.nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+            self._entries[key] = (stamp, columns)
+            self._nbytes += columns.nbytes
+            return True
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1].nbytes
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable, Iterable, Mapping, MutableMapping
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -27,6 +28,34 @@ class SourceLookupMaterialized:
     keys: list[str] | None = None
 
 
+class ParsedFileCache(MutableMapping[Path, "ParsedFile"]):
+    """Parsed reference files by path, shared by the GUI thread and workers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: dict[Path, ParsedFile] = {}
+
+    def __getitem__(self, path: Path) -> ParsedFile:
+        with self._lock:
+            return self._files[path]
+
+    def __setitem__(self, path: Path, parsed: ParsedFile) -> None:
+        with self._lock:
+            self._files[path] = parsed
+
+    def __delitem__(self, path: Path) -> None:
+        with self._lock:
+            del self._files[path]
+
+    def __iter__(self) -> Iterator[Path]:
+        with self._lock:
+            return iter(list(self._files))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+
 def source_reference_path_key(root: Path, path: Path) -> str:
     try:
         rel = path.relative_to(root)
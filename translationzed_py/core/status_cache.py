@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import contextlib
+import inspect
 import struct
-from collections.abc import Iterable
+import weakref
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -32,6 +34,13 @@ _RECORD_V4 = struct.Struct("<QBBII")
 
 _FLAG_HAS_DRAFTS = 0x1
 
+# (root, file_path, entries) after every cache write, entries None after
+# `restore` (drop what was derived from the file's cache); bound methods are
+# held weakly so a closed window does not keep its listeners alive, other
+# callables (functions, lambdas, partials) strongly until removed.
+WriteListener = Callable[[Path, Path, Sequence[Entry] | None], None]
+_WRITE_LISTENERS: list[Callable[[], WriteListener | None]] = []
+
 
 @dataclass(frozen=True, slots=True)
 class CacheEntry:
@@ -40,6 +49,15 @@ class CacheEntry:
     original: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class CacheSnapshot:
+    """Raw bytes of a file's cache paths (None = absent) before a write."""
+
+    root: Path
+    file_path: Path
+    files: tuple[tuple[Path, bytes | None], ...]
+
+
 class CacheMap(dict[int, CacheEntry]):
     __slots__ = ("hash_bits", "legacy_status", "last_opened", "magic", "has_drafts")
 
@@ -138,6 +156,11 @@ def cache_path(root: Path, file_path: Path) -> Path:
     return _cache_path(root, file_path)
 
 
+def entry_key_hash(entry: Entry, cache_map: CacheMap) -> int:
+    """Hash of *entry*'s key in the width *cache_map* was written with."""
+    return _hash_key(entry.key, bits=cache_map.hash_bits, key_hash=entry.key_hash)
+
+
 def _original_path_from_cache(root: Path, cache_path: Path) -> Path | None:
     cfg = _load_app_config(root)
     rel: Path | None = None
@@ -520,6 +543,30 @@ def read(root: Path, file_path: Path) -> CacheMap:
         return CacheMap()
 
 
+def add_write_listener(listener: WriteListener) -> None:
+    if inspect.ismethod(listener):
+        _WRITE_LISTENERS.append(weakref.WeakMethod(listener))
+    else:
+        _WRITE_LISTENERS.append(lambda: listener)
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    _WRITE_LISTENERS[:] = [
+        ref for ref in _WRITE_LISTENERS if ref() not in (None, listener)
+    ]
+
+
+def _notify_write(root: Path, file_path: Path, entries: Sequence[Entry] | None) -> None:
+    for ref in list(_WRITE_LISTENERS):
+        listener = ref()
+        if listener is None:
+            with contextlib.suppress(ValueError):
+                _WRITE_LISTENERS.remove(ref)
+            continue
+        with contextlib.suppress(Exception):
+            listener(root, file_path, entries)
+
+
 def write(
     root: Path,
     file_path: Path,
@@ -546,7 +593,10 @@ def write(
     if changed_keys:
         existing = read(root, file_path)
         existing_hash_bits = getattr(existing, "hash_bits", 64)
+    seen: list[Entry] | None = [] if _WRITE_LISTENERS else None
     for e in entries:
+        if seen is not None:
+            seen.append(e)
         include = e.status != Status.UNTOUCHED or e.key in changed_keys
         if not include:
             continue
@@ -569,6 +619,8 @@ def write(
             status_file.unlink()
         if legacy_status_file != status_file and legacy_status_file.exists():
             legacy_status_file.unlink()
+        if seen is not None:
+            _notify_write(root, file_path, seen)
         return
     if last_opened is None and read_status_file.exists():
         last_opened = read_last_opened_from_path(read_status_file)
@@ -578,6 +630,34 @@ def write(
     if legacy_status_file != status_file and legacy_status_file.exists():
         with contextlib.suppress(OSError):
             legacy_status_file.unlink()
+    if seen is not None:
+        _notify_write(root, file_path, seen)
+
+
+def snapshot(root: Path, file_path: Path) -> CacheSnapshot:
+    files: list[tuple[Path, bytes | None]] = []
+    for path in dict.fromkeys(
+        (_cache_path(root, file_path), _legacy_cache_path(root, file_path))
+    ):
+        try:
+            files.append((path, path.read_bytes()))
+        except FileNotFoundError:
+            files.append((path, None))
+    return CacheSnapshot(root=root, file_path=file_path, files=tuple(files))
+
+
+def restore(saved: CacheSnapshot) -> None:
+    """Put cache files back as captured by `snapshot`; write listeners are
+    told to forget the file (entries None), since the values they were sent
+    for the overwritten write are gone."""
+    try:
+        for path, data in saved.files:
+            if data is None:
+                path.unlink(missing_ok=True)
+            else:
+                write_bytes_atomic(path, data)
+    finally:
+        _notify_write(saved.root, saved.file_path, None)
 
 
 def read_last_opened_from_path(path: Path) -> int:
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import multiprocessing
+import os
+import queue
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-from .tm_store import TMImportFile, TMStore
-from .tmx_io import detect_tm_languages, supported_tm_import_suffixes
+from .tm_store import TMImportFile, TMStore, import_file_content_hash
+from .tmx_io import (
+    detect_tm_languages,
+    iter_tm_pairs,
+    supported_tm_import_suffixes,
+    tm_import_suffix,
+)
 
 LocaleResolver = Callable[[Path, set[str]], tuple[tuple[str, str] | None, bool]]
 _SUPPORTED_TM_IMPORT_SUFFIXES = frozenset(supported_tm_import_suffixes())
+# Worker processes only pay off once there is enough XML to amortize spawn cost.
+_PARALLEL_IMPORT_MIN_BYTES = 8 * 1024 * 1024
+_MAX_IMPORT_WORKERS = 4
+# Workers hand pairs back in chunks through a bounded queue per file, so a
+# parse runs at most this far ahead of the writer.
+_IMPORT_CHUNK_PAIRS = 2000
+_IMPORT_QUEUE_CHUNKS = 4
+_IMPORT_POLL_SECONDS = 0.1
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,6 +41,18 @@ class TMImportSyncReport:
     changed: bool
 
 
+@dataclass(frozen=True, slots=True)
+class _ImportJob:
+    path: Path
+    source_locale: str
+    target_locale: str
+    source_locale_raw: str
+    target_locale_raw: str
+    mtime_ns: int
+    file_size: int
+    content_hash: str
+
+
 def sync_import_folder(
     store: TMStore,
     tm_dir: Path,
@@ -29,6 +60,7 @@ def sync_import_folder(
     resolve_locales: LocaleResolver,
     only_paths: set[Path] | None = None,
     pending_only: bool = False,
+    max_workers: int | None = None,
 ) -> TMImportSyncReport:
     target_paths = {
         path.resolve()
@@ -38,7 +70,7 @@ def sync_import_folder(
     files = sorted(
         path.resolve()
         for path in tm_dir.iterdir()
-        if path.is_file() and path.suffix.lower() in _SUPPORTED_TM_IMPORT_SUFFIXES
+        if path.is_file() and tm_import_suffix(path) in _SUPPORTED_TM_IMPORT_SUFFIXES
     )
     if target_paths:
         files = [path for path in files if path in target_paths]
@@ -62,6 +94,7 @@ def sync_import_folder(
     zero_segment_files: list[str] = []
     failures: list[str] = []
     checked_files: list[str] = []
+    jobs: list[_ImportJob] = []
     skip_remaining_mappings = False
     for path in files:
         checked_files.append(path.name)
@@ -78,6 +111,33 @@ def sync_import_folder(
             has_entries=has_entries,
         ):
             continue
+        try:
+            content_hash = import_file_content_hash(path)
+        except OSError as exc:
+            failures.append(f"{path.name}: {exc}")
+            store.upsert_import_file(
+                tm_path=str(path),
+                tm_name=path.stem,
+                mtime_ns=stat.st_mtime_ns,
+                file_size=stat.st_size,
+                status="error",
+                note=str(exc),
+            )
+            continue
+        if _is_same_content_ready(
+            record,
+            content_hash,
+            pending_only,
+            has_entries=has_entries,
+        ):
+            # Touched but byte-identical: refresh stat so the next sync takes
+            # the cheap mtime/size path again.
+            store.touch_import_file(
+                str(path),
+                mtime_ns=stat.st_mtime_ns,
+                file_size=stat.st_size,
+            )
+            continue
         try:
             langs = detect_tm_languages(path)
         except Exception as exc:
@@ -124,31 +184,49 @@ def sync_import_folder(
             )
             continue
         source_locale, target_locale = pair
-        try:
-            count = store.replace_import_tm(
-                path,
+        jobs.append(
+            _ImportJob(
+                path=path,
                 source_locale=source_locale,
                 target_locale=target_locale,
                 source_locale_raw=source_locale_raw,
                 target_locale_raw=target_locale_raw,
-                tm_name=path.stem,
+                mtime_ns=stat.st_mtime_ns,
+                file_size=stat.st_size,
+                content_hash=content_hash,
+            )
+        )
+
+    # Locale resolution above may prompt the user, so it stays on the caller's
+    # thread; parsing fans out to worker processes while this thread writes.
+    for job, pairs in _iter_parsed_jobs(jobs, max_workers=max_workers):
+        try:
+            count = store.replace_import_pairs(
+                job.path,
+                pairs,
+                source_locale=job.source_locale,
+                target_locale=job.target_locale,
+                source_locale_raw=job.source_locale_raw,
+                target_locale_raw=job.target_locale_raw,
+                tm_name=job.path.stem,
+                content_hash=job.content_hash,
             )
             imported += count
-            imported_files.append(f"{path.name} ({count} segment(s))")
+            imported_files.append(f"{job.path.name} ({count} segment(s))")
             if count == 0:
-                zero_segment_files.append(path.name)
+                zero_segment_files.append(job.path.name)
             changed = True
         except Exception as exc:
-            failures.append(f"{path.name}: {exc}")
+            failures.append(f"{job.path.name}: {exc}")
             store.upsert_import_file(
-                tm_path=str(path),
-                tm_name=path.stem,
-                source_locale=source_locale,
-                target_locale=target_locale,
-                source_locale_raw=source_locale_raw,
-                target_locale_raw=target_locale_raw,
-                mtime_ns=stat.st_mtime_ns,
-                file_size=stat.st_size,
+                tm_path=str(job.path),
+                tm_name=job.path.stem,
+                source_locale=job.source_locale,
+                target_locale=job.target_locale,
+                source_locale_raw=job.source_locale_raw,
+                target_locale_raw=job.target_locale_raw,
+                mtime_ns=job.mtime_ns,
+                file_size=job.file_size,
                 status="error",
                 note=str(exc),
             )
@@ -164,6 +242,114 @@ def sync_import_folder(
     )
 
 
+def _iter_parsed_jobs(
+    jobs: list[_ImportJob],
+    *,
+    max_workers: int | None,
+) -> Iterator[tuple[_ImportJob, Iterator[tuple[str, str]]]]:
+    workers = _import_worker_count(jobs, max_workers)
+    if workers <= 1:
+        for job in jobs:
+            yield job, iter_tm_pairs(job.path, job.source_locale, job.target_locale)
+        return
+    context = multiprocessing.get_context("spawn")
+    with (
+        context.Manager() as manager,
+        ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool,
+    ):
+        remaining = iter(jobs)
+        in_flight: deque[tuple[_ImportJob, Any, Any, Future[None]]] = deque()
+        cancels: list[Any] = []
+
+        def _submit_next() -> None:
+            job = next(remaining, None)
+            if job is None:
+                return
+            channel = manager.Queue(maxsize=_IMPORT_QUEUE_CHUNKS)
+            cancel = manager.Event()
+            cancels.append(cancel)
+            future = pool.submit(
+                _parse_import_file,
+                str(job.path),
+                job.source_locale,
+                job.target_locale,
+                channel,
+                cancel,
+            )
+            in_flight.append((job, channel, cancel, future))
+
+        for _ in range(workers):
+            _submit_next()
+        try:
+            while in_flight:
+                job, channel, cancel, future = in_flight.popleft()
+                _submit_next()
+                yield job, _channel_pairs(channel, cancel, future)
+        finally:
+            for cancel in cancels:
+                cancel.set()
+            for _job, _channel, _cancel, future in in_flight:
+                future.cancel()
+
+
+def _import_worker_count(jobs: list[_ImportJob], max_workers: int | None) -> int:
+    if len(jobs) < 2:
+        return 1
+    if max_workers is None:
+        if sum(job.file_size for job in jobs) < _PARALLEL_IMPORT_MIN_BYTES:
+            return 1
+        max_workers = min(os.cpu_count() or 1, _MAX_IMPORT_WORKERS)
+    return max(1, min(len(jobs), int(max_workers)))
+
+
+def _channel_pairs(
+    channel: Any, cancel: Any, future: Future[None]
+) -> Iterator[tuple[str, str]]:
+    # Parse errors surface while the writer consumes the pairs, which keeps
+    # them on the same failure path as sequential imports.
+    finished = False
+    try:
+        while True:
+            try:
+                chunk = channel.get(timeout=_IMPORT_POLL_SECONDS)
+            except queue.Empty:
+                if future.done():
+                    future.result()
+                continue
+            if chunk is None:
+                finished = True
+                return
+            yield from chunk
+    finally:
+        if not finished:
+            cancel.set()
+
+
+def _parse_import_file(
+    path: str, source_locale: str, target_locale: str, channel: Any, cancel: Any
+) -> None:
+    chunk: list[tuple[str, str]] = []
+    for pair in iter_tm_pairs(Path(path), source_locale, target_locale):
+        chunk.append(pair)
+        if len(chunk) >= _IMPORT_CHUNK_PAIRS:
+            if not _put_chunk(channel, cancel, chunk):
+                return
+            chunk = []
+    if chunk and not _put_chunk(channel, cancel, chunk):
+        return
+    _put_chunk(channel, cancel, None)
+
+
+def _put_chunk(channel: Any, cancel: Any, chunk: list[tuple[str, str]] | None) -> bool:
+    while not cancel.is_set():
+        try:
+            channel.put(chunk, timeout=_IMPORT_POLL_SECONDS)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
 def _normalize_locale_tag(value: str) -> str:
     raw = value.strip().upper().replace("_", "-")
     if not raw:
@@ -227,3 +413,17 @@ def _is_up_to_date_ready(
     if not has_entries:
         return False
     return record.mtime_ns == mtime_ns and record.file_size == file_size
+
+
+def _is_same_content_ready(
+    record: TMImportFile | None,
+    content_hash: str,
+    pending_only: bool,
+    *,
+    has_entries: bool,
+) -> bool:
+    if pending_only or record is None or record.status != "ready":
+        return False
+    if not has_entries or not record.content_hash:
+        return False
+    return record.content_hash == content_hash
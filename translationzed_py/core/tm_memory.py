@@ -0,0 +1,560 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from heapq import merge
+from itertools import accumulate, islice
+
+_SEP = "\x00"
+_NO_PATH = -1
+# Rows written since the last compaction are searched as a separate sorted
+# delta; past this many (written plus hidden base rows) the base is rebuilt.
+_DELTA_LIMIT = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryRow:
+    entry_id: int
+    source_norm: str
+    origin: str
+    tm_path: str | None
+    updated_at: int
+
+
+@dataclass(frozen=True, slots=True)
+class _State:
+    # Rows sorted by (len, -updated_at, id). Sources live in one buffer as
+    # SEP row0 SEP row1 ... SEP; `starts` holds each row's offset into it.
+    buffer: str
+    starts: array[int]
+    lens: array[int]
+    ids: array[int]
+    updated: array[int]
+    projects: array[int]  # 1 for project rows, 0 for imports
+    path_ix: array[int]  # index into `tm_paths`, or _NO_PATH
+    tm_paths: tuple[str, ...]
+    id_order: array[int]  # positions sorted by id, for id -> position lookups
+    sorted_ids: array[int]
+
+    def __len__(self) -> int:
+        return len(self.lens)
+
+    def norm(self, pos: int) -> str:
+        start = self.starts[pos]
+        return self.buffer[start : start + self.lens[pos]]
+
+    def sort_key(self, pos: int) -> tuple[int, int, int]:
+        return self.lens[pos], -self.updated[pos], self.ids[pos]
+
+    def position(self, entry_id: int) -> int | None:
+        idx = bisect_left(self.sorted_ids, entry_id)
+        if idx < len(self.sorted_ids) and self.sorted_ids[idx] == entry_id:
+            return int(self.id_order[idx])
+        return None
+
+
+def _clean(norm: str) -> str:
+    # The separator must not occur inside a row.
+    return norm.replace(_SEP, " ") if _SEP in norm else norm
+
+
+def _row_key(row: MemoryRow) -> tuple[int, int, int]:
+    return len(row.source_norm), -row.updated_at, row.entry_id
+
+
+def _build_state(
+    norms: Sequence[str],
+    ids: array[int],
+    updated: array[int],
+    projects: array[int],
+    path_ix: array[int],
+    tm_paths: tuple[str, ...],
+) -> _State:
+    lens = array("q", (len(norm) for norm in norms))
+    # Row i starts after i separators plus the lengths of rows before it.
+    starts = array("q", accumulate((length + 1 for length in lens), initial=1))
+    del starts[-1]
+    id_order = array("q", sorted(range(len(ids)), key=ids.__getitem__))
+    return _State(
+        buffer=_SEP + _SEP.join(norms) + _SEP,
+        starts=starts,
+        lens=lens,
+        ids=ids,
+        updated=updated,
+        projects=projects,
+        path_ix=path_ix,
+        tm_paths=tm_paths,
+        id_order=id_order,
+        sorted_ids=array("q", (ids[pos] for pos in id_order)),
+    )
+
+
+def _rows_state(rows: Iterable[MemoryRow]) -> _State:
+    ordered = sorted(rows, key=_row_key)
+    tm_paths = tuple(
+        dict.fromkeys(row.tm_path for row in ordered if row.tm_path is not None)
+    )
+    path_lookup = {path: idx for idx, path in enumerate(tm_paths)}
+    return _build_state(
+        [_clean(row.source_norm) for row in ordered],
+        array("q", (row.entry_id for row in ordered)),
+        array("q", (row.updated_at for row in ordered)),
+        array("b", (row.origin == "project" for row in ordered)),
+        array(
+            "q",
+            (
+                _NO_PATH if row.tm_path is None else path_lookup[row.tm_path]
+                for row in ordered
+            ),
+        ),
+        tm_paths,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    # Base rows plus a small sorted delta of rows written since the last
+    # compaction. Delta positions follow the base's; base positions in
+    # `masked` were removed or superseded by a delta row.
+    base: _State
+    delta: _State
+    masked: frozenset[int]
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.delta)
+
+    def _locate(self, pos: int) -> tuple[_State, int]:
+        size = len(self.base)
+        return (self.base, pos) if pos < size else (self.delta, pos - size)
+
+    def live(self, pos: int) -> bool:
+        return pos >= len(self.base) or pos not in self.masked
+
+    def norm(self, pos: int) -> str:
+        state, local = self._locate(pos)
+        return state.norm(local)
+
+    def length(self, pos: int) -> int:
+        state, local = self._locate(pos)
+        return state.lens[local]
+
+    def entry_id(self, pos: int) -> int:
+        state, local = self._locate(pos)
+        return state.ids[local]
+
+    def updated_at(self, pos: int) -> int:
+        state, local = self._locate(pos)
+        return state.updated[local]
+
+    def is_project(self, pos: int) -> bool:
+        state, local = self._locate(pos)
+        return bool(state.projects[local])
+
+    def sort_key(self, pos: int) -> tuple[int, int, int]:
+        state, local = self._locate(pos)
+        return state.sort_key(local)
+
+    def position(self, entry_id: int) -> int | None:
+        local = self.delta.position(entry_id)
+        if local is not None:
+            return len(self.base) + local
+        pos = self.base.position(entry_id)
+        return None if pos is None or pos in self.masked else pos
+
+    def positions(self) -> Iterator[int]:
+        """Live positions in (length, newest, id) order."""
+        size = len(self.base)
+        base = (pos for pos in range(size) if pos not in self.masked)
+        return merge(base, range(size, len(self)), key=self.sort_key)
+
+
+_EMPTY = _rows_state(())
+
+
+class TMMemoryIndex:
+    """Length-sorted in-memory copy of one locale pair's TM sources.
+
+    Only retrieval data is held here (normalized source, origin, import path,
+    recency); targets and full rows stay in SQLite and are read by id.
+    """
+
+    def __init__(self, source_locale: str, target_locale: str) -> None:
+        self.source_locale = source_locale
+        self.target_locale = target_locale
+        self._lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._ready = False
+        self._pending_rows: dict[int, MemoryRow] = {}
+        self._pending_removed: set[int] = set()
+        self._pending_paths: set[str] = set()
+        # Rows written since the last compaction, and the base rows they hide.
+        self._delta_rows: dict[int, MemoryRow] = {}
+        self._removed_ids: set[int] = set()
+        self._masked: set[int] = set()
+        # Candidate `_query_tokens` results, keyed by normalized source.
+        self.parts_memo: dict[str, tuple[str, ...]] = {}
+        self.stems: dict[str, str] = {}
+        self._snapshot = _Snapshot(_EMPTY, _EMPTY, frozenset())
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def load(self, rows: Iterable[MemoryRow]) -> None:
+        # Changes applied while the rows were being read stay queued and are
+        # merged on top, so registering before reading loses no writes.
+        state = _rows_state(rows)
+        with self._merge_lock:
+            self._delta_rows = {}
+            self._removed_ids = set()
+            self._masked = set()
+            self._snapshot = _Snapshot(state, _EMPTY, frozenset())
+            self._ready = True
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot) - len(snapshot.masked)
+
+    def apply(
+        self,
+        *,
+        upserted: Iterable[MemoryRow] = (),
+        removed_ids: Iterable[int] = (),
+        removed_tm_paths: Iterable[str] = (),
+    ) -> None:
+        # Cheap for writers: changes queue up and are merged by the next query.
+        with self._lock:
+            for row in upserted:
+                self._pending_rows[row.entry_id] = row
+            for entry_id in removed_ids:
+                self._pending_rows.pop(entry_id, None)
+                self._pending_removed.add(entry_id)
+            for tm_path in removed_tm_paths:
+                self._pending_paths.add(tm_path)
+                for entry_id, row in list(self._pending_rows.items()):
+                    if row.tm_path == tm_path and row.origin != "project":
+                        del self._pending_rows[entry_id]
+
+    def snapshot(self) -> _Snapshot:
+        """Current rows. Queued changes land in the delta, which costs
+        O(delta); the base is rebuilt only once the delta outgrows
+        `_DELTA_LIMIT` or an import path is removed."""
+        with self._merge_lock:
+            if not self._ready:
+                return self._snapshot
+            with self._lock:
+                rows = self._pending_rows
+                removed_ids = self._pending_removed
+                removed_paths = self._pending_paths
+                self._pending_rows = {}
+                self._pending_removed = set()
+                self._pending_paths = set()
+            if not (rows or removed_ids or removed_paths):
+                return self._snapshot
+            base = self._snapshot.base
+            delta = self._delta_rows
+            for entry_id in removed_ids:
+                delta.pop(entry_id, None)
+            delta.update(rows)
+            self._removed_ids.update(removed_ids)
+            for entry_id in (*removed_ids, *rows):
+                pos = base.position(entry_id)
+                if pos is not None:
+                    self._masked.add(pos)
+            if removed_paths or len(delta) + len(self._masked) > _DELTA_LIMIT:
+                for entry_id, row in list(delta.items()):
+                    if row.tm_path in removed_paths and row.origin != "project":
+                        del delta[entry_id]
+                base = self._merged(
+                    base, list(delta.values()), self._removed_ids, removed_paths
+                )
+                self._delta_rows = {}
+                self._removed_ids = set()
+                self._masked = set()
+                self._snapshot = _Snapshot(base, _EMPTY, frozenset())
+            else:
+                self._snapshot = _Snapshot(
+                    base, _rows_state(delta.values()), frozenset(self._masked)
+                )
+            return self._snapshot
+
+    @staticmethod
+    def _merged(
+        state: _State,
+        added: list[MemoryRow],
+        removed_ids: set[int],
+        removed_paths: set[str],
+    ) -> _State:
+        removed: set[int] = set()
+        for entry_id in (*removed_ids, *(row.entry_id for row in added)):
+            pos = state.position(entry_id)
+            if pos is not None:
+                removed.add(pos)
+        if removed_paths:
+            hidden = {
+                idx for idx, path in enumerate(state.tm_paths) if path in removed_paths
+            }
+            removed.update(
+                pos
+                for pos, idx in enumerate(state.path_ix)
+                if idx in hidden and not state.projects[pos]
+            )
+        tm_paths = list(state.tm_paths)
+        path_lookup = {path: idx for idx, path in enumerate(tm_paths)}
+        for row in added:
+            if row.tm_path is not None and row.tm_path not in path_lookup:
+                path_lookup[row.tm_path] = len(tm_paths)
+                tm_paths.append(row.tm_path)
+        added.sort(key=_row_key)
+        count = len(state)
+        inserts = [
+            (bisect_left(range(count), _row_key(row), key=state.sort_key), row)
+            for row in added
+        ]
+        norms: list[str] = []
+        ids = array("q")
+        updated = array("q")
+        projects = array("b")
+        path_ix = array("q")
+
+        def _keep(lo: int, hi: int) -> None:
+            if lo >= hi:
+                return
+            start = state.starts[lo]
+            end = state.starts[hi - 1] + state.lens[hi - 1]
+            norms.append(state.buffer[start:end])
+            ids.extend(state.ids[lo:hi])
+            updated.extend(state.updated[lo:hi])
+            projects.extend(state.projects[lo:hi])
+            path_ix.extend(state.path_ix[lo:hi])
+
+        dropped = sorted(removed)
+
+        def _keep_until(point: int, cursor: int) -> int:
+            # Keeps rows [cursor, point) minus dropped ones; returns the new cursor.
+            lo = bisect_left(dropped, cursor)
+            hi = bisect_left(dropped, point)
+            for pos in dropped[lo:hi]:
+                _keep(cursor, pos)
+                cursor = pos + 1
+            _keep(cursor, point)
+            return point
+
+        cursor = 0
+        for point, row in inserts:
+            cursor = _keep_until(point, cursor)
+            norms.append(_clean(row.source_norm))
+            ids.append(row.entry_id)
+            updated.append(row.updated_at)
+            projects.append(1 if row.origin == "project" else 0)
+            path_ix.append(
+                _NO_PATH if row.tm_path is None else path_lookup[row.tm_path]
+            )
+        _keep_until(count, cursor)
+        # Kept ranges were appended as pre-joined chunks; split them back so
+        # `_build_state` sees one string per row.
+        flat = _SEP.join(norms).split(_SEP) if norms else []
+        return _build_state(flat, ids, updated, projects, path_ix, tuple(tm_paths))
+
+
+class _Layer:
+    # One sorted layer of a snapshot, restricted to the query's length window.
+    __slots__ = ("state", "offset", "masked", "lo", "hi", "hidden")
+
+    def __init__(
+        self,
+        state: _State,
+        offset: int,
+        masked: frozenset[int],
+        *,
+        min_len: int,
+        max_len: int,
+        hidden_tm_paths: set[str],
+    ) -> None:
+        self.state = state
+        self.offset = offset
+        self.masked = masked
+        self.lo = bisect_left(state.lens, min_len)
+        self.hi = bisect_right(state.lens, max_len)
+        self.hidden = {
+            idx for idx, path in enumerate(state.tm_paths) if path in hidden_tm_paths
+        }
+
+    def span(self) -> tuple[int, int]:
+        # Buffer range covering rows [lo, hi), separators included.
+        state = self.state
+        if self.lo >= self.hi:
+            return 0, 0
+        last = self.hi - 1
+        return state.starts[self.lo] - 1, state.starts[last] + state.lens[last] + 1
+
+
+class MemoryQuery:
+    """Candidate buckets over one index snapshot, mirroring the SQL buckets.
+
+    Positions are snapshot positions; the base and the delta are searched
+    separately and their hits merged.
+    """
+
+    def __init__(
+        self,
+        state: _Snapshot,
+        *,
+        length: int,
+        min_len: int,
+        max_len: int,
+        origins: Sequence[str],
+        hidden_tm_paths: Iterable[str],
+    ) -> None:
+        self.state = state
+        self._length = length
+        self._min_len = min_len
+        self._max_len = max_len
+        hidden = set(hidden_tm_paths)
+        self._layers = tuple(
+            _Layer(
+                layer,
+                offset,
+                masked,
+                min_len=min_len,
+                max_len=max_len,
+                hidden_tm_paths=hidden,
+            )
+            for layer, offset, masked in (
+                (state.base, 0, state.masked),
+                (state.delta, len(state.base), frozenset()),
+            )
+            if len(layer)
+        )
+        self._want_project = "project" in origins
+        self._want_import = "import" in origins
+
+    def visible(self, pos: int) -> bool:
+        for layer in self._layers:
+            local = pos - layer.offset
+            if 0 <= local < len(layer.state):
+                return self._visible(layer, local)
+        return False
+
+    def _visible(self, layer: _Layer, local: int) -> bool:
+        if local in layer.masked:
+            return False
+        state = layer.state
+        if state.projects[local]:
+            return self._want_project
+        return self._want_import and state.path_ix[local] not in layer.hidden
+
+    def _by_distance(self, positions: Iterable[int]) -> list[int]:
+        state = self.state
+        length = self._length
+        return sorted(
+            positions,
+            key=lambda pos: (abs(state.length(pos) - length), -state.updated_at(pos)),
+        )
+
+    def prefix_bucket(self, prefix: str, limit: int) -> list[int]:
+        # `source_prefix = norm[:8]`: full-length prefixes match row starts,
+        # shorter ones only equal rows.
+        needle = _SEP + prefix + (_SEP if len(prefix) < 8 else "")
+        hits: list[int] = []
+        for layer in self._layers:
+            state = layer.state
+            begin, end = layer.span()
+            offset = state.buffer.find(needle, begin, end)
+            while offset >= 0:
+                pos = bisect_left(state.starts, offset + 1)
+                if self._visible(layer, pos):
+                    hits.append(layer.offset + pos)
+                offset = state.buffer.find(needle, offset + 1, end)
+        return self._by_distance(hits)[:limit]
+
+    def length_bucket(self, limit: int) -> list[int]:
+        # Rows nearest the query length first, newest first within a distance.
+        length = self._length
+        snapshot = self.state
+        per_layer = [self._layer_length_bucket(layer, limit) for layer in self._layers]
+        if len(per_layer) == 1:
+            return per_layer[0]
+        ordered = merge(
+            *per_layer,
+            key=lambda pos: (
+                abs(snapshot.length(pos) - length),
+                -snapshot.updated_at(pos),
+            ),
+        )
+        return list(islice(ordered, limit))
+
+    def _layer_length_bucket(self, layer: _Layer, limit: int) -> list[int]:
+        state = layer.state
+        out: list[int] = []
+        length = self._length
+        reach = max(length - self._min_len, self._max_len - length)
+        for distance in range(reach + 1):
+            groups: list[Iterator[int]] = []
+            for size in dict.fromkeys((length - distance, length + distance)):
+                if not self._min_len <= size <= self._max_len:
+                    continue
+                lo = bisect_left(state.lens, size, layer.lo, layer.hi)
+                hi = bisect_right(state.lens, size, lo, layer.hi)
+                if lo < hi:
+                    groups.append(iter(range(lo, hi)))
+            ordered = (
+                merge(*groups, key=lambda pos: -state.updated[pos])
+                if len(groups) > 1
+                else (groups[0] if groups else ())
+            )
+            for pos in ordered:
+                if self._visible(layer, pos):
+                    out.append(layer.offset + pos)
+                    if len(out) >= limit:
+                        return out
+        return out
+
+    def token_bucket(
+        self, token: str, limit: int, *, extra_ids: Iterable[int] = ()
+    ) -> list[int]:
+        # Rows whose source contains the token (so some source token contains
+        # it, as with the vocabulary lookup) plus `extra_ids` (stem matches).
+        snapshot = self.state
+        found: set[int] = set()
+        for layer in self._layers:
+            state = layer.state
+            begin, end = layer.span()
+            buffer = state.buffer
+            offset = buffer.find(token, begin, end)
+            while offset >= 0:
+                pos = bisect_right(state.starts, offset) - 1
+                if self._visible(layer, pos):
+                    found.add(layer.offset + pos)
+                offset = buffer.find(token, state.starts[pos] + state.lens[pos], end)
+        for entry_id in extra_ids:
+            extra = snapshot.position(entry_id)
+            if (
+                extra is not None
+                and self._min_len <= snapshot.length(extra) <= self._max_len
+                and self.visible(extra)
+            ):
+                found.add(extra)
+        spaced = f" {token} "
+        head = f"{token} "
+        tail = f" {token}"
+        length = self._length
+
+        def rank(pos: int) -> tuple[int, int, int]:
+            norm = snapshot.norm(pos)
+            if norm == token:
+                kind = 0
+            elif norm.startswith(head):
+                kind = 1
+            elif spaced in norm:
+                kind = 2
+            elif norm.endswith(tail):
+                kind = 3
+            else:
+                kind = 4
+            return kind, abs(len(norm) - length), -snapshot.updated_at(pos)
+
+        return sorted(found, key=rank)[:limit]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import importlib
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+# Layout (little endian):
+#   magic "TZPTM", version u8, codec u8, reserved u8,
+#   source locale (u16 length + UTF-8), target locale (u16 length + UTF-8),
+#   blocks of (count u32, raw size u32, stored size u32, payload),
+#   terminated by an all-zero block header.
+# A raw payload is columnar: `count` u32 source byte lengths, `count` u32 target
+# byte lengths, then the concatenated source and target UTF-8 columns.
+SNAPSHOT_SUFFIX = ".tzptm"
+SNAPSHOT_CODECS = ("none", "zlib", "zstd")
+_MAGIC = b"TZPTM"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<5sBBB")
+_LOCALE_LEN = struct.Struct("<H")
+_BLOCK = struct.Struct("<III")
+_BLOCK_PAIRS = 4096
+_ZLIB_LEVEL = 6
+
+
+@dataclass(frozen=True, slots=True)
+class TMSnapshotHeader:
+    version: int
+    codec: str
+    source_locale: str
+    target_locale: str
+    body_offset: int
+
+
+def _zstd() -> Any:
+    # Python 3.14 ships `compression.zstd`; older runtimes need `zstandard`.
+    for name in ("compression.zstd", "zstandard"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    raise ValueError("zstd TM snapshots need Python 3.14+ or the zstandard package")
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(data, _ZLIB_LEVEL)
+    if codec == "zstd":
+        return bytes(_zstd().compress(data))
+    return data
+
+
+def _decompress(codec: str, data: bytes, raw_size: int) -> bytes:
+    if codec == "zlib":
+        out = zlib.decompress(data)
+    elif codec == "zstd":
+        out = bytes(_zstd().decompress(data))
+    else:
+        out = data
+    if len(out) != raw_size:
+        raise ValueError("Corrupt TM snapshot block")
+    return out
+
+
+def _u32_bytes(values: list[int]) -> bytes:
+    column = array("I", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _u32_values(data: bytes) -> array[int]:
+    column = array("I")
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _write_block(
+    handle: IO[bytes], codec: str, sources: list[bytes], targets: list[bytes]
+) -> None:
+    raw = b"".join(
+        (
+            _u32_bytes([len(item) for item in sources]),
+            _u32_bytes([len(item) for item in targets]),
+            *sources,
+            *targets,
+        )
+    )
+    stored = _compress(codec, raw)
+    handle.write(_BLOCK.pack(len(sources), len(raw), len(stored)))
+    handle.write(stored)
+
+
+def write_tm_snapshot(
+    path: Path,
+    pairs: Iterable[tuple[str, str]],
+    *,
+    source_locale: str,
+    target_locale: str,
+    codec: str = "zlib",
+    progress: Callable[[int], object] | None = None,
+) -> int:
+    if codec not in SNAPSHOT_CODECS:
+        raise ValueError(f"Unknown TM snapshot codec: {codec}")
+    if codec == "zstd":
+        _zstd()
+    count = 0
+    sources: list[bytes] = []
+    targets: list[bytes] = []
+    with path.open("wb") as handle:
+        handle.write(_PREAMBLE.pack(_MAGIC, _VERSION, SNAPSHOT_CODECS.index(codec), 0))
+        for locale in (source_locale, target_locale):
+            encoded = locale.strip().encode("utf-8")
+            handle.write(_LOCALE_LEN.pack(len(encoded)))
+            handle.write(encoded)
+        # Pairs are pulled lazily, so SQLite cursors stream straight to disk.
+        for source_text, target_text in pairs:
+            if not (source_text and target_text):
+                continue
+            sources.append(source_text.encode("utf-8"))
+            targets.append(target_text.encode("utf-8"))
+            if len(sources) >= _BLOCK_PAIRS:
+                _write_block(handle, codec, sources, targets)
+                count += len(sources)
+                sources, targets = [], []
+                if progress is not None:
+                    progress(count)
+        if sources:
+            _write_block(handle, codec, sources, targets)
+            count += len(sources)
+        handle.write(_BLOCK.pack(0, 0, 0))
+    if progress is not None:
+        progress(count)
+    return count
+
+
+def _parse_header(data: bytes | mmap.mmap) -> TMSnapshotHeader:
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("Not a TM snapshot")
+    magic, version, codec_id, _reserved = _PREAMBLE.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not a TM snapshot")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported TM snapshot version: {version}")
+    if codec_id >= len(SNAPSHOT_CODECS):
+        raise ValueError(f"Unknown TM snapshot codec id: {codec_id}")
+    offset = _PREAMBLE.size
+    locales: list[str] = []
+    for _side in range(2):
+        if len(data) < offset + _LOCALE_LEN.size:
+            raise ValueError("Truncated TM snapshot header")
+        (size,) = _LOCALE_LEN.unpack_from(data, offset)
+        offset += _LOCALE_LEN.size
+        locales.append(bytes(data[offset : offset + size]).decode("utf-8"))
+        offset += size
+    return TMSnapshotHeader(
+        version=version,
+        codec=SNAPSHOT_CODECS[codec_id],
+        source_locale=locales[0],
+        target_locale=locales[1],
+        body_offset=offset,
+    )
+
+
+def read_tm_snapshot_header(path: Path) -> TMSnapshotHeader:
+    with path.open("rb") as handle:
+        # Upper bound of the preamble plus two maximal locale fields.
+        return _parse_header(
+            handle.read(_PREAMBLE.size + 2 * (_LOCALE_LEN.size + 0xFFFF))
+        )
+
+
+def _iter_blocks(
+    view: mmap.mmap, header: TMSnapshotHeader
+) -> Iterator[tuple[int, bytes]]:
+    offset = header.body_offset
+    end = len(view)
+    while True:
+        if offset + _BLOCK.size > end:
+            raise ValueError("Truncated TM snapshot")
+        count, raw_size, stored_size = _BLOCK.unpack_from(view, offset)
+        offset += _BLOCK.size
+        if count == 0:
+            return
+        if offset + stored_size > end:
+            raise ValueError("Truncated TM snapshot")
+        yield count, _decompress(
+            header.codec, view[offset : offset + stored_size], raw_size
+        )
+        offset += stored_size
+
+
+def iter_tm_snapshot_pairs(path: Path) -> Iterator[tuple[str, str]]:
+    if path.stat().st_size == 0:
+        raise ValueError("Not a TM snapshot")
+    with (
+        path.open("rb") as handle,
+        mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view,
+    ):
+        header = _parse_header(view)
+        for count, raw in _iter_blocks(view, header):
+            lengths = _u32_values(raw[: 8 * count])
+            pos = 8 * count
+            sources: list[str] = []
+            for size in lengths[:count]:
+                sources.append(raw[pos : pos + size].decode("utf-8"))
+                pos += size
+            for index, size in enumerate(lengths[count:]):
+                yield sources[index], raw[pos : pos + size].decode("utf-8")
+                pos += size
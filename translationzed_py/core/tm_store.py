@@ -5,13 +5,21 @@ import re
 import sqlite3
 import threading
 import time
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
 from dataclasses import dataclass
+from difflib import SequenceMatcher
+from itertools import islice
 from pathlib import Path
+from typing import Any
+
+import xxhash
 
 from .app_config import LEGACY_CONFIG_DIR
 from .app_config import load as _load_app_config
 from .model import Status
+from .tm_memory import MemoryQuery, MemoryRow, TMMemoryIndex
+from .tm_snapshot import SNAPSHOT_SUFFIX, write_tm_snapshot
 from .tmx_io import iter_tm_pairs, write_tmx
 
 _PROJECT_ORIGIN = "project"
@@ -27,6 +35,71 @@ _SHORT_QUERY_MAX_CANDIDATES = 5000
 _SHORT_QUERY_BUCKET_CANDIDATES = 2500
 _MULTI_TOKEN_LEN_PADDING = 4
 _MAX_FUZZY_SOURCE_LEN = 5000
+_CONTENT_HASH_CHUNK = 1 << 20
+_TOKEN_INDEX_BATCH = 5000
+_EXPORT_BATCH_ROWS = 2000
+_MEMORY_FETCH_BATCH = 32
+_MEMORY_PARTS_MEMO = 50_000
+_SCORE_MEMO_LIMIT = 200_000
+_RESULT_MEMO_LIMIT = 2048
+_SHARDED_LAYOUT = "sharded"
+_SHARD_DIR = "tm_shards"
+_SHARD_CONN_CACHE = 8
+# Entry tables moved into shards by `migrate_layout`, in drop order.
+_ENTRY_TABLES = (
+    "tm_concordance",
+    "tm_concordance_build",
+    "tm_tokens",
+    "tm_token_vocab",
+    "tm_tokens_pending",
+    "tm_tokens_backfill",
+    "tm_memory_pending",
+    "tm_import_segments",
+    "tm_entries",
+)
+_ENTRY_COLUMNS = (
+    "source_text, target_text, source_norm, source_prefix, source_len, "
+    "source_locale, target_locale, origin, tm_name, tm_path, file_path, key, "
+    "row_status, updated_at"
+)
+# Trigram FTS needs at least three characters; shorter needles use a scan.
+_CONCORDANCE_MIN_FTS_LEN = 3
+_CONCORDANCE_MAX_SPANS = 32
+_CONCORDANCE_COLUMNS = {
+    "source": ("source_text",),
+    "target": ("target_text",),
+    "both": ("source_text", "target_text"),
+}
+# Delimited so one pair's phrase never matches inside another's.
+_CONCORDANCE_PAIR_SQL = (
+    "'|' || {row}.source_locale || '|' || {row}.target_locale || '|'"
+)
+_CONCORDANCE_TRIGGERS = ("tm_concordance_ai", "tm_concordance_ad", "tm_concordance_au")
+_TOKEN_TRIGGERS = ("tm_tokens_ai", "tm_tokens_ad", "tm_tokens_au")
+# Rows per executemany call when bulk-loading a snapshot.
+_BULK_INSERT_ROWS = 5000
+# Rows indexed per committed batch by `build_concordance_index`.
+_CONCORDANCE_BUILD_ROWS = 20_000
+# Page cache for concordance reads, set on the connection on first use.
+_CONCORDANCE_CACHE_KIB = 65536
+_INSERT_IMPORT_SQL = """
+INSERT OR IGNORE INTO tm_entries (
+    source_text,
+    target_text,
+    source_norm,
+    source_prefix,
+    source_len,
+    source_locale,
+    target_locale,
+    origin,
+    tm_name,
+    tm_path,
+    file_path,
+    key,
+    row_status,
+    updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 _IMPORT_VISIBLE_SQL = """
 origin != 'import'
 OR tm_path IS NULL
@@ -63,6 +136,20 @@ class TMMatch:
     row_status: int | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class TMConcordanceHit:
+    source_text: str
+    target_text: str
+    origin: str
+    tm_name: str | None
+    tm_path: str | None
+    file_path: str | None
+    key: str | None
+    updated_at: int
+    source_spans: tuple[tuple[int, int], ...] = ()
+    target_spans: tuple[tuple[int, int], ...] = ()
+
+
 @dataclass(frozen=True, slots=True)
 class TMImportFile:
     tm_path: str
@@ -78,6 +165,55 @@ class TMImportFile:
     status: str
     note: str
     updated_at: int
+    content_hash: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class TMMaintenancePair:
+    source_locale: str
+    target_locale: str
+    rows_before: int
+    rows_after: int
+    deduped: int
+    pruned: int
+
+
+@dataclass(frozen=True, slots=True)
+class TMMaintenanceReport:
+    pairs: tuple[TMMaintenancePair, ...]
+    bytes_before: int
+    bytes_after: int
+
+
+def format_maintenance_report(report: TMMaintenanceReport) -> str:
+    lines = [
+        f"Size: {report.bytes_before / 1048576:.2f} MiB -> "
+        f"{report.bytes_after / 1048576:.2f} MiB "
+        f"({(report.bytes_after - report.bytes_before) / 1048576:+.2f} MiB)"
+    ]
+    for pair in report.pairs:
+        lines.append(
+            f"{pair.source_locale}->{pair.target_locale}: "
+            f"{pair.rows_before} -> {pair.rows_after} rows "
+            f"(deduped {pair.deduped}, pruned {pair.pruned})"
+        )
+    if not report.pairs:
+        lines.append("No TM entries.")
+    return "\n".join(lines)
+
+
+def import_file_content_hash(path: Path) -> str:
+    digest = xxhash.xxh64()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_CONTENT_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _segment_hash(source_text: str, target_text: str) -> int:
+    # Stored in a signed SQLite INTEGER column.
+    value = xxhash.xxh3_64_intdigest(f"{source_text}\0{target_text}".encode())
+    return value - (1 << 64) if value >= (1 << 63) else value
 
 
 def _normalize(text: str) -> str:
@@ -120,12 +256,17 @@ def _token_matches(
     candidate_token: str,
     *,
     use_en_stemming: bool,
+    stems: Mapping[str, str] | None = None,
 ) -> bool:
     if query_token == candidate_token:
         return True
     if use_en_stemming:
-        query_stem = _stem_token(query_token)
-        candidate_stem = _stem_token(candidate_token)
+        query_stem = stems.get(query_token) if stems else None
+        if query_stem is None:
+            query_stem = _stem_token(query_token)
+        candidate_stem = stems.get(candidate_token) if stems else None
+        if candidate_stem is None:
+            candidate_stem = _stem_token(candidate_token)
         if len(query_stem) >= 3 and query_stem == candidate_stem:
             return True
     if len(query_token) == len(candidate_token) and len(query_token) >= 4:
@@ -161,17 +302,22 @@ def _contains_composed_phrase(
     query: str,
     *,
     use_en_stemming: bool,
+    parts: tuple[str, ...] | None = None,
+    text_tokens: tuple[str, ...] | None = None,
+    stems: Mapping[str, str] | None = None,
 ) -> bool:
-    parts = _query_tokens(query)
+    if parts is None:
+        parts = _query_tokens(query)
     if not parts:
         return False
-    text_tokens = _query_tokens(text)
+    if text_tokens is None:
+        text_tokens = _query_tokens(text)
     if not text_tokens:
         return False
     if len(parts) == 1:
         token = parts[0]
         return any(
-            _token_matches(token, cand, use_en_stemming=use_en_stemming)
+            _token_matches(token, cand, use_en_stemming=use_en_stemming, stems=stems)
             for cand in text_tokens
         )
     pos = 0
@@ -182,6 +328,7 @@ def _contains_composed_phrase(
                 part,
                 text_tokens[pos],
                 use_en_stemming=use_en_stemming,
+                stems=stems,
             ):
                 found = True
                 pos += 1
@@ -197,6 +344,7 @@ def _soft_token_overlap(
     candidate_tokens: set[str],
     *,
     use_en_stemming: bool,
+    stems: Mapping[str, str] | None = None,
 ) -> float:
     if not query_tokens or not candidate_tokens:
         return 0.0
@@ -207,6 +355,7 @@ def _soft_token_overlap(
                 query_token,
                 cand,
                 use_en_stemming=use_en_stemming,
+                stems=stems,
             )
             for cand in candidate_tokens
         ):
@@ -224,10 +373,256 @@ def _exact_token_overlap(
     return matched / max(1, len(query_tokens))
 
 
+def _score_candidate(
+    norm: str,
+    query_tokens: set[str],
+    cand_norm: str,
+    *,
+    use_en_stemming: bool,
+    query_parts: tuple[str, ...] | None = None,
+    cand_parts: tuple[str, ...] | None = None,
+    stems: Mapping[str, str] | None = None,
+) -> tuple[int, int, int] | None:
+    # Returns (score, raw_score, token_count_delta), or None when the candidate
+    # fails the token relevance gates. `*_parts` / `stems` are precomputed
+    # `_query_tokens` / `_stem_token` results; missing ones are derived here.
+    if cand_parts is None:
+        cand_parts = _query_tokens(cand_norm)
+    ratio = SequenceMatcher(None, norm, cand_norm, autojunk=False).ratio()
+    composed = _contains_composed_phrase(
+        cand_norm,
+        norm,
+        use_en_stemming=use_en_stemming,
+        parts=query_parts,
+        text_tokens=cand_parts,
+        stems=stems,
+    )
+    overlap = 0.0
+    exact_overlap = 0.0
+    token_count_delta = 999
+    if query_tokens:
+        cand_tokens = set(cand_parts)
+        token_count_delta = abs(len(cand_tokens) - len(query_tokens))
+        if cand_tokens:
+            overlap = _soft_token_overlap(
+                query_tokens,
+                cand_tokens,
+                use_en_stemming=use_en_stemming,
+                stems=stems,
+            )
+            exact_overlap = _exact_token_overlap(query_tokens, cand_tokens)
+            if len(query_tokens) == 1:
+                if overlap < 0.5 and not composed:
+                    return None
+            elif overlap < 0.34 and ratio < 0.75 and not composed:
+                return None
+        elif not composed:
+            return None
+    raw_score = int(round(ratio * 100))
+    score = raw_score
+    token_bonus = int(round((overlap * 6.0) + (exact_overlap * 4.0)))
+    score = min(100, score + token_bonus)
+    if composed:
+        score = max(score, 90 if len(query_tokens) > 1 else 85)
+    if score >= 100 and cand_norm != norm:
+        score = 99
+    return score, raw_score, token_count_delta
+
+
+# `_score_candidate` is pure in (query norm, candidate norm, stemming), so
+# results stay valid across writes and are shared by every store and thread.
+_SCORE_MEMO: dict[tuple[str, str, bool], tuple[int, int, int] | None] = {}
+
+
+def _memo_score(
+    norm: str,
+    query_tokens: set[str],
+    cand_norm: str,
+    *,
+    use_en_stemming: bool,
+    query_parts: tuple[str, ...],
+    cand_parts: tuple[str, ...] | None,
+    stems: Mapping[str, str],
+) -> tuple[int, int, int] | None:
+    key = (norm, cand_norm, use_en_stemming)
+    try:
+        return _SCORE_MEMO[key]
+    except KeyError:
+        pass
+    if len(_SCORE_MEMO) >= _SCORE_MEMO_LIMIT:
+        _SCORE_MEMO.clear()
+    result = _SCORE_MEMO[key] = _score_candidate(
+        norm,
+        query_tokens,
+        cand_norm,
+        use_en_stemming=use_en_stemming,
+        query_parts=query_parts,
+        cand_parts=cand_parts,
+        stems=stems,
+    )
+    return result
+
+
+def _scored_rank_key(
+    item: tuple[Any, int, int, int], *, length: int, multi_token: bool
+) -> tuple[int, ...]:
+    row, score, _raw_score, token_count_delta = item
+    key = (
+        -score,
+        abs(len(row["source_norm"]) - length),
+        0 if row["origin"] == _PROJECT_ORIGIN else 1,
+        -row["updated_at"],
+    )
+    return (token_count_delta, *key) if multi_token else key
+
+
+def _sort_scored(
+    scored: list[tuple[Any, int, int, int]],
+    *,
+    length: int,
+    multi_token: bool,
+) -> None:
+    scored.sort(
+        key=lambda item: _scored_rank_key(item, length=length, multi_token=multi_token)
+    )
+
+
+def _fuzzy_window(norm: str, token_count: int) -> tuple[int, int, int, int]:
+    # (min_len, max_len, max_candidates, bucket_candidates) for fuzzy retrieval.
+    length = len(norm)
+    min_len = max(1, int(length * 0.6))
+    max_len = int(length * 1.4) if length > 5 else length + 10
+    if token_count > 1:
+        # Allow phrase-expansion neighbors (e.g. "make item" -> "make new item").
+        max_len = max(
+            max_len,
+            length + max(_MULTI_TOKEN_LEN_PADDING, token_count * 2),
+        )
+    if length <= _SHORT_QUERY_LEN:
+        max_len = max(max_len, 40)
+        return 1, max_len, _SHORT_QUERY_MAX_CANDIDATES, _SHORT_QUERY_BUCKET_CANDIDATES
+    return min_len, max_len, _MAX_FUZZY_CANDIDATES, _FUZZY_BUCKET_CANDIDATES
+
+
+def _merge_buckets(
+    length: int,
+    prefix_rows: list[Any],
+    token_rows: list[Any],
+    fallback_rows: list[Any],
+    *,
+    limit: int,
+    key: Callable[[Any], Hashable],
+) -> list[Any]:
+    # For tiny queries, prefix-only retrieval is too strict
+    # (e.g. "all" vs "apply all").
+    # Seed token-containing rows first to keep close phrase neighbors visible.
+    if length <= _SHORT_QUERY_LEN:
+        buckets = (token_rows, prefix_rows, fallback_rows)
+    else:
+        buckets = (prefix_rows, token_rows, fallback_rows)
+    rows: list[Any] = []
+    seen: set[Hashable] = set()
+    for bucket in buckets:
+        for row in bucket:
+            row_key = key(row)
+            if row_key in seen:
+                continue
+            seen.add(row_key)
+            rows.append(row)
+            if len(rows) >= limit:
+                return rows
+    return rows
+
+
+def _import_entry_row(
+    source_text: str,
+    target_text: str,
+    source_norm: str,
+    *,
+    source_locale: str,
+    target_locale: str,
+    tm_name: str | None,
+    tm_path: str | None,
+    updated_at: int,
+) -> tuple[object, ...]:
+    return (
+        source_text,
+        target_text,
+        source_norm,
+        _prefix(source_norm),
+        len(source_norm),
+        source_locale,
+        target_locale,
+        _IMPORT_ORIGIN,
+        tm_name,
+        tm_path,
+        None,
+        None,
+        None,
+        updated_at,
+    )
+
+
+def _iter_import_rows(
+    pairs: Iterable[tuple[str, str]],
+    *,
+    source_locale: str,
+    target_locale: str,
+    tm_name: str | None,
+    tm_path: str | None,
+    updated_at: int,
+) -> Iterator[tuple[object, ...]]:
+    for source_text, target_text in pairs:
+        if not (source_text and target_text):
+            continue
+        source_norm = _normalize(source_text)
+        if not source_norm:
+            continue
+        yield _import_entry_row(
+            source_text,
+            target_text,
+            source_norm,
+            source_locale=source_locale,
+            target_locale=target_locale,
+            tm_name=tm_name,
+            tm_path=tm_path,
+            updated_at=updated_at,
+        )
+
+
+def _concordance_spans(
+    pattern: re.Pattern[str], text: str
+) -> tuple[tuple[int, int], ...]:
+    spans: list[tuple[int, int]] = []
+    for match in pattern.finditer(text):
+        spans.append(match.span())
+        if len(spans) >= _CONCORDANCE_MAX_SPANS:
+            break
+    return tuple(spans)
+
+
+def _casefold(text: object) -> str:
+    return text.casefold() if isinstance(text, str) else ""
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
 def _normalize_locale(locale: str) -> str:
     return locale.strip().upper()
 
 
+def _shard_path(db_path: Path, source_locale: str, target_locale: str) -> Path:
+    # Pairs whose codes differ only in punctuation share a file; rows still
+    # carry their locales, so every query keeps filtering on the pair.
+    parts = [
+        re.sub(r"[^A-Z0-9]+", "-", _normalize_locale(locale)).strip("-") or "_"
+        for locale in (source_locale, target_locale)
+    ]
+    return db_path.parent / _SHARD_DIR / f"{parts[0]}__{parts[1]}.sqlite"
+
+
 def _normalize_row_status(value: object) -> int | None:
     if value is None:
         return None
@@ -266,13 +661,30 @@ def _normalize_origins(origins: Iterable[str] | None) -> tuple[str, ...]:
 
 class TMStore:
     _QUERY_LOCAL = threading.local()
+    # In-memory retrieval indexes keyed by (resolved DB path, source, target).
+    _MEMORY_LOCK = threading.Lock()
+    _MEMORY_INDEXES: dict[tuple[str, str, str], TMMemoryIndex] = {}
+    # Whether a DB uses the per-locale-pair shard layout, keyed by path.
+    _LAYOUT_LOCK = threading.Lock()
+    _LAYOUTS: dict[str, bool] = {}
+    # Query results keyed by (DB, norm, pair, origins, limit, min score,
+    # generation); any committed write bumps the generation.
+    _RESULT_LOCK = threading.Lock()
+    _RESULT_MEMO: OrderedDict[Hashable, tuple[TMMatch, ...]] = OrderedDict()
+    _GENERATION = 0
 
     def __init__(self, root: Path) -> None:
         cfg = _load_app_config(root)
+        self._root = root
         self._path = self._resolve_db_path(root, cfg.config_dir)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(self._path)
         self._conn.row_factory = sqlite3.Row
+        # Deletions not yet committed, forwarded to memory indexes on commit.
+        self._memory_removed_ids: list[int] = []
+        self._memory_removed_paths: list[str] = []
+        self._shard_conns: dict[Path, sqlite3.Connection] = {}
+        self._sharded = False
         self._configure()
         self._ensure_schema()
 
@@ -301,16 +713,26 @@ class TMStore:
             return False
 
     def close(self) -> None:
+        for conn in self._shard_conns.values():
+            conn.close()
+        self._shard_conns.clear()
         self._conn.close()
 
     @property
     def db_path(self) -> Path:
         return self._path
 
+    @property
+    def sharded(self) -> bool:
+        return self._sharded
+
     def has_entries(self, *, source_locale: str, target_locale: str) -> bool:
         source_locale = _normalize_locale(source_locale)
         target_locale = _normalize_locale(target_locale)
-        row = self._conn.execute(
+        conn = self._existing_entries_conn(source_locale, target_locale)
+        if conn is None:
+            return False
+        row = conn.execute(
             """
             SELECT 1
             FROM tm_entries
@@ -326,25 +748,363 @@ class TMStore:
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA temp_store=MEMORY")
+        conn.create_function("tzp_casefold", 1, _casefold, deterministic=True)
 
     def _configure(self) -> None:
         self._configure_conn(self._conn)
 
     @classmethod
-    def _query_conn_for_path(cls, db_path: Path) -> sqlite3.Connection:
+    def _query_conn_for_path(
+        cls,
+        db_path: Path,
+        source_locale: str | None = None,
+        target_locale: str | None = None,
+    ) -> sqlite3.Connection | None:
+        # Per-thread read connection: the main DB, or the pair's shard (None
+        # when a sharded DB has no rows for the pair yet).
         local = cls._QUERY_LOCAL
-        conn = getattr(local, "conn", None)
-        path = getattr(local, "path", None)
-        if conn is None or path != db_path:
+        conns: dict[Path, sqlite3.Connection] | None = getattr(local, "conns", None)
+        if conns is None:
+            conns = local.conns = {}
+        path = db_path
+        if (
+            source_locale is not None
+            and target_locale is not None
+            and cls._is_sharded(db_path)
+        ):
+            path = _shard_path(db_path, source_locale, target_locale)
+        conn = conns.get(path)
+        if conn is not None:
+            return conn
+        if path != db_path and not path.exists():
+            return None
+        if len(conns) >= _SHARD_CONN_CACHE:
+            for stale in conns.values():
+                stale.close()
+            conns.clear()
+        if path == db_path:
             conn = sqlite3.connect(db_path)
             conn.row_factory = sqlite3.Row
             cls._configure_conn(conn)
-            local.conn = conn
-            local.path = db_path
+        else:
+            conn = cls._open_shard(db_path, path)
+        conns[path] = conn
+        return conn
+
+    @classmethod
+    def _open_shard(cls, db_path: Path, shard_path: Path) -> sqlite3.Connection:
+        # The shard is `main`; the registry DB is attached, so unqualified
+        # `tm_import_files` (absent from shards) resolves to it.
+        conn = sqlite3.connect(shard_path)
+        conn.row_factory = sqlite3.Row
+        cls._configure_conn(conn)
+        conn.execute("ATTACH DATABASE ? AS registry", (str(db_path),))
+        return conn
+
+    @staticmethod
+    def _read_layout(conn: sqlite3.Connection) -> str:
+        try:
+            row = conn.execute(
+                "SELECT value FROM tm_meta WHERE name = 'layout'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return ""
+        return str(row[0]) if row is not None else ""
+
+    @classmethod
+    def _is_sharded(cls, db_path: Path) -> bool:
+        key = str(db_path)
+        with cls._LAYOUT_LOCK:
+            cached = cls._LAYOUTS.get(key)
+        if cached is not None:
+            return cached
+        conn = sqlite3.connect(db_path)
+        try:
+            sharded = cls._read_layout(conn) == _SHARDED_LAYOUT
+        finally:
+            conn.close()
+        with cls._LAYOUT_LOCK:
+            cls._LAYOUTS[key] = sharded
+        return sharded
+
+    def _shard_conn(self, path: Path) -> sqlite3.Connection:
+        conn = self._shard_conns.get(path)
+        if conn is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._open_shard(self._path, path)
+            self._ensure_entry_schema(conn)
+            conn.commit()
+            self._shard_conns[path] = conn
         return conn
 
+    def _entries_conn(
+        self, source_locale: str, target_locale: str
+    ) -> sqlite3.Connection:
+        if not self._sharded:
+            return self._conn
+        return self._shard_conn(_shard_path(self._path, source_locale, target_locale))
+
+    def _existing_entries_conn(
+        self, source_locale: str, target_locale: str
+    ) -> sqlite3.Connection | None:
+        # Like `_entries_conn`, but reads never create an empty shard.
+        if not self._sharded:
+            return self._conn
+        path = _shard_path(self._path, source_locale, target_locale)
+        if path not in self._shard_conns and not path.exists():
+            return None
+        return self._shard_conn(path)
+
+    def _tm_path_conns(self, tm_path: str) -> list[sqlite3.Connection]:
+        if not self._sharded:
+            return [self._conn]
+        row = self._conn.execute(
+            "SELECT source_locale, target_locale FROM tm_import_files WHERE tm_path = ?",
+            (tm_path,),
+        ).fetchone()
+        if row is not None and row[0] and row[1]:
+            conn = self._existing_entries_conn(row[0], row[1])
+            return [] if conn is None else [conn]
+        return self._all_entries_conns()
+
+    def migrate_layout(self, *, sharded: bool) -> int:
+        """Move entries between `tm.sqlite` and per-locale-pair shard files.
+
+        Returns the number of rows moved. Run it while no other process has
+        the DB open: readers keep connections to the previous layout.
+        """
+        if sharded == self._sharded:
+            return 0
+        for conn in self._shard_conns.values():
+            conn.close()
+        self._shard_conns.clear()
+        local_conns = getattr(self._QUERY_LOCAL, "conns", None)
+        if local_conns:
+            for conn in local_conns.values():
+                conn.close()
+            local_conns.clear()
+        self.unload_memory_index(self._path)
+        moved = self._shard_entries() if sharded else self._unshard_entries()
+        self._sharded = sharded
+        with self._LAYOUT_LOCK:
+            self._LAYOUTS[str(self._path)] = sharded
+        self._bump_generation()
+        return moved
+
+    def _shard_entries(self) -> int:
+        self._conn.commit()
+        shard_dir = self._path.parent / _SHARD_DIR
+        pairs: dict[Path, list[tuple[str, str]]] = {}
+        for source_locale, target_locale in self._conn.execute(
+            "SELECT DISTINCT source_locale, target_locale FROM tm_entries"
+        ):
+            path = _shard_path(self._path, source_locale, target_locale)
+            pairs.setdefault(path, []).append((source_locale, target_locale))
+        for stale in shard_dir.glob("*.sqlite*"):
+            stale.unlink()
+        moved = 0
+        for path, locales in sorted(pairs.items()):
+            conn = self._shard_conn(path)
+            for source_locale, target_locale in locales:
+                # Ids are kept, so tokens and import segments copy verbatim.
+                cur = conn.execute(
+                    f"""
+                    INSERT INTO tm_entries (id, {_ENTRY_COLUMNS})
+                    SELECT id, {_ENTRY_COLUMNS}
+                    FROM registry.tm_entries
+                    WHERE source_locale = ? AND target_locale = ?
+                    ORDER BY id
+                    """,
+                    (source_locale, target_locale),
+                )
+                moved += max(cur.rowcount, 0)
+            conn.execute("""
+                INSERT OR REPLACE INTO tm_tokens(token, entry_id, pos, stem)
+                SELECT t.token, t.entry_id, t.pos, t.stem
+                FROM registry.tm_tokens AS t
+                JOIN tm_entries AS e ON e.id = t.entry_id
+                """)
+            conn.execute("""
+                DELETE FROM tm_tokens_pending
+                WHERE entry_id IN (SELECT entry_id FROM tm_tokens)
+                """)
+            conn.execute("""
+                INSERT OR IGNORE INTO tm_token_vocab(token)
+                SELECT DISTINCT token FROM tm_tokens
+                """)
+            conn.execute("""
+                INSERT OR REPLACE INTO tm_import_segments(tm_path, seg_hash, entry_id)
+                SELECT s.tm_path, s.seg_hash, s.entry_id
+                FROM registry.tm_import_segments AS s
+                JOIN tm_entries AS e ON e.id = s.entry_id
+                """)
+            self._index_pending_tokens(conn)
+            conn.commit()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tm_meta(name, value) VALUES ('layout', ?)",
+            (_SHARDED_LAYOUT,),
+        )
+        self._conn.execute("DROP VIEW IF EXISTS tm_concordance_content")
+        for table in _ENTRY_TABLES:
+            self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+        return moved
+
+    def _unshard_entries(self) -> int:
+        self._ensure_entry_schema(self._conn)
+        self._conn.commit()
+        shard_dir = self._path.parent / _SHARD_DIR
+        shards = sorted(shard_dir.glob("*.sqlite"))
+        moved = 0
+        for path in shards:
+            self._conn.execute("ATTACH DATABASE ? AS shard", (str(path),))
+            try:
+                # Ids are reassigned; segments are rebuilt from the rows below.
+                cur = self._conn.execute(f"""
+                    INSERT OR IGNORE INTO tm_entries ({_ENTRY_COLUMNS})
+                    SELECT {_ENTRY_COLUMNS}
+                    FROM shard.tm_entries
+                    ORDER BY id
+                    """)
+                moved += max(cur.rowcount, 0)
+                self._conn.commit()
+            finally:
+                self._conn.execute("DETACH DATABASE shard")
+        self._conn.execute("DELETE FROM tm_import_segments")
+        for (tm_path,) in self._conn.execute(
+            "SELECT DISTINCT tm_path FROM tm_entries "
+            "WHERE origin = ? AND tm_path IS NOT NULL",
+            (_IMPORT_ORIGIN,),
+        ).fetchall():
+            self._rebuild_import_segments(self._conn, tm_path)
+        self._index_pending_tokens(self._conn)
+        self._conn.execute("DELETE FROM tm_meta WHERE name = 'layout'")
+        self._conn.commit()
+        for path in shard_dir.glob("*.sqlite*"):
+            path.unlink()
+        with contextlib.suppress(OSError):
+            shard_dir.rmdir()
+        return moved
+
+    @classmethod
+    def clear_query_memos(cls) -> None:
+        _SCORE_MEMO.clear()
+        cls._bump_generation()
+
+    @classmethod
+    def _bump_generation(cls) -> None:
+        with cls._RESULT_LOCK:
+            cls._GENERATION += 1
+            cls._RESULT_MEMO.clear()
+
+    @classmethod
+    def _memory_indexes(cls, db_path: Path) -> list[TMMemoryIndex]:
+        db_key = str(db_path.resolve())
+        with cls._MEMORY_LOCK:
+            return [
+                index for key, index in cls._MEMORY_INDEXES.items() if key[0] == db_key
+            ]
+
+    @classmethod
+    def _memory_index(
+        cls, db_path: Path, source_locale: str, target_locale: str
+    ) -> TMMemoryIndex | None:
+        with cls._MEMORY_LOCK:
+            if not cls._MEMORY_INDEXES:
+                return None
+            index = cls._MEMORY_INDEXES.get(
+                (str(db_path.resolve()), source_locale, target_locale)
+            )
+        return index if index is not None and index.ready else None
+
+    @classmethod
+    def load_memory_index(
+        cls, db_path: Path, *, source_locale: str, target_locale: str
+    ) -> TMMemoryIndex:
+        """Serve fuzzy queries for one locale pair from memory.
+
+        Replaces any other pair loaded for the same DB; SQLite stays the
+        durable store and writers keep the index in sync.
+        """
+        source_locale = _normalize_locale(source_locale)
+        target_locale = _normalize_locale(target_locale)
+        key = (str(db_path.resolve()), source_locale, target_locale)
+        with cls._MEMORY_LOCK:
+            index = cls._MEMORY_INDEXES.get(key)
+            if index is not None:
+                return index
+            for other in [k for k in cls._MEMORY_INDEXES if k[0] == key[0]]:
+                del cls._MEMORY_INDEXES[other]
+            # Registered before reading so writes committed meanwhile queue up.
+            index = TMMemoryIndex(source_locale, target_locale)
+            cls._MEMORY_INDEXES[key] = index
+        conn = cls._query_conn_for_path(db_path, source_locale, target_locale)
+        try:
+            if conn is None:
+                index.load(())
+                return index
+            index.load(
+                MemoryRow(int(entry_id), source_norm, origin, tm_path, int(updated))
+                for entry_id, source_norm, origin, tm_path, updated in conn.execute(
+                    """
+                    SELECT id, source_norm, origin, tm_path, updated_at
+                    FROM tm_entries
+                    WHERE source_locale = ? AND target_locale = ?
+                    """,
+                    (source_locale, target_locale),
+                )
+            )
+        except BaseException:
+            with cls._MEMORY_LOCK:
+                if cls._MEMORY_INDEXES.get(key) is index:
+                    del cls._MEMORY_INDEXES[key]
+            raise
+        return index
+
+    @classmethod
+    def unload_memory_index(cls, db_path: Path) -> None:
+        db_key = str(db_path.resolve())
+        with cls._MEMORY_LOCK:
+            for key in [k for k in cls._MEMORY_INDEXES if k[0] == db_key]:
+                del cls._MEMORY_INDEXES[key]
+
     def _ensure_schema(self) -> None:
         self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_import_files (
+                tm_path TEXT PRIMARY KEY,
+                tm_name TEXT NOT NULL,
+                source_locale TEXT,
+                target_locale TEXT,
+                source_locale_raw TEXT NOT NULL DEFAULT '',
+                target_locale_raw TEXT NOT NULL DEFAULT '',
+                segment_count INTEGER NOT NULL DEFAULT 0,
+                mtime_ns INTEGER NOT NULL,
+                file_size INTEGER NOT NULL,
+                enabled INTEGER NOT NULL DEFAULT 1,
+                status TEXT NOT NULL,
+                note TEXT NOT NULL DEFAULT '',
+                updated_at INTEGER NOT NULL
+            )
+            """)
+        self._ensure_tm_import_files_columns()
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """)
+        self._sharded = self._read_layout(self._conn) == _SHARDED_LAYOUT
+        with self._LAYOUT_LOCK:
+            self._LAYOUTS[str(self._path)] = self._sharded
+        if not self._sharded:
+            self._ensure_entry_schema(self._conn)
+        self._conn.commit()
+
+    @classmethod
+    def _ensure_entry_schema(cls, conn: sqlite3.Connection) -> None:
+        # Entry tables live in `tm.sqlite`, or in each pair's shard file.
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS tm_entries (
                 id INTEGER PRIMARY KEY,
                 source_text TEXT NOT NULL,
@@ -363,32 +1123,29 @@ class TMStore:
                 updated_at INTEGER NOT NULL
             )
             """)
-        self._ensure_tm_entries_columns()
-        self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS tm_import_files (
-                tm_path TEXT PRIMARY KEY,
-                tm_name TEXT NOT NULL,
-                source_locale TEXT,
-                target_locale TEXT,
-                source_locale_raw TEXT NOT NULL DEFAULT '',
-                target_locale_raw TEXT NOT NULL DEFAULT '',
-                segment_count INTEGER NOT NULL DEFAULT 0,
-                mtime_ns INTEGER NOT NULL,
-                file_size INTEGER NOT NULL,
-                enabled INTEGER NOT NULL DEFAULT 1,
-                status TEXT NOT NULL,
-                note TEXT NOT NULL DEFAULT '',
-                updated_at INTEGER NOT NULL
-            )
+        cls._ensure_tm_entries_columns(conn)
+        # Per-file fingerprints of imported pairs; lets a changed TM file be
+        # re-synced by applying only added/removed pairs.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_import_segments (
+                tm_path TEXT NOT NULL,
+                seg_hash INTEGER NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY (tm_path, seg_hash)
+            ) WITHOUT ROWID
             """)
-        self._ensure_tm_import_files_columns()
-        self._conn.execute("DROP INDEX IF EXISTS tm_project_key")
-        self._conn.execute("DROP INDEX IF EXISTS tm_import_unique")
-        self._conn.execute("""
+        cls._ensure_unique_index(
+            conn,
+            "tm_project_key",
+            """
             CREATE UNIQUE INDEX IF NOT EXISTS tm_project_key
             ON tm_entries(origin, source_locale, target_locale, file_path, key)
-            """)
-        self._conn.execute("""
+            """,
+        )
+        cls._ensure_unique_index(
+            conn,
+            "tm_import_unique",
+            """
             CREATE UNIQUE INDEX IF NOT EXISTS tm_import_unique
             ON tm_entries(
                 origin,
@@ -399,89 +1156,520 @@ class TMStore:
                 target_text
             )
             WHERE origin = 'import'
-            """)
-        self._conn.execute("""
+            """,
+        )
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS tm_exact_lookup
             ON tm_entries(source_locale, target_locale, source_norm, origin)
             """)
-        self._conn.execute("""
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS tm_prefix_lookup
             ON tm_entries(source_locale, target_locale, source_prefix, source_len)
             """)
-        self._conn.execute("""
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS tm_len_lookup
             ON tm_entries(source_locale, target_locale, source_len, origin)
             """)
-        self._conn.execute("""
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS tm_import_path_lookup
             ON tm_entries(origin, tm_path)
             """)
-        self._conn.commit()
+        cls._ensure_concordance_index(conn)
+        cls._ensure_token_index(conn)
+        cls._ensure_memory_queue(conn)
 
-    def _ensure_tm_entries_columns(self) -> None:
-        cols = {
-            row["name"]
-            for row in self._conn.execute("PRAGMA table_info(tm_entries)").fetchall()
-        }
-        if "tm_name" not in cols:
-            self._conn.execute("ALTER TABLE tm_entries ADD COLUMN tm_name TEXT")
-        if "tm_path" not in cols:
-            self._conn.execute("ALTER TABLE tm_entries ADD COLUMN tm_path TEXT")
-        if "row_status" not in cols:
-            self._conn.execute("ALTER TABLE tm_entries ADD COLUMN row_status INTEGER")
+    @staticmethod
+    def _ensure_unique_index(conn: sqlite3.Connection, name: str, sql: str) -> None:
+        # Recreated only when an older definition is stored; rebuilding it on
+        # every open would sort the whole table.
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (name,),
+        ).fetchone()
+        wanted = " ".join(sql.replace("IF NOT EXISTS ", "").split())
+        if row is not None and " ".join(str(row[0]).split()) != wanted:
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute(sql)
 
-    def _ensure_tm_import_files_columns(self) -> None:
-        cols = {
-            row["name"]
-            for row in self._conn.execute(
-                "PRAGMA table_info(tm_import_files)"
-            ).fetchall()
-        }
-        if "enabled" not in cols:
-            self._conn.execute(
-                "ALTER TABLE tm_import_files ADD COLUMN enabled INTEGER NOT NULL DEFAULT 1"
-            )
-        if "source_locale_raw" not in cols:
-            self._conn.execute(
-                "ALTER TABLE tm_import_files ADD COLUMN source_locale_raw TEXT NOT NULL DEFAULT ''"
-            )
-        if "target_locale_raw" not in cols:
-            self._conn.execute(
-                "ALTER TABLE tm_import_files ADD COLUMN target_locale_raw TEXT NOT NULL DEFAULT ''"
-            )
-        if "segment_count" not in cols:
-            self._conn.execute(
-                "ALTER TABLE tm_import_files ADD COLUMN segment_count INTEGER NOT NULL DEFAULT 0"
+    @staticmethod
+    def _ensure_concordance_index(conn: sqlite3.Connection) -> None:
+        # External-content trigram index over both sides, kept in sync by
+        # triggers so every write path (upsert, import, delta, delete) is
+        # covered. SQLite builds without FTS5/trigram fall back to a scan.
+        # `locale_pair` is indexed too, so MATCH is scoped to one pair before
+        # ranking instead of running over every locale in the DB. The index
+        # itself is only created by `build_concordance_index`: it is about as
+        # large as the entry text, so opening a store never pays for it.
+        conn.execute(f"""
+            CREATE VIEW IF NOT EXISTS tm_concordance_content AS
+            SELECT
+                id,
+                {_CONCORDANCE_PAIR_SQL.format(row="tm_entries")} AS locale_pair,
+                source_text,
+                target_text
+            FROM tm_entries
+            """)
+        # Id range not yet indexed by a running (or interrupted) build; the
+        # triggers skip rows inside it, the build fills them in.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_concordance_build (
+                next_id INTEGER NOT NULL,
+                last_id INTEGER NOT NULL
             )
+            """)
+        columns = {
+            str(row[1])
+            for row in conn.execute("PRAGMA main.table_info(tm_concordance)").fetchall()
+        }
+        if columns and "locale_pair" not in columns:
+            # Indexes from before the pair column are rebuilt on next use.
+            for trigger in _CONCORDANCE_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute("DROP TABLE tm_concordance")
+            return
+        if not columns:
+            return
+        trigger_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+            (_CONCORDANCE_TRIGGERS[0],),
+        ).fetchone()
+        if trigger_sql is not None and "tm_concordance_build" not in trigger_sql[0]:
+            # Triggers from before batched builds index every row.
+            for trigger in _CONCORDANCE_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        TMStore._create_concordance_triggers(conn)
 
-    def upsert_project_entries(
+    @staticmethod
+    def _create_concordance_triggers(conn: sqlite3.Connection) -> None:
+        new_pair = _CONCORDANCE_PAIR_SQL.format(row="new")
+        old_pair = _CONCORDANCE_PAIR_SQL.format(row="old")
+        indexed = (
+            "NOT EXISTS (SELECT 1 FROM tm_concordance_build "
+            "WHERE {row}.id BETWEEN next_id AND last_id)"
+        )
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tm_concordance_ai
+            AFTER INSERT ON tm_entries
+            WHEN {indexed.format(row="new")}
+            BEGIN
+                INSERT INTO tm_concordance(rowid, locale_pair, source_text, target_text)
+                VALUES (new.id, {new_pair}, new.source_text, new.target_text);
+            END
+            """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tm_concordance_ad
+            AFTER DELETE ON tm_entries
+            WHEN {indexed.format(row="old")}
+            BEGIN
+                INSERT INTO tm_concordance(
+                    tm_concordance, rowid, locale_pair, source_text, target_text
+                ) VALUES (
+                    'delete', old.id, {old_pair}, old.source_text, old.target_text
+                );
+            END
+            """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tm_concordance_au
+            AFTER UPDATE OF source_text, target_text, source_locale, target_locale
+            ON tm_entries
+            WHEN (
+                old.source_text IS NOT new.source_text
+                OR old.target_text IS NOT new.target_text
+                OR old.source_locale IS NOT new.source_locale
+                OR old.target_locale IS NOT new.target_locale
+            ) AND {indexed.format(row="old")}
+            BEGIN
+                INSERT INTO tm_concordance(
+                    tm_concordance, rowid, locale_pair, source_text, target_text
+                ) VALUES (
+                    'delete', old.id, {old_pair}, old.source_text, old.target_text
+                );
+                INSERT INTO tm_concordance(rowid, locale_pair, source_text, target_text)
+                VALUES (new.id, {new_pair}, new.source_text, new.target_text);
+            END
+            """)
+
+    def concordance_ready(self, *, source_locale: str, target_locale: str) -> bool:
+        """Whether concordance for the pair is served by the trigram index."""
+        conn = self._existing_entries_conn(
+            _normalize_locale(source_locale), _normalize_locale(target_locale)
+        )
+        return conn is not None and self._has_concordance_index(conn)
+
+    def build_concordance_index(
         self,
-        entries: Iterable[ProjectEntryRow],
         *,
         source_locale: str,
         target_locale: str,
-        file_path: str,
-        updated_at: int | None = None,
-    ) -> int:
-        source_locale = _normalize_locale(source_locale)
-        target_locale = _normalize_locale(target_locale)
-        now = int(updated_at if updated_at is not None else time.time())
-        count = 0
-        rows = []
-        for row in entries:
-            if len(row) == 3:
-                key, source_text, target_text = row
-                row_status: int | None = None
-            elif len(row) == 4:
-                key, source_text, target_text, status_raw = row
-                row_status = _normalize_row_status(status_raw)
+        should_stop: Callable[[], bool] | None = None,
+    ) -> bool:
+        """Create and fill the concordance index holding the pair's entries.
+
+        Rows are indexed in committed batches, so other connections keep
+        writing in between and a stopped build resumes where it left off.
+        Returns True once the index is ready; False when *should_stop*
+        interrupted it or SQLite lacks FTS5 trigram.
+        """
+        conn = self._existing_entries_conn(
+            _normalize_locale(source_locale), _normalize_locale(target_locale)
+        )
+        if conn is None or not self._start_concordance_build(conn):
+            return False
+        while True:
+            row = conn.execute(
+                "SELECT next_id, last_id FROM tm_concordance_build"
+            ).fetchone()
+            if row is None:
+                return True
+            if should_stop is not None and should_stop():
+                return False
+            next_id, last_id = int(row[0]), int(row[1])
+            end = min(last_id, next_id + _CONCORDANCE_BUILD_ROWS - 1)
+            conn.execute(
+                """
+                INSERT INTO tm_concordance(rowid, locale_pair, source_text, target_text)
+                SELECT id, locale_pair, source_text, target_text
+                FROM tm_concordance_content
+                WHERE id BETWEEN ? AND ?
+                """,
+                (next_id, end),
+            )
+            if end >= last_id:
+                conn.execute("DELETE FROM tm_concordance_build")
             else:
+                conn.execute("UPDATE tm_concordance_build SET next_id = ?", (end + 1,))
+            conn.commit()
+
+    @classmethod
+    def _start_concordance_build(cls, conn: sqlite3.Connection) -> bool:
+        if cls._has_concordance_table(conn):
+            return True
+        # One transaction, so readers never see the table without its range.
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE tm_concordance USING fts5(
+                    locale_pair,
+                    source_text,
+                    target_text,
+                    content='tm_concordance_content',
+                    content_rowid='id',
+                    tokenize='trigram'
+                )
+                """)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            return False
+        conn.execute("""
+            INSERT INTO tm_concordance_build(next_id, last_id)
+            SELECT MIN(id), MAX(id) FROM tm_entries HAVING COUNT(*) > 0
+            """)
+        cls._create_concordance_triggers(conn)
+        conn.commit()
+        return True
+
+    @classmethod
+    def _ensure_token_index(cls, conn: sqlite3.Connection) -> None:
+        # Source tokens (`_query_tokens` order) and EN stems, computed once per
+        # stored source instead of on every query; also the inverted index for
+        # token retrieval. Triggers queue changed rows in `tm_tokens_pending`,
+        # which `_index_pending_tokens` drains before each entry write commits.
+        # Rows stored before the index existed are an id range in
+        # `tm_tokens_backfill`, tokenised in batches by `backfill_tokens`.
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            ("tm_tokens",),
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_tokens (
+                token TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                pos INTEGER NOT NULL,
+                stem TEXT NOT NULL,
+                PRIMARY KEY (token, entry_id)
+            ) WITHOUT ROWID
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS tm_tokens_entry
+            ON tm_tokens(entry_id, pos, stem)
+            """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS tm_tokens_stem
+            ON tm_tokens(stem)
+            """)
+        # Distinct tokens, so substring lookups scan the vocabulary instead of
+        # every source. Never pruned; stale tokens just have no postings.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_token_vocab (
+                token TEXT PRIMARY KEY
+            ) WITHOUT ROWID
+            """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_tokens_pending (
+                entry_id INTEGER PRIMARY KEY
+            )
+            """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_tokens_backfill (
+                next_id INTEGER NOT NULL,
+                last_id INTEGER NOT NULL
+            )
+            """)
+        cls._create_token_triggers(conn)
+        if exists is None:
+            conn.execute("""
+                INSERT INTO tm_tokens_backfill(next_id, last_id)
+                SELECT MIN(id), MAX(id) FROM tm_entries HAVING COUNT(*) > 0
+                """)
+
+    @staticmethod
+    def _create_token_triggers(conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS tm_tokens_ai
+            AFTER INSERT ON tm_entries BEGIN
+                INSERT OR IGNORE INTO tm_tokens_pending(entry_id) VALUES (new.id);
+            END
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS tm_tokens_ad
+            AFTER DELETE ON tm_entries BEGIN
+                DELETE FROM tm_tokens WHERE entry_id = old.id;
+                DELETE FROM tm_tokens_pending WHERE entry_id = old.id;
+            END
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS tm_tokens_au
+            AFTER UPDATE OF source_norm ON tm_entries
+            WHEN old.source_norm IS NOT new.source_norm
+            BEGIN
+                DELETE FROM tm_tokens WHERE entry_id = old.id;
+                INSERT OR IGNORE INTO tm_tokens_pending(entry_id) VALUES (new.id);
+            END
+            """)
+
+    @staticmethod
+    def _ensure_memory_queue(conn: sqlite3.Connection) -> None:
+        # Rows whose recency changed without a new source (project upserts of
+        # an unchanged string). Re-sourced rows are already in
+        # tm_tokens_pending; both feed memory indexes on commit.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_memory_pending (
+                entry_id INTEGER PRIMARY KEY
+            )
+            """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS tm_memory_au
+            AFTER UPDATE OF updated_at ON tm_entries
+            WHEN old.updated_at IS NOT new.updated_at
+             AND old.source_norm IS new.source_norm
+            BEGIN
+                INSERT OR IGNORE INTO tm_memory_pending(entry_id) VALUES (new.id);
+            END
+            """)
+
+    @staticmethod
+    def _store_tokens(conn: sqlite3.Connection, batch: list[tuple[int, str]]) -> None:
+        rows = [
+            (token, entry_id, pos, _stem_token(token))
+            for entry_id, source_norm in batch
+            for pos, token in enumerate(_query_tokens(source_norm))
+        ]
+        conn.executemany(
+            "INSERT OR REPLACE INTO tm_tokens(token, entry_id, pos, stem) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO tm_token_vocab(token) VALUES (?)",
+            [(token,) for token in {row[0] for row in rows}],
+        )
+
+    @classmethod
+    def _index_pending_tokens(cls, conn: sqlite3.Connection) -> int:
+        indexed = 0
+        while True:
+            batch = conn.execute(
+                """
+                SELECT p.entry_id, e.source_norm
+                FROM tm_tokens_pending AS p
+                JOIN tm_entries AS e ON e.id = p.entry_id
+                LIMIT ?
+                """,
+                (_TOKEN_INDEX_BATCH,),
+            ).fetchall()
+            if not batch:
+                break
+            cls._store_tokens(conn, batch)
+            conn.executemany(
+                "DELETE FROM tm_tokens_pending WHERE entry_id = ?",
+                [(entry_id,) for entry_id, _source_norm in batch],
+            )
+            indexed += len(batch)
+        return indexed
+
+    @staticmethod
+    def _token_backfill_range(conn: sqlite3.Connection) -> tuple[int, int] | None:
+        row = conn.execute("SELECT next_id, last_id FROM tm_tokens_backfill").fetchone()
+        return None if row is None else (int(row[0]), int(row[1]))
+
+    def token_backfill_pending(self) -> bool:
+        """Whether rows stored before the token index still need tokens."""
+        return any(
+            self._token_backfill_range(conn) is not None
+            for conn in self._all_entries_conns()
+        )
+
+    def backfill_tokens(self, *, should_stop: Callable[[], bool] | None = None) -> bool:
+        """Tokenise rows stored before the token index existed.
+
+        Works in committed batches, so other connections keep writing in
+        between and a stopped run resumes where it left off; queries tokenise
+        such rows on the fly meanwhile. Returns True once every entry DB is
+        done, False when *should_stop* interrupted it.
+        """
+        for conn in self._all_entries_conns():
+            while (span := self._token_backfill_range(conn)) is not None:
+                if should_stop is not None and should_stop():
+                    return False
+                next_id, last_id = span
+                end = min(last_id, next_id + _TOKEN_INDEX_BATCH - 1)
+                batch = conn.execute(
+                    "SELECT id, source_norm FROM tm_entries WHERE id BETWEEN ? AND ?",
+                    (next_id, end),
+                ).fetchall()
+                self._store_tokens(conn, batch)
+                if end >= last_id:
+                    conn.execute("DELETE FROM tm_tokens_backfill")
+                else:
+                    conn.execute(
+                        "UPDATE tm_tokens_backfill SET next_id = ?", (end + 1,)
+                    )
+                conn.commit()
+        return True
+
+    def _commit_entries(self, conn: sqlite3.Connection) -> None:
+        # The registry connection of a sharded DB holds no entry tables.
+        entries = conn is not self._conn or not self._sharded
+        indexes = self._memory_indexes(self._path)
+        # Pending token rows are exactly the inserted / re-sourced entries;
+        # tm_memory_pending adds rows whose recency alone changed.
+        changed = (
+            [
+                (
+                    (source_locale, target_locale),
+                    MemoryRow(
+                        int(entry_id), source_norm, origin, tm_path, int(updated)
+                    ),
+                )
+                for (
+                    entry_id,
+                    source_norm,
+                    origin,
+                    tm_path,
+                    updated,
+                    source_locale,
+                    target_locale,
+                ) in conn.execute(
+                    """
+                    SELECT e.id, e.source_norm, e.origin, e.tm_path, e.updated_at,
+                           e.source_locale, e.target_locale
+                    FROM (
+                        SELECT entry_id FROM tm_tokens_pending
+                        UNION
+                        SELECT entry_id FROM tm_memory_pending
+                    ) AS p
+                    JOIN tm_entries AS e ON e.id = p.entry_id
+                    """
+                )
+            ]
+            if indexes and entries
+            else []
+        )
+        if entries:
+            self._index_pending_tokens(conn)
+            conn.execute("DELETE FROM tm_memory_pending")
+        conn.commit()
+        self._bump_generation()
+        removed_ids, self._memory_removed_ids = self._memory_removed_ids, []
+        removed_paths, self._memory_removed_paths = self._memory_removed_paths, []
+        for index in indexes:
+            pair = (index.source_locale, index.target_locale)
+            index.apply(
+                upserted=[row for locales, row in changed if locales == pair],
+                removed_ids=removed_ids,
+                removed_tm_paths=removed_paths,
+            )
+
+    @staticmethod
+    def _ensure_tm_entries_columns(conn: sqlite3.Connection) -> None:
+        cols = {
+            row["name"]
+            for row in conn.execute("PRAGMA table_info(tm_entries)").fetchall()
+        }
+        if "tm_name" not in cols:
+            conn.execute("ALTER TABLE tm_entries ADD COLUMN tm_name TEXT")
+        if "tm_path" not in cols:
+            conn.execute("ALTER TABLE tm_entries ADD COLUMN tm_path TEXT")
+        if "row_status" not in cols:
+            conn.execute("ALTER TABLE tm_entries ADD COLUMN row_status INTEGER")
+
+    def _ensure_tm_import_files_columns(self) -> None:
+        cols = {
+            row["name"]
+            for row in self._conn.execute(
+                "PRAGMA table_info(tm_import_files)"
+            ).fetchall()
+        }
+        if "enabled" not in cols:
+            self._conn.execute(
+                "ALTER TABLE tm_import_files ADD COLUMN enabled INTEGER NOT NULL DEFAULT 1"
+            )
+        if "source_locale_raw" not in cols:
+            self._conn.execute(
+                "ALTER TABLE tm_import_files ADD COLUMN source_locale_raw TEXT NOT NULL DEFAULT ''"
+            )
+        if "target_locale_raw" not in cols:
+            self._conn.execute(
+                "ALTER TABLE tm_import_files ADD COLUMN target_locale_raw TEXT NOT NULL DEFAULT ''"
+            )
+        if "segment_count" not in cols:
+            self._conn.execute(
+                "ALTER TABLE tm_import_files ADD COLUMN segment_count INTEGER NOT NULL DEFAULT 0"
+            )
+        if "content_hash" not in cols:
+            self._conn.execute(
+                "ALTER TABLE tm_import_files ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''"
+            )
+
+    def upsert_project_entries(
+        self,
+        entries: Iterable[ProjectEntryRow],
+        *,
+        source_locale: str,
+        target_locale: str,
+        file_path: str,
+        updated_at: int | None = None,
+    ) -> int:
+        source_locale = _normalize_locale(source_locale)
+        target_locale = _normalize_locale(target_locale)
+        now = int(updated_at if updated_at is not None else time.time())
+        count = 0
+        rows = []
+        for row in entries:
+            if len(row) == 3:
+                key, source_text, target_text = row
+                row_status: int | None = None
+            elif len(row) == 4:
+                key, source_text, target_text, status_raw = row
+                row_status = _normalize_row_status(status_raw)
+            else:
+                continue
+            if not (source_text or target_text):
+                continue
+            source_norm = _normalize(source_text)
+            if not source_norm:
                 continue
-            if not (source_text or target_text):
-                continue
-            source_norm = _normalize(source_text)
-            if not source_norm:
-                continue
             rows.append(
                 (
                     source_text,
@@ -502,7 +1690,8 @@ class TMStore:
             )
         if not rows:
             return 0
-        cur = self._conn.executemany(
+        conn = self._entries_conn(source_locale, target_locale)
+        cur = conn.executemany(
             """
             INSERT INTO tm_entries (
                 source_text,
@@ -533,7 +1722,7 @@ class TMStore:
             rows,
         )
         count += cur.rowcount if cur.rowcount >= 0 else 0
-        self._conn.commit()
+        self._commit_entries(conn)
         return count
 
     def insert_import_pairs(
@@ -551,56 +1740,22 @@ class TMStore:
         tm_name = (tm_name or "").strip() or None
         tm_path = str(tm_path).strip() if tm_path else None
         now = int(updated_at if updated_at is not None else time.time())
-        rows = []
-        for source_text, target_text in pairs:
-            if not (source_text and target_text):
-                continue
-            source_norm = _normalize(source_text)
-            if not source_norm:
-                continue
-            rows.append(
-                (
-                    source_text,
-                    target_text,
-                    source_norm,
-                    _prefix(source_norm),
-                    len(source_norm),
-                    source_locale,
-                    target_locale,
-                    _IMPORT_ORIGIN,
-                    tm_name,
-                    tm_path,
-                    None,
-                    None,
-                    None,
-                    now,
-                )
+        rows = list(
+            _iter_import_rows(
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                tm_name=tm_name,
+                tm_path=tm_path,
+                updated_at=now,
             )
+        )
         if not rows:
             return 0
-        cur = self._conn.executemany(
-            """
-            INSERT OR IGNORE INTO tm_entries (
-                source_text,
-                target_text,
-                source_norm,
-                source_prefix,
-                source_len,
-                source_locale,
-                target_locale,
-                origin,
-                tm_name,
-                tm_path,
-                file_path,
-                key,
-                row_status,
-                updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
+        conn = self._entries_conn(source_locale, target_locale)
+        cur = conn.executemany(_INSERT_IMPORT_SQL, rows)
         count = cur.rowcount if cur.rowcount >= 0 else 0
-        self._conn.commit()
+        self._commit_entries(conn)
         return count
 
     def import_tmx(self, path: Path, *, source_locale: str, target_locale: str) -> int:
@@ -650,6 +1805,33 @@ class TMStore:
         source_locale_raw: str = "",
         target_locale_raw: str = "",
         tm_name: str | None = None,
+    ) -> int:
+        return self.replace_import_pairs(
+            path,
+            iter_tm_pairs(
+                path,
+                _normalize_locale(source_locale),
+                _normalize_locale(target_locale),
+            ),
+            source_locale=source_locale,
+            target_locale=target_locale,
+            source_locale_raw=source_locale_raw,
+            target_locale_raw=target_locale_raw,
+            tm_name=tm_name,
+            content_hash=import_file_content_hash(path),
+        )
+
+    def replace_import_pairs(
+        self,
+        path: Path,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        source_locale: str,
+        target_locale: str,
+        source_locale_raw: str = "",
+        target_locale_raw: str = "",
+        tm_name: str | None = None,
+        content_hash: str = "",
     ) -> int:
         source_locale = _normalize_locale(source_locale)
         target_locale = _normalize_locale(target_locale)
@@ -658,28 +1840,62 @@ class TMStore:
         enabled = True
         row = self._conn.execute(
             """
-            SELECT enabled
+            SELECT enabled, source_locale, target_locale, tm_name
             FROM tm_import_files
             WHERE tm_path = ?
             """,
             (path_str,),
         ).fetchone()
+        conn = self._entries_conn(source_locale, target_locale)
+        existing: dict[int, int] = {}
         if row is not None:
             enabled = bool(row["enabled"])
-        self._conn.execute(
-            """
-            DELETE FROM tm_entries
-            WHERE origin = ? AND tm_path = ?
-            """,
-            (_IMPORT_ORIGIN, path_str),
-        )
-        count = self.insert_import_pairs(
-            iter_tm_pairs(path, source_locale, target_locale),
-            source_locale=source_locale,
-            target_locale=target_locale,
-            tm_name=name,
-            tm_path=path_str,
-        )
+            if (row["source_locale"], row["target_locale"], row["tm_name"]) == (
+                source_locale,
+                target_locale,
+                name,
+            ):
+                existing = self._import_segment_ids(conn, path_str)
+            elif self._sharded and row["source_locale"] and row["target_locale"]:
+                # The file moved to another locale pair: drop its old shard rows.
+                old_conn = self._existing_entries_conn(
+                    row["source_locale"], row["target_locale"]
+                )
+                if old_conn is not None and old_conn is not conn:
+                    self._delete_import_entries(old_conn, path_str)
+                    self._commit_entries(old_conn)
+        if existing:
+            count = self._apply_import_delta(
+                conn,
+                path_str,
+                pairs,
+                existing,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                tm_name=name,
+            )
+        elif path.suffix.lower() == SNAPSHOT_SUFFIX:
+            self._delete_import_entries(conn, path_str)
+            count = self._bulk_insert_import(
+                conn,
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                tm_name=name,
+                tm_path=path_str,
+            )
+        else:
+            self._delete_import_entries(conn, path_str)
+            count = self.insert_import_pairs(
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                tm_name=name,
+                tm_path=path_str,
+            )
+            self._rebuild_import_segments(conn, path_str)
+        if conn is not self._conn:
+            self._commit_entries(conn)
         self.upsert_import_file(
             tm_path=path_str,
             tm_name=name,
@@ -693,9 +1909,195 @@ class TMStore:
             enabled=enabled,
             status="ready",
             note="",
+            content_hash=content_hash,
         )
         return count
 
+    def _delete_import_entries(self, conn: sqlite3.Connection, tm_path: str) -> None:
+        conn.execute(
+            """
+            DELETE FROM tm_entries
+            WHERE origin = ? AND tm_path = ?
+            """,
+            (_IMPORT_ORIGIN, tm_path),
+        )
+        self._memory_removed_paths.append(tm_path)
+        conn.execute(
+            "DELETE FROM tm_import_segments WHERE tm_path = ?",
+            (tm_path,),
+        )
+
+    @staticmethod
+    def _import_segment_ids(conn: sqlite3.Connection, tm_path: str) -> dict[int, int]:
+        cursor = conn.execute(
+            """
+            SELECT seg_hash, entry_id
+            FROM tm_import_segments
+            WHERE tm_path = ?
+            """,
+            (tm_path,),
+        )
+        # Both columns are INTEGER, so the rows already are (hash, id) ints.
+        cursor.row_factory = None
+        return dict(cursor)
+
+    @staticmethod
+    def _rebuild_import_segments(conn: sqlite3.Connection, tm_path: str) -> None:
+        cursor = conn.execute(
+            """
+            SELECT id, source_text, target_text
+            FROM tm_entries
+            WHERE origin = ? AND tm_path = ?
+            """,
+            (_IMPORT_ORIGIN, tm_path),
+        )
+        segments = [
+            (tm_path, _segment_hash(source_text, target_text), entry_id)
+            for entry_id, source_text, target_text in cursor
+        ]
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO tm_import_segments(tm_path, seg_hash, entry_id)
+            VALUES (?, ?, ?)
+            """,
+            segments,
+        )
+
+    def _bulk_insert_import(
+        self,
+        conn: sqlite3.Connection,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        source_locale: str,
+        target_locale: str,
+        tm_name: str,
+        tm_path: str,
+    ) -> int:
+        # Snapshot loads skip the per-row FTS and token triggers: rows go in
+        # under one transaction, then the FTS is rebuilt once and the queued
+        # rows are tokenised in batches by `_commit_entries`. DDL is
+        # transactional, so other connections never see the triggers missing
+        # and a failed load restores them on rollback.
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        try:
+            has_fts = self._has_concordance_table(conn)
+            for trigger in (*_CONCORDANCE_TRIGGERS, *_TOKEN_TRIGGERS):
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            rows = _iter_import_rows(
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                tm_name=tm_name,
+                tm_path=tm_path,
+                updated_at=int(time.time()),
+            )
+            count = 0
+            while chunk := list(islice(rows, _BULK_INSERT_ROWS)):
+                cur = conn.executemany(_INSERT_IMPORT_SQL, chunk)
+                count += cur.rowcount if cur.rowcount >= 0 else 0
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO tm_tokens_pending(entry_id)
+                SELECT id FROM tm_entries WHERE origin = ? AND tm_path = ?
+                """,
+                (_IMPORT_ORIGIN, tm_path),
+            )
+            self._rebuild_import_segments(conn, tm_path)
+            if has_fts:
+                conn.execute(
+                    "INSERT INTO tm_concordance(tm_concordance) VALUES('rebuild')"
+                )
+                # The rebuild covers any rows a paused build had left.
+                conn.execute("DELETE FROM tm_concordance_build")
+                self._create_concordance_triggers(conn)
+            self._create_token_triggers(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        return count
+
+    def _apply_import_delta(
+        self,
+        conn: sqlite3.Connection,
+        tm_path: str,
+        pairs: Iterable[tuple[str, str]],
+        existing: dict[int, int],
+        *,
+        source_locale: str,
+        target_locale: str,
+        tm_name: str,
+    ) -> int:
+        # Pairs are hashed as they stream in; only the hashes still unseen
+        # (removed pairs) and the added pairs are held, so a small edit to a
+        # large file keeps memory and DB work proportional to the change.
+        unseen = dict(existing)
+        added: dict[int, tuple[str, str]] = {}
+        for source_text, target_text in pairs:
+            if not (source_text and target_text):
+                continue
+            seg_hash = _segment_hash(source_text, target_text)
+            if seg_hash in existing:
+                unseen.pop(seg_hash, None)
+            else:
+                added.setdefault(seg_hash, (source_text, target_text))
+        removed = list(unseen)
+        removed_ids = list(unseen.values())
+        # Removed rows go first so an added pair that only differs from a
+        # removed one in case or spacing is not dropped by the unique index.
+        conn.executemany(
+            "DELETE FROM tm_entries WHERE id = ?",
+            [(entry_id,) for entry_id in removed_ids],
+        )
+        self._memory_removed_ids.extend(removed_ids)
+        conn.executemany(
+            "DELETE FROM tm_import_segments WHERE tm_path = ? AND seg_hash = ?",
+            [(tm_path, seg_hash) for seg_hash in removed],
+        )
+        now = int(time.time())
+        segments: list[tuple[str, int, int]] = []
+        for seg_hash, (source_text, target_text) in added.items():
+            source_norm = _normalize(source_text)
+            if not source_norm:
+                continue
+            # Pairs that collide with a kept row on (source_norm, target) are
+            # ignored by the unique index and stay unrecorded, exactly like a
+            # full insert_import_pairs run would leave them.
+            cur = conn.execute(
+                _INSERT_IMPORT_SQL,
+                _import_entry_row(
+                    source_text,
+                    target_text,
+                    source_norm,
+                    source_locale=source_locale,
+                    target_locale=target_locale,
+                    tm_name=tm_name,
+                    tm_path=tm_path,
+                    updated_at=now,
+                ),
+            )
+            if cur.rowcount == 1 and cur.lastrowid is not None:
+                segments.append((tm_path, seg_hash, cur.lastrowid))
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO tm_import_segments(tm_path, seg_hash, entry_id)
+            VALUES (?, ?, ?)
+            """,
+            segments,
+        )
+        return len(existing) - len(removed) + len(segments)
+
+    def touch_import_file(self, tm_path: str, *, mtime_ns: int, file_size: int) -> None:
+        self._conn.execute(
+            """
+            UPDATE tm_import_files
+            SET mtime_ns = ?, file_size = ?
+            WHERE tm_path = ?
+            """,
+            (int(mtime_ns), int(file_size), tm_path),
+        )
+        self._conn.commit()
+
     def list_import_files(self) -> list[TMImportFile]:
         rows = self._conn.execute("""
             SELECT
@@ -711,7 +2113,8 @@ class TMStore:
                 enabled,
                 status,
                 note,
-                updated_at
+                updated_at,
+                content_hash
             FROM tm_import_files
             ORDER BY tm_name COLLATE NOCASE, tm_path
             """).fetchall()
@@ -730,6 +2133,7 @@ class TMStore:
                 status=row["status"],
                 note=row["note"],
                 updated_at=int(row["updated_at"]),
+                content_hash=row["content_hash"],
             )
             for row in rows
         ]
@@ -750,6 +2154,7 @@ class TMStore:
         status: str,
         note: str = "",
         updated_at: int | None = None,
+        content_hash: str = "",
     ) -> None:
         now = int(updated_at if updated_at is not None else time.time())
         self._conn.execute(
@@ -767,8 +2172,9 @@ class TMStore:
                 enabled,
                 status,
                 note,
-                updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                updated_at,
+                content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(tm_path) DO UPDATE SET
                 tm_name=excluded.tm_name,
                 source_locale=excluded.source_locale,
@@ -781,7 +2187,8 @@ class TMStore:
                 enabled=excluded.enabled,
                 status=excluded.status,
                 note=excluded.note,
-                updated_at=excluded.updated_at
+                updated_at=excluded.updated_at,
+                content_hash=excluded.content_hash
             """,
             (
                 tm_path,
@@ -797,9 +2204,11 @@ class TMStore:
                 status,
                 note,
                 now,
+                content_hash,
             ),
         )
-        self._conn.commit()
+        # Also commits rows added by `_apply_import_delta` (unsharded layout).
+        self._commit_entries(self._conn)
 
     def set_import_enabled(self, tm_path: str, enabled: bool) -> None:
         self._conn.execute(
@@ -808,18 +2217,16 @@ class TMStore:
             SET enabled = ?, updated_at = ?
             WHERE tm_path = ?
             """,
-            (1 if enabled else 0, int(time.time()), tm_path),
-        )
-        self._conn.commit()
-
-    def delete_import_file(self, tm_path: str) -> None:
-        self._conn.execute(
-            """
-            DELETE FROM tm_entries
-            WHERE origin = ? AND tm_path = ?
-            """,
-            (_IMPORT_ORIGIN, tm_path),
+            (1 if enabled else 0, int(time.time()), tm_path),
         )
+        self._conn.commit()
+        self._bump_generation()
+
+    def delete_import_file(self, tm_path: str) -> None:
+        for conn in self._tm_path_conns(tm_path):
+            self._delete_import_entries(conn, tm_path)
+            if conn is not self._conn:
+                self._commit_entries(conn)
         self._conn.execute(
             """
             DELETE FROM tm_import_files
@@ -827,19 +2234,22 @@ class TMStore:
             """,
             (tm_path,),
         )
-        self._conn.commit()
+        self._commit_entries(self._conn)
 
     def has_import_entries(self, tm_path: str) -> bool:
-        row = self._conn.execute(
-            """
-            SELECT 1
-            FROM tm_entries
-            WHERE origin = ? AND tm_path = ?
-            LIMIT 1
-            """,
-            (_IMPORT_ORIGIN, tm_path),
-        ).fetchone()
-        return row is not None
+        return any(
+            conn.execute(
+                """
+                SELECT 1
+                FROM tm_entries
+                WHERE origin = ? AND tm_path = ?
+                LIMIT 1
+                """,
+                (_IMPORT_ORIGIN, tm_path),
+            ).fetchone()
+            is not None
+            for conn in self._tm_path_conns(tm_path)
+        )
 
     def export_tmx(
         self,
@@ -848,26 +2258,322 @@ class TMStore:
         source_locale: str,
         target_locale: str,
         include_imported: bool = True,
+        dedupe: bool = False,
+        compress: bool | None = None,
+        progress: Callable[[int, int], object] | None = None,
+    ) -> int:
+        source_locale = _normalize_locale(source_locale)
+        target_locale = _normalize_locale(target_locale)
+        return self._export_pairs(
+            lambda pairs, on_progress: write_tmx(
+                path,
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                compress=compress,
+                progress=on_progress,
+            ),
+            source_locale=source_locale,
+            target_locale=target_locale,
+            include_imported=include_imported,
+            dedupe=dedupe,
+            progress=progress,
+        )
+
+    def export_snapshot(
+        self,
+        path: Path,
+        *,
+        source_locale: str,
+        target_locale: str,
+        include_imported: bool = True,
+        dedupe: bool = False,
+        codec: str = "zlib",
+        progress: Callable[[int, int], object] | None = None,
     ) -> int:
         source_locale = _normalize_locale(source_locale)
         target_locale = _normalize_locale(target_locale)
+        return self._export_pairs(
+            lambda pairs, on_progress: write_tm_snapshot(
+                path,
+                pairs,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                codec=codec,
+                progress=on_progress,
+            ),
+            source_locale=source_locale,
+            target_locale=target_locale,
+            include_imported=include_imported,
+            dedupe=dedupe,
+            progress=progress,
+        )
+
+    def _export_pairs(
+        self,
+        write: Callable[
+            [Iterable[tuple[str, str]], Callable[[int], object] | None], int
+        ],
+        *,
+        source_locale: str,
+        target_locale: str,
+        include_imported: bool,
+        dedupe: bool,
+        progress: Callable[[int, int], object] | None,
+    ) -> int:
         origins = (
             (_PROJECT_ORIGIN, _IMPORT_ORIGIN)
             if include_imported
             else (_PROJECT_ORIGIN,)
         )
-        rows = self._conn.execute(
+        params = (source_locale, target_locale, origins[0], origins[-1])
+        # Writers skip units with an empty side; filter them here so the
+        # progress total matches what is written.
+        where_sql = (
+            "source_locale = ? AND target_locale = ? AND origin IN (?, ?) "
+            "AND source_text <> '' AND target_text <> ''"
+        )
+        if dedupe:
+            count_sql = (
+                f"SELECT COUNT(DISTINCT source_norm) FROM tm_entries WHERE {where_sql}"
+            )
+        else:
+            count_sql = f"SELECT COUNT(*) FROM tm_entries WHERE {where_sql}"
+        conn = self._existing_entries_conn(source_locale, target_locale)
+        if conn is None:
+            return write((), None)
+        on_progress: Callable[[int], object] | None = None
+        if progress is not None:
+            total = int(conn.execute(count_sql, params).fetchone()[0])
+            report = progress
+
+            def _report(done: int) -> None:
+                report(done, total)
+
+            on_progress = _report
+
+        if dedupe:
+            return write(
+                self._iter_deduped_export(conn, where_sql, params), on_progress
+            )
+        return write(self._iter_export_batches(conn, where_sql, params), on_progress)
+
+    @staticmethod
+    def _iter_export_batches(
+        conn: sqlite3.Connection, where_sql: str, params: tuple[str, ...]
+    ) -> Iterator[tuple[str, str]]:
+        # Keyed batches walk the rowid range without a sorter, and no read
+        # transaction stays open between batches.
+        select_sql = f"""
+            SELECT id, source_text, target_text
+            FROM tm_entries NOT INDEXED
+            WHERE id > ? AND {where_sql}
+            ORDER BY id
+            LIMIT {_EXPORT_BATCH_ROWS}
             """
-            SELECT source_text, target_text
-            FROM tm_entries
-            WHERE source_locale = ? AND target_locale = ? AND origin IN (?, ?)
-            ORDER BY updated_at DESC
+        last_id = 0
+        while True:
+            rows = conn.execute(select_sql, (last_id, *params)).fetchall()
+            if not rows:
+                return
+            for _row_id, source_text, target_text in rows:
+                yield source_text, target_text
+            last_id = int(rows[-1][0])
+
+    @staticmethod
+    def _iter_deduped_export(
+        conn: sqlite3.Connection, where_sql: str, params: tuple[str, ...]
+    ) -> Iterator[tuple[str, str]]:
+        # One unit per normalized source: project rows win over imports, then
+        # the most recently updated row. tm_exact_lookup already yields rows
+        # grouped by source_norm, so only one group is held at a time.
+        cursor = conn.execute(
+            f"""
+            SELECT source_norm, origin, updated_at, id, source_text, target_text
+            FROM tm_entries INDEXED BY tm_exact_lookup
+            WHERE {where_sql}
+            ORDER BY source_norm
             """,
-            (source_locale, target_locale, origins[0], origins[-1]),
-        ).fetchall()
-        pairs = [(row["source_text"], row["target_text"]) for row in rows]
-        write_tmx(path, pairs, source_locale=source_locale, target_locale=target_locale)
-        return len(pairs)
+            params,
+        )
+        try:
+            group_norm: str | None = None
+            best: tuple[tuple[int, int, int], str, str] | None = None
+            for source_norm, origin, updated_at, row_id, source, target in cursor:
+                rank = (
+                    0 if origin == _PROJECT_ORIGIN else 1,
+                    -int(updated_at or 0),
+                    -int(row_id),
+                )
+                if source_norm != group_norm:
+                    if best is not None:
+                        yield best[1], best[2]
+                    group_norm = source_norm
+                    best = (rank, source, target)
+                elif best is None or rank < best[0]:
+                    best = (rank, source, target)
+            if best is not None:
+                yield best[1], best[2]
+        finally:
+            cursor.close()
+
+    def maintain(self) -> TMMaintenanceReport:
+        """Dedupe imports, prune rows of deleted project files, then compact.
+
+        Import rows repeating a (source_norm, target) pair of the same locale
+        pair are dropped, keeping project rows, then enabled files, then the
+        newest row. A later re-import of a changed file restores its rows.
+        Rows still awaiting tokens are tokenised first.
+        """
+        self.backfill_tokens()
+        bytes_before = self._storage_bytes()
+        counts: dict[tuple[str, str], list[int]] = {}
+        conns = self._all_entries_conns()
+        for conn in conns:
+            for source_locale, target_locale, rows in conn.execute("""
+                SELECT source_locale, target_locale, COUNT(*)
+                FROM tm_entries
+                GROUP BY source_locale, target_locale
+                """):
+                counts[(source_locale, target_locale)] = [int(rows), 0, 0, 0]
+            removed = self._stale_project_rows(conn)
+            for _entry_id, source_locale, target_locale in removed:
+                counts[(source_locale, target_locale)][3] += 1
+            # Pruned first, so a stale project row never outranks an import.
+            self._delete_entries(conn, [row[0] for row in removed])
+            duplicates = conn.execute(f"""
+                SELECT id, source_locale, target_locale, tm_path
+                FROM (
+                    SELECT
+                        e.id,
+                        e.source_locale,
+                        e.target_locale,
+                        e.tm_path,
+                        e.origin,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY
+                                e.source_locale,
+                                e.target_locale,
+                                e.source_norm,
+                                e.target_text
+                            ORDER BY
+                                CASE e.origin WHEN '{_PROJECT_ORIGIN}' THEN 0 ELSE 1 END,
+                                COALESCE(f.enabled, 1) DESC,
+                                e.updated_at DESC,
+                                e.id DESC
+                        ) AS source_rank
+                    FROM tm_entries AS e
+                    LEFT JOIN tm_import_files AS f ON f.tm_path = e.tm_path
+                )
+                WHERE source_rank > 1 AND origin = '{_IMPORT_ORIGIN}'
+                """).fetchall()
+            for _entry_id, source_locale, target_locale, _tm_path in duplicates:
+                counts[(source_locale, target_locale)][2] += 1
+            self._delete_entries(conn, [row[0] for row in duplicates])
+            if duplicates:
+                conn.execute("""
+                    DELETE FROM tm_import_segments
+                    WHERE entry_id NOT IN (SELECT id FROM tm_entries)
+                    """)
+                conn.executemany(
+                    """
+                    UPDATE tm_import_files
+                    SET segment_count = (
+                        SELECT COUNT(*) FROM tm_import_segments WHERE tm_path = ?
+                    )
+                    WHERE tm_path = ?
+                    """,
+                    [
+                        (tm_path, tm_path)
+                        for tm_path in {row[3] for row in duplicates}
+                        if tm_path
+                    ],
+                )
+            conn.execute("""
+                DELETE FROM tm_token_vocab
+                WHERE token NOT IN (SELECT token FROM tm_tokens)
+                """)
+            if self._has_concordance_index(conn):
+                conn.execute(
+                    "INSERT INTO tm_concordance(tm_concordance) VALUES('optimize')"
+                )
+            self._commit_entries(conn)
+            for source_locale, target_locale, rows in conn.execute("""
+                SELECT source_locale, target_locale, COUNT(*)
+                FROM tm_entries
+                GROUP BY source_locale, target_locale
+                """):
+                counts[(source_locale, target_locale)][1] = int(rows)
+        for conn in [*conns, self._conn] if self._sharded else conns:
+            self._compact(conn)
+        return TMMaintenanceReport(
+            pairs=tuple(
+                TMMaintenancePair(pair[0], pair[1], *values)
+                for pair, values in sorted(counts.items())
+            ),
+            bytes_before=bytes_before,
+            bytes_after=self._storage_bytes(),
+        )
+
+    def _delete_entries(self, conn: sqlite3.Connection, entry_ids: list[int]) -> None:
+        conn.executemany(
+            "DELETE FROM tm_entries WHERE id = ?",
+            [(entry_id,) for entry_id in entry_ids],
+        )
+        self._memory_removed_ids.extend(entry_ids)
+
+    def _stale_project_rows(
+        self, conn: sqlite3.Connection
+    ) -> list[tuple[int, str, str]]:
+        # A missing project root (unmounted drive) must not wipe project rows.
+        if not self._root.is_dir():
+            return []
+        stale = [
+            file_path
+            for (file_path,) in conn.execute(
+                "SELECT DISTINCT file_path FROM tm_entries "
+                "WHERE origin = ? AND file_path IS NOT NULL",
+                (_PROJECT_ORIGIN,),
+            ).fetchall()
+            if not (self._root / file_path).exists()
+        ]
+        rows: list[tuple[int, str, str]] = []
+        for file_path in stale:
+            rows.extend(
+                (int(entry_id), source_locale, target_locale)
+                for entry_id, source_locale, target_locale in conn.execute(
+                    "SELECT id, source_locale, target_locale FROM tm_entries "
+                    "WHERE origin = ? AND file_path = ?",
+                    (_PROJECT_ORIGIN, file_path),
+                )
+            )
+        return rows
+
+    @staticmethod
+    def _compact(conn: sqlite3.Connection) -> None:
+        conn.execute("ANALYZE main")
+        if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+            # One full VACUUM switches the file to incremental mode.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            conn.execute("PRAGMA incremental_vacuum")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _all_entries_conns(self) -> list[sqlite3.Connection]:
+        if not self._sharded:
+            return [self._conn]
+        shard_dir = self._path.parent / _SHARD_DIR
+        return [self._shard_conn(path) for path in sorted(shard_dir.glob("*.sqlite"))]
+
+    def _storage_bytes(self) -> int:
+        files = [self._path, *(self._path.parent / _SHARD_DIR).glob("*.sqlite")]
+        return sum(
+            candidate.stat().st_size
+            for path in files
+            for candidate in (path, path.with_name(path.name + "-wal"))
+            if candidate.exists()
+        )
 
     def query(
         self,
@@ -879,14 +2585,20 @@ class TMStore:
         min_score: int | None = None,
         origins: Iterable[str] | None = None,
     ) -> list[TMMatch]:
+        conn = self._existing_entries_conn(
+            _normalize_locale(source_locale), _normalize_locale(target_locale)
+        )
+        if conn is None:
+            return []
         return self._query_conn(
-            self._conn,
+            conn,
             source_text,
             source_locale=source_locale,
             target_locale=target_locale,
             limit=limit,
             min_score=min_score,
             origins=origins,
+            db_path=self._path,
         )
 
     @classmethod
@@ -901,7 +2613,9 @@ class TMStore:
         min_score: int | None = None,
         origins: Iterable[str] | None = None,
     ) -> list[TMMatch]:
-        conn = cls._query_conn_for_path(db_path)
+        conn = cls._query_conn_for_path(db_path, source_locale, target_locale)
+        if conn is None:
+            return []
         return cls._query_conn(
             conn,
             source_text,
@@ -910,6 +2624,185 @@ class TMStore:
             limit=limit,
             min_score=min_score,
             origins=origins,
+            db_path=db_path,
+        )
+
+    def concordance(
+        self,
+        text: str,
+        *,
+        source_locale: str,
+        target_locale: str,
+        side: str = "source",
+        origins: Iterable[str] | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[TMConcordanceHit]:
+        conn = self._existing_entries_conn(
+            _normalize_locale(source_locale), _normalize_locale(target_locale)
+        )
+        if conn is None:
+            return []
+        return self._concordance_conn(
+            conn,
+            text,
+            source_locale=source_locale,
+            target_locale=target_locale,
+            side=side,
+            origins=origins,
+            limit=limit,
+            offset=offset,
+        )
+
+    @classmethod
+    def concordance_path(
+        cls,
+        db_path: Path,
+        text: str,
+        *,
+        source_locale: str,
+        target_locale: str,
+        side: str = "source",
+        origins: Iterable[str] | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[TMConcordanceHit]:
+        conn = cls._query_conn_for_path(db_path, source_locale, target_locale)
+        if conn is None:
+            return []
+        return cls._concordance_conn(
+            conn,
+            text,
+            source_locale=source_locale,
+            target_locale=target_locale,
+            side=side,
+            origins=origins,
+            limit=limit,
+            offset=offset,
+        )
+
+    @classmethod
+    def _concordance_conn(
+        cls,
+        conn: sqlite3.Connection,
+        text: str,
+        *,
+        source_locale: str,
+        target_locale: str,
+        side: str,
+        origins: Iterable[str] | None,
+        limit: int,
+        offset: int,
+    ) -> list[TMConcordanceHit]:
+        columns = _CONCORDANCE_COLUMNS.get(side)
+        if columns is None:
+            raise ValueError(f"unknown concordance side: {side!r}")
+        source_locale = _normalize_locale(source_locale)
+        target_locale = _normalize_locale(target_locale)
+        origin_list = _normalize_origins(origins)
+        needle = text.strip()
+        if not (needle and origin_list) or limit <= 0:
+            return []
+        origin_clause = f"origin IN ({', '.join('?' * len(origin_list))})"
+        params: tuple[object, ...] = (source_locale, target_locale, *origin_list)
+        rows: list[sqlite3.Row] | None = None
+        cls._ensure_concordance_cache(conn)
+        if len(needle) >= _CONCORDANCE_MIN_FTS_LEN and cls._has_concordance_index(conn):
+            pair_phrase = _fts_phrase(f"|{source_locale}|{target_locale}|")
+            match = (
+                f"locale_pair : {pair_phrase} AND "
+                f"{{{' '.join(columns)}}} : {_fts_phrase(needle)}"
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                        tm_entries.source_text AS source_text,
+                        tm_entries.target_text AS target_text,
+                        origin,
+                        tm_name,
+                        tm_path,
+                        file_path,
+                        key,
+                        updated_at
+                    FROM tm_concordance
+                    JOIN tm_entries ON tm_entries.id = tm_concordance.rowid
+                    WHERE tm_concordance MATCH ?
+                      AND source_locale = ? AND target_locale = ?
+                      AND {origin_clause}
+                      AND ({_IMPORT_VISIBLE_SQL})
+                    ORDER BY bm25(tm_concordance), updated_at DESC, tm_entries.id
+                    LIMIT ? OFFSET ?
+                    """,
+                    (match, *params, limit, max(0, offset)),
+                ).fetchall()
+        if rows is None:
+            # Casefold both sides, as the trigram index does, so short needles
+            # match non-ASCII text the same way as long ones.
+            folded = needle.casefold()
+            scan_clause = " OR ".join(
+                f"instr(tzp_casefold({col}), ?) > 0" for col in columns
+            )
+            rows = conn.execute(
+                f"""
+                SELECT
+                    source_text,
+                    target_text,
+                    origin,
+                    tm_name,
+                    tm_path,
+                    file_path,
+                    key,
+                    updated_at
+                FROM tm_entries
+                WHERE source_locale = ? AND target_locale = ?
+                  AND {origin_clause}
+                  AND ({_IMPORT_VISIBLE_SQL})
+                  AND ({scan_clause})
+                ORDER BY source_len, updated_at DESC, id
+                LIMIT ? OFFSET ?
+                """,
+                (*params, *([folded] * len(columns)), limit, max(0, offset)),
+            ).fetchall()
+        pattern = re.compile(re.escape(needle), re.IGNORECASE)
+        return [
+            TMConcordanceHit(
+                source_text=row["source_text"],
+                target_text=row["target_text"],
+                origin=row["origin"],
+                tm_name=row["tm_name"],
+                tm_path=row["tm_path"],
+                file_path=row["file_path"],
+                key=row["key"],
+                updated_at=row["updated_at"],
+                source_spans=_concordance_spans(pattern, row["source_text"]),
+                target_spans=_concordance_spans(pattern, row["target_text"]),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _ensure_concordance_cache(conn: sqlite3.Connection) -> None:
+        if (
+            int(conn.execute("PRAGMA cache_size").fetchone()[0])
+            != -_CONCORDANCE_CACHE_KIB
+        ):
+            conn.execute(f"PRAGMA cache_size=-{_CONCORDANCE_CACHE_KIB}")
+
+    @staticmethod
+    def _has_concordance_table(conn: sqlite3.Connection) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            ("tm_concordance",),
+        ).fetchone()
+        return row is not None
+
+    @classmethod
+    def _has_concordance_index(cls, conn: sqlite3.Connection) -> bool:
+        # Ready once built; a partial build still answers with the scan.
+        return (
+            cls._has_concordance_table(conn)
+            and conn.execute("SELECT 1 FROM tm_concordance_build").fetchone() is None
         )
 
     @classmethod
@@ -923,6 +2816,7 @@ class TMStore:
         limit: int,
         min_score: int | None,
         origins: Iterable[str] | None,
+        db_path: Path | None = None,
     ) -> list[TMMatch]:
         source_locale = _normalize_locale(source_locale)
         target_locale = _normalize_locale(target_locale)
@@ -935,6 +2829,64 @@ class TMStore:
         norm = _normalize(source_text)
         if not norm:
             return []
+        if db_path is None:
+            return cls._query_matches(
+                conn,
+                norm,
+                source_locale=source_locale,
+                target_locale=target_locale,
+                limit=limit,
+                min_score=min_score,
+                origin_list=origin_list,
+                db_path=None,
+            )
+        # The generation is read first: a write racing this query files its
+        # result under a stale key that is never looked up again.
+        with cls._RESULT_LOCK:
+            memo_key = (
+                str(db_path),
+                norm,
+                source_locale,
+                target_locale,
+                origin_list,
+                limit,
+                min_score,
+                cls._GENERATION,
+            )
+            cached = cls._RESULT_MEMO.get(memo_key)
+            if cached is not None:
+                cls._RESULT_MEMO.move_to_end(memo_key)
+                return list(cached)
+        matches = cls._query_matches(
+            conn,
+            norm,
+            source_locale=source_locale,
+            target_locale=target_locale,
+            limit=limit,
+            min_score=min_score,
+            origin_list=origin_list,
+            db_path=db_path,
+        )
+        with cls._RESULT_LOCK:
+            if memo_key[-1] == cls._GENERATION:
+                cls._RESULT_MEMO[memo_key] = tuple(matches)
+                if len(cls._RESULT_MEMO) > _RESULT_MEMO_LIMIT:
+                    cls._RESULT_MEMO.popitem(last=False)
+        return matches
+
+    @classmethod
+    def _query_matches(
+        cls,
+        conn: sqlite3.Connection,
+        norm: str,
+        *,
+        source_locale: str,
+        target_locale: str,
+        limit: int,
+        min_score: int,
+        origin_list: tuple[str, ...],
+        db_path: Path | None,
+    ) -> list[TMMatch]:
         origin_params: tuple[str, ...]
         if len(origin_list) == 1:
             origin_clause = "origin = ?"
@@ -999,12 +2951,21 @@ class TMStore:
                 break
         if len(norm) > _MAX_FUZZY_SOURCE_LEN:
             return matches
-        candidates = cls._fuzzy_candidates(
-            conn,
-            norm,
-            source_locale,
-            target_locale,
-            origin_list,
+        memory = (
+            cls._memory_index(db_path, source_locale, target_locale)
+            if db_path is not None
+            else None
+        )
+        candidates = (
+            cls._memory_fuzzy_candidates(conn, memory, norm, origin_list)
+            if memory is not None
+            else cls._fuzzy_candidates(
+                conn,
+                norm,
+                source_locale,
+                target_locale,
+                origin_list,
+            )
         )
         for cand, score, raw_score in candidates:
             if cand["source_norm"] == norm:
@@ -1039,18 +3000,186 @@ class TMStore:
                 break
         return matches
 
-    @staticmethod
+    @classmethod
     def _fuzzy_candidates(
+        cls,
         conn: sqlite3.Connection,
         norm: str,
         source_locale: str,
         target_locale: str,
         origins: Iterable[str],
     ) -> list[tuple[sqlite3.Row, int, int]]:
-        from difflib import SequenceMatcher
-
-        query_tokens = set(_query_tokens(norm))
+        query_parts = _query_tokens(norm)
+        query_tokens = set(query_parts)
         use_en_stemming = source_locale == "EN"
+        rows = cls._fuzzy_candidate_rows(
+            conn, norm, source_locale, target_locale, origins
+        )
+        cand_parts, stems = cls._candidate_tokens(conn, [row["id"] for row in rows])
+        for token in query_parts:
+            stems.setdefault(token, _stem_token(token))
+        scored: list[tuple[sqlite3.Row, int, int, int]] = []
+        for row in rows:
+            result = _memo_score(
+                norm,
+                query_tokens,
+                row["source_norm"],
+                use_en_stemming=use_en_stemming,
+                query_parts=query_parts,
+                # None (not yet indexed) falls back to tokenising the source.
+                cand_parts=cand_parts.get(row["id"]),
+                stems=stems,
+            )
+            if result is not None:
+                scored.append((row, *result))
+        _sort_scored(scored, length=len(norm), multi_token=len(query_tokens) > 1)
+        return [(row, score, raw_score) for row, score, raw_score, _delta in scored]
+
+    @classmethod
+    def _memory_fuzzy_candidates(
+        cls,
+        conn: sqlite3.Connection,
+        memory: TMMemoryIndex,
+        norm: str,
+        origins: tuple[str, ...],
+    ) -> Iterator[tuple[sqlite3.Row, int, int]]:
+        # Same buckets, scoring and order as `_fuzzy_candidates`, with retrieval
+        # served from memory; full rows are read by id only as they are taken.
+        query_parts = _query_tokens(norm)
+        query_tokens = set(query_parts)
+        source_locale = memory.source_locale
+        length = len(norm)
+        min_len, max_len, max_candidates, bucket_candidates = _fuzzy_window(
+            norm, len(query_tokens)
+        )
+        hidden = [row[0] for row in conn.execute("""
+                SELECT tm_path FROM tm_import_files
+                WHERE NOT (enabled = 1 AND status = 'ready')
+                """)]
+        state = memory.snapshot()
+        lookup = MemoryQuery(
+            state,
+            length=length,
+            min_len=min_len,
+            max_len=max_len,
+            origins=origins,
+            hidden_tm_paths=hidden,
+        )
+        token_hits: list[int] = []
+        if query_tokens:
+            token = max(query_parts, key=len)
+            if len(token) >= 3:
+                stem_ids: list[int] = []
+                if source_locale == "EN":
+                    stem_ids = [
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT entry_id FROM tm_tokens WHERE stem = ?",
+                            (_stem_token(token),),
+                        )
+                    ]
+                token_hits = lookup.token_bucket(
+                    token, bucket_candidates, extra_ids=stem_ids
+                )
+        positions = _merge_buckets(
+            length,
+            lookup.prefix_bucket(_prefix(norm), bucket_candidates),
+            token_hits,
+            lookup.length_bucket(bucket_candidates),
+            limit=max_candidates,
+            key=lambda pos: pos,
+        )
+        memo = memory.parts_memo
+        if len(memo) > _MEMORY_PARTS_MEMO:
+            memo.clear()
+        stems = memory.stems
+        for token in query_parts:
+            if token not in stems:
+                stems[token] = _stem_token(token)
+        scored: list[tuple[dict[str, Any], int, int, int]] = []
+        for pos in positions:
+            cand_norm = state.norm(pos)
+            cand_parts = memo.get(cand_norm)
+            if cand_parts is None:
+                cand_parts = memo[cand_norm] = _query_tokens(cand_norm)
+                for token in cand_parts:
+                    if token not in stems:
+                        stems[token] = _stem_token(token)
+            result = _memo_score(
+                norm,
+                query_tokens,
+                cand_norm,
+                use_en_stemming=source_locale == "EN",
+                query_parts=query_parts,
+                cand_parts=cand_parts,
+                stems=stems,
+            )
+            if result is not None:
+                item = {
+                    "id": state.entry_id(pos),
+                    "source_norm": cand_norm,
+                    "origin": (
+                        _PROJECT_ORIGIN if state.is_project(pos) else _IMPORT_ORIGIN
+                    ),
+                    "updated_at": state.updated_at(pos),
+                }
+                scored.append((item, *result))
+        _sort_scored(scored, length=length, multi_token=len(query_tokens) > 1)
+        for start in range(0, len(scored), _MEMORY_FETCH_BATCH):
+            chunk = scored[start : start + _MEMORY_FETCH_BATCH]
+            marks = ",".join("?" * len(chunk))
+            rows = {
+                row["id"]: row
+                for row in conn.execute(
+                    f"""
+                    SELECT
+                        id, source_text, source_norm, target_text, origin, file_path
+                        , key, row_status, updated_at, tm_name, tm_path
+                    FROM tm_entries
+                    WHERE id IN ({marks})
+                    """,
+                    [item["id"] for item, *_rest in chunk],
+                )
+            }
+            for cand, score, raw_score, _delta in chunk:
+                row = rows.get(cand["id"])
+                # Rows deleted since the snapshot are skipped.
+                if row is not None:
+                    yield row, score, raw_score
+
+    @staticmethod
+    def _candidate_tokens(
+        conn: sqlite3.Connection, entry_ids: list[int]
+    ) -> tuple[dict[int, tuple[str, ...]], dict[str, str]]:
+        parts: dict[int, list[str]] = {}
+        stems: dict[str, str] = {}
+        # Stay below SQLite's default host-parameter limit.
+        for start in range(0, len(entry_ids), 900):
+            chunk = entry_ids[start : start + 900]
+            marks = ",".join("?" * len(chunk))
+            for entry_id, token, stem in conn.execute(
+                f"""
+                SELECT entry_id, token, stem
+                FROM tm_tokens
+                WHERE entry_id IN ({marks})
+                ORDER BY entry_id, pos
+                """,
+                chunk,
+            ):
+                parts.setdefault(entry_id, []).append(token)
+                stems[token] = stem
+        return {key: tuple(value) for key, value in parts.items()}, stems
+
+    @staticmethod
+    def _fuzzy_candidate_rows(
+        conn: sqlite3.Connection,
+        norm: str,
+        source_locale: str,
+        target_locale: str,
+        origins: Iterable[str],
+    ) -> list[sqlite3.Row]:
+        query_parts = _query_tokens(norm)
+        query_tokens = set(query_parts)
         origin_list = _normalize_origins(origins)
         if not origin_list:
             return []
@@ -1064,23 +3193,9 @@ class TMStore:
         # Keep lookup prefix length aligned with stored/indexed source_prefix.
         prefix = _prefix(norm)
         length = len(norm)
-        min_len = max(1, int(length * 0.6))
-        max_len = int(length * 1.4) if length > 5 else length + 10
-        if len(query_tokens) > 1:
-            # Allow phrase-expansion neighbors (e.g. "make item" -> "make new item").
-            max_len = max(
-                max_len,
-                length + max(_MULTI_TOKEN_LEN_PADDING, len(query_tokens) * 2),
-            )
-        max_candidates = _MAX_FUZZY_CANDIDATES
-        bucket_candidates = _FUZZY_BUCKET_CANDIDATES
-        if length <= _SHORT_QUERY_LEN:
-            min_len = 1
-            max_len = max(max_len, 40)
-            max_candidates = _SHORT_QUERY_MAX_CANDIDATES
-            bucket_candidates = _SHORT_QUERY_BUCKET_CANDIDATES
-        rows: list[sqlite3.Row] = []
-        seen_rows: set[tuple[object, ...]] = set()
+        min_len, max_len, max_candidates, bucket_candidates = _fuzzy_window(
+            norm, len(query_tokens)
+        )
 
         def _select_rows(
             where_sql: str,
@@ -1093,8 +3208,8 @@ class TMStore:
             return conn.execute(
                 f"""
                 SELECT
-                    source_text, source_norm, target_text, origin, file_path, key
-                    , row_status, updated_at, tm_name, tm_path
+                    id, source_text, source_norm, target_text, origin, file_path
+                    , key, row_status, updated_at, tm_name, tm_path
                 FROM tm_entries
                 WHERE source_locale = ? AND target_locale = ?
                   AND {where_sql}
@@ -1113,24 +3228,6 @@ class TMStore:
                 ),
             ).fetchall()
 
-        def _append_unique(candidates: list[sqlite3.Row]) -> None:
-            for row in candidates:
-                row_key = (
-                    row["source_text"],
-                    row["target_text"],
-                    row["origin"],
-                    row["tm_name"],
-                    row["tm_path"],
-                    row["file_path"],
-                    row["key"],
-                )
-                if row_key in seen_rows:
-                    continue
-                seen_rows.add(row_key)
-                rows.append(row)
-                if len(rows) >= max_candidates:
-                    return
-
         prefix_rows = _select_rows(
             "source_prefix = ? AND source_len BETWEEN ? AND ?",
             "ABS(source_len - ?) ASC, updated_at DESC",
@@ -1149,10 +3246,31 @@ class TMStore:
         if query_tokens:
             # Query by longest token first to keep phrase neighbors visible even
             # when source_prefix diverges ("drop one" -> "drop-all").
-            token = max(query_tokens, key=len)
+            # First longest token in text order; set order varies per process.
+            token = max(query_parts, key=len)
             if len(token) >= 3:
+                # Inverted index: rows with a token containing the query token
+                # (the recall of a substring scan over source_norm), plus (EN)
+                # rows sharing its stem.
+                postings = (
+                    "SELECT entry_id FROM tm_tokens WHERE token IN ("
+                    "SELECT token FROM tm_token_vocab WHERE instr(token, ?) > 0)"
+                )
+                posting_params: tuple[object, ...] = (token,)
+                if source_locale == "EN":
+                    postings += " UNION SELECT entry_id FROM tm_tokens WHERE stem = ?"
+                    posting_params += (_stem_token(token),)
+                token_where = f"id IN ({postings})"
+                backfill = TMStore._token_backfill_range(conn)
+                if backfill is not None:
+                    # Rows still awaiting tokens are matched by substring.
+                    token_where = (
+                        f"({token_where} OR (id BETWEEN ? AND ? "
+                        "AND instr(source_norm, ?) > 0))"
+                    )
+                    posting_params += (*backfill, token)
                 token_rows = _select_rows(
-                    "instr(source_norm, ?) > 0 AND source_len BETWEEN ? AND ?",
+                    f"{token_where} AND source_len BETWEEN ? AND ?",
                     (
                         "CASE WHEN source_norm = ? THEN 0 "
                         "WHEN source_norm LIKE ? THEN 1 "
@@ -1160,11 +3278,7 @@ class TMStore:
                         "WHEN source_norm LIKE ? THEN 3 "
                         "ELSE 4 END, ABS(source_len - ?) ASC, updated_at DESC"
                     ),
-                    (
-                        token,
-                        min_len,
-                        max_len,
-                    ),
+                    (*posting_params, min_len, max_len),
                     order_params=(
                         token,
                         f"{token} %",
@@ -1174,77 +3288,19 @@ class TMStore:
                     ),
                     limit=bucket_candidates,
                 )
-        if length <= _SHORT_QUERY_LEN:
-            # For tiny queries, prefix-only retrieval is too strict
-            # (e.g. "all" vs "apply all").
-            # Seed token-containing rows first to keep close phrase neighbors visible.
-            if token_rows:
-                _append_unique(token_rows)
-            if len(rows) < max_candidates:
-                _append_unique(prefix_rows)
-            if len(rows) < max_candidates:
-                _append_unique(fallback_rows)
-        else:
-            _append_unique(prefix_rows)
-            if len(rows) < max_candidates and token_rows:
-                _append_unique(token_rows)
-            if len(rows) < max_candidates:
-                _append_unique(fallback_rows)
-        scored: list[tuple[sqlite3.Row, int, int, int]] = []
-        for row in rows:
-            cand_norm = row["source_norm"]
-            ratio = SequenceMatcher(None, norm, cand_norm, autojunk=False).ratio()
-            composed = _contains_composed_phrase(
-                cand_norm,
-                norm,
-                use_en_stemming=use_en_stemming,
-            )
-            overlap = 0.0
-            exact_overlap = 0.0
-            token_count_delta = 999
-            if query_tokens:
-                cand_tokens = set(_query_tokens(cand_norm))
-                token_count_delta = abs(len(cand_tokens) - len(query_tokens))
-                if cand_tokens:
-                    overlap = _soft_token_overlap(
-                        query_tokens,
-                        cand_tokens,
-                        use_en_stemming=use_en_stemming,
-                    )
-                    exact_overlap = _exact_token_overlap(query_tokens, cand_tokens)
-                    if len(query_tokens) == 1:
-                        if overlap < 0.5 and not composed:
-                            continue
-                    elif overlap < 0.34 and ratio < 0.75 and not composed:
-                        continue
-                elif not composed:
-                    continue
-            raw_score = int(round(ratio * 100))
-            score = raw_score
-            token_bonus = int(round((overlap * 6.0) + (exact_overlap * 4.0)))
-            score = min(100, score + token_bonus)
-            if composed:
-                score = max(score, 90 if len(query_tokens) > 1 else 85)
-            if score >= 100 and cand_norm != norm:
-                score = 99
-            scored.append((row, score, raw_score, token_count_delta))
-        if len(query_tokens) > 1:
-            scored.sort(
-                key=lambda item: (
-                    item[3],
-                    -item[1],
-                    abs(len(item[0]["source_norm"]) - length),
-                    0 if item[0]["origin"] == _PROJECT_ORIGIN else 1,
-                    -item[0]["updated_at"],
-                )
-            )
-        else:
-            scored.sort(
-                key=lambda item: (
-                    -item[1],
-                    abs(len(item[0]["source_norm"]) - length),
-                    0 if item[0]["origin"] == _PROJECT_ORIGIN else 1,
-                    -item[0]["updated_at"],
-                )
-            )
-        return [(row, score, raw_score) for row, score, raw_score, _delta in scored]
+        return _merge_buckets(
+            length,
+            prefix_rows,
+            token_rows,
+            fallback_rows,
+            limit=max_candidates,
+            key=lambda row: (
+                row["source_text"],
+                row["target_text"],
+                row["origin"],
+                row["tm_name"],
+                row["tm_path"],
+                row["file_path"],
+                row["key"],
+            ),
+        )
@@ -3,16 +3,29 @@ from __future__ import annotations
 import ast
 import csv
 import gettext
+import gzip
 import zipfile
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import IO, Protocol
 from xml.etree import ElementTree as ET
+from xml.parsers import expat
 from xml.sax.saxutils import escape
 
+from .tm_snapshot import (
+    SNAPSHOT_SUFFIX,
+    iter_tm_snapshot_pairs,
+    read_tm_snapshot_header,
+)
+
 _XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+# Expat reports namespaced names as "<uri>}<local>" with namespace_separator="}".
+_EXPAT_XML_LANG = "http://www.w3.org/XML/1998/namespace}lang"
+_EXPAT_READ_CHUNK = 1 << 16
 _XML_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
 _SUPPORTED_TM_IMPORT_SUFFIXES = (
     ".tmx",
+    ".tmx.gz",  # gzip-compressed TMX, as written by export
     ".xliff",
     ".xlf",
     ".po",
@@ -21,6 +34,7 @@ _SUPPORTED_TM_IMPORT_SUFFIXES = (
     ".mo",
     ".xml",
     ".xlsx",
+    SNAPSHOT_SUFFIX,
 )
 _CSV_SOURCE_HEADERS = frozenset(
     {
@@ -58,6 +72,52 @@ def _local_name(tag: str) -> str:
     return tag.rsplit("}", 1)[-1] if "}" in tag else tag
 
 
+def _expat_lang_value(attrs: dict[str, str]) -> str:
+    return attrs.get(_EXPAT_XML_LANG) or attrs.get("xml:lang") or ""
+
+
+class _ExpatPairCollector(Protocol):
+    pending: list[tuple[str, str]]
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None: ...
+
+    def text(self, data: str) -> None: ...
+
+    def end(self, tag: str) -> None: ...
+
+
+def _iter_expat_pairs(
+    path: Path, collector: _ExpatPairCollector
+) -> Iterator[tuple[str, str]]:
+    # Pull-style driver: feed fixed-size chunks and hand back the pairs that
+    # each chunk completed, so memory stays bounded by one chunk plus one unit.
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.buffer_text = True
+    parser.StartElementHandler = collector.start
+    parser.EndElementHandler = collector.end
+    parser.CharacterDataHandler = collector.text
+    pending = collector.pending
+    with _open_binary(path) as handle:
+        while True:
+            chunk = handle.read(_EXPAT_READ_CHUNK)
+            parser.Parse(chunk, not chunk)
+            if pending:
+                yield from pending
+                pending.clear()
+            if not chunk:
+                return
+
+
+def _is_gzip_tmx(path: Path) -> bool:
+    return path.name.lower().endswith(".tmx.gz")
+
+
+def _open_binary(path: Path) -> IO[bytes] | gzip.GzipFile:
+    if _is_gzip_tmx(path):
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
 def _seg_text(elem: ET.Element | None) -> str:
     if elem is None:
         return ""
@@ -83,13 +143,19 @@ def supported_tm_import_suffixes() -> tuple[str, ...]:
     return _SUPPORTED_TM_IMPORT_SUFFIXES
 
 
+def tm_import_suffix(path: Path) -> str:
+    """Format suffix of *path*; ``.tmx.gz`` for gzip TMX, so other ``.gz``
+    files are not taken for TMX."""
+    return ".tmx.gz" if _is_gzip_tmx(path) else path.suffix.lower()
+
+
 def iter_tm_pairs(
     path: Path,
     source_locale: str,
     target_locale: str,
 ) -> Iterator[tuple[str, str]]:
-    suffix = path.suffix.lower()
-    if suffix == ".tmx":
+    suffix = tm_import_suffix(path)
+    if suffix in {".tmx", ".tmx.gz"}:
         yield from iter_tmx_pairs(path, source_locale, target_locale)
         return
     if suffix in {".xliff", ".xlf"}:
@@ -110,6 +176,9 @@ def iter_tm_pairs(
     if suffix == ".xlsx":
         yield from iter_xlsx_pairs(path, source_locale, target_locale)
         return
+    if suffix == SNAPSHOT_SUFFIX:
+        yield from iter_snapshot_pairs(path, source_locale, target_locale)
+        return
     raise ValueError(f"Unsupported TM import format: {path.suffix or '<none>'}")
 
 
@@ -120,33 +189,85 @@ def iter_tmx_pairs(
     target_locale = _normalize_locale_tag(target_locale)
     if not source_locale or not target_locale:
         return
-    source_base = _locale_base(source_locale)
-    target_base = _locale_base(target_locale)
-    for _event, elem in ET.iterparse(path, events=("end",)):
-        if _local_name(elem.tag) != "tu":
-            continue
-        source_text = ""
-        target_text = ""
-        for tuv in elem:
-            if _local_name(tuv.tag) != "tuv":
-                continue
-            lang = _normalize_locale_tag(_lang_value(tuv))
+    collector = _TmxPairCollector(source_locale, target_locale)
+    yield from _iter_expat_pairs(path, collector)
+
+
+class _TmxPairCollector:
+    # Expat handlers for TMX: keep only the text of the first <seg> per <tuv>
+    # instead of materializing an Element subtree for every <tu>.
+    __slots__ = (
+        "pending",
+        "_source_locale",
+        "_target_locale",
+        "_source_base",
+        "_target_base",
+        "_stack",
+        "_chunks",
+        "_capture_depth",
+        "_tuv_lang",
+        "_tuv_text",
+        "_source_text",
+        "_target_text",
+    )
+
+    def __init__(self, source_locale: str, target_locale: str) -> None:
+        self.pending: list[tuple[str, str]] = []
+        self._source_locale = source_locale
+        self._target_locale = target_locale
+        self._source_base = _locale_base(source_locale)
+        self._target_base = _locale_base(target_locale)
+        self._stack: list[str] = []
+        self._chunks: list[str] = []
+        self._capture_depth = -1
+        self._tuv_lang = ""
+        self._tuv_text: str | None = None
+        self._source_text = ""
+        self._target_text = ""
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        name = _local_name(tag)
+        parent = self._stack[-1] if self._stack else ""
+        self._stack.append(name)
+        if name == "tu":
+            self._source_text = ""
+            self._target_text = ""
+        elif name == "tuv" and parent == "tu":
+            self._tuv_lang = _normalize_locale_tag(_expat_lang_value(attrs))
+            self._tuv_text = None
+        elif (
+            name == "seg"
+            and parent == "tuv"
+            and self._tuv_text is None
+            and self._capture_depth < 0
+        ):
+            self._capture_depth = len(self._stack)
+            self._chunks = []
+
+    def text(self, data: str) -> None:
+        if self._capture_depth >= 0:
+            self._chunks.append(data)
+
+    def end(self, _tag: str) -> None:
+        depth = len(self._stack)
+        name = self._stack.pop()
+        if depth == self._capture_depth:
+            self._tuv_text = "".join(self._chunks)
+            self._capture_depth = -1
+            return
+        if name == "tuv" and self._stack and self._stack[-1] == "tu":
+            lang = self._tuv_lang
             if not lang:
-                continue
+                return
+            text = self._tuv_text or ""
             lang_base = _locale_base(lang)
-            seg = None
-            for child in tuv:
-                if _local_name(child.tag) == "seg":
-                    seg = child
-                    break
-            text = _seg_text(seg)
-            if lang == source_locale or lang_base == source_base:
-                source_text = text
-            elif lang == target_locale or lang_base == target_base:
-                target_text = text
-        if source_text and target_text:
-            yield source_text, target_text
-        elem.clear()
+            if lang == self._source_locale or lang_base == self._source_base:
+                self._source_text = text
+            elif lang == self._target_locale or lang_base == self._target_base:
+                self._target_text = text
+            return
+        if name == "tu" and self._source_text and self._target_text:
+            self.pending.append((self._source_text, self._target_text))
 
 
 def write_tmx(
@@ -155,37 +276,58 @@ def write_tmx(
     *,
     source_locale: str,
     target_locale: str,
-) -> None:
+    compress: bool | None = None,
+    progress: Callable[[int], object] | None = None,
+    progress_every: int = 1000,
+) -> int:
     source_locale = source_locale.strip()
     target_locale = target_locale.strip()
-    with path.open("w", encoding="utf-8") as handle:
+    # Units are written as they are pulled, so lazy sources (SQLite cursors)
+    # are exported without being materialized.
+    if compress is None:
+        compress = _is_gzip_tmx(path)
+    src_attr = escape(source_locale)
+    trg_attr = escape(target_locale)
+    step = max(1, int(progress_every))
+    count = 0
+    with _open_tmx_writer(path, compress=compress) as handle:
         handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
         handle.write('<tmx version="1.4">\n')
         handle.write(
             '  <header creationtool="TranslationZed-Py" '
             'creationtoolversion="0.2" datatype="PlainText" segtype="sentence" '
-            f'srclang="{escape(source_locale)}" />\n'
+            f'srclang="{src_attr}" />\n'
         )
         handle.write("  <body>\n")
         for source_text, target_text in pairs:
             if not (source_text and target_text):
                 continue
-            handle.write("    <tu>\n")
             handle.write(
-                f'      <tuv xml:lang="{escape(source_locale)}"><seg>'
+                "    <tu>\n"
+                f'      <tuv xml:lang="{src_attr}"><seg>'
                 f"{escape(source_text)}</seg></tuv>\n"
-            )
-            handle.write(
-                f'      <tuv xml:lang="{escape(target_locale)}"><seg>'
+                f'      <tuv xml:lang="{trg_attr}"><seg>'
                 f"{escape(target_text)}</seg></tuv>\n"
+                "    </tu>\n"
             )
-            handle.write("    </tu>\n")
+            count += 1
+            if progress is not None and count % step == 0:
+                progress(count)
         handle.write("  </body>\n</tmx>\n")
+    if progress is not None:
+        progress(count)
+    return count
+
+
+def _open_tmx_writer(path: Path, *, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return path.open("w", encoding="utf-8")
 
 
 def detect_tm_languages(path: Path, *, limit: int = 2000) -> set[str]:
-    suffix = path.suffix.lower()
-    if suffix == ".tmx":
+    suffix = tm_import_suffix(path)
+    if suffix in {".tmx", ".tmx.gz"}:
         return detect_tmx_languages(path, limit=limit)
     if suffix in {".xliff", ".xlf"}:
         return detect_xliff_languages(path, limit=limit)
@@ -199,22 +341,25 @@ def detect_tm_languages(path: Path, *, limit: int = 2000) -> set[str]:
         return detect_xml_languages(path, limit=limit)
     if suffix == ".xlsx":
         return detect_xlsx_languages(path, limit=limit)
+    if suffix == SNAPSHOT_SUFFIX:
+        return detect_snapshot_languages(path)
     return set()
 
 
 def detect_tmx_languages(path: Path, *, limit: int = 2000) -> set[str]:
     langs: set[str] = set()
     count = 0
-    for _event, elem in ET.iterparse(path, events=("end",)):
-        if _local_name(elem.tag) != "tuv":
-            continue
-        lang = _lang_value(elem).strip()
-        if lang:
-            langs.add(lang)
-            if len(langs) >= 32 or count >= limit:
-                break
-        count += 1
-        elem.clear()
+    with _open_binary(path) as handle:
+        for _event, elem in ET.iterparse(handle, events=("end",)):
+            if _local_name(elem.tag) != "tuv":
+                continue
+            lang = _lang_value(elem).strip()
+            if lang:
+                langs.add(lang)
+                if len(langs) >= 32 or count >= limit:
+                    break
+            count += 1
+            elem.clear()
     return langs
 
 
@@ -225,78 +370,144 @@ def iter_xliff_pairs(
 ) -> Iterator[tuple[str, str]]:
     source_locale_norm = _normalize_locale_tag(source_locale)
     target_locale_norm = _normalize_locale_tag(target_locale)
-    source_base = _locale_base(source_locale_norm)
-    target_base = _locale_base(target_locale_norm)
     if not source_locale_norm or not target_locale_norm:
         return
-    root_source_lang = ""
-    root_target_lang = ""
-    file_source_lang = ""
-    file_target_lang = ""
-    for event, elem in ET.iterparse(path, events=("start", "end")):
-        name = _local_name(elem.tag)
-        if event == "start":
-            if name == "xliff":
-                root_source_lang = (
-                    elem.attrib.get("srcLang")
-                    or elem.attrib.get("source-language")
-                    or root_source_lang
-                )
-                root_target_lang = (
-                    elem.attrib.get("trgLang")
-                    or elem.attrib.get("target-language")
-                    or root_target_lang
-                )
-            elif name == "file":
-                file_source_lang = (
-                    elem.attrib.get("source-language")
-                    or elem.attrib.get("srcLang")
-                    or root_source_lang
-                )
-                file_target_lang = (
-                    elem.attrib.get("target-language")
-                    or elem.attrib.get("trgLang")
-                    or root_target_lang
-                )
-            continue
-        if name == "file":
-            file_source_lang = root_source_lang
-            file_target_lang = root_target_lang
-            elem.clear()
-            continue
-        if name in {"source", "target"}:
-            continue
-        if name not in {"trans-unit", "segment"}:
-            elem.clear()
-            continue
-        source_elem = None
-        target_elem = None
-        for child in elem:
-            child_name = _local_name(child.tag)
-            if child_name == "source" and source_elem is None:
-                source_elem = child
-            elif child_name == "target" and target_elem is None:
-                target_elem = child
-        source_text = _seg_text(source_elem)
-        target_text = _seg_text(target_elem)
-        if source_text and target_text:
-            source_lang = _lang_value(source_elem) if source_elem is not None else ""
-            target_lang = _lang_value(target_elem) if target_elem is not None else ""
-            source_lang = source_lang or file_source_lang or root_source_lang
-            target_lang = target_lang or file_target_lang or root_target_lang
-            source_ok = (
-                True
-                if not source_lang
-                else _locale_matches(source_lang, source_locale_norm, source_base)
+    collector = _XliffPairCollector(source_locale_norm, target_locale_norm)
+    yield from _iter_expat_pairs(path, collector)
+
+
+class _XliffUnit:
+    __slots__ = ("depth", "source_text", "target_text", "source_lang", "target_lang")
+
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+        self.source_text: str | None = None
+        self.target_text: str | None = None
+        self.source_lang = ""
+        self.target_lang = ""
+
+
+class _XliffPairCollector:
+    # Expat handlers for XLIFF 1.2/2.x: first direct <source>/<target> child of
+    # each <trans-unit>/<segment>, with file/root language fallbacks.
+    __slots__ = (
+        "pending",
+        "_source_locale",
+        "_target_locale",
+        "_source_base",
+        "_target_base",
+        "_stack",
+        "_units",
+        "_chunks",
+        "_capture_depth",
+        "_capture_field",
+        "_root_source_lang",
+        "_root_target_lang",
+        "_file_source_lang",
+        "_file_target_lang",
+    )
+
+    def __init__(self, source_locale: str, target_locale: str) -> None:
+        self.pending: list[tuple[str, str]] = []
+        self._source_locale = source_locale
+        self._target_locale = target_locale
+        self._source_base = _locale_base(source_locale)
+        self._target_base = _locale_base(target_locale)
+        self._stack: list[str] = []
+        self._units: list[_XliffUnit] = []
+        self._chunks: list[str] = []
+        self._capture_depth = -1
+        self._capture_field = ""
+        self._root_source_lang = ""
+        self._root_target_lang = ""
+        self._file_source_lang = ""
+        self._file_target_lang = ""
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        name = _local_name(tag)
+        self._stack.append(name)
+        depth = len(self._stack)
+        if name == "xliff":
+            self._root_source_lang = (
+                attrs.get("srcLang")
+                or attrs.get("source-language")
+                or self._root_source_lang
             )
-            target_ok = (
-                True
-                if not target_lang
-                else _locale_matches(target_lang, target_locale_norm, target_base)
+            self._root_target_lang = (
+                attrs.get("trgLang")
+                or attrs.get("target-language")
+                or self._root_target_lang
             )
-            if source_ok and target_ok:
-                yield source_text, target_text
-        elem.clear()
+        elif name == "file":
+            self._file_source_lang = (
+                attrs.get("source-language")
+                or attrs.get("srcLang")
+                or self._root_source_lang
+            )
+            self._file_target_lang = (
+                attrs.get("target-language")
+                or attrs.get("trgLang")
+                or self._root_target_lang
+            )
+        elif name in {"trans-unit", "segment"}:
+            self._units.append(_XliffUnit(depth))
+        elif (
+            name in {"source", "target"}
+            and self._capture_depth < 0
+            and self._units
+            and self._units[-1].depth == depth - 1
+        ):
+            unit = self._units[-1]
+            if name == "source" and unit.source_text is None:
+                unit.source_lang = _expat_lang_value(attrs)
+            elif name == "target" and unit.target_text is None:
+                unit.target_lang = _expat_lang_value(attrs)
+            else:
+                return
+            self._capture_depth = depth
+            self._capture_field = name
+            self._chunks = []
+
+    def text(self, data: str) -> None:
+        if self._capture_depth >= 0:
+            self._chunks.append(data)
+
+    def end(self, _tag: str) -> None:
+        depth = len(self._stack)
+        name = self._stack.pop()
+        if depth == self._capture_depth:
+            unit = self._units[-1]
+            if self._capture_field == "source":
+                unit.source_text = "".join(self._chunks)
+            else:
+                unit.target_text = "".join(self._chunks)
+            self._capture_depth = -1
+            return
+        if name == "file":
+            self._file_source_lang = self._root_source_lang
+            self._file_target_lang = self._root_target_lang
+            return
+        if not self._units or self._units[-1].depth != depth:
+            return
+        unit = self._units.pop()
+        source_text = unit.source_text or ""
+        target_text = unit.target_text or ""
+        if not (source_text and target_text):
+            return
+        source_lang = (
+            unit.source_lang or self._file_source_lang or self._root_source_lang
+        )
+        target_lang = (
+            unit.target_lang or self._file_target_lang or self._root_target_lang
+        )
+        source_ok = not source_lang or _locale_matches(
+            source_lang, self._source_locale, self._source_base
+        )
+        target_ok = not target_lang or _locale_matches(
+            target_lang, self._target_locale, self._target_base
+        )
+        if source_ok and target_ok:
+            self.pending.append((source_text, target_text))
 
 
 def detect_xliff_languages(path: Path, *, limit: int = 2000) -> set[str]:
@@ -869,3 +1080,23 @@ def _parse_po_quoted(value: str) -> str:
     if isinstance(parsed, str):
         return parsed
     return str(parsed)
+
+
+def iter_snapshot_pairs(
+    path: Path, source_locale: str, target_locale: str
+) -> Iterator[tuple[str, str]]:
+    # Snapshots hold one locale pair, so the header decides for every unit.
+    header = read_tm_snapshot_header(path)
+    for raw, requested in (
+        (header.source_locale, source_locale),
+        (header.target_locale, target_locale),
+    ):
+        normalized = _normalize_locale_tag(requested)
+        if not _locale_matches(raw, normalized, _locale_base(normalized)):
+            return
+    yield from iter_tm_snapshot_pairs(path)
+
+
+def detect_snapshot_languages(path: Path) -> set[str]:
+    header = read_tm_snapshot_header(path)
+    return {lang for lang in (header.source_locale, header.target_locale) if lang}
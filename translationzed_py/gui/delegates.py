@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import re
+import time
 from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
 
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QEvent, QSize, Qt
 from PySide6.QtGui import (
     QColor,
     QPalette,
@@ -23,6 +24,7 @@ from PySide6.QtWidgets import (
     QStyle,
     QStyledItemDelegate,
     QStyleOptionViewItem,
+    QWidget,
 )
 
 from translationzed_py.core.model import STATUS_ORDER, Status
@@ -38,6 +40,11 @@ from translationzed_py.core.qa_rules import (
 from translationzed_py.core.qa_rules import (
     TAG_TOKEN_RE as _TAG_RE,
 )
+from translationzed_py.core.row_height_store import (
+    RowHeightStore,
+    text_hash,
+    width_bucket,
+)
 
 from .perf_trace import PERF_TRACE
 
@@ -164,7 +171,12 @@ _WS_GLYPH_RE = re.compile(r"[ \t]")
 _MAX_RENDER_CHARS = 4000
 _MAX_RENDER_LINES = 12
 MAX_VISUAL_CHARS = 100_000
-_DOC_CACHE_MAX = 256
+# Budget in characters of cached text; each document also counts a fixed
+# overhead so many short cells cannot grow the cache without bound.
+_DOC_CACHE_MAX_CHARS = 1_000_000
+_DOC_OVERHEAD_CHARS = 256
+# Longer lines are estimated from the average char width.
+_ESTIMATE_EXACT_CHARS = 512
 
 _TAG_LIGHT = QColor("#2a6f97")
 _TAG_DARK = QColor("#8bcfff")
@@ -190,10 +202,8 @@ class _VisualFormats:
 
 @dataclass(frozen=True, slots=True)
 class _DocCacheEntry:
-    text: str
-    width: int
-    height: int
     doc: QTextDocument
+    cost: int
 
 
 def _is_dark_palette(palette: QPalette) -> bool:
@@ -208,13 +218,9 @@ def _alpha(color: QColor, value: int) -> QColor:
     return out
 
 
-def _palette_cache_key(palette: QPalette) -> int | tuple[int, int, int, int]:
-    key_attr = getattr(palette, "cacheKey", None)
-    if callable(key_attr):
-        try:
-            return int(key_attr())
-        except Exception:
-            pass
+def _palette_cache_key(palette: QPalette) -> tuple[int, int, int, int]:
+    # By value: palettes changed per cell (foreground role) get a fresh
+    # cacheKey() on every paint.
     return (
         palette.color(QPalette.Base).rgba(),
         palette.color(QPalette.Text).rgba(),
@@ -311,6 +317,80 @@ def _apply_visual_formats(
         cursor.mergeCharFormat(formats.ws_repeat)
 
 
+class TextDocumentCache:
+    """Laid-out cell documents shared by the text delegates.
+
+    Keys carry a hash of the text instead of the text itself. The cache is
+    bounded by total characters (plus a per-document overhead) and evicts
+    least recently used documents first.
+    """
+
+    def __init__(self, max_chars: int = _DOC_CACHE_MAX_CHARS) -> None:
+        self.max_chars = max(1, int(max_chars))
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _DocCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(
+        text: str,
+        width: int,
+        *,
+        font_key: str,
+        view_palette: tuple,
+        palette: tuple,
+        flags: tuple[bool, ...],
+    ) -> tuple:
+        return (
+            font_key,
+            view_palette,
+            palette,
+            text_hash(text),
+            len(text),
+            width,
+            *flags,
+        )
+
+    def get(self, key: tuple) -> QTextDocument | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.doc
+
+    def put(self, key: tuple, doc: QTextDocument, chars: int) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.chars -= old.cost
+        entry = _DocCacheEntry(doc=doc, cost=max(0, chars) + _DOC_OVERHEAD_CHARS)
+        self._entries[key] = entry
+        self.chars += entry.cost
+        while self.chars > self.max_chars and len(self._entries) > 1:
+            _key, evicted = self._entries.popitem(last=False)
+            self.chars -= evicted.cost
+
+    def retain(self, *, font_key: str, view_palette: tuple) -> None:
+        """Drop documents laid out for any other view font or palette."""
+        stale = [
+            key for key in self._entries if key[0] != font_key or key[1] != view_palette
+        ]
+        for key in stale:
+            self.chars -= self._entries.pop(key).cost
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.chars = 0
+
+
+TEXT_DOC_CACHE = TextDocumentCache()
+
+
 class TextVisualHighlighter(QSyntaxHighlighter):
     def __init__(
         self,
@@ -356,14 +436,37 @@ class VisualTextDelegate(MultiLineEditDelegate):
         *,
         read_only: bool = False,
         options_provider: Callable[[], tuple[bool, bool, bool]] | None = None,
+        doc_cache: TextDocumentCache | None = None,
     ) -> None:
         super().__init__(parent, read_only=read_only)
         self._options_provider = options_provider or (lambda: (False, False, False))
         self._doc = QTextDocument()
-        self._doc_cache: OrderedDict[tuple, _DocCacheEntry] = OrderedDict()
+        self._doc_cache = doc_cache if doc_cache is not None else TEXT_DOC_CACHE
+        self._height_store: RowHeightStore | None = None
+        if isinstance(parent, QWidget):
+            parent.installEventFilter(self)
+
+    def set_height_store(self, store: RowHeightStore | None) -> None:
+        self._height_store = store
 
     def clear_visual_cache(self) -> None:
-        self._doc_cache.clear()
+        """Drop cached documents that no longer match the view's font and
+        palette; other views' documents stay."""
+        view = self.parent()
+        if not isinstance(view, QWidget):
+            self._doc_cache.clear()
+            return
+        self._doc_cache.retain(
+            font_key=view.font().key(),
+            view_palette=_palette_cache_key(view.palette()),
+        )
+
+    def eventFilter(self, obj, event):  # noqa: N802
+        if obj is self.parent():
+            if event.type() in (QEvent.FontChange, QEvent.PaletteChange):
+                self.clear_visual_cache()
+            return False
+        return super().eventFilter(obj, event)
 
     def _get_cached_doc(
         self,
@@ -372,23 +475,25 @@ class VisualTextDelegate(MultiLineEditDelegate):
         *,
         font,
         palette,
+        view_palette,
         show_ws: bool,
         highlight: bool,
         selected: bool,
-    ) -> _DocCacheEntry:
-        cache_key = (
+    ) -> QTextDocument:
+        perf_trace = PERF_TRACE
+        perf_start = perf_trace.start("paint")
+        cache_key = TextDocumentCache.key(
             text,
             width,
-            font.key(),
-            _palette_cache_key(palette),
-            show_ws,
-            highlight,
-            selected,
+            font_key=font.key(),
+            view_palette=_palette_cache_key(view_palette),
+            palette=_palette_cache_key(palette),
+            flags=(show_ws, highlight, selected),
         )
-        entry = self._doc_cache.get(cache_key)
-        if entry is not None:
-            self._doc_cache.move_to_end(cache_key)
-            return entry
+        doc = self._doc_cache.get(cache_key)
+        if doc is not None:
+            self._record_doc_lookup(perf_start, hit=True)
+            return doc
         doc = QTextDocument()
         doc.setDefaultFont(font)
         doc.setPlainText(text)
@@ -410,13 +515,22 @@ class VisualTextDelegate(MultiLineEditDelegate):
             palette=palette,
             selected=selected,
         )
-        entry = _DocCacheEntry(
-            text=text, width=width, height=int(doc.size().height()), doc=doc
+        self._doc_cache.put(cache_key, doc, len(text))
+        self._record_doc_lookup(perf_start, hit=False)
+        return doc
+
+    @staticmethod
+    def _record_doc_lookup(start: float | None, *, hit: bool) -> None:
+        # `paint:doc_cache` calls are lookups; misses = calls - hits.
+        if start is None:
+            return
+        PERF_TRACE.record(
+            "paint",
+            (time.perf_counter() - start) * 1000.0,
+            unit="docs",
+            detail="doc_cache",
+            hits=int(hit),
         )
-        self._doc_cache[cache_key] = entry
-        if len(self._doc_cache) > _DOC_CACHE_MAX:
-            self._doc_cache.popitem(last=False)
-        return entry
 
     def createEditor(self, parent, _option, _index):  # noqa: N802
         editor = super().createEditor(parent, _option, _index)
@@ -442,28 +556,59 @@ class VisualTextDelegate(MultiLineEditDelegate):
 
     def sizeHint(self, option, index):  # noqa: N802
         text = index.data(Qt.DisplayRole)
-        if isinstance(text, str) and len(text) > _MAX_RENDER_CHARS:
-            line_height = option.fontMetrics.lineSpacing()
-            height = line_height * _MAX_RENDER_LINES + 8
-            return QSize(0, height)
         if not isinstance(text, str) or not text:
             return super().sizeHint(option, index)
-        show_ws, highlight, optimize = self._options_provider()
+        height = self.cached_height(option, text)
+        if height is None:
+            height = self._measure_height(option, text)
+        return QSize(0, height)
+
+    def _layout_key(self, option, text: str) -> tuple[str, bool]:
+        # Colors never change line breaks; font and whitespace glyphs do.
+        show_ws, _highlight, optimize = self._options_provider()
         if optimize and len(text) >= MAX_VISUAL_CHARS:
             show_ws = False
-            highlight = False
-        width = max(0, option.rect.width() - 8)
-        entry = self._get_cached_doc(
-            text,
-            width,
-            font=option.font,
-            palette=option.palette,
-            show_ws=show_ws,
-            highlight=highlight,
-            selected=False,
-        )
-        height = max(0, entry.height) + 8
-        return QSize(0, height)
+        return f"{option.font.key()}|ws={int(show_ws)}", show_ws
+
+    def cached_height(self, option, text: str) -> int | None:
+        """Height for *text* without laying it out, when already measured."""
+        if len(text) > _MAX_RENDER_CHARS:
+            return option.fontMetrics.lineSpacing() * _MAX_RENDER_LINES + 8
+        if self._height_store is None:
+            return None
+        layout, _show_ws = self._layout_key(option, text)
+        bucket = width_bucket(option.rect.width() - 8)
+        height = self._height_store.get(layout, text, bucket)
+        return None if height is None else height + 8
+
+    def estimate_height(self, option, text: str) -> int:
+        """Cheap height guess from font metrics and explicit line breaks."""
+        metrics = option.fontMetrics
+        if len(text) > _MAX_RENDER_CHARS:
+            return metrics.lineSpacing() * _MAX_RENDER_LINES + 8
+        width = max(1, width_bucket(option.rect.width() - 8) - 8)
+        lines = 0
+        for line in text.split("\n"):
+            if len(line) <= _ESTIMATE_EXACT_CHARS:
+                advance = metrics.horizontalAdvance(line)
+            else:
+                advance = metrics.averageCharWidth() * len(line)
+            lines += max(1, -(-advance // width))
+        margin = int(self._doc.documentMargin() * 2)
+        return lines * metrics.lineSpacing() + margin + 8
+
+    def _measure_height(self, option, text: str) -> int:
+        layout, show_ws = self._layout_key(option, text)
+        bucket = width_bucket(option.rect.width() - 8)
+        doc = self._doc
+        doc.setDefaultFont(option.font)
+        _apply_whitespace_option(doc, show_ws)
+        doc.setTextWidth(bucket)
+        doc.setPlainText(text)
+        height = max(0, int(doc.size().height()))
+        if self._height_store is not None:
+            self._height_store.put(layout, text, bucket, height)
+        return height + 8
 
     def paint(self, painter, option, index):  # noqa: N802
         perf_trace = PERF_TRACE
@@ -538,11 +683,12 @@ class VisualTextDelegate(MultiLineEditDelegate):
                 highlight = False
             text_rect = opt.rect.adjusted(4, 0, -4, 0)
             width = max(0, text_rect.width())
-            entry = self._get_cached_doc(
+            doc = self._get_cached_doc(
                 text,
                 width,
                 font=opt.font,
                 palette=opt.palette,
+                view_palette=opt.widget.palette() if opt.widget else opt.palette,
                 show_ws=show_ws,
                 highlight=highlight,
                 selected=bool(opt.state & QStyle.State_Selected),
@@ -551,7 +697,7 @@ class VisualTextDelegate(MultiLineEditDelegate):
             painter.save()
             painter.setClipRect(text_rect)
             painter.translate(text_rect.topLeft())
-            entry.doc.drawContents(painter)
+            doc.drawContents(painter)
             painter.restore()
         finally:
             perf_trace.stop("paint", start, items=1, unit="cells")
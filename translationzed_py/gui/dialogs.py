@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QCheckBox,
@@ -244,6 +245,8 @@ class ReplaceFilesDialog(QDialog):
         files: Iterable[str] | Iterable[tuple[str, int]],
         scope_label: str,
         parent=None,
+        *,
+        previews: Mapping[str, Sequence[str]] | None = None,
     ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Replace in multiple files")
@@ -260,7 +263,10 @@ class ReplaceFilesDialog(QDialog):
                 path, count = item
                 list_widget.addItem(f"{path} ({count})")
             else:
-                list_widget.addItem(str(item))
+                path = str(item)
+                list_widget.addItem(path)
+            for line in (previews or {}).get(str(path), ()):
+                list_widget.addItem(f"    {line}")
         list_widget.setMaximumHeight(240)
         main_layout.addWidget(list_widget)
 
@@ -398,3 +404,29 @@ class AboutDialog(QDialog):
             return (root / "LICENSE").read_text(encoding="utf-8")
         except Exception:
             return "License text not available."
+
+
+class CopyableReportDialog(QDialog):
+    """Read-only plain-text report with a Copy button."""
+
+    def __init__(self, parent: QWidget | None, title: str, text: str) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(760, 460)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(8)
+
+        editor = QPlainTextEdit(self)
+        editor.setReadOnly(True)
+        editor.setLineWrapMode(QPlainTextEdit.NoWrap)
+        editor.setPlainText(text)
+        layout.addWidget(editor)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, self)
+        copy_btn = buttons.addButton("Copy", QDialogButtonBox.ActionRole)
+        copy_btn.clicked.connect(
+            lambda: QGuiApplication.clipboard().setText(editor.toPlainText())
+        )
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
@@ -55,6 +55,8 @@ class TranslationModel(QAbstractTableModel):
             self._entries = list(pf.entries)
         self._source_values = source_values or {}
         self._source_by_row = source_by_row
+        # Bumped whenever the source column is swapped out.
+        self.source_revision = 0
         self._baseline_by_row = dict(baseline_by_row or {})
         self._changed_rows: set[int] = set(self._baseline_by_row)
         self._status_touched_rows: set[int] = set()
@@ -226,6 +228,7 @@ class TranslationModel(QAbstractTableModel):
     ) -> None:
         self._source_values = source_values or {}
         self._source_by_row = source_by_row
+        self.source_revision += 1
         if not self._entries:
             return
         top = self.index(0, 1)
@@ -294,6 +297,10 @@ class TranslationModel(QAbstractTableModel):
             return text
         return truncated + "\n...(truncated)"
 
+    def row_texts(self, row: int) -> tuple[str, str]:
+        """Full (source, value) text of *row*."""
+        return self._full_source_text(row), self._full_value_text(row)
+
     def _full_source_text(self, row: int) -> str:
         if self._source_by_row is not None and row < len(self._source_by_row):
             return self._source_by_row[row] or ""
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import contextlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from translationzed_py.core.file_workflow import OpenFileResult
+
+from .search_rows_loader import load_source_lookup
+from .source_lookup import SourceLookup
+from .source_reference_state import effective_source_reference_mode_for_window
+
+# Smaller files parse well within a frame and open synchronously.
+ASYNC_OPEN_MIN_BYTES = 256 * 1024
+
+
+class FileOpenJob:
+    """One background open: parse + cache overlay, then (with the table
+    already showing values) the reference-source lookup."""
+
+    __slots__ = ("path", "locale", "encoding", "future", "open_result")
+
+    def __init__(self, path: Path, locale: str | None, encoding: str) -> None:
+        self.path = path
+        self.locale = locale
+        self.encoding = encoding
+        self.future: Future[Any] | None = None
+        self.open_result: OpenFileResult | None = None
+
+
+def should_open_async(win: Any, path: Path) -> bool:
+    try:
+        return path.stat().st_size >= ASYNC_OPEN_MIN_BYTES
+    except OSError:
+        return False
+
+
+def _pool(win: Any) -> ThreadPoolExecutor:
+    if win._file_open_pool is None:
+        win._file_open_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tzp-file-open"
+        )
+    return win._file_open_pool
+
+
+def start_open(win: Any, path: Path) -> None:
+    """Open *path* off the GUI thread; a pending open is cancelled."""
+    cancel_open(win)
+    locale = win._locale_for_path(path)
+    job = FileOpenJob(path, locale, win._encoding_for_locale(locale))
+    job.future = _pool(win).submit(win._prepare_open_file, path, job.encoding)
+    win._file_open_job = job
+    win._open_flow_depth += 1
+    win.statusBar().showMessage(f"Opening {path.name}…", 0)
+    win._file_open_timer.start()
+
+
+def poll_open(win: Any) -> None:
+    job = win._file_open_job
+    if job is None:
+        win._file_open_timer.stop()
+        return
+    if job.future is None or not job.future.done():
+        return
+    if job.open_result is None:
+        _show_values(win, job)
+    else:
+        _show_source(win, job)
+
+
+def _show_values(win: Any, job: FileOpenJob) -> None:
+    assert job.future is not None
+    win._open_flow_depth = max(0, win._open_flow_depth - 1)
+    try:
+        open_result = job.future.result()
+    except Exception as exc:
+        _finish(win)
+        win._report_parse_error(job.path, exc)
+        return
+    if not win._leave_current_file(job.path):
+        _finish(win)
+        return
+    with win._open_flow_guard():
+        win._show_opened_file(job.path, job.encoding, open_result, None)
+    job.open_result = open_result
+    # Everything the worker reads is captured here; the parsed-file cache it
+    # shares with the GUI thread is locked.
+    job.future = _pool(win).submit(
+        load_source_lookup,
+        root=win._root,
+        path=job.path,
+        locale=job.locale,
+        reference_mode=effective_source_reference_mode_for_window(
+            win, job.path, job.locale
+        ),
+        locale_encodings={code: meta.charset for code, meta in win._locales.items()},
+        parsed_cache=win._en_cache,
+        lazy_parse_min_bytes=win._lazy_parse_min_bytes,
+        target_entries=open_result.parsed_file.entries,
+    )
+
+
+def _show_source(win: Any, job: FileOpenJob) -> None:
+    assert job.future is not None and job.open_result is not None
+    _finish(win)
+    model = win._current_model
+    if model is None or win._current_pf is not job.open_result.parsed_file:
+        return
+    try:
+        source_lookup = job.future.result()
+    except Exception:
+        source_lookup = SourceLookup(by_key={})
+    model.set_source_lookup(
+        source_values=source_lookup, source_by_row=source_lookup.by_row
+    )
+    if win._wrap_text:
+        win._clear_row_height_cache()
+        win._schedule_row_resize()
+    win._sync_detail_editors()
+    win._apply_opened_source(
+        job.path, source_lookup, job.open_result.overlay.conflict_originals
+    )
+    win._update_status_bar()
+
+
+def _finish(win: Any) -> None:
+    win._file_open_job = None
+    win._file_open_timer.stop()
+    win.statusBar().clearMessage()
+
+
+def cancel_open(win: Any) -> None:
+    """Drop the pending open; a parse already running finishes unused."""
+    job = win._file_open_job
+    if job is None:
+        return
+    if job.future is not None:
+        job.future.cancel()
+    if job.open_result is None:
+        win._open_flow_depth = max(0, win._open_flow_depth - 1)
+    _finish(win)
+
+
+def shutdown(win: Any) -> None:
+    cancel_open(win)
+    if win._file_open_pool is not None:
+        with contextlib.suppress(Exception):
+            win._file_open_pool.shutdown(wait=False, cancel_futures=True)
+    win._file_open_pool = None
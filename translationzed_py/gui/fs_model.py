@@ -1,119 +1,311 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Collection
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-from PySide6.QtCore import QModelIndex, Qt
-from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtCore import (
+    QAbstractItemModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    QTimer,
+)
 
-from translationzed_py.core.project_scanner import LocaleMeta, list_translatable_files
+from translationzed_py.core.project_scanner import LocaleMeta, ProjectFileSnapshot
 
 _ABS_PATH_ROLE = int(Qt.ItemDataRole.UserRole)
 _REL_PATH_ROLE = _ABS_PATH_ROLE + 1
 _LOCALE_CODE_ROLE = _ABS_PATH_ROLE + 2
+# Rows inserted per timer tick once a locale's listing is ready.
+_INSERT_CHUNK = 2000
 
+_Index = QModelIndex | QPersistentModelIndex
 
-class FsModel(QStandardItemModel):
-    """Tiny tree showing translatable files under <root>/<LOCALE>/."""
+
+class _LocaleListing:
+    __slots__ = ("paths", "rels", "rows", "dirty")
 
     def __init__(
-        self, root: Path, locales: list[LocaleMeta], *, lazy: bool = True
+        self, meta: LocaleMeta, files: tuple[Path, ...], dirty: Collection[Path]
+    ) -> None:
+        self.paths = [str(path) for path in files]
+        self.rels = [str(path.relative_to(meta.path)) for path in files]
+        self.rows = {path: row for row, path in enumerate(self.paths)}
+        self.dirty = {str(path) for path in dirty}
+
+
+class _LocaleNode:
+    __slots__ = ("meta", "listing", "shown", "future")
+
+    def __init__(self, meta: LocaleMeta) -> None:
+        self.meta = meta
+        self.listing: _LocaleListing | None = None
+        self.shown = 0
+        self.future: Future[_LocaleListing] | None = None
+
+
+class FsModel(QAbstractItemModel):
+    """Tree of translatable files under <root>/<LOCALE>/.
+
+    Locale listings come from a `ProjectFileSnapshot` on a worker thread and
+    are inserted in chunks, so expanding a locale with thousands of files
+    does not block the GUI. *draft_files* (locale code -> paths with drafts)
+    runs on the worker too and seeds the dirty marks.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        locales: list[LocaleMeta],
+        *,
+        lazy: bool = True,
+        snapshot: ProjectFileSnapshot | None = None,
+        draft_files: Callable[[str], Collection[Path]] | None = None,
     ) -> None:
         super().__init__()
         self._root = root  # keep for helpers
         self._lazy = lazy
-        self._path_items: dict[str, QStandardItem] = {}
-        self._pending_dirty: set[str] = set()
-        self._locale_meta: dict[str, LocaleMeta] = {meta.code: meta for meta in locales}
-        self._locale_items: dict[str, QStandardItem] = {}
-        self._loaded_locales: set[str] = set()
-        self.setHorizontalHeaderLabels(["Project files"])
-
-        for meta in locales:
-            loc_item = QStandardItem(f"{meta.code} — {meta.display_name}")
-            loc_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-            loc_item.setData(meta.code, _LOCALE_CODE_ROLE)
-            if self._lazy:
-                placeholder = QStandardItem("...")
-                placeholder.setFlags(Qt.ItemFlag.ItemIsEnabled)
-                loc_item.appendRow(placeholder)
-            else:
-                self._populate_locale(loc_item, meta)
-                self._loaded_locales.add(meta.code)
-            self.appendRow(loc_item)
-            self._locale_items[meta.code] = loc_item
+        self._snapshot = snapshot or ProjectFileSnapshot()
+        self._draft_files = draft_files
+        self._nodes = [_LocaleNode(meta) for meta in locales]
+        self._node_rows = {node.meta.code: row for row, node in enumerate(self._nodes)}
+        self._pending_dirty: dict[str, bool] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._insert_timer = QTimer(self)
+        self._insert_timer.setInterval(0)
+        self._insert_timer.timeout.connect(self._insert_ready_rows)
+        if not self._lazy:
+            for node in self._nodes:
+                self._start_loading(node)
 
     def is_lazy(self) -> bool:
         return self._lazy
 
-    def ensure_loaded_for_index(self, index: QModelIndex) -> None:
+    def is_loading(self) -> bool:
+        for node in self._nodes:
+            if node.future is not None:
+                return True
+            if node.listing is not None and node.shown < len(node.listing.paths):
+                return True
+        return False
+
+    def shutdown(self) -> None:
+        self._insert_timer.stop()
+        for node in self._nodes:
+            if node.future is not None:
+                node.future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ------------------------------------------------------------ Qt model API
+    def index(self, row: int, column: int, parent: _Index | None = None):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if parent is None or not parent.isValid():
+            if row >= len(self._nodes):
+                return QModelIndex()
+            return self.createIndex(row, 0, 0)
+        if parent.internalId() != 0:
+            return QModelIndex()
+        node = self._nodes[parent.row()]
+        if row >= node.shown:
+            return QModelIndex()
+        return self.createIndex(row, 0, parent.row() + 1)
+
+    def parent(self, index: _Index | None = None):  # type: ignore[override]
+        if index is None:
+            return super().parent()  # QObject.parent()
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(int(index.internalId()) - 1, 0, 0)
+
+    def rowCount(self, parent: _Index | None = None) -> int:  # noqa: N802
+        if parent is None or not parent.isValid():
+            return len(self._nodes)
+        if parent.internalId() != 0:
+            return 0
+        return self._nodes[parent.row()].shown
+
+    def columnCount(self, _parent: _Index | None = None) -> int:  # noqa: N802
+        return 1
+
+    def hasChildren(self, parent: _Index | None = None) -> bool:  # noqa: N802
+        if parent is None or not parent.isValid():
+            return bool(self._nodes)
+        if parent.internalId() != 0:
+            return False
+        node = self._nodes[parent.row()]
+        return node.listing is None or bool(node.listing.paths)
+
+    def flags(self, index: _Index):
         if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.internalId() == 0:
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(  # noqa: N802
+        self, section: int, orientation: Qt.Orientation, role: int = 0
+    ):
+        if (
+            section == 0
+            and orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return "Project files"
+        return None
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            meta = self._nodes[index.row()].meta
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"{meta.code} — {meta.display_name}"
+            if role == _LOCALE_CODE_ROLE:
+                return meta.code
+            return None
+        listing = self._nodes[int(index.internalId()) - 1].listing
+        if listing is None:
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            rel = listing.rels[row]
+            return f"● {rel}" if listing.paths[row] in listing.dirty else rel
+        if role == _ABS_PATH_ROLE:
+            return listing.paths[row]
+        if role == _REL_PATH_ROLE:
+            return listing.rels[row]
+        return None
+
+    def canFetchMore(self, parent: _Index) -> bool:  # noqa: N802
+        if not parent.isValid() or parent.internalId() != 0:
+            return False
+        node = self._nodes[parent.row()]
+        return node.listing is None and node.future is None
+
+    def fetchMore(self, parent: _Index) -> None:  # noqa: N802
+        self.ensure_loaded_for_index(parent)
+
+    # ----------------------------------------------------------------- loading
+    def ensure_loaded_for_index(self, index: _Index) -> None:
+        if not index.isValid() or index.internalId() != 0:
             return
-        item = self.itemFromIndex(index)
-        if item is None:
-            return
-        code = item.data(_LOCALE_CODE_ROLE)
-        if isinstance(code, str):
-            self._ensure_locale_loaded(code)
+        self._start_loading(self._nodes[index.row()])
 
-    def _ensure_locale_loaded(self, code: str) -> None:
-        if code in self._loaded_locales:
+    def _start_loading(self, node: _LocaleNode) -> None:
+        if node.listing is not None or node.future is not None:
             return
-        meta = self._locale_meta.get(code)
-        item = self._locale_items.get(code)
-        if not meta or item is None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tzp-file-tree"
+            )
+        node.future = self._pool.submit(self._load_listing, node.meta)
+        self._insert_timer.start()
+
+    def _load_listing(self, meta: LocaleMeta) -> _LocaleListing:
+        files = self._snapshot.files(meta.path)
+        dirty = self._draft_files(meta.code) if self._draft_files else ()
+        return _LocaleListing(meta, files, dirty)
+
+    def _finish_loading(self, node: _LocaleNode, *, wait: bool) -> bool:
+        future = node.future
+        if future is None:
+            return node.listing is not None
+        if not wait and not future.done():
+            return False
+        node.future = None
+        try:
+            listing = future.result()
+        except Exception:
+            listing = self._load_listing(node.meta)
+        self._adopt_listing(node, listing)
+        return True
+
+    def _adopt_listing(self, node: _LocaleNode, listing: _LocaleListing) -> None:
+        # Absorbed marks are dropped so a later reload of the locale trusts
+        # its fresh status-cache read instead of replaying them.
+        for path in [path for path in self._pending_dirty if path in listing.rows]:
+            if self._pending_dirty.pop(path):
+                listing.dirty.add(path)
+            else:
+                listing.dirty.discard(path)
+        node.listing = listing
+
+    def _insert_ready_rows(self) -> None:
+        busy = False
+        for row, node in enumerate(self._nodes):
+            if node.future is not None and not self._finish_loading(node, wait=False):
+                busy = True
+                continue
+            if node.listing is None:
+                continue
+            total = len(node.listing.paths)
+            if node.shown >= total:
+                continue
+            self._show_rows(row, node, min(total, node.shown + _INSERT_CHUNK))
+            busy = busy or node.shown < total
+        if not busy:
+            self._insert_timer.stop()
+
+    def _show_rows(self, row: int, node: _LocaleNode, upto: int) -> None:
+        if upto <= node.shown:
             return
-        self._populate_locale(item, meta)
-        self._loaded_locales.add(code)
-
-    def _populate_locale(self, loc_item: QStandardItem, meta: LocaleMeta) -> None:
-        loc_item.removeRows(0, loc_item.rowCount())
-        for txt in list_translatable_files(meta.path):
-            rel = str(txt.relative_to(meta.path))
-            file_item = QStandardItem(rel)
-            file_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-            abs_path = str(txt)
-            file_item.setData(abs_path, _ABS_PATH_ROLE)
-            file_item.setData(rel, _REL_PATH_ROLE)
-            loc_item.appendRow(file_item)
-            self._path_items[abs_path] = file_item
-            if abs_path in self._pending_dirty:
-                self._apply_dirty_label(file_item, True)
-                self._pending_dirty.discard(abs_path)
+        self.beginInsertRows(self.index(row, 0), node.shown, upto - 1)
+        node.shown = upto
+        self.endInsertRows()
+
+    def _ensure_locale_loaded(self, code: str) -> _LocaleNode | None:
+        """Load *code* now, finishing any background load; used when a caller
+        needs a file index immediately."""
+        row = self._node_rows.get(code)
+        if row is None:
+            return None
+        node = self._nodes[row]
+        if node.listing is None:
+            if node.future is None:
+                self._adopt_listing(node, self._load_listing(node.meta))
+            else:
+                self._finish_loading(node, wait=True)
+        if node.listing is not None:
+            self._show_rows(row, node, len(node.listing.paths))
+        return node
 
+    # ------------------------------------------------------------- dirty flags
     def set_dirty(self, path: Path, dirty: bool) -> None:
         abs_path = str(path)
-        item = self._path_items.get(abs_path)
-        if item is None:
-            if dirty:
-                self._pending_dirty.add(abs_path)
-            else:
-                self._pending_dirty.discard(abs_path)
+        for row, node in enumerate(self._nodes):
+            listing = node.listing
+            if listing is None:
+                continue
+            file_row = listing.rows.get(abs_path)
+            if file_row is None:
+                continue
+            self._pending_dirty.pop(abs_path, None)
+            if (abs_path in listing.dirty) != dirty:
+                if dirty:
+                    listing.dirty.add(abs_path)
+                else:
+                    listing.dirty.discard(abs_path)
+                if file_row < node.shown:
+                    index = self.createIndex(file_row, 0, row + 1)
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
             return
-        self._apply_dirty_label(item, dirty)
-        if dirty:
-            self._pending_dirty.discard(abs_path)
-
-    def _apply_dirty_label(self, item: QStandardItem, dirty: bool) -> None:
-        base = item.data(_REL_PATH_ROLE) or item.text()
-        label = f"● {base}" if dirty else str(base)
-        item.setText(label)
+        self._pending_dirty[abs_path] = dirty
 
     # ------------------------------------------------------------------ helper
     def index_for_path(self, path: Path) -> QModelIndex:
         """Return QModelIndex of *path* inside the tree."""
-        abs_path = str(path)
-        item = self._path_items.get(abs_path)
-        if item is not None:
-            return item.index()
-        if not self._lazy:
-            return QModelIndex()
         code = self._locale_code_for_path(path)
-        if code:
-            self._ensure_locale_loaded(code)
-            item = self._path_items.get(abs_path)
-            if item is not None:
-                return item.index()
-        return QModelIndex()
+        node = self._ensure_locale_loaded(code) if code else None
+        if node is None or node.listing is None:
+            return QModelIndex()
+        file_row = node.listing.rows.get(str(path))
+        if file_row is None:
+            return QModelIndex()
+        return self.createIndex(file_row, 0, self._node_rows[node.meta.code] + 1)
 
     def _locale_code_for_path(self, path: Path) -> str | None:
         try:
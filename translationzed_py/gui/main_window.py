@@ -6,10 +6,10 @@ import os
 import re
 import shutil
 import sys
+import threading
 import time
 import traceback
-from collections import OrderedDict
-from collections.abc import Callable, Iterable, Mapping, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
@@ -41,8 +41,6 @@ from PySide6.QtWidgets import (
     QButtonGroup,
     QCheckBox,
     QComboBox,
-    QDialog,
-    QDialogButtonBox,
     QFileDialog,
     QHBoxLayout,
     QHeaderView,
@@ -77,7 +75,6 @@ from translationzed_py.core import (
     Entry,
     LocaleMeta,
     ParsedFile,
-    list_translatable_files,
     parse,
     parse_lazy,
     scan_root_with_errors,
@@ -95,6 +92,7 @@ from translationzed_py.core.conflict_service import (
 from translationzed_py.core.conflict_service import (
     ConflictWorkflowService as _ConflictWorkflowService,
 )
+from translationzed_py.core.draft_manifest import DraftManifest as _DraftManifest
 from translationzed_py.core.en_hash_cache import compute as _compute_en_hashes
 from translationzed_py.core.en_hash_cache import read as _read_en_hash_cache
 from translationzed_py.core.en_hash_cache import write as _write_en_hash_cache
@@ -104,6 +102,9 @@ from translationzed_py.core.file_workflow import (
 from translationzed_py.core.file_workflow import (
     OpenFileCallbacks as _OpenFileCallbacks,
 )
+from translationzed_py.core.file_workflow import (
+    OpenFileResult as _OpenFileResult,
+)
 from translationzed_py.core.file_workflow import (
     SaveCurrentCallbacks as _SaveCurrentCallbacks,
 )
@@ -113,6 +114,12 @@ from translationzed_py.core.file_workflow import (
 from translationzed_py.core.file_workflow import (
     SaveFromCacheParseError as _SaveFromCacheParseError,
 )
+from translationzed_py.core.locale_variant_index import (
+    LocaleVariantIndex as _LocaleVariantIndex,
+)
+from translationzed_py.core.locale_variant_index import (
+    variant_path_for_locale as _variant_path_for_locale,
+)
 from translationzed_py.core.model import STATUS_ORDER, Status
 from translationzed_py.core.preferences_service import (
     PreferencesService as _PreferencesService,
@@ -120,6 +127,9 @@ from translationzed_py.core.preferences_service import (
 from translationzed_py.core.preferences_service import (
     resolve_qa_preferences as _resolve_qa_preferences,
 )
+from translationzed_py.core.project_scanner import (
+    ProjectFileSnapshot as _ProjectFileSnapshot,
+)
 from translationzed_py.core.project_session import (
     CacheMigrationBatchCallbacks as _CacheMigrationBatchCallbacks,
 )
@@ -138,15 +148,22 @@ from translationzed_py.core.project_session import (
 from translationzed_py.core.project_session import (
     TreeRebuildPlan as _TreeRebuildPlan,
 )
+from translationzed_py.core.qa_scan import QAProjectScanner as _QAProjectScanner
 from translationzed_py.core.qa_service import (
     QAFinding as _QAFinding,
 )
+from translationzed_py.core.qa_service import (
+    QARowFindings as _QARowFindings,
+)
 from translationzed_py.core.qa_service import (
     QAService as _QAService,
 )
+from translationzed_py.core.regex_guard import RegexGuard as _RegexGuard
+from translationzed_py.core.regex_guard import RegexTimeoutError as _RegexTimeoutError
 from translationzed_py.core.render_workflow_service import (
     RenderWorkflowService as _RenderWorkflowService,
 )
+from translationzed_py.core.row_height_store import RowHeightStore as _RowHeightStore
 from translationzed_py.core.save_exit_flow import (
     SaveExitFlowService as _SaveExitFlowService,
 )
@@ -160,18 +177,8 @@ from translationzed_py.core.search import (
 from translationzed_py.core.search import (
     SearchRow as _SearchRow,
 )
-from translationzed_py.core.search import (
-    iter_matches as _iter_search_matches,
-)
-from translationzed_py.core.search_replace_service import (
-    ReplaceAllFileApplyCallbacks as _ReplaceAllFileApplyCallbacks,
-)
-from translationzed_py.core.search_replace_service import (
-    ReplaceAllFileCountCallbacks as _ReplaceAllFileCountCallbacks,
-)
-from translationzed_py.core.search_replace_service import (
-    ReplaceAllFileParseError as _ReplaceAllFileParseError,
-)
+from translationzed_py.core.search_executor import SearchExecutor as _SearchExecutor
+from translationzed_py.core.search_index import SearchIndex as _SearchIndex
 from translationzed_py.core.search_replace_service import (
     ReplaceAllRowsCallbacks as _ReplaceAllRowsCallbacks,
 )
@@ -185,26 +192,20 @@ from translationzed_py.core.search_replace_service import (
     ReplaceRequestError as _ReplaceRequestError,
 )
 from translationzed_py.core.search_replace_service import (
-    SearchReplaceService as _SearchReplaceService,
-)
-from translationzed_py.core.search_replace_service import (
-    SearchRowsCacheStamp as _SearchRowsCacheStamp,
+    SearchRefinementMemo as _SearchRefinementMemo,
 )
 from translationzed_py.core.search_replace_service import (
-    SearchRowsCacheStampCallbacks as _SearchRowsCacheStampCallbacks,
+    SearchReplaceService as _SearchReplaceService,
 )
-from translationzed_py.core.search_replace_service import (
-    SearchRowsFileCallbacks as _SearchRowsFileCallbacks,
+from translationzed_py.core.search_rows_store import (
+    SearchRowsStore as _SearchRowsStore,
 )
 from translationzed_py.core.source_reference_service import (
-    load_reference_lookup as _load_reference_lookup,
+    ParsedFileCache as _ParsedFileCache,
 )
 from translationzed_py.core.source_reference_service import (
     normalize_source_reference_mode as _normalize_source_reference_mode,
 )
-from translationzed_py.core.source_reference_service import (
-    reference_path_for as _reference_path_for,
-)
 from translationzed_py.core.status_cache import (
     CacheEntry,
 )
@@ -220,9 +221,6 @@ from translationzed_py.core.status_cache import (
 from translationzed_py.core.status_cache import (
     read as _read_status_cache,
 )
-from translationzed_py.core.status_cache import (
-    read_has_drafts_from_path as _read_has_drafts_from_path,
-)
 from translationzed_py.core.status_cache import (
     read_last_opened_from_path as _read_last_opened_from_path,
 )
@@ -236,11 +234,17 @@ from translationzed_py.core.tm_import_sync import (
 from translationzed_py.core.tm_query import (
     TMQueryKey,
     TMQueryPolicy,
+    origins_for,
 )
 from translationzed_py.core.tm_rebuild import (
     TMRebuildResult,
 )
-from translationzed_py.core.tm_store import TMMatch, TMStore
+from translationzed_py.core.tm_store import (
+    TMConcordanceHit,
+    TMMaintenanceReport,
+    TMMatch,
+    TMStore,
+)
 from translationzed_py.core.tm_workflow_service import (
     TMSelectionPlan as _TMSelectionPlan,
 )
@@ -258,20 +262,42 @@ from .delegates import (
 from .dialogs import (
     AboutDialog,
     ConflictChoiceDialog,
+    CopyableReportDialog,
     LocaleChooserDialog,
-    ReplaceFilesDialog,
     SaveFilesDialog,
     TmLanguageDialog,
 )
 from .entry_model import TranslationModel
+from .file_open_async import cancel_open as _cancel_file_open
+from .file_open_async import poll_open as _poll_file_open
+from .file_open_async import should_open_async as _should_open_async
+from .file_open_async import shutdown as _shutdown_file_open
+from .file_open_async import start_open as _start_file_open
 from .fs_model import FsModel
 from .perf_trace import PERF_TRACE
 from .preferences_dialog import PreferencesDialog
 from .qa_async import poll_scan as _qa_poll_scan
+from .qa_async import refresh_scan as _qa_refresh_scan
 from .qa_async import refresh_sync_for_test as _qa_refresh_sync_for_test
 from .qa_async import start_scan as _qa_start_scan
+from .qa_project_async import cancel_project_scan as _cancel_qa_project_scan
+from .qa_project_async import is_project_scan_running as _qa_project_running
+from .qa_project_async import poll_project_scan as _poll_qa_project_scan
+from .qa_project_async import start_project_scan as _start_qa_project_scan
+from .replace_all_batch import run_replace_all as _run_replace_all
+from .row_heights import refine_row_heights as _refine_row_heights
+from .row_heights import resize_visible_rows as _resize_visible_rows
+from .search_index_sync import IndexedRows as _IndexedRows
+from .search_index_sync import close_search_index as _close_search_index
+from .search_index_sync import fresh_indexed_rows as _fresh_indexed_rows
+from .search_panel_async import cancel_panel_search as _cancel_panel_search
+from .search_panel_async import flag_regex_timeout as _flag_regex_timeout
+from .search_panel_async import poll_panel_search as _poll_panel_search
+from .search_panel_async import start_panel_search as _start_panel_search
+from .search_panel_async import warn_regex_timeout as _warn_regex_timeout
+from .search_rows_loader import RowsLoader as _RowsLoader
+from .search_rows_loader import load_source_lookup as _load_source_lookup
 from .search_scope_ui import scope_icon_for as _scope_icon_for
-from .source_lookup import LazySourceRows as _LazySourceRows
 from .source_lookup import SourceLookup as _SourceLookup
 from .source_reference_header import handle_header_click as _source_header_click
 from .source_reference_header import refresh_header_label as _source_header_refresh
@@ -298,6 +324,15 @@ from .theme import apply_theme as _apply_app_theme
 from .theme import connect_system_theme_sync as _connect_system_theme_sync
 from .theme import disconnect_system_theme_sync as _disconnect_system_theme_sync
 from .theme import normalize_theme_mode as _normalize_theme_mode
+from .tm_concordance import TMConcordancePanel
+from .tm_maintenance import (
+    ensure_tm_concordance_index as _ensure_tm_concordance_index,
+)
+from .tm_maintenance import poll_tm_index as _poll_tm_index
+from .tm_maintenance import poll_tm_maintenance as _poll_tm_maintenance
+from .tm_maintenance import shutdown_tm_maintenance as _shutdown_tm_maintenance
+from .tm_maintenance import start_tm_maintenance as _start_tm_maintenance
+from .tm_maintenance import start_tm_token_backfill as _start_tm_token_backfill
 from .tm_preview import apply_tm_preview_highlights as _apply_tm_preview_highlights
 from .tm_preview import prepare_tm_preview_terms as _prepare_tm_preview_terms
 
@@ -310,6 +345,7 @@ _LEFT_PANEL_FILES = 0
 _LEFT_PANEL_TM = 1
 _LEFT_PANEL_SEARCH = 2
 _LEFT_PANEL_QA = 3
+_LEFT_PANEL_CONCORDANCE = 4
 
 
 def _in_test_mode() -> bool:
@@ -438,11 +474,13 @@ class MainWindow(QMainWindow):
         self._selected_locales: list[str] = []
         self._current_encoding = "utf-8"
         self._app_config = _load_app_config(self._root)
+        self._draft_manifest = _DraftManifest.for_root(self._root)
+        self._file_snapshot = _ProjectFileSnapshot()
         self._project_session_service = _ProjectSessionService(
             cache_dir=self._app_config.cache_dir,
             cache_ext=self._app_config.cache_ext,
             translation_ext=self._app_config.translation_ext,
-            has_drafts=_read_has_drafts_from_path,
+            has_drafts=self._draft_manifest.has_drafts,
             read_last_opened=_read_last_opened_from_path,
         )
         self._render_workflow_service = _RenderWorkflowService()
@@ -462,8 +500,9 @@ class MainWindow(QMainWindow):
         self._skip_cache_write = False
         self._open_flow_depth = 0
         self._files_by_locale: dict[str, list[Path]] = {}
-        self._en_cache: dict[Path, ParsedFile] = {}
+        self._en_cache = _ParsedFileCache()
         self._locale_variant_pf_cache: dict[Path, tuple[int, ParsedFile]] = {}
+        self._locale_variants = _LocaleVariantIndex(self._root)
         self._child_windows: list[MainWindow] = []
         self._tm_store: TMStore | None = None
         self._tm_workflow = _TMWorkflowService(cache_limit=128)
@@ -471,25 +510,44 @@ class MainWindow(QMainWindow):
         self._tm_query_pool: ThreadPoolExecutor | None = None
         self._tm_query_future: Future[list[TMMatch]] | None = None
         self._tm_query_key: TMQueryKey | None = None
+        self._tm_memory_pair: tuple[str, str] | None = None
         self._tm_rebuild_pool: ThreadPoolExecutor | None = None
         self._tm_rebuild_future: Future[TMRebuildResult] | None = None
         self._tm_rebuild_locales: list[str] = []
         self._tm_rebuild_interactive = False
         self._tm_bootstrap_pending = False
+        self._tm_maintain_pool: ThreadPoolExecutor | None = None
+        self._tm_maintain_future: Future[TMMaintenanceReport] | None = None
+        self._tm_index_future: Future[str] | None = None
+        self._tm_index_stop: threading.Event | None = None
         self._qa_findings: tuple[_QAFinding, ...] = ()
         self._qa_panel_result_limit = 500
         self._qa_refresh_delay_ms = 140
         self._qa_scan_pool: ThreadPoolExecutor | None = None
-        self._qa_scan_future: Future[tuple[Path, list[_QAFinding]]] | None = None
+        self._qa_scan_future: Future[tuple[Path, object, list[_QAFinding]]] | None = (
+            None
+        )
+        self._qa_row_findings = _QARowFindings()
+        self._qa_dirty_rows: set[int] = set()
         self._qa_scan_path: Path | None = None
         self._qa_scan_busy = False
         self._qa_scan_timer = QTimer(self)
         self._qa_scan_timer.setSingleShot(False)
         self._qa_scan_timer.setInterval(50)
         self._qa_scan_timer.timeout.connect(self._poll_qa_scan)
+        self._qa_project_scanner = _QAProjectScanner(self._root)
+        self._qa_project_findings: dict[Path, tuple[_QAFinding, ...]] = {}
+        self._file_open_job = None
+        self._file_open_pool = None
+        self._file_open_timer = QTimer(self)
+        self._file_open_timer.setInterval(15)
+        self._file_open_timer.timeout.connect(self._poll_file_open)
+        self._qa_project_timer = QTimer(self)
+        self._qa_project_timer.setInterval(50)
+        self._qa_project_timer.timeout.connect(self._poll_qa_project_scan)
         self._qa_refresh_timer = QTimer(self)
         self._qa_refresh_timer.setSingleShot(True)
-        self._qa_refresh_timer.timeout.connect(self._start_qa_scan_for_current_file)
+        self._qa_refresh_timer.timeout.connect(self._refresh_qa_scan)
 
         if not self._smoke and not self._check_en_hash_cache():
             self._startup_aborted = True
@@ -608,6 +666,12 @@ class MainWindow(QMainWindow):
         self._tm_rebuild_timer.setSingleShot(False)
         self._tm_rebuild_timer.setInterval(100)
         self._tm_rebuild_timer.timeout.connect(self._poll_tm_rebuild)
+        self._tm_maintain_timer = QTimer(self)
+        self._tm_maintain_timer.setInterval(100)
+        self._tm_maintain_timer.timeout.connect(self._poll_tm_maintenance)
+        self._tm_index_timer = QTimer(self)
+        self._tm_index_timer.setInterval(250)
+        self._tm_index_timer.timeout.connect(self._poll_tm_index)
 
         self._main_splitter = QSplitter(Qt.Vertical, self)
         self._content_splitter = QSplitter(Qt.Horizontal, self)
@@ -758,12 +822,16 @@ class MainWindow(QMainWindow):
         self._search_timer.timeout.connect(self._run_search)
         self._search_column = 0
         self._last_saved_text = ""
-        self._search_rows_cache: OrderedDict[
-            tuple[Path, bool, bool], tuple[_SearchRowsCacheStamp, list[_SearchRow]]
-        ] = OrderedDict()
-        self._search_cache_max = 64
+        self._search_rows_cache = _SearchRowsStore(max_bytes=64 * 1024 * 1024)
+        self._search_index: _SearchIndex | None = None
+        self._search_refinement = _SearchRefinementMemo()
         self._search_cache_row_limit = 5000
         self._search_panel_result_limit = 200
+        self._search_executor = _SearchExecutor()
+        self._regex_guard = _RegexGuard()
+        self._search_panel_timer = QTimer(self)
+        self._search_panel_timer.setInterval(50)
+        self._search_panel_timer.timeout.connect(self._poll_search_panel)
         self._replace_visible = False
         self._search_progress_text = ""
         self._row_resize_timer = QTimer(self)
@@ -781,6 +849,12 @@ class MainWindow(QMainWindow):
         self._scrolling = False
         self._row_height_cache: dict[int, int] = {}
         self._row_height_cache_key: tuple[int, ...] | None = None
+        self._row_height_store = _RowHeightStore.for_root(self._root)
+        self._row_refine_rows: dict[int, None] = {}
+        self._row_refine_timer = QTimer(self)
+        self._row_refine_timer.setSingleShot(True)
+        self._row_refine_timer.setInterval(0)
+        self._row_refine_timer.timeout.connect(self._refine_row_heights)
         self._row_resize_budget_ms = 8.0
         self._row_resize_cursor: int | None = None
         self._tooltip_timer = QTimer(self)
@@ -846,7 +920,7 @@ class MainWindow(QMainWindow):
         self.menu_view = menubar.addMenu("View")
         self.menu_help = menubar.addMenu("Help")
 
-        # ── left pane: side panel (Files / TM / Search / QA) ────────────────
+        # ── left pane: side panel (Files / TM / Search / QA / Concordance) ───
         self._left_panel = QWidget()
         left_layout = QVBoxLayout(self._left_panel)
         left_layout.setContentsMargins(0, 0, 0, 0)
@@ -870,11 +944,15 @@ class MainWindow(QMainWindow):
         self._left_qa_btn = QToolButton(self)
         self._left_qa_btn.setText("QA")
         self._left_qa_btn.setCheckable(True)
+        self._left_concordance_btn = QToolButton(self)
+        self._left_concordance_btn.setText("Concordance")
+        self._left_concordance_btn.setCheckable(True)
         for btn, idx in (
             (self._left_files_btn, _LEFT_PANEL_FILES),
             (self._left_tm_btn, _LEFT_PANEL_TM),
             (self._left_search_btn, _LEFT_PANEL_SEARCH),
             (self._left_qa_btn, _LEFT_PANEL_QA),
+            (self._left_concordance_btn, _LEFT_PANEL_CONCORDANCE),
         ):
             btn.setAutoRaise(True)
             self._left_group.addButton(btn, idx)
@@ -899,8 +977,8 @@ class MainWindow(QMainWindow):
         # prevent in-place renaming on double-click; we use double-click to open
         self.tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self._schedule_post_locale_tasks()
-        self.tree.activated.connect(self._file_chosen)  # Enter / platform activation
-        self.tree.doubleClicked.connect(self._file_chosen)
+        self.tree.activated.connect(self._file_activated)  # Enter / activation
+        self.tree.doubleClicked.connect(self._file_activated)
         self._left_stack.addWidget(self.tree)
 
         self._tm_panel = QWidget(self._left_panel)
@@ -1017,6 +1095,13 @@ class MainWindow(QMainWindow):
         self._qa_refresh_btn.setToolTip("Run QA checks for current file")
         self._qa_refresh_btn.clicked.connect(self._start_qa_scan_for_current_file)
         qa_header.addWidget(self._qa_refresh_btn)
+        self._qa_project_btn = QToolButton(self._qa_panel)
+        self._qa_project_btn.setText("Scan Locales")
+        self._qa_project_btn.setToolTip(
+            "Run QA checks for all files in selected locales"
+        )
+        self._qa_project_btn.clicked.connect(self._start_qa_project_scan)
+        qa_header.addWidget(self._qa_project_btn)
         self._qa_progress = QProgressBar(self._qa_panel)
         self._qa_progress.setTextVisible(False)
         self._qa_progress.setRange(0, 0)
@@ -1029,6 +1114,10 @@ class MainWindow(QMainWindow):
         qa_layout.addWidget(self._qa_progress)
         qa_layout.addWidget(self._qa_results_list)
         self._left_stack.addWidget(self._qa_panel)
+        self._concordance_panel = TMConcordancePanel(
+            self._search_tm_concordance, self._left_panel
+        )
+        self._left_stack.addWidget(self._concordance_panel)
 
         self._left_files_btn.setChecked(True)
         self._left_stack.setCurrentIndex(_LEFT_PANEL_FILES)
@@ -1092,6 +1181,8 @@ class MainWindow(QMainWindow):
             options_provider=self._text_visual_options_table,
         )
         self.table.setItemDelegateForColumn(2, self._value_delegate)
+        self._source_delegate.set_height_store(self._row_height_store)
+        self._value_delegate.set_height_store(self._row_height_store)
         self._status_delegate = StatusDelegate(self.table)
         self.table.setItemDelegateForColumn(3, self._status_delegate)
         header = self.table.horizontalHeader()
@@ -1644,6 +1735,8 @@ class MainWindow(QMainWindow):
         except Exception as exc:
             self._tm_store = None
             QMessageBox.warning(self, "TM init failed", str(exc))
+            return
+        _start_tm_token_backfill(self)
 
     def _ensure_tm_store(self) -> bool:
         if self._tm_store is None:
@@ -1891,41 +1984,26 @@ class MainWindow(QMainWindow):
         locale: str | None,
         *,
         target_entries: Sequence[Entry] | None = None,
+        reference_mode: str | None = None,
     ) -> _SourceLookup:
-        reference_mode = _effective_source_reference_mode_for_window(
-            self,
-            path,
-            locale,
-        )
-        materialized = _load_reference_lookup(
+        if reference_mode is None:
+            reference_mode = _effective_source_reference_mode_for_window(
+                self,
+                path,
+                locale,
+            )
+        return _load_source_lookup(
             root=self._root,
             path=path,
-            target_locale=locale,
-            reference_locale=reference_mode,
+            locale=locale,
+            reference_mode=reference_mode,
             locale_encodings={
                 code: meta.charset for code, meta in self._locales.items()
             },
-            target_entries=target_entries,
             parsed_cache=self._en_cache,
-            should_parse_lazy=self._should_parse_lazy,
-            parse_eager=lambda file_path, encoding: parse(file_path, encoding=encoding),
-            parse_lazy=lambda file_path, encoding: parse_lazy(
-                file_path, encoding=encoding
-            ),
+            lazy_parse_min_bytes=self._lazy_parse_min_bytes,
+            target_entries=target_entries,
         )
-        if materialized is None:
-            return _SourceLookup(by_key={})
-        if materialized.by_row_entries is not None:
-            return _SourceLookup(
-                by_row=_LazySourceRows(materialized.by_row_entries),
-                keys=materialized.keys,
-            )
-        if materialized.by_row_values is not None:
-            return _SourceLookup(
-                by_row=materialized.by_row_values,
-                keys=materialized.keys,
-            )
-        return _SourceLookup(by_key=materialized.by_key or {})
 
     # ----------------------------------------------------------------- slots
     def _check_en_hash_cache(self) -> bool:
@@ -1994,8 +2072,9 @@ class MainWindow(QMainWindow):
             "Import TM",
             str(self._root),
             (
-                "TM files (*.tmx *.xliff *.xlf *.po *.pot *.csv *.mo *.xml *.xlsx);;"
-                "TMX files (*.tmx);;"
+                "TM files "
+                "(*.tmx *.tmx.gz *.xliff *.xlf *.po *.pot *.csv *.mo *.xml *.xlsx);;"
+                "TMX files (*.tmx *.tmx.gz);;"
                 "XLIFF files (*.xliff *.xlf);;"
                 "PO files (*.po *.pot);;"
                 "CSV files (*.csv);;"
@@ -2033,7 +2112,8 @@ class MainWindow(QMainWindow):
             self,
             "Export TMX",
             str(self._root / "translation_memory.tmx"),
-            "TMX files (*.tmx);;All files (*)",
+            "TMX files (*.tmx);;Compressed TMX files (*.tmx.gz);;"
+            "TM snapshots (*.tzptm);;All files (*)",
         )
         if not path:
             return
@@ -2057,8 +2137,11 @@ class MainWindow(QMainWindow):
                 self, "Invalid locales", "Source/target locales required."
             )
             return
+        export = self._tm_store.export_tmx
+        if path.lower().endswith(".tzptm"):
+            export = self._tm_store.export_snapshot
         try:
-            count = self._tm_store.export_tmx(
+            count = export(
                 Path(path), source_locale=source_locale, target_locale=target_locale
             )
         except Exception as exc:
@@ -2081,27 +2164,7 @@ class MainWindow(QMainWindow):
         self._start_tm_rebuild(locales, interactive=True, force=True)
 
     def _show_copyable_report(self, title: str, text: str) -> None:
-        dialog = QDialog(self)
-        dialog.setWindowTitle(title)
-        dialog.resize(760, 460)
-        layout = QVBoxLayout(dialog)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(8)
-
-        editor = QPlainTextEdit(dialog)
-        editor.setReadOnly(True)
-        editor.setLineWrapMode(QPlainTextEdit.NoWrap)
-        editor.setPlainText(text)
-        layout.addWidget(editor)
-
-        buttons = QDialogButtonBox(QDialogButtonBox.Close, dialog)
-        copy_btn = buttons.addButton("Copy", QDialogButtonBox.ActionRole)
-        copy_btn.clicked.connect(
-            lambda: QGuiApplication.clipboard().setText(editor.toPlainText())
-        )
-        buttons.rejected.connect(dialog.reject)
-        layout.addWidget(buttons)
-        dialog.exec()
+        CopyableReportDialog(self, title, text).exec()
 
     def _show_tm_diagnostics(self) -> None:
         if not self._ensure_tm_store():
@@ -2323,6 +2386,9 @@ class MainWindow(QMainWindow):
             self._qa_auto_mark_for_review,
             self._qa_auto_mark_touched_for_review,
         ) = updated_qa
+        if qa_changed:
+            self._cancel_qa_project_scan()
+            self._qa_project_findings = {}
         if qa_changed and self._current_model is not None:
             if self._qa_auto_refresh:
                 self._schedule_qa_refresh(immediate=True)
@@ -2348,6 +2414,7 @@ class MainWindow(QMainWindow):
         tm_resolve_pending = bool(values.get("tm_resolve_pending", False))
         tm_export_tmx = bool(values.get("tm_export_tmx", False))
         tm_rebuild = bool(values.get("tm_rebuild", False))
+        tm_maintain = bool(values.get("tm_maintain", False))
         tm_show_diagnostics = bool(values.get("tm_show_diagnostics", False))
         self._persist_preferences()
         if tm_resolve_pending:
@@ -2356,6 +2423,8 @@ class MainWindow(QMainWindow):
             self._export_tmx()
         if tm_rebuild:
             self._rebuild_tm_selected()
+        if tm_maintain and self._ensure_tm_store():
+            _start_tm_maintenance(self)
         if tm_show_diagnostics:
             self._show_tm_diagnostics()
         if self._left_stack.currentIndex() == 1:
@@ -2455,11 +2524,18 @@ class MainWindow(QMainWindow):
     def _rebuild_tree_for_selected_locales(
         self, *, tree_plan: _TreeRebuildPlan
     ) -> None:
+        old_model = getattr(self, "fs_model", None)
+        if old_model is not None:
+            self._cancel_file_open()
         self.fs_model = FsModel(
             self._root,
             [self._locales[c] for c in self._selected_locales],
             lazy=tree_plan.lazy_tree,
+            snapshot=self._file_snapshot,
+            draft_files=lambda code: self._all_draft_files([code]),
         )
+        if old_model is not None:
+            old_model.shutdown()
         self.tree.setModel(self.fs_model)
         if tree_plan.preload_single_root:
             idx = self.fs_model.index(0, 0)
@@ -2480,173 +2556,216 @@ class MainWindow(QMainWindow):
 
     def _file_chosen(self, index) -> None:
         """Populate table when user activates a translation file."""
+        path = self._path_to_open(index)
+        if path is None:
+            return
+        self._cancel_file_open()
+        if not self._leave_current_file(path):
+            return
+        with self._open_flow_guard():
+            locale = self._locale_for_path(path)
+            encoding = self._encoding_for_locale(locale)
+            try:
+                open_result = self._prepare_open_file(path, encoding)
+            except Exception as exc:
+                self._report_parse_error(path, exc)
+                return
+            source_lookup = self._load_reference_source(
+                path, locale, target_entries=open_result.parsed_file.entries
+            )
+            self._show_opened_file(path, encoding, open_result, source_lookup)
+
+    def _file_activated(self, index) -> None:
+        """Tree activation: large files open through the background pipeline."""
+        path = self._path_to_open(index)
+        if path is not None and _should_open_async(self, path):
+            self._start_file_open(path)
+        else:
+            self._file_chosen(index)
+
+    def _path_to_open(self, index) -> Path | None:
         raw_path = index.data(Qt.UserRole)  # FsModel stores absolute path string
         path = Path(raw_path) if raw_path else None
         if not (path and path.suffix == self._app_config.translation_ext):
-            return
+            return None
         if (
             self._current_pf
             and self._current_pf.path == path
             and not self._skip_cache_write
         ):
-            return
+            return None
+        return path
+
+    def _leave_current_file(self, path: Path) -> bool:
         self._conflict_notified.discard(path)
         if self._skip_cache_write:
             self._skip_cache_write = False
+            return True
+        return self._write_cache_current()
+
+    def _encoding_for_locale(self, locale: str | None) -> str:
+        return self._locales.get(
+            locale or "", LocaleMeta("", Path(), "", "utf-8")
+        ).charset
+
+    def _prepare_open_file(self, path: Path, encoding: str) -> _OpenFileResult:
+        """Parse, read the status cache and overlay it; safe off the GUI thread."""
+        callbacks = _OpenFileCallbacks(
+            parse_eager=lambda file_path, enc: parse(file_path, encoding=enc),
+            parse_lazy=lambda file_path, enc: parse_lazy(file_path, encoding=enc),
+            read_cache=lambda file_path: _read_status_cache(self._root, file_path),
+            touch_last_opened=lambda file_path, ts: _touch_last_opened(
+                self._root, file_path, ts
+            ),
+            now_ts=lambda: int(time.time()),
+        )
+        return self._file_workflow_service.prepare_open_file(
+            path,
+            encoding,
+            use_lazy_parser=self._should_parse_lazy(path),
+            callbacks=callbacks,
+            hash_for_entry=lambda entry, cache_map: self._hash_for_cache(
+                entry, cache_map
+            ),
+        )
+
+    def _show_opened_file(
+        self,
+        path: Path,
+        encoding: str,
+        open_result: _OpenFileResult,
+        source_lookup: _SourceLookup | None,
+    ) -> None:
+        """Install *open_result* as the current file. With no *source_lookup*
+        the source column stays empty until `_apply_opened_source`."""
+        pending_source = source_lookup is None
+        if source_lookup is None:
+            source_lookup = _SourceLookup(by_key={})
+        pf = open_result.parsed_file
+        self._current_encoding = encoding
+        try:
+            self._current_file_size = path.stat().st_size
+        except OSError:
+            self._current_file_size = 0
+
+        self._cache_map = open_result.cache_map
+        overlay = open_result.overlay
+        changed_keys = overlay.changed_keys
+        baseline_by_row = overlay.baseline_by_row
+        conflict_originals = overlay.conflict_originals
+        original_values = overlay.original_values
+        self._current_pf = pf
+        self._opened_files.add(path)
+        if self._current_model:
+            try:
+                self._current_model.dataChanged.disconnect(self._on_model_changed)
+                self._current_model.dataChanged.disconnect(self._on_model_data_changed)
+            except (TypeError, RuntimeError):
+                pass
+        self._current_model = TranslationModel(
+            pf,
+            baseline_by_row=baseline_by_row,
+            source_values=source_lookup,
+            source_by_row=source_lookup.by_row,
+        )
+        self._current_model.dataChanged.connect(self._on_model_changed)
+        self._current_model.dataChanged.connect(self._on_model_data_changed)
+        if not self._user_resized_columns:
+            self._source_translation_ratio = 0.5
+        self._table_layout_guard = True
+        self.table.setModel(self._current_model)
+        self._clear_row_height_cache()
+        self._apply_table_layout()
+        self._table_layout_guard = False
+        self._update_render_cost_flags()
+        self._update_large_file_mode()
+        self.table.selectionModel().currentChanged.connect(self._on_selection_changed)
+        self._sync_source_reference_override_ui()
+        self._update_status_combo_from_selection()
+        self._update_replace_enabled()
+        self._sync_detail_editors()
+        self._update_status_bar()
+        if not self._last_saved_text:
+            self._last_saved_text = "Ready"
+            self._update_status_bar()
+        if self._should_defer_post_open():
+            self._schedule_post_open_tasks(path)
         else:
-            if not self._write_cache_current():
-                return
-        with self._open_flow_guard():
-            locale = self._locale_for_path(path)
-            encoding = self._locales.get(
-                locale, LocaleMeta("", Path(), "", "utf-8")
-            ).charset
-            callbacks = _OpenFileCallbacks(
-                parse_eager=lambda file_path, enc: parse(file_path, encoding=enc),
-                parse_lazy=lambda file_path, enc: parse_lazy(file_path, encoding=enc),
-                read_cache=lambda file_path: _read_status_cache(self._root, file_path),
-                touch_last_opened=lambda file_path, ts: _touch_last_opened(
-                    self._root, file_path, ts
-                ),
-                now_ts=lambda: int(time.time()),
-            )
+            self._prefetch_visible_rows()
+            if self._wrap_text:
+                self._schedule_row_resize()
+        if changed_keys:
+            self.fs_model.set_dirty(self._current_pf.path, True)
+        if not pending_source:
+            self._apply_opened_source(path, source_lookup, conflict_originals)
+
+        if self._cache_map and getattr(self._cache_map, "hash_bits", 64) == 16:
             try:
-                open_result = self._file_workflow_service.prepare_open_file(
+                _write_status_cache(
+                    self._root,
                     path,
-                    encoding,
-                    use_lazy_parser=self._should_parse_lazy(path),
-                    callbacks=callbacks,
-                    hash_for_entry=lambda entry, cache_map: self._hash_for_cache(
-                        entry, cache_map
-                    ),
+                    pf.entries,
+                    changed_keys=changed_keys,
+                    original_values=original_values,
+                    last_opened=int(time.time()),
                 )
             except Exception as exc:
-                self._report_parse_error(path, exc)
-                return
-            pf = open_result.parsed_file
-
-            self._current_encoding = encoding
-            try:
-                self._current_file_size = path.stat().st_size
-            except OSError:
-                self._current_file_size = 0
-
-            source_lookup = self._load_reference_source(
-                path, locale, target_entries=pf.entries
-            )
-            self._cache_map = open_result.cache_map
-            overlay = open_result.overlay
-            changed_keys = overlay.changed_keys
-            baseline_by_row = overlay.baseline_by_row
-            conflict_originals = overlay.conflict_originals
-            original_values = overlay.original_values
-            self._current_pf = pf
-            self._opened_files.add(path)
-            if self._current_model:
+                QMessageBox.warning(self, "Cache migration failed", str(exc))
+
+        # (re)create undo/redo actions bound to this file's stack
+        for action in list(self.menu_edit.actions()):
+            text = action.text().replace("&", "").strip()
+            if text.startswith("Undo") or text.startswith("Redo"):
+                self.menu_edit.removeAction(action)
+        for old in (self.act_undo, self.act_redo):
+            if old and isValid(old):
                 try:
-                    self._current_model.dataChanged.disconnect(self._on_model_changed)
-                    self._current_model.dataChanged.disconnect(
-                        self._on_model_data_changed
-                    )
-                except (TypeError, RuntimeError):
+                    if old in self.menu_edit.actions():
+                        self.menu_edit.removeAction(old)
+                    self.removeAction(old)
+                    old.deleteLater()
+                except RuntimeError:
                     pass
-            self._current_model = TranslationModel(
-                pf,
-                baseline_by_row=baseline_by_row,
-                source_values=source_lookup,
-                source_by_row=source_lookup.by_row,
-            )
-            self._current_model.dataChanged.connect(self._on_model_changed)
-            self._current_model.dataChanged.connect(self._on_model_data_changed)
-            if self._qa_auto_refresh:
-                self._schedule_qa_refresh(immediate=True)
-            else:
-                self._set_qa_findings(())
-                self._set_qa_panel_message("QA is manual. Click Run QA for this file.")
-            if not self._user_resized_columns:
-                self._source_translation_ratio = 0.5
-            self._table_layout_guard = True
-            self.table.setModel(self._current_model)
-            self._clear_row_height_cache()
-            self._apply_table_layout()
-            self._table_layout_guard = False
-            self._update_render_cost_flags()
-            self._update_large_file_mode()
-            self.table.selectionModel().currentChanged.connect(
-                self._on_selection_changed
-            )
-            self._sync_source_reference_override_ui()
-            self._update_status_combo_from_selection()
-            self._update_replace_enabled()
-            self._sync_detail_editors()
-            self._update_status_bar()
-            if not self._last_saved_text:
-                self._last_saved_text = "Ready"
-                self._update_status_bar()
-            if self._should_defer_post_open():
-                self._schedule_post_open_tasks(path)
-            else:
-                self._prefetch_visible_rows()
-                if self._wrap_text:
-                    self._schedule_row_resize()
-            if changed_keys:
-                self.fs_model.set_dirty(self._current_pf.path, True)
-            if not self._skip_conflict_check:
-                if conflict_originals:
-                    conflict_sources = {
-                        key: source_lookup.get(key, "") for key in conflict_originals
-                    }
-                    self._register_conflicts(path, conflict_originals, conflict_sources)
-                else:
-                    self._clear_conflicts(path)
-            else:
-                self._skip_conflict_check = False
+        self.act_undo = None
+        self.act_redo = None
+        stack = self._current_model.undo_stack
+        self.act_undo = stack.createUndoAction(self, "&Undo")
+        self.act_redo = stack.createRedoAction(self, "&Redo")
+        self.act_undo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.act_redo.setShortcut(QKeySequence("Ctrl+Y"))
+        self.act_undo.setShortcutContext(Qt.ApplicationShortcut)
+        self.act_redo.setShortcutContext(Qt.ApplicationShortcut)
+        for action in (self.act_undo, self.act_redo):
+            self.addAction(action)
+        if self.menu_edit.actions():
+            first = self.menu_edit.actions()[0]
+            self.menu_edit.insertAction(first, self.act_redo)
+            self.menu_edit.insertAction(first, self.act_undo)
+        else:
+            self.menu_edit.addAction(self.act_undo)
+            self.menu_edit.addAction(self.act_redo)
 
-            if self._cache_map and getattr(self._cache_map, "hash_bits", 64) == 16:
-                try:
-                    _write_status_cache(
-                        self._root,
-                        path,
-                        pf.entries,
-                        changed_keys=changed_keys,
-                        original_values=original_values,
-                        last_opened=int(time.time()),
-                    )
-                except Exception as exc:
-                    QMessageBox.warning(self, "Cache migration failed", str(exc))
-
-            # (re)create undo/redo actions bound to this file's stack
-            for action in list(self.menu_edit.actions()):
-                text = action.text().replace("&", "").strip()
-                if text.startswith("Undo") or text.startswith("Redo"):
-                    self.menu_edit.removeAction(action)
-            for old in (self.act_undo, self.act_redo):
-                if old and isValid(old):
-                    try:
-                        if old in self.menu_edit.actions():
-                            self.menu_edit.removeAction(old)
-                        self.removeAction(old)
-                        old.deleteLater()
-                    except RuntimeError:
-                        pass
-            self.act_undo = None
-            self.act_redo = None
-            stack = self._current_model.undo_stack
-            self.act_undo = stack.createUndoAction(self, "&Undo")
-            self.act_redo = stack.createRedoAction(self, "&Redo")
-            self.act_undo.setShortcut(QKeySequence.StandardKey.Undo)
-            self.act_redo.setShortcut(QKeySequence("Ctrl+Y"))
-            self.act_undo.setShortcutContext(Qt.ApplicationShortcut)
-            self.act_redo.setShortcutContext(Qt.ApplicationShortcut)
-            for action in (self.act_undo, self.act_redo):
-                self.addAction(action)
-            if self.menu_edit.actions():
-                first = self.menu_edit.actions()[0]
-                self.menu_edit.insertAction(first, self.act_redo)
-                self.menu_edit.insertAction(first, self.act_undo)
-            else:
-                self.menu_edit.addAction(self.act_undo)
-                self.menu_edit.addAction(self.act_redo)
+    def _apply_opened_source(
+        self,
+        path: Path,
+        source_lookup: _SourceLookup,
+        conflict_originals: dict[str, str],
+    ) -> None:
+        """Steps of an open that need the reference source."""
+        if self._qa_auto_refresh:
+            self._schedule_qa_refresh(immediate=True)
+        else:
+            self._set_qa_findings(())
+            self._set_qa_panel_message("QA is manual. Click Run QA for this file.")
+        if self._skip_conflict_check:
+            self._skip_conflict_check = False
+        elif conflict_originals:
+            conflict_sources = {
+                key: source_lookup.get(key, "") for key in conflict_originals
+            }
+            self._register_conflicts(path, conflict_originals, conflict_sources)
+        else:
+            self._clear_conflicts(path)
 
     def _apply_table_layout(self) -> None:
         if not self.table.model():
@@ -2813,61 +2932,18 @@ class MainWindow(QMainWindow):
         if rows is None:
             self._row_height_cache.clear()
             self._row_height_cache_key = None
+            self._row_refine_rows.clear()
             return
         for row in rows:
             self._row_height_cache.pop(row, None)
 
-    def _resize_visible_rows(self) -> None:
-        if not self._wrap_text or not self._current_model:
-            return
-        raw_span = self._pending_row_span or self._visible_row_span()
-        span = self._render_workflow_service.resume_resize_span(
-            span=raw_span,
-            cursor=self._row_resize_cursor,
-        )
-        if span is None:
-            return
-        signature = self._row_height_cache_signature()
-        if signature != self._row_height_cache_key:
-            self._row_height_cache_key = signature
-            self._row_height_cache.clear()
-        start, end = span
-        perf_trace = PERF_TRACE
-        perf_start = perf_trace.start("row_resize")
-        rows_processed = 0
-        budget_ms = self._row_resize_budget_ms
-        time_start = time.perf_counter()
-        for row in range(start, end + 1):
-            rows_processed += 1
-            cached = self._row_height_cache.get(row)
-            if cached is not None:
-                if self.table.rowHeight(row) != cached:
-                    self.table.setRowHeight(row, cached)
-                if (time.perf_counter() - time_start) * 1000.0 >= budget_ms:
-                    self._row_resize_cursor = row + 1
-                    self._pending_row_span = span
-                    self._row_resize_timer.start()
-                    perf_trace.stop(
-                        "row_resize", perf_start, items=rows_processed, unit="rows"
-                    )
-                    return
-                continue
-            height = self.table.sizeHintForRow(row)
-            if height <= 0:
-                continue
-            self._row_height_cache[row] = height
-            self.table.setRowHeight(row, height)
-            if (time.perf_counter() - time_start) * 1000.0 >= budget_ms:
-                self._row_resize_cursor = row + 1
-                self._pending_row_span = span
-                self._row_resize_timer.start()
-                perf_trace.stop(
-                    "row_resize", perf_start, items=rows_processed, unit="rows"
-                )
-                return
-        self._pending_row_span = None
-        self._row_resize_cursor = None
-        perf_trace.stop("row_resize", perf_start, items=rows_processed, unit="rows")
+    _resize_visible_rows = _resize_visible_rows
+    _refine_row_heights = _refine_row_heights
+    _start_file_open = _start_file_open
+    _poll_file_open = _poll_file_open
+    _poll_tm_maintenance = _poll_tm_maintenance
+    _poll_tm_index = _poll_tm_index
+    _cancel_file_open = _cancel_file_open
 
     def _on_table_scrolled(self, *_args) -> None:
         self._prefetch_pending = True
@@ -3152,6 +3228,8 @@ class MainWindow(QMainWindow):
             selected_locales=self._selected_locales
         )
         self._pending_post_locale_plan = plan
+        if self._selected_locales:
+            self._locale_variants.refresh_async(self._locales, self._selected_locales)
         if not plan.should_schedule:
             return
         if self._post_locale_timer.isActive():
@@ -3207,7 +3285,7 @@ class MainWindow(QMainWindow):
                 return
             index = self.fs_model.index_for_path(best_path)
             if index.isValid():
-                self._file_chosen(index)
+                self._file_activated(index)
         finally:
             perf_trace.stop("auto_open", perf_start, items=scanned, unit="files")
 
@@ -3445,6 +3523,7 @@ class MainWindow(QMainWindow):
     def _on_search_controls_changed(self, *_args) -> None:
         # Search runs only on explicit Enter/Next/Prev, not on typing.
         self._update_replace_enabled()
+        self.search_edit.setToolTip("")
         self._search_progress_text = ""
         self._update_status_bar()
         if self._search_timer.isActive():
@@ -3547,7 +3626,7 @@ class MainWindow(QMainWindow):
         meta = self._locales.get(locale)
         if not meta:
             return []
-        files = list_translatable_files(meta.path)
+        files = list(self._file_snapshot.files(meta.path))
         self._files_by_locale[locale] = files
         return files
 
@@ -3573,10 +3652,14 @@ class MainWindow(QMainWindow):
                 row=row,
                 request=request,
                 callbacks=callbacks,
+                regex_guard=self._regex_guard,
             )
         except re.error as exc:
             QMessageBox.warning(self, "Replace failed", str(exc))
             return
+        except _RegexTimeoutError as exc:
+            _warn_regex_timeout(self, exc)
+            return
         if changed:
             self._schedule_search()
 
@@ -3604,124 +3687,17 @@ class MainWindow(QMainWindow):
                 matches_empty=matches_empty,
                 has_group_ref=has_group_ref,
                 callbacks=callbacks,
+                regex_guard=self._regex_guard,
             )
         except re.error as exc:
             QMessageBox.warning(self, "Replace failed", str(exc))
             return None
-
-    def _replace_all_count_in_file(
-        self,
-        path: Path,
-        pattern: re.Pattern[str],
-        replacement: str,
-        use_regex: bool,
-        matches_empty: bool,
-        has_group_ref: bool,
-    ) -> int | None:
-        locale = self._locale_for_path(path)
-        encoding = self._locales.get(
-            locale, LocaleMeta("", Path(), "", "utf-8")
-        ).charset
-        callbacks = _ReplaceAllFileCountCallbacks(
-            parse_file=lambda file_path: parse(file_path, encoding=encoding),
-            read_cache=lambda file_path: _read_status_cache(self._root, file_path),
-        )
-        try:
-            return self._search_replace_service.count_replace_all_in_file(
-                path,
-                pattern=pattern,
-                replacement=replacement,
-                use_regex=use_regex,
-                matches_empty=matches_empty,
-                has_group_ref=has_group_ref,
-                callbacks=callbacks,
-                hash_for_entry=lambda entry, cache_map: self._hash_for_cache(
-                    entry, cache_map
-                ),
-            )
-        except _ReplaceAllFileParseError as exc:
-            self._report_parse_error(exc.path, exc.original)
-            return None
-        except re.error as exc:
-            QMessageBox.warning(self, "Replace failed", str(exc))
+        except _RegexTimeoutError as exc:
+            _warn_regex_timeout(self, exc)
             return None
 
     def _replace_all(self) -> None:
-        if not self._current_model:
-            return
-        request = self._prepare_replace_request()
-        if request is None:
-            return
-        scope = self._replace_scope
-        files = self._files_for_scope(scope)
-        if not files:
-            return
-        current_path = self._current_pf.path if self._current_pf else None
-        locale = (
-            self._locale_for_path(current_path) if current_path is not None else None
-        )
-
-        def _display_name(path: Path) -> str:
-            with contextlib.suppress(ValueError):
-                return str(path.relative_to(self._root))
-            return str(path)
-
-        run_plan = self._search_replace_service.build_replace_all_run_plan(
-            scope=scope,
-            current_locale=locale,
-            selected_locale_count=len(self._selected_locales),
-            files=files,
-            current_file=current_path,
-            display_name=_display_name,
-            count_in_current=lambda: self._replace_all_count_in_model(
-                request.pattern,
-                request.replacement,
-                request.use_regex,
-                request.matches_empty,
-                request.has_group_ref,
-            ),
-            count_in_file=lambda path: self._replace_all_count_in_file(
-                path,
-                request.pattern,
-                request.replacement,
-                request.use_regex,
-                request.matches_empty,
-                request.has_group_ref,
-            ),
-        )
-        if run_plan is None:
-            return
-        if not run_plan.run_replace:
-            return
-        if run_plan.show_confirmation:
-            dialog = ReplaceFilesDialog(
-                list(run_plan.counts), run_plan.scope_label, self
-            )
-            dialog.exec()
-            if not dialog.confirmed():
-                return
-        applied = self._search_replace_service.apply_replace_all(
-            files=files,
-            current_file=current_path,
-            apply_in_current=lambda: self._replace_all_in_model(
-                request.pattern,
-                request.replacement,
-                request.use_regex,
-                request.matches_empty,
-                request.has_group_ref,
-            ),
-            apply_in_file=lambda path: self._replace_all_in_file(
-                path,
-                request.pattern,
-                request.replacement,
-                request.use_regex,
-                request.matches_empty,
-                request.has_group_ref,
-            ),
-        )
-        if not applied:
-            return
-        self._schedule_search()
+        _run_replace_all(self)
 
     def _replace_all_in_model(
         self,
@@ -3749,60 +3725,14 @@ class MainWindow(QMainWindow):
                 matches_empty=matches_empty,
                 has_group_ref=has_group_ref,
                 callbacks=callbacks,
+                regex_guard=self._regex_guard,
             )
         except re.error as exc:
             QMessageBox.warning(self, "Replace failed", str(exc))
             return False
-        return True
-
-    def _replace_all_in_file(
-        self,
-        path: Path,
-        pattern: re.Pattern[str],
-        replacement: str,
-        use_regex: bool,
-        matches_empty: bool,
-        has_group_ref: bool,
-    ) -> bool:
-        locale = self._locale_for_path(path)
-        encoding = self._locales.get(
-            locale, LocaleMeta("", Path(), "", "utf-8")
-        ).charset
-        callbacks = _ReplaceAllFileApplyCallbacks(
-            parse_file=lambda file_path: parse(file_path, encoding=encoding),
-            read_cache=lambda file_path: _read_status_cache(self._root, file_path),
-            write_cache=lambda file_path, entries, changed_keys, original_values: (
-                _write_status_cache(
-                    self._root,
-                    file_path,
-                    entries,
-                    changed_keys=changed_keys,
-                    original_values=dict(original_values),
-                    force_original=set(original_values),
-                )
-            ),
-        )
-        try:
-            result = self._search_replace_service.apply_replace_all_in_file(
-                path,
-                pattern=pattern,
-                replacement=replacement,
-                use_regex=use_regex,
-                matches_empty=matches_empty,
-                has_group_ref=has_group_ref,
-                callbacks=callbacks,
-                hash_for_entry=lambda entry, cache_map: self._hash_for_cache(
-                    entry, cache_map
-                ),
-            )
-        except _ReplaceAllFileParseError as exc:
-            self._report_parse_error(exc.path, exc.original)
-            return False
-        except re.error as exc:
-            QMessageBox.warning(self, "Replace failed", str(exc))
+        except _RegexTimeoutError as exc:
+            _warn_regex_timeout(self, exc)
             return False
-        if result.changed_any:
-            self.fs_model.set_dirty(path, True)
         return True
 
     def _report_parse_error(self, path: Path, exc: Exception) -> None:
@@ -4125,46 +4055,9 @@ class MainWindow(QMainWindow):
         include_source: bool = True,
         include_value: bool = True,
     ) -> tuple[Iterable[_SearchRow], int]:
-        meta = self._locales.get(locale)
-        encoding = meta.charset if meta else "utf-8"
-        result = self._search_replace_service.load_search_rows_from_file(
-            path=path,
-            encoding=encoding,
-            use_lazy_parser=self._should_parse_lazy(path),
-            include_source=include_source,
-            include_value=include_value,
-            cache_row_limit=self._search_cache_row_limit,
-            callbacks=_SearchRowsFileCallbacks(
-                parse_eager=lambda file_path, enc: parse(file_path, encoding=enc),
-                parse_lazy=lambda file_path, enc: parse_lazy(file_path, encoding=enc),
-                read_cache=lambda file_path: _read_status_cache(self._root, file_path),
-                load_source_lookup=lambda parsed_file: (
-                    self._source_lookup_for_rows(
-                        path=path,
-                        locale=locale,
-                        entries=parsed_file.entries,
-                    )
-                ),
-            ),
-            hash_for_entry=lambda entry, cache_map: self._hash_for_cache(
-                entry, cache_map
-            ),
-        )
-        if result is None:
-            return (), 0
-        return result.rows, result.entry_count
-
-    def _source_lookup_for_rows(
-        self,
-        *,
-        path: Path,
-        locale: str,
-        entries: Sequence[Entry],
-    ) -> tuple[Sequence[str] | None, Callable[[str], str]]:
-        source_lookup = self._load_reference_source(
-            path, locale, target_entries=entries
+        return _RowsLoader.capture(self, (path,), locale=locale).rows(
+            path, include_source=include_source, include_value=include_value
         )
-        return source_lookup.by_row, lambda key: source_lookup.get(key, "")
 
     def _cached_rows_from_file(
         self,
@@ -4174,94 +4067,9 @@ class MainWindow(QMainWindow):
         include_source: bool,
         include_value: bool,
     ) -> Iterable[_SearchRow]:
-        stamp = self._search_replace_service.collect_rows_cache_stamp(
-            path=path,
-            include_source=include_source,
-            include_value=include_value,
-            callbacks=_SearchRowsCacheStampCallbacks(
-                file_mtime_ns=self._file_mtime_for_rows,
-                cache_mtime_ns=self._cache_mtime_for_rows,
-                source_mtime_ns=lambda file_path: self._source_mtime_for_rows(
-                    file_path, locale
-                ),
-            ),
+        return _RowsLoader.capture(self, (path,), locale=locale).cached_rows(
+            path, include_source=include_source, include_value=include_value
         )
-        if stamp is None:
-            return []
-        key = (path, include_source, include_value)
-        cached = self._search_rows_cache.get(key)
-        lookup_plan = self._search_replace_service.build_rows_cache_lookup_plan(
-            path=path,
-            include_source=include_source,
-            include_value=include_value,
-            file_mtime_ns=stamp.file_mtime_ns,
-            cache_mtime_ns=stamp.cache_mtime_ns,
-            source_mtime_ns=stamp.source_mtime_ns,
-            cached_stamp=cached[0] if cached else None,
-        )
-        cache_key = (
-            lookup_plan.key.path,
-            lookup_plan.key.include_source,
-            lookup_plan.key.include_value,
-        )
-        if lookup_plan.use_cached_rows and cached:
-            self._search_rows_cache.move_to_end(cache_key)
-            return cached[1]
-        rows, entry_count = self._rows_from_file(
-            path,
-            locale,
-            include_source=include_source,
-            include_value=include_value,
-        )
-        store_plan = self._search_replace_service.build_rows_cache_store_plan(
-            rows_materialized=isinstance(rows, list),
-            entry_count=entry_count,
-            cache_row_limit=self._search_cache_row_limit,
-        )
-        if store_plan.should_store_rows and isinstance(rows, list):
-            self._search_rows_cache[cache_key] = (lookup_plan.stamp, rows)
-            self._search_rows_cache.move_to_end(cache_key)
-            if len(self._search_rows_cache) > self._search_cache_max:
-                self._search_rows_cache.popitem(last=False)
-        return rows
-
-    def _file_mtime_for_rows(self, path: Path) -> int | None:
-        try:
-            return path.stat().st_mtime_ns
-        except OSError:
-            return None
-
-    def _cache_mtime_for_rows(self, path: Path) -> int:
-        try:
-            rel = path.relative_to(self._root)
-        except ValueError:
-            return 0
-        cache_path = (self._root / self._app_config.cache_dir / rel).with_suffix(
-            self._app_config.cache_ext
-        )
-        with contextlib.suppress(OSError):
-            return cache_path.stat().st_mtime_ns
-        return 0
-
-    def _source_mtime_for_rows(self, path: Path, locale: str) -> int:
-        reference_locale = _effective_source_reference_mode_for_window(
-            self,
-            path,
-            locale,
-        )
-        source_path = _reference_path_for(
-            self._root,
-            path,
-            target_locale=locale,
-            reference_locale=reference_locale,
-        )
-        if reference_locale == locale:
-            source_path = path if path.exists() else None
-        if not source_path:
-            return 0
-        with contextlib.suppress(OSError):
-            return source_path.stat().st_mtime_ns
-        return 0
 
     def _search_files_for_scope(self) -> list[Path]:
         return list(self._files_for_scope(self._search_scope))
@@ -4285,6 +4093,7 @@ class MainWindow(QMainWindow):
             start_row=start_row,
             direction=direction,
             case_sensitive=case_sensitive,
+            regex_guard=self._regex_guard,
         )
 
     def _find_match_in_file(
@@ -4298,12 +4107,15 @@ class MainWindow(QMainWindow):
         include_value: bool,
         start_row: int,
         direction: int,
+        indexed: _IndexedRows | None = None,
     ) -> _SearchMatch | None:
-        rows = self._search_rows_for_file(
-            path,
-            include_source=include_source,
-            include_value=include_value,
-        )
+        rows = indexed(path) if indexed is not None else None
+        if rows is None:
+            rows = self._search_rows_for_file(
+                path,
+                include_source=include_source,
+                include_value=include_value,
+            )
         return self._find_match_in_rows(
             rows,
             query,
@@ -4418,6 +4230,13 @@ class MainWindow(QMainWindow):
                 self._set_search_panel_message(plan.status_message)
             return False
         assert plan.field is not None
+        indexed = _fresh_indexed_rows(
+            self,
+            _RowsLoader.capture(self, plan.files),
+            query=plan.query,
+            field=plan.field,
+            use_regex=plan.use_regex,
+        )
         self._refresh_search_panel_results(
             query=plan.query,
             use_regex=plan.use_regex,
@@ -4437,16 +4256,21 @@ class MainWindow(QMainWindow):
                 include_value=plan.include_value,
                 start_row=start_row,
                 direction=direction,
+                indexed=indexed,
             )
 
-        match = self._search_replace_service.search_across_files(
-            files=list(plan.files),
-            anchor_path=plan.anchor_path,
-            anchor_row=plan.anchor_row,
-            direction=direction,
-            wrap=wrap,
-            find_in_file=_find_in_file,
-        )
+        try:
+            match = self._search_replace_service.search_across_files(
+                files=list(plan.files),
+                anchor_path=plan.anchor_path,
+                anchor_row=plan.anchor_row,
+                direction=direction,
+                wrap=wrap,
+                find_in_file=_find_in_file,
+            )
+        except _RegexTimeoutError as exc:
+            _flag_regex_timeout(self, exc)
+            return False
         return bool(match and self._select_match(match))
 
     def _set_search_panel_message(self, text: str) -> None:
@@ -4460,6 +4284,8 @@ class MainWindow(QMainWindow):
             and self._search_results_list is not None
         ):
             self._search_results_list.clear()
+        if hasattr(self, "_search_executor"):
+            _cancel_panel_search(self)
 
     def _refresh_search_panel_results(
         self,
@@ -4494,35 +4320,15 @@ class MainWindow(QMainWindow):
         if not files:
             self._set_search_panel_message("No files in current search scope.")
             return
-
-        def _iter_matches_for_file(path: Path) -> Iterable[_SearchMatch]:
-            rows = self._search_rows_for_file(
-                path,
-                include_source=include_source,
-                include_value=include_value,
-            )
-            return _iter_search_matches(
-                rows,
-                query_text,
-                field,
-                use_regex,
-                case_sensitive=self._search_case_sensitive,
-                include_preview=True,
-                preview_chars=96,
-            )
-
-        plan = self._search_replace_service.build_search_panel_plan(
-            files=files,
-            root=self._root,
-            result_limit=self._search_panel_result_limit,
-            iter_matches_for_file=_iter_matches_for_file,
+        _start_panel_search(
+            self,
+            files,
+            query=query_text,
+            field=field,
+            use_regex=use_regex,
+            include_source=include_source,
+            include_value=include_value,
         )
-        self._search_results_list.clear()
-        for row in plan.items:
-            item = QListWidgetItem(row.label)
-            item.setData(Qt.UserRole, (str(row.file), int(row.row)))
-            self._search_results_list.addItem(item)
-        self._search_status_label.setText(plan.status_message)
 
     def _open_search_result_item(self, item: QListWidgetItem) -> None:
         payload = item.data(Qt.UserRole)
@@ -4549,12 +4355,17 @@ class MainWindow(QMainWindow):
 
     def _set_qa_progress_visible(self, visible: bool) -> None:
         self._qa_scan_busy = bool(visible)
-        self._qa_progress.setVisible(self._qa_scan_busy)
+        self._qa_progress.setVisible(self._qa_scan_busy or _qa_project_running(self))
         self._qa_refresh_btn.setEnabled(not self._qa_scan_busy)
 
     _refresh_qa_for_current_file = _qa_refresh_sync_for_test
     _start_qa_scan_for_current_file = _qa_start_scan
     _poll_qa_scan = _qa_poll_scan
+    _refresh_qa_scan = _qa_refresh_scan
+    _start_qa_project_scan = _start_qa_project_scan
+    _poll_qa_project_scan = _poll_qa_project_scan
+    _cancel_qa_project_scan = _cancel_qa_project_scan
+    _poll_search_panel = _poll_panel_search
 
     def _set_qa_findings(self, findings: Sequence[_QAFinding]) -> None:
         self._qa_findings = tuple(findings)
@@ -4840,6 +4651,15 @@ class MainWindow(QMainWindow):
     def _on_model_data_changed(self, top_left, bottom_right, roles=None) -> None:
         if not self._current_model:
             return
+        if self._qa_auto_refresh and (
+            roles is None or Qt.EditRole in roles or Qt.DisplayRole in roles
+        ):
+            # Source-column swaps bump the model's source revision instead.
+            if bottom_right.column() >= 2:
+                self._qa_dirty_rows.update(
+                    range(top_left.row(), bottom_right.row() + 1)
+                )
+            self._schedule_qa_refresh()
         current = self.table.currentIndex()
         if not current.isValid():
             self._update_status_combo_from_selection()
@@ -4859,9 +4679,7 @@ class MainWindow(QMainWindow):
                 and not self._detail_translation.hasFocus()
             ):
                 self._sync_detail_editors()
-            if self._qa_auto_refresh:
-                self._schedule_qa_refresh()
-            else:
+            if not self._qa_auto_refresh:
                 self._set_qa_findings(())
                 if self._left_stack.currentIndex() == _LEFT_PANEL_QA:
                     self._set_qa_panel_message(
@@ -4972,6 +4790,28 @@ class MainWindow(QMainWindow):
         self._persist_preferences()
         self._update_tm_suggestions()
 
+    def _search_tm_concordance(
+        self, text: str, side: str, offset: int, limit: int
+    ) -> list[TMConcordanceHit] | None:
+        if not self._current_pf or not self._ensure_tm_store():
+            return None
+        assert self._tm_store is not None
+        target_locale = self._locale_for_path(self._current_pf.path)
+        if not target_locale:
+            return None
+        _ensure_tm_concordance_index(
+            self, source_locale=self._tm_source_locale, target_locale=target_locale
+        )
+        return self._tm_store.concordance(
+            text,
+            source_locale=self._tm_source_locale,
+            target_locale=target_locale,
+            side=side,
+            origins=origins_for(self._tm_query_policy()),
+            limit=limit,
+            offset=offset,
+        )
+
     def _current_tm_lookup(self) -> tuple[str, str] | None:
         if not (self._current_model and self._current_pf):
             return None
@@ -4996,39 +4836,6 @@ class MainWindow(QMainWindow):
         key = str(key_index.data(Qt.EditRole) or "").strip()
         return key or None
 
-    def _variant_path_for_locale(
-        self, path: Path, *, from_locale: str, to_locale: str
-    ) -> Path | None:
-        locale_root = self._root / from_locale
-        try:
-            rel = path.relative_to(locale_root)
-        except ValueError:
-            try:
-                rel_full = path.relative_to(self._root)
-                if rel_full.parts and rel_full.parts[0] == from_locale:
-                    rel = Path(*rel_full.parts[1:])
-                else:
-                    return None
-            except ValueError:
-                return None
-        candidate = self._root / to_locale / rel
-        if candidate.exists():
-            return candidate
-        stem = rel.stem
-        from_tokens = (from_locale, from_locale.replace(" ", "_"))
-        to_tokens = (to_locale, to_locale.replace(" ", "_"))
-        for from_token in from_tokens:
-            suffix = f"_{from_token}"
-            if not stem.endswith(suffix):
-                continue
-            stem_prefix = stem[: -len(suffix)]
-            for to_token in to_tokens:
-                alt = rel.with_name(f"{stem_prefix}_{to_token}{rel.suffix}")
-                alt_path = self._root / to_locale / alt
-                if alt_path.exists():
-                    return alt_path
-        return None
-
     def _load_locale_variant_pf(self, path: Path, locale: str) -> ParsedFile | None:
         try:
             mtime_ns = path.stat().st_mtime_ns
@@ -5092,11 +4899,19 @@ class MainWindow(QMainWindow):
         current_locale = self._locale_for_path(current_path)
         if not current_locale:
             return []
+        locales = [
+            loc for loc in self._selected_locales if loc not in {current_locale, "EN"}
+        ]
+        indexed = self._locale_variants.lookup(current_path, key, locales)
+        if indexed is not None:
+            return [
+                (loc, self._locale_display_name(loc), value, status)
+                for loc, value, status in indexed
+            ]
         out: list[tuple[str, str, str, int]] = []
-        for locale in self._selected_locales:
-            if locale in {current_locale, "EN"}:
-                continue
-            variant_path = self._variant_path_for_locale(
+        for locale in locales:
+            variant_path = _variant_path_for_locale(
+                self._root,
                 current_path,
                 from_locale=current_locale,
                 to_locale=locale,
@@ -5110,11 +4925,13 @@ class MainWindow(QMainWindow):
             if entry is None:
                 continue
             value, status = self._variant_value_and_status(variant_path, entry)
-            locale_meta = self._locales.get(locale)
-            locale_name = locale_meta.display_name if locale_meta else locale
-            out.append((locale, locale_name, value, status))
+            out.append((locale, self._locale_display_name(locale), value, status))
         return out
 
+    def _locale_display_name(self, locale: str) -> str:
+        meta = self._locales.get(locale)
+        return meta.display_name if meta else locale
+
     def _update_tm_locale_variants(self) -> None:
         self._tm_variants_list.clear()
         view = self._tm_workflow.build_locale_variants_view(
@@ -5202,6 +5019,16 @@ class MainWindow(QMainWindow):
             return
         self._tm_query_key = cache_key
         request = self._tm_workflow.build_query_request(cache_key)
+        pair = (request.source_locale, request.target_locale)
+        if self._tm_memory_pair != pair:
+            # Queued ahead of the query on the single worker; SQL serves until ready.
+            self._tm_memory_pair = pair
+            self._tm_query_pool.submit(
+                TMStore.load_memory_index,
+                self._tm_store.db_path,
+                source_locale=pair[0],
+                target_locale=pair[1],
+            )
         self._tm_query_future = self._tm_query_pool.submit(
             TMStore.query_path,
             self._tm_store.db_path,
@@ -5510,6 +5337,15 @@ class MainWindow(QMainWindow):
             self._flush_tm_updates()
         self._shutdown_qa_workers()
         self._shutdown_tm_workers()
+        _shutdown_tm_maintenance(self)
+        self._locale_variants.close()
+        self._search_executor.shutdown()
+        self._regex_guard.shutdown()
+        self._row_height_store.flush()
+        self.fs_model.shutdown()
+        _shutdown_file_open(self)
+        self._draft_manifest.flush()
+        _close_search_index(self)
         if self._tm_store is not None:
             with contextlib.suppress(Exception):
                 self._tm_store.close()
@@ -5525,6 +5361,10 @@ class MainWindow(QMainWindow):
                 self._tm_query_future.cancel()
         self._tm_query_future = None
         self._tm_query_key = None
+        self._tm_memory_pair = None
+        if self._tm_store is not None:
+            with contextlib.suppress(Exception):
+                TMStore.unload_memory_index(self._tm_store.db_path)
         if self._tm_query_pool is None:
             self._tm_query_pool = None
         else:
@@ -5552,12 +5392,15 @@ class MainWindow(QMainWindow):
             with contextlib.suppress(Exception):
                 self._qa_scan_pool.shutdown(wait=False, cancel_futures=True)
         self._qa_scan_pool = None
+        self._qa_project_scanner.shutdown()
         self._set_qa_progress_visible(False)
 
     def _stop_timers(self) -> None:
         timers = [
             self._search_timer,
+            self._search_panel_timer,
             self._row_resize_timer,
+            self._row_refine_timer,
             self._resize_reflow_timer,
             self._scroll_idle_timer,
             self._tooltip_timer,
@@ -5565,10 +5408,14 @@ class MainWindow(QMainWindow):
             self._post_locale_timer,
             self._qa_refresh_timer,
             self._qa_scan_timer,
+            self._qa_project_timer,
+            self._file_open_timer,
             self._tm_update_timer,
             self._tm_flush_timer,
             self._tm_query_timer,
             self._tm_rebuild_timer,
+            self._tm_maintain_timer,
+            self._tm_index_timer,
         ]
         if self._migration_timer is not None:
             timers.append(self._migration_timer)
@@ -16,6 +16,7 @@ _DEFAULT_CATEGORIES = {
     "selection",
     "detail_sync",
     "layout",
+    "qa",
 }
 
 
@@ -38,6 +39,7 @@ class _Bucket:
     items: int = 0
     max_ms: float = 0.0
     unit: str = "items"
+    hits: int = 0
 
 
 class PerfTrace:
@@ -55,8 +57,11 @@ class PerfTrace:
     def from_env(cls) -> PerfTrace:
         return cls(_parse_categories(os.getenv(_TRACE_ENV, "")))
 
+    def wants(self, name: str) -> bool:
+        return self.enabled and name in self._categories
+
     def start(self, name: str) -> float | None:
-        if not self.enabled or name not in self._categories:
+        if not self.wants(name):
             return None
         return time.perf_counter()
 
@@ -69,19 +74,30 @@ class PerfTrace:
         self.record(name, elapsed_ms, items=items, unit=unit)
 
     def record(
-        self, name: str, elapsed_ms: float, *, items: int = 1, unit: str = "items"
+        self,
+        name: str,
+        elapsed_ms: float,
+        *,
+        items: int = 1,
+        unit: str = "items",
+        detail: str = "",
+        hits: int = 0,
     ) -> None:
-        if not self.enabled or name not in self._categories:
+        """Add one timing to *name*'s bucket, or to a `name:detail` sub-bucket
+        (e.g. one per QA rule); *hits* counts results such as findings."""
+        if not self.wants(name):
             return
-        bucket = self._buckets.get(name)
+        key = f"{name}:{detail}" if detail else name
+        bucket = self._buckets.get(key)
         if bucket is None:
             bucket = _Bucket(unit=unit)
-            self._buckets[name] = bucket
+            self._buckets[key] = bucket
         if bucket.unit != unit:
             unit = bucket.unit
         bucket.total_ms += elapsed_ms
         bucket.calls += 1
         bucket.items += max(0, items)
+        bucket.hits += max(0, hits)
         if elapsed_ms > bucket.max_ms:
             bucket.max_ms = elapsed_ms
         now = time.monotonic()
@@ -101,6 +117,8 @@ class PerfTrace:
                 item_part = f", {avg_item:.4f}ms/{bucket.unit}"
             else:
                 item_part = ""
+            if bucket.hits:
+                item_part += f", {bucket.hits} hits"
             lines.append(
                 f"perf {name}: {bucket.calls} calls, {bucket.items} {bucket.unit}, "
                 f"{bucket.total_ms:.1f}ms total, {avg_call:.2f}ms/call{item_part}, "
@@ -61,6 +61,7 @@ class PreferencesDialog(QDialog):
         self._tm_resolve_pending = False
         self._tm_export_tmx = False
         self._tm_rebuild = False
+        self._tm_maintain = False
         self._tm_show_diagnostics = False
         self._tm_resolve_btn: QPushButton | None = None
         self._tm_zero_segment_banner: QLabel | None = None
@@ -119,6 +120,7 @@ class PreferencesDialog(QDialog):
             "tm_resolve_pending": self._tm_resolve_pending,
             "tm_export_tmx": self._tm_export_tmx,
             "tm_rebuild": self._tm_rebuild,
+            "tm_maintain": self._tm_maintain,
             "tm_show_diagnostics": self._tm_show_diagnostics,
         }
 
@@ -310,8 +312,9 @@ class PreferencesDialog(QDialog):
         self._tm_formats_label = QLabel(
             "Supported now:\n"
             "- Import: TMX (.tmx), XLIFF (.xliff/.xlf), "
-            "PO (.po/.pot), CSV (.csv), MO (.mo), XML (.xml), XLSX (.xlsx)\n"
-            "- Export: TMX (.tmx, TMX 1.4)\n"
+            "PO (.po/.pot), CSV (.csv), MO (.mo), XML (.xml), XLSX (.xlsx), "
+            "TM snapshot (.tzptm)\n"
+            "- Export: TMX (.tmx, TMX 1.4), TM snapshot (.tzptm)\n"
             "- Runtime store: .tzp/config/tm.sqlite\n"
             "- Managed imported folder: .tzp/tms\n"
             "\n"
@@ -363,12 +366,19 @@ class PreferencesDialog(QDialog):
         rebuild_btn = QPushButton("Rebuild TM", widget)
         rebuild_btn.setToolTip("Rebuild project TM from selected locale files")
         rebuild_btn.clicked.connect(self._request_tm_rebuild)
+        maintain_btn = QPushButton("Maintain TM", widget)
+        maintain_btn.setToolTip(
+            "Remove duplicate imported rows and rows of deleted project files, "
+            "then compact the TM database"
+        )
+        maintain_btn.clicked.connect(self._request_tm_maintain)
         diagnostics_btn = QPushButton("Diagnostics", widget)
         diagnostics_btn.setToolTip("Show TM diagnostics for current filters and row")
         diagnostics_btn.clicked.connect(self._request_tm_diagnostics)
         ops_row.addWidget(self._tm_resolve_btn)
         ops_row.addWidget(export_btn)
         ops_row.addWidget(rebuild_btn)
+        ops_row.addWidget(maintain_btn)
         ops_row.addWidget(diagnostics_btn)
         ops_row.addStretch(1)
         layout.addLayout(ops_row)
@@ -433,14 +443,17 @@ class PreferencesDialog(QDialog):
             "Import TM files",
             start_dir,
             (
-                "TM files (*.tmx *.xliff *.xlf *.po *.pot *.csv *.mo *.xml *.xlsx);;"
-                "TMX files (*.tmx);;"
+                "TM files "
+                "(*.tmx *.tmx.gz *.xliff *.xlf *.po *.pot *.csv *.mo *.xml *.xlsx "
+                "*.tzptm);;"
+                "TMX files (*.tmx *.tmx.gz);;"
                 "XLIFF files (*.xliff *.xlf);;"
                 "PO files (*.po *.pot);;"
                 "CSV files (*.csv);;"
                 "MO files (*.mo);;"
                 "XML files (*.xml);;"
                 "XLSX files (*.xlsx);;"
+                "TM snapshots (*.tzptm);;"
                 "All files (*)"
             ),
         )
@@ -537,6 +550,10 @@ class PreferencesDialog(QDialog):
         self._tm_rebuild = True
         self.accept()
 
+    def _request_tm_maintain(self) -> None:
+        self._tm_maintain = True
+        self.accept()
+
     def _request_tm_diagnostics(self) -> None:
         self._tm_show_diagnostics = True
 
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Hashable, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from translationzed_py.core.qa_service import QAFinding, QAInputRow
+from translationzed_py.core.qa_service import QAFinding, QAInputRow, QARuleTiming
+
+from .perf_trace import PERF_TRACE
+from .qa_project_async import merge_current_file_findings, qa_rule_set
+
+
+def _record_rule_timing(code: str, elapsed_ms: float, rows: int, hits: int) -> None:
+    PERF_TRACE.record("qa", elapsed_ms, items=rows, unit="rows", detail=code, hits=hits)
+
+
+def _rule_timing() -> QARuleTiming | None:
+    return _record_rule_timing if PERF_TRACE.wants("qa") else None
 
 
 def _collect_input_rows(win: Any) -> tuple[QAInputRow, ...]:
@@ -23,15 +35,24 @@ def _collect_input_rows(win: Any) -> tuple[QAInputRow, ...]:
     return tuple(rows)
 
 
+def qa_scan_stamp(win: Any) -> Hashable:
+    """What per-row findings depend on besides the rows themselves."""
+    model = win._current_model
+    if model is None:
+        return None
+    return (qa_rule_set(win), id(model), model.source_revision)
+
+
 def _run_scan_job(
     win: Any,
     path: Path,
+    stamp: Hashable,
     rows: tuple[QAInputRow, ...],
     check_trailing: bool,
     check_newlines: bool,
     check_tokens: bool,
     check_same_as_source: bool,
-) -> tuple[Path, list[QAFinding]]:
+) -> tuple[Path, Hashable, list[QAFinding]]:
     findings = win._qa_service.scan_rows(
         file=path,
         rows=rows,
@@ -39,8 +60,9 @@ def _run_scan_job(
         check_newlines=check_newlines,
         check_tokens=check_tokens,
         check_same_as_source=check_same_as_source,
+        on_rule=_rule_timing(),
     )
-    return path, findings
+    return path, stamp, findings
 
 
 def start_scan(win: Any) -> None:
@@ -53,6 +75,7 @@ def start_scan(win: Any) -> None:
         win._set_qa_panel_message("QA is already running...")
         return
     rows = _collect_input_rows(win)
+    win._qa_dirty_rows.clear()
     if win._qa_scan_pool is None:
         win._qa_scan_pool = ThreadPoolExecutor(
             max_workers=1,
@@ -65,6 +88,7 @@ def start_scan(win: Any) -> None:
         _run_scan_job,
         win,
         path,
+        qa_scan_stamp(win),
         rows,
         win._qa_check_trailing,
         win._qa_check_newlines,
@@ -87,15 +111,57 @@ def poll_scan(win: Any) -> None:
     win._qa_scan_future = None
     win._set_qa_progress_visible(False)
     try:
-        path, findings = future.result()
+        path, stamp, findings = future.result()
     except Exception as exc:
         win._set_qa_panel_message(f"QA failed: {exc}")
         return
     if win._current_pf is None or win._current_pf.path != path:
+        win._schedule_qa_refresh()
+        return
+    win._qa_row_findings.reset(path, stamp, findings)
+    _publish(win, path, findings)
+    if win._qa_dirty_rows or stamp != qa_scan_stamp(win):
+        # Edits or rule changes that arrived while the scan ran.
+        win._schedule_qa_refresh()
+
+
+def refresh_scan(win: Any) -> None:
+    """Re-check only the rows edited since the last scan; falls back to a
+    full scan when the file, rules or source column changed."""
+    path = win._current_pf.path if win._current_pf is not None else None
+    model = win._current_model
+    if win._qa_scan_future is not None and not win._qa_scan_future.done():
         return
-    win._set_qa_findings(findings)
-    if win._qa_auto_mark_for_review:
-        win._apply_qa_auto_mark(findings)
+    if (
+        path is None
+        or model is None
+        or not win._qa_row_findings.matches(path, qa_scan_stamp(win))
+    ):
+        start_scan(win)
+        return
+    count = model.rowCount()
+    rows = sorted(row for row in win._qa_dirty_rows if 0 <= row < count)
+    win._qa_dirty_rows.clear()
+    if not rows:
+        return
+    fresh = win._qa_service.rescan_rows(
+        win._qa_row_findings,
+        rows=[QAInputRow(row, *model.row_texts(row)) for row in rows],
+        check_trailing=win._qa_check_trailing,
+        check_newlines=win._qa_check_newlines,
+        check_tokens=win._qa_check_escapes,
+        check_same_as_source=win._qa_check_same_as_source,
+        on_rule=_rule_timing(),
+    )
+    _publish(win, path, fresh)
+
+
+def _publish(win: Any, path: Path, fresh: Sequence[QAFinding]) -> None:
+    merged = merge_current_file_findings(win, path, win._qa_row_findings.findings())
+    if merged != win._qa_findings:
+        win._set_qa_findings(merged)
+    if win._qa_auto_mark_for_review and fresh:
+        win._apply_qa_auto_mark(fresh)
 
 
 def refresh_sync_for_test(win: Any) -> None:
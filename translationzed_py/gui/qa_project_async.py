@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from translationzed_py.core.qa_scan import QAFileJob, QARuleSet
+from translationzed_py.core.qa_service import QAFinding
+
+from .search_index_sync import source_path_for_rows
+
+
+def qa_rule_set(win: Any) -> QARuleSet:
+    return QARuleSet(
+        check_trailing=win._qa_check_trailing,
+        check_newlines=win._qa_check_newlines,
+        check_tokens=win._qa_check_escapes,
+        check_same_as_source=win._qa_check_same_as_source,
+    )
+
+
+def _job_for(win: Any, path: Path) -> QAFileJob | None:
+    locale = win._locale_for_path(path)
+    meta = win._locales.get(locale) if locale else None
+    if meta is None:
+        return None
+    source_path = source_path_for_rows(win, path, locale)
+    source_locale = win._locale_for_path(source_path) if source_path else None
+    source_meta = win._locales.get(source_locale) if source_locale else None
+    return QAFileJob(
+        root=win._root,
+        path=path,
+        encoding=meta.charset,
+        source_path=source_path,
+        source_encoding=source_meta.charset if source_meta else "utf-8",
+    )
+
+
+def start_project_scan(win: Any) -> None:
+    """QA over every file of the selected locales. The open file is checked
+    from its model by the regular scan; the rest run on the project scanner."""
+    if is_project_scan_running(win):
+        cancel_project_scan(win)
+        win._set_qa_panel_message("Locale scan stopped.")
+        return
+    current = win._current_pf.path if win._current_pf is not None else None
+    jobs = [
+        job
+        for job in (
+            _job_for(win, path)
+            for path in win._files_for_scope("POOL")
+            if path != current
+        )
+        if job is not None
+    ]
+    win._qa_project_findings = {}
+    if current is not None and win._current_model is not None:
+        win._qa_project_findings[current] = tuple(
+            finding for finding in win._qa_findings if finding.file == current
+        )
+        win._start_qa_scan_for_current_file()
+    if not jobs:
+        win._set_qa_findings(
+            win._qa_service.merge_file_findings(win._qa_project_findings)
+        )
+        return
+    win._qa_project_scanner.start(jobs, qa_rule_set(win))
+    win._qa_project_btn.setText("Stop Scan")
+    win._qa_progress.setVisible(True)
+    win._qa_project_timer.start()
+
+
+def poll_project_scan(win: Any) -> None:
+    run = win._qa_project_scanner.current
+    if run is None:
+        win._qa_project_timer.stop()
+        return
+    finished = run.done
+    taken = run.take()
+    for path, findings in taken:
+        win._qa_project_findings[path] = findings
+    if taken or finished:
+        win._set_qa_findings(
+            win._qa_service.merge_file_findings(win._qa_project_findings)
+        )
+    service = win._qa_service
+    message = service.project_status_message(
+        files_done=run.files_done,
+        files_total=run.total,
+        cached_files=run.cached_files,
+        findings=len(win._qa_findings),
+        failures=len(run.failures),
+        running=not finished,
+    )
+    if finished:
+        _stop_polling(win)
+        error = run.error()
+        if error is not None:
+            message = f"QA failed: {error}"
+    win._qa_status_label.setText(message)
+
+
+def merge_current_file_findings(
+    win: Any, path: Path, findings: Sequence[QAFinding]
+) -> tuple[QAFinding, ...]:
+    """Findings to show after a current-file scan: the file's own findings
+    merged into the locale scan when one has run."""
+    if not win._qa_project_findings:
+        return tuple(findings)
+    win._qa_project_findings[path] = tuple(findings)
+    return win._qa_service.merge_file_findings(win._qa_project_findings)
+
+
+def is_project_scan_running(win: Any) -> bool:
+    run = win._qa_project_scanner.current
+    return run is not None and not run.done
+
+
+def cancel_project_scan(win: Any) -> None:
+    win._qa_project_scanner.cancel()
+    _stop_polling(win)
+
+
+def _stop_polling(win: Any) -> None:
+    win._qa_project_timer.stop()
+    win._qa_project_btn.setText("Scan Locales")
+    if not win._qa_scan_busy:
+        win._qa_progress.setVisible(False)
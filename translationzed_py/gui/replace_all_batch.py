@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import contextlib
+import re
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtWidgets import QMessageBox
+
+from translationzed_py.core import parse
+from translationzed_py.core.project_scanner import LocaleMeta
+from translationzed_py.core.regex_guard import RegexGuard, RegexTimeoutError
+from translationzed_py.core.search_replace_service import (
+    ReplaceAllBatchCallbacks,
+    ReplaceAllFileCountCallbacks,
+    ReplaceAllFileDiff,
+    ReplaceAllFileParseError,
+    ReplaceRequest,
+)
+from translationzed_py.core.status_cache import read as read_status_cache
+from translationzed_py.core.status_cache import restore as restore_status_cache
+from translationzed_py.core.status_cache import snapshot as snapshot_status_cache
+from translationzed_py.core.status_cache import write as write_status_cache
+
+from .dialogs import ReplaceFilesDialog
+from .search_panel_async import warn_regex_timeout
+
+
+def plan_file(
+    win: Any,
+    path: Path,
+    request: ReplaceRequest,
+    regex_guard: RegexGuard | None = None,
+) -> ReplaceAllFileDiff:
+    locale = win._locale_for_path(path)
+    encoding = win._locales.get(locale, LocaleMeta("", Path(), "", "utf-8")).charset
+    return win._search_replace_service.plan_replace_all_in_file(
+        path,
+        pattern=request.pattern,
+        replacement=request.replacement,
+        use_regex=request.use_regex,
+        matches_empty=request.matches_empty,
+        has_group_ref=request.has_group_ref,
+        callbacks=ReplaceAllFileCountCallbacks(
+            parse_file=lambda file_path: parse(file_path, encoding=encoding),
+            read_cache=lambda file_path: read_status_cache(win._root, file_path),
+        ),
+        hash_for_entry=lambda entry, cache_map: win._hash_for_cache(entry, cache_map),
+        regex_guard=regex_guard,
+    )
+
+
+def run_replace_all(win: Any) -> None:
+    """Replace-all over the replace scope: one dry-run pass over the other
+    files (counts + preview), then one all-or-nothing cache batch, then the
+    open file through its model (undoable)."""
+    if not win._current_model:
+        return
+    request = win._prepare_replace_request()
+    if request is None:
+        return
+    scope = win._replace_scope
+    files = win._files_for_scope(scope)
+    if not files:
+        return
+    current_path = win._current_pf.path if win._current_pf else None
+    locale = win._locale_for_path(current_path) if current_path is not None else None
+    service = win._search_replace_service
+    regex_guard = win._regex_guard.for_query()
+    try:
+        diffs = service.plan_replace_all_batch(
+            [path for path in files if path != current_path],
+            lambda path: plan_file(win, path, request, regex_guard),
+        )
+    except ReplaceAllFileParseError as exc:
+        win._report_parse_error(exc.path, exc.original)
+        return
+    except re.error as exc:
+        QMessageBox.warning(win, "Replace failed", str(exc))
+        return
+    except RegexTimeoutError as exc:
+        warn_regex_timeout(win, exc)
+        return
+    counts = {diff.path: diff.count for diff in diffs}
+
+    def _display_name(path: Path) -> str:
+        with contextlib.suppress(ValueError):
+            return str(path.relative_to(win._root))
+        return str(path)
+
+    def _apply_in_current() -> bool:
+        return bool(
+            win._replace_all_in_model(
+                request.pattern,
+                request.replacement,
+                request.use_regex,
+                request.matches_empty,
+                request.has_group_ref,
+            )
+        )
+
+    run_plan = service.build_replace_all_run_plan(
+        scope=scope,
+        current_locale=locale,
+        selected_locale_count=len(win._selected_locales),
+        files=files,
+        current_file=current_path,
+        display_name=_display_name,
+        count_in_current=lambda: win._replace_all_count_in_model(
+            request.pattern,
+            request.replacement,
+            request.use_regex,
+            request.matches_empty,
+            request.has_group_ref,
+        ),
+        count_in_file=lambda path: counts.get(path, 0),
+    )
+    if run_plan is None or not run_plan.run_replace:
+        return
+    if run_plan.show_confirmation:
+        dialog = ReplaceFilesDialog(
+            list(run_plan.counts),
+            run_plan.scope_label,
+            win,
+            previews={
+                _display_name(diff.path): service.replace_all_preview_lines(diff)
+                for diff in diffs
+            },
+        )
+        dialog.exec()
+        if not dialog.confirmed():
+            return
+    try:
+        service.commit_replace_all_batch(
+            diffs,
+            callbacks=ReplaceAllBatchCallbacks(
+                write_cache=lambda path, entries, changed_keys, originals: (
+                    write_status_cache(
+                        win._root,
+                        path,
+                        entries,
+                        changed_keys=changed_keys,
+                        original_values=dict(originals),
+                        force_original=set(originals),
+                    )
+                ),
+                snapshot=lambda path: snapshot_status_cache(win._root, path),
+                restore=restore_status_cache,
+            ),
+        )
+    except Exception as exc:
+        QMessageBox.warning(win, "Replace failed", f"No files were changed.\n\n{exc}")
+        # Restored caches dropped the variant rows; re-index them and redraw
+        # what the open file shows from other files.
+        if win._selected_locales:
+            win._locale_variants.refresh_async(win._locales, win._selected_locales)
+        win._update_tm_locale_variants()
+        win._schedule_search()
+        return
+    for diff in diffs:
+        win.fs_model.set_dirty(diff.path, True)
+    if current_path in files and not _apply_in_current():
+        return
+    win._schedule_search()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QFontMetrics
+from PySide6.QtWidgets import QStyleOptionViewItem
+
+from .delegates import VisualTextDelegate
+from .perf_trace import PERF_TRACE
+
+
+def _text_columns(win: Any) -> list[tuple[int, VisualTextDelegate, Any]]:
+    table = win.table
+    font = table.font()
+    metrics = QFontMetrics(font)
+    columns = []
+    for column in range(table.model().columnCount()):
+        delegate = table.itemDelegateForColumn(column)
+        if not isinstance(delegate, VisualTextDelegate) or table.isColumnHidden(column):
+            continue
+        option = QStyleOptionViewItem()
+        option.font = font
+        option.fontMetrics = metrics
+        option.rect = QRect(0, 0, table.columnWidth(column), 0)
+        columns.append((column, delegate, option))
+    return columns
+
+
+def _cached_or_estimate(
+    win: Any, row: int, columns: list[tuple[int, VisualTextDelegate, Any]]
+) -> int | None:
+    """Estimated height for *row*, or None when every text cell is already
+    measured (so `sizeHintForRow` is cheap and exact)."""
+    model = win.table.model()
+    estimate: int | None = None
+    for column, delegate, option in columns:
+        text = model.index(row, column).data()
+        if not isinstance(text, str) or not text:
+            continue
+        if delegate.cached_height(option, text) is not None:
+            continue
+        height = delegate.estimate_height(option, text)
+        estimate = height if estimate is None else max(estimate, height)
+    if estimate is None:
+        return None
+    return max(estimate, win.table.verticalHeader().minimumSectionSize())
+
+
+def resize_visible_rows(win: Any) -> None:
+    """Size visible rows from measured heights, or from estimates that
+    `refine_row_heights` replaces with measurements in idle-time batches."""
+    if not win._wrap_text or not win._current_model:
+        return
+    raw_span = win._pending_row_span or win._visible_row_span()
+    span = win._render_workflow_service.resume_resize_span(
+        span=raw_span,
+        cursor=win._row_resize_cursor,
+    )
+    if span is None:
+        return
+    signature = win._row_height_cache_signature()
+    if signature != win._row_height_cache_key:
+        win._row_height_cache_key = signature
+        win._row_height_cache.clear()
+        win._row_refine_rows.clear()
+    start, end = span
+    table = win.table
+    columns = _text_columns(win)
+    perf_trace = PERF_TRACE
+    perf_start = perf_trace.start("row_resize")
+    rows_processed = 0
+    budget_ms = win._row_resize_budget_ms
+    time_start = time.perf_counter()
+    for row in range(start, end + 1):
+        rows_processed += 1
+        height = win._row_height_cache.get(row)
+        if height is None:
+            estimate = _cached_or_estimate(win, row, columns)
+            if estimate is None:
+                height = table.sizeHintForRow(row)
+                if height > 0:
+                    win._row_height_cache[row] = height
+            else:
+                height = estimate
+                win._row_refine_rows[row] = None
+        if height > 0 and table.rowHeight(row) != height:
+            table.setRowHeight(row, height)
+        if (time.perf_counter() - time_start) * 1000.0 >= budget_ms:
+            win._row_resize_cursor = row + 1
+            win._pending_row_span = span
+            win._row_resize_timer.start()
+            perf_trace.stop("row_resize", perf_start, items=rows_processed, unit="rows")
+            _schedule_refine(win)
+            return
+    win._pending_row_span = None
+    win._row_resize_cursor = None
+    perf_trace.stop("row_resize", perf_start, items=rows_processed, unit="rows")
+    _schedule_refine(win)
+
+
+def refine_row_heights(win: Any) -> None:
+    """Measure estimated rows still in view, a time-budgeted batch at a time."""
+    pending = win._row_refine_rows
+    if not pending or not win._wrap_text or not win._current_model:
+        pending.clear()
+        return
+    if win._scrolling:
+        return
+    span = win._visible_row_span()
+    if not span:
+        pending.clear()
+        return
+    first, last = span
+    table = win.table
+    perf_trace = PERF_TRACE
+    perf_start = perf_trace.start("layout")
+    measured = 0
+    time_start = time.perf_counter()
+    while pending:
+        row = next(iter(pending))
+        del pending[row]
+        if row < first or row > last:
+            continue
+        height = table.sizeHintForRow(row)
+        measured += 1
+        if height > 0:
+            win._row_height_cache[row] = height
+            if table.rowHeight(row) != height:
+                table.setRowHeight(row, height)
+        if (time.perf_counter() - time_start) * 1000.0 >= win._row_resize_budget_ms:
+            break
+    perf_trace.stop("layout", perf_start, items=measured, unit="rows")
+    _schedule_refine(win)
+
+
+def _schedule_refine(win: Any) -> None:
+    if win._row_refine_rows and not win._row_refine_timer.isActive():
+        win._row_refine_timer.start()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+from collections.abc import Callable, Hashable, Sequence
+from pathlib import Path
+from typing import Any
+
+from translationzed_py.core.search import SearchField, SearchRow
+from translationzed_py.core.search_index import SearchIndex
+
+from .search_rows_loader import RowsLoader
+
+IndexedRows = Callable[[Path], Sequence[SearchRow] | None]
+
+
+def _not_indexed(_path: Path) -> None:
+    return None
+
+
+def source_path_for_rows(win: Any, path: Path, locale: str) -> Path | None:
+    return RowsLoader.capture(win, (path,), locale=locale).source_path(path)
+
+
+def search_rows_stamp(win: Any, path: Path) -> Hashable | None:
+    """Stamp of a file's searchable rows for search refinement; None for the
+    open file, whose rows change with unsaved edits."""
+    return RowsLoader.capture(win, (path,)).stamp(path)
+
+
+def indexed_search_rows(
+    win: Any,
+    loader: RowsLoader,
+    *,
+    query: str,
+    field: SearchField,
+    use_regex: bool,
+) -> IndexedRows:
+    """Return per-file candidate rows: the previous matches when the query
+    refines the last search, else rows from the project search index, which
+    syncs each file as it is asked for, so a cancelled search stops after the
+    current file. None means "read rows the usual way" (the open file, whose
+    unsaved edits only live in its model, or an index failure). Call on the
+    GUI thread; the returned function only uses *loader* and locked state, so
+    it may run on a search worker."""
+    current = loader.current if win._current_model else None
+    scope = [path for path in loader.locales if path != current]
+    try:
+        if win._search_index is None:
+            win._search_index = SearchIndex(win._root)
+    except sqlite3.Error:
+        return _not_indexed
+    index: SearchIndex = win._search_index
+    service = win._search_replace_service
+    case_sensitive = win._search_case_sensitive
+    # One prefilter query for the whole scope, taken after the first file is
+    # synced; files re-indexed later are looked up on their own.
+    shared: list[IndexedRows] = []
+
+    def _indexed_rows(path: Path) -> Sequence[SearchRow] | None:
+        index.sync(
+            (path,),
+            source_for=loader.source_path,
+            load_rows=lambda file_path: loader.rows(file_path)[0],
+        )
+        if not shared:
+            shared.append(
+                index.lookup(scope, query=query, field=field, use_regex=use_regex)
+            )
+        rows = shared[0](path)
+        if rows is None:
+            rows = index.lookup((path,), query=query, field=field, use_regex=use_regex)(
+                path
+            )
+        return rows
+
+    def _rows_for(path: Path) -> Sequence[SearchRow] | None:
+        if path == current or path not in loader.locales:
+            return None
+        refined = service.refined_search_rows(
+            loader.refinement,
+            path,
+            query=query,
+            field=field,
+            use_regex=use_regex,
+            case_sensitive=case_sensitive,
+            stamp=loader.stamp(path),
+        )
+        if refined is not None:
+            return refined
+        try:
+            return _indexed_rows(path)
+        except sqlite3.Error:
+            return None
+
+    return _rows_for
+
+
+def fresh_indexed_rows(
+    win: Any,
+    loader: RowsLoader,
+    *,
+    query: str,
+    field: SearchField,
+    use_regex: bool,
+) -> IndexedRows:
+    """Per-file candidate rows for navigation on the GUI thread (F3): the
+    previous matches when the query refines the last search, else index rows
+    only for a file already indexed and current. Never syncs and never waits
+    for a search worker; None means "scan the file the usual way"."""
+    current = loader.current if win._current_model else None
+    index: SearchIndex | None = win._search_index
+    service = win._search_replace_service
+    case_sensitive = win._search_case_sensitive
+
+    def _rows_for(path: Path) -> Sequence[SearchRow] | None:
+        if path == current or path not in loader.locales:
+            return None
+        refined = service.refined_search_rows(
+            loader.refinement,
+            path,
+            query=query,
+            field=field,
+            use_regex=use_regex,
+            case_sensitive=case_sensitive,
+            stamp=loader.stamp(path),
+        )
+        if refined is not None or index is None:
+            return refined
+        try:
+            return index.fresh_rows(
+                path,
+                loader.source_path(path),
+                query=query,
+                field=field,
+                use_regex=use_regex,
+            )
+        except sqlite3.Error:
+            return None
+
+    return _rows_for
+
+
+def close_search_index(win: Any) -> None:
+    if win._search_index is not None:
+        with contextlib.suppress(sqlite3.Error):
+            win._search_index.close()
+        win._search_index = None
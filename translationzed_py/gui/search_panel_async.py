@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QListWidgetItem, QMessageBox
+
+from translationzed_py.core.regex_guard import RegexTimeoutError
+from translationzed_py.core.search import Match, SearchField, SearchRow
+
+from .search_index_sync import indexed_search_rows
+from .search_rows_loader import RowsLoader
+
+
+def start_panel_search(
+    win: Any,
+    files: Sequence[Path],
+    *,
+    query: str,
+    field: SearchField,
+    use_regex: bool,
+    include_source: bool,
+    include_value: bool,
+) -> None:
+    # The open file's rows come from its model, so they are read here on the
+    # GUI thread; every other file is read on the search worker through a
+    # loader that holds only what is captured here plus locked caches.
+    current = win._current_pf.path if win._current_pf and win._current_model else None
+    loader = RowsLoader.capture(win, files)
+    current_rows: list[SearchRow] = []
+    if current is not None and current in files:
+        current_rows = list(
+            win._rows_from_model(
+                include_source=include_source, include_value=include_value
+            )
+        )
+    indexed = indexed_search_rows(
+        win, loader, query=query, field=field, use_regex=use_regex
+    )
+    case_sensitive = win._search_case_sensitive
+    service = win._search_replace_service
+    regex_guard = win._regex_guard.for_query() if use_regex else None
+
+    def _iter_matches_for_file(path: Path) -> Iterable[Match]:
+        stamp = None if path == current else loader.stamp(path)
+        if path == current:
+            rows: Iterable[SearchRow] | None = current_rows
+        else:
+            rows = indexed(path)
+        if rows is None:
+            rows = loader.cached_rows(
+                path, include_source=include_source, include_value=include_value
+            )
+        return service.iter_refining_matches(
+            loader.refinement,
+            rows,
+            path=path,
+            query=query,
+            field=field,
+            use_regex=use_regex,
+            case_sensitive=case_sensitive,
+            stamp=stamp,
+            include_preview=True,
+            preview_chars=96,
+            regex_guard=regex_guard,
+        )
+
+    win._search_results_list.clear()
+    run = win._search_executor.start(
+        files, _iter_matches_for_file, limit=win._search_panel_result_limit
+    )
+    win._search_status_label.setText(
+        win._search_replace_service.search_panel_status_message(
+            count=0, limit=run.limit, truncated=False, running=True
+        )
+    )
+    win._search_panel_timer.start()
+
+
+def poll_panel_search(win: Any) -> None:
+    run = win._search_executor.current
+    if run is None:
+        win._search_panel_timer.stop()
+        return
+    finished = run.done
+    service = win._search_replace_service
+    for match in run.take():
+        item = QListWidgetItem(service.search_result_label(match=match, root=win._root))
+        item.setData(Qt.UserRole, (str(match.file), int(match.row)))
+        win._search_results_list.addItem(item)
+    if not finished:
+        win._search_status_label.setText(
+            service.search_panel_status_message(
+                count=run.count, limit=run.limit, truncated=False, running=True
+            )
+        )
+        return
+    win._search_panel_timer.stop()
+    error = run.error()
+    if isinstance(error, RegexTimeoutError):
+        win._search_status_label.setText(
+            flag_regex_timeout(win, error, count=run.count)
+        )
+        return
+    if error is not None:
+        win._search_status_label.setText(f"Search failed: {error}")
+        return
+    win._search_status_label.setText(
+        service.search_panel_status_message(
+            count=run.count, limit=run.limit, truncated=run.truncated
+        )
+    )
+
+
+def cancel_panel_search(win: Any) -> None:
+    win._search_executor.cancel()
+    win._search_panel_timer.stop()
+
+
+def flag_regex_timeout(win: Any, error: RegexTimeoutError, *, count: int = 0) -> str:
+    """Mark the search box until the query changes; returns the message."""
+    message = win._search_replace_service.regex_timeout_message(error, count=count)
+    win.search_edit.setToolTip(message)
+    win.statusBar().showMessage(message, 8000)
+    return message
+
+
+def warn_regex_timeout(win: Any, error: RegexTimeoutError) -> None:
+    flag_regex_timeout(win, error)
+    QMessageBox.warning(win, "Replace failed", f"No changes were made.\n\n{error}")
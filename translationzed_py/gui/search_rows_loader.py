@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import contextlib
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from translationzed_py.core import Entry, parse, parse_lazy
+from translationzed_py.core.search import SearchRow, SearchRowColumns
+from translationzed_py.core.search_replace_service import (
+    SearchRefinementMemo,
+    SearchReplaceService,
+    SearchRowsCacheStampCallbacks,
+    SearchRowsFileCallbacks,
+)
+from translationzed_py.core.search_rows_store import SearchRowsStore
+from translationzed_py.core.source_reference_service import (
+    ParsedFileCache,
+    load_reference_lookup,
+    reference_path_for,
+)
+from translationzed_py.core.status_cache import CacheEntry
+from translationzed_py.core.status_cache import read as read_status_cache
+
+from .source_lookup import LazySourceRows, SourceLookup
+from .source_reference_state import effective_source_reference_mode_for_window
+
+
+def file_mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _should_parse_lazy(path: Path, min_bytes: int) -> bool:
+    try:
+        return path.stat().st_size >= min_bytes
+    except OSError:
+        return False
+
+
+def load_source_lookup(
+    *,
+    root: Path,
+    path: Path,
+    locale: str | None,
+    reference_mode: str,
+    locale_encodings: Mapping[str, str],
+    parsed_cache: ParsedFileCache,
+    lazy_parse_min_bytes: int,
+    target_entries: Sequence[Entry] | None = None,
+) -> SourceLookup:
+    """Reference-source lookup for *path*; safe off the GUI thread when the
+    arguments were captured on it."""
+    materialized = load_reference_lookup(
+        root=root,
+        path=path,
+        target_locale=locale,
+        reference_locale=reference_mode,
+        locale_encodings=locale_encodings,
+        target_entries=target_entries,
+        parsed_cache=parsed_cache,
+        should_parse_lazy=lambda file_path: _should_parse_lazy(
+            file_path, lazy_parse_min_bytes
+        ),
+        parse_eager=lambda file_path, encoding: parse(file_path, encoding=encoding),
+        parse_lazy=lambda file_path, encoding: parse_lazy(file_path, encoding=encoding),
+    )
+    if materialized is None:
+        return SourceLookup(by_key={})
+    if materialized.by_row_entries is not None:
+        return SourceLookup(
+            by_row=LazySourceRows(materialized.by_row_entries),
+            keys=materialized.keys,
+        )
+    if materialized.by_row_values is not None:
+        return SourceLookup(
+            by_row=materialized.by_row_values,
+            keys=materialized.keys,
+        )
+    return SourceLookup(by_key=materialized.by_key or {})
+
+
+class RowsLoader:
+    """Reads search rows of project files without touching the window.
+
+    `capture` runs on the GUI thread and copies the settings it needs (locale,
+    encoding and reference mode per file, the open file's path); the loader
+    then only uses those and the window's locked caches, so a search worker
+    may call it while the GUI keeps changing window state.
+    """
+
+    __slots__ = (
+        "root",
+        "current",
+        "refinement",
+        "_cache_dir",
+        "_cache_ext",
+        "_locales",
+        "_reference_modes",
+        "_encodings",
+        "_lazy_parse_min_bytes",
+        "_cache_row_limit",
+        "_parsed_cache",
+        "_rows_cache",
+        "_service",
+        "_hash_for_entry",
+    )
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        current: Path | None,
+        locales: Mapping[Path, str],
+        reference_modes: Mapping[Path, str],
+        encodings: Mapping[str, str],
+        cache_dir: str,
+        cache_ext: str,
+        lazy_parse_min_bytes: int,
+        cache_row_limit: int,
+        parsed_cache: ParsedFileCache,
+        rows_cache: SearchRowsStore,
+        refinement: SearchRefinementMemo,
+        service: SearchReplaceService,
+        hash_for_entry: Callable[[Entry, Mapping[int, CacheEntry]], int],
+    ) -> None:
+        self.root = root
+        self.current = current
+        self.refinement = refinement
+        self._cache_dir = cache_dir
+        self._cache_ext = cache_ext
+        self._locales = locales
+        self._reference_modes = reference_modes
+        self._encodings = encodings
+        self._lazy_parse_min_bytes = lazy_parse_min_bytes
+        self._cache_row_limit = cache_row_limit
+        self._parsed_cache = parsed_cache
+        self._rows_cache = rows_cache
+        self._service = service
+        self._hash_for_entry = hash_for_entry
+
+    @classmethod
+    def capture(
+        cls, win: Any, files: Iterable[Path], *, locale: str | None = None
+    ) -> RowsLoader:
+        """Snapshot what loading *files* needs; *locale* overrides the
+        locale derived from each path."""
+        current = win._current_pf.path if win._current_pf else None
+        locales = {
+            path: file_locale
+            for path in files
+            if (file_locale := locale or win._locale_for_path(path))
+        }
+        return cls(
+            root=win._root,
+            current=current,
+            locales=locales,
+            reference_modes={
+                path: effective_source_reference_mode_for_window(win, path, file_locale)
+                for path, file_locale in locales.items()
+            },
+            encodings={code: meta.charset for code, meta in win._locales.items()},
+            cache_dir=win._app_config.cache_dir,
+            cache_ext=win._app_config.cache_ext,
+            lazy_parse_min_bytes=win._lazy_parse_min_bytes,
+            cache_row_limit=win._search_cache_row_limit,
+            parsed_cache=win._en_cache,
+            rows_cache=win._search_rows_cache,
+            refinement=win._search_refinement,
+            service=win._search_replace_service,
+            hash_for_entry=win._hash_for_cache,
+        )
+
+    @property
+    def locales(self) -> Mapping[Path, str]:
+        return self._locales
+
+    def source_path(self, path: Path) -> Path | None:
+        locale = self._locales.get(path)
+        if locale is None:
+            return None
+        reference_locale = self._reference_modes[path]
+        if reference_locale == locale:
+            return path if path.exists() else None
+        return reference_path_for(
+            self.root,
+            path,
+            target_locale=locale,
+            reference_locale=reference_locale,
+        )
+
+    def _cache_mtime_ns(self, path: Path) -> int:
+        try:
+            rel = path.relative_to(self.root)
+        except ValueError:
+            return 0
+        cache_path = (self.root / self._cache_dir / rel).with_suffix(self._cache_ext)
+        with contextlib.suppress(OSError):
+            return cache_path.stat().st_mtime_ns
+        return 0
+
+    def _source_mtime_ns(self, path: Path) -> int:
+        source_path = self.source_path(path)
+        if not source_path:
+            return 0
+        with contextlib.suppress(OSError):
+            return source_path.stat().st_mtime_ns
+        return 0
+
+    def stamp(self, path: Path) -> Hashable | None:
+        """Stamp of a file's searchable rows for search refinement; None for
+        the open file, whose rows change with unsaved edits."""
+        if path == self.current or path not in self._locales:
+            return None
+        source_path = self.source_path(path)
+        source_mtime = 0
+        if source_path is not None:
+            with contextlib.suppress(OSError):
+                source_mtime = source_path.stat().st_mtime_ns
+        return (
+            file_mtime_ns(path),
+            self._cache_mtime_ns(path),
+            str(source_path or ""),
+            source_mtime,
+        )
+
+    def source_lookup(
+        self, path: Path, *, target_entries: Sequence[Entry] | None = None
+    ) -> SourceLookup:
+        return load_source_lookup(
+            root=self.root,
+            path=path,
+            locale=self._locales.get(path),
+            reference_mode=self._reference_modes.get(path, "EN"),
+            locale_encodings=self._encodings,
+            parsed_cache=self._parsed_cache,
+            lazy_parse_min_bytes=self._lazy_parse_min_bytes,
+            target_entries=target_entries,
+        )
+
+    def rows(
+        self,
+        path: Path,
+        *,
+        include_source: bool = True,
+        include_value: bool = True,
+    ) -> tuple[Iterable[SearchRow], int]:
+        locale = self._locales.get(path)
+        if locale is None:
+            return (), 0
+
+        def _load_source(
+            parsed_file: Any,
+        ) -> tuple[Sequence[str] | None, Callable[[str], str]]:
+            lookup = self.source_lookup(path, target_entries=parsed_file.entries)
+            return lookup.by_row, lambda key: lookup.get(key, "")
+
+        result = self._service.load_search_rows_from_file(
+            path=path,
+            encoding=self._encodings.get(locale, "utf-8"),
+            use_lazy_parser=_should_parse_lazy(path, self._lazy_parse_min_bytes),
+            include_source=include_source,
+            include_value=include_value,
+            cache_row_limit=self._cache_row_limit,
+            callbacks=SearchRowsFileCallbacks(
+                parse_eager=lambda file_path, enc: parse(file_path, encoding=enc),
+                parse_lazy=lambda file_path, enc: parse_lazy(file_path, encoding=enc),
+                read_cache=lambda file_path: read_status_cache(self.root, file_path),
+                load_source_lookup=_load_source,
+            ),
+            hash_for_entry=self._hash_for_entry,
+        )
+        if result is None:
+            return (), 0
+        return result.rows, result.entry_count
+
+    def cached_rows(
+        self,
+        path: Path,
+        *,
+        include_source: bool,
+        include_value: bool,
+    ) -> Iterable[SearchRow]:
+        """Rows of *path* from the window's search-rows cache, loading and
+        storing them when the cached stamp is stale."""
+        if path not in self._locales:
+            return ()
+        service = self._service
+        stamp = service.collect_rows_cache_stamp(
+            path=path,
+            include_source=include_source,
+            include_value=include_value,
+            callbacks=SearchRowsCacheStampCallbacks(
+                file_mtime_ns=file_mtime_ns,
+                cache_mtime_ns=self._cache_mtime_ns,
+                source_mtime_ns=self._source_mtime_ns,
+            ),
+        )
+        if stamp is None:
+            return []
+        key = (path, include_source, include_value)
+        cached = self._rows_cache.get(key)
+        lookup_plan = service.build_rows_cache_lookup_plan(
+            path=path,
+            include_source=include_source,
+            include_value=include_value,
+            file_mtime_ns=stamp.file_mtime_ns,
+            cache_mtime_ns=stamp.cache_mtime_ns,
+            source_mtime_ns=stamp.source_mtime_ns,
+            cached_stamp=cached[0] if cached else None,
+        )
+        cache_key = (
+            lookup_plan.key.path,
+            lookup_plan.key.include_source,
+            lookup_plan.key.include_value,
+        )
+        if lookup_plan.use_cached_rows and cached:
+            return cached[1]
+        rows, _entry_count = self.rows(
+            path,
+            include_source=include_source,
+            include_value=include_value,
+        )
+        columns = SearchRowColumns.from_rows(path, rows)
+        store_plan = service.build_rows_cache_store_plan(
+            row_bytes=columns.nbytes,
+            max_bytes=self._rows_cache.max_bytes,
+        )
+        if store_plan.should_store_rows:
+            self._rows_cache.put(cache_key, lookup_plan.stamp, columns)
+        else:
+            self._rows_cache.discard(cache_key)
+        return columns
@@ -223,6 +223,9 @@ def apply_source_reference_preferences_for_window(
     if not changed:
         return False
     win._search_rows_cache.clear()
+    # Fallback sources are not part of the index stamps; re-index on demand.
+    if win._search_index is not None:
+        win._search_index.clear()
     sync_source_reference_override_ui_for_window(win)
     refresh_source_reference_from_window(win)
     return True
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import html
+from collections.abc import Callable, Sequence
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QToolButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from translationzed_py.core.tm_store import TMConcordanceHit
+
+# (query, side, offset, limit) -> hits, or None when no TM is available.
+ConcordanceSearch = Callable[[str, str, int, int], Sequence[TMConcordanceHit] | None]
+
+PAGE_SIZE = 50
+_SIDES = (("Source", "source"), ("Translation", "target"), ("Both", "both"))
+_HIT_STYLE = "background-color:#ffeb78; color:#000000;"
+_MAX_SNIPPET_LEN = 400
+
+
+def highlight_html(text: str, spans: Sequence[tuple[int, int]]) -> str:
+    visible = text[:_MAX_SNIPPET_LEN]
+    parts: list[str] = []
+    pos = 0
+    for start, end in spans:
+        if start < pos or start >= len(visible):
+            continue
+        end = min(end, len(visible))
+        parts.append(html.escape(visible[pos:start]))
+        parts.append(
+            f'<span style="{_HIT_STYLE}">{html.escape(visible[start:end])}</span>'
+        )
+        pos = end
+    parts.append(html.escape(visible[pos:]))
+    if len(text) > len(visible):
+        parts.append("…")
+    return "".join(parts).replace("\n", "<br>")
+
+
+class TMConcordancePanel(QWidget):
+    def __init__(self, search: ConcordanceSearch, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._search = search
+        self._query = ""
+        self._side = "source"
+        self._offset = 0
+        self._has_more = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 0, 6, 6)
+        layout.setSpacing(6)
+        query_row = QHBoxLayout()
+        query_row.setContentsMargins(0, 0, 0, 0)
+        query_row.setSpacing(6)
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("Search words or phrases in the TM")
+        self.query_edit.setClearButtonEnabled(True)
+        self.query_edit.returnPressed.connect(self.run_search)
+        query_row.addWidget(self.query_edit, 1)
+        self.side_combo = QComboBox(self)
+        for label, side in _SIDES:
+            self.side_combo.addItem(label, side)
+        self.side_combo.setToolTip("TM side to search")
+        self.side_combo.currentIndexChanged.connect(self._on_side_changed)
+        query_row.addWidget(self.side_combo)
+        self.status_label = QLabel(
+            "Press Enter to search the TM for the current locale.", self
+        )
+        self.status_label.setWordWrap(True)
+        self.results_list = QListWidget(self)
+        self.results_list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results_list.setWordWrap(True)
+        page_row = QHBoxLayout()
+        page_row.setContentsMargins(0, 0, 0, 0)
+        page_row.setSpacing(6)
+        self.prev_btn = QToolButton(self)
+        self.prev_btn.setArrowType(Qt.LeftArrow)
+        self.prev_btn.setToolTip("Previous page")
+        self.prev_btn.clicked.connect(self.previous_page)
+        self.next_btn = QToolButton(self)
+        self.next_btn.setArrowType(Qt.RightArrow)
+        self.next_btn.setToolTip("Next page")
+        self.next_btn.clicked.connect(self.next_page)
+        self.page_label = QLabel(self)
+        page_row.addWidget(self.prev_btn)
+        page_row.addWidget(self.page_label, 1, Qt.AlignCenter)
+        page_row.addWidget(self.next_btn)
+        layout.addLayout(query_row)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.results_list, 1)
+        layout.addLayout(page_row)
+        self._update_paging()
+
+    def run_search(self) -> None:
+        self._query = self.query_edit.text().strip()
+        self._side = str(self.side_combo.currentData() or "source")
+        self._offset = 0
+        self._load_page()
+
+    def next_page(self) -> None:
+        if not self._has_more:
+            return
+        self._offset += PAGE_SIZE
+        self._load_page()
+
+    def previous_page(self) -> None:
+        if self._offset <= 0:
+            return
+        self._offset = max(0, self._offset - PAGE_SIZE)
+        self._load_page()
+
+    def _on_side_changed(self, _index: int) -> None:
+        if self._query:
+            self.run_search()
+
+    def _load_page(self) -> None:
+        self.results_list.clear()
+        self._has_more = False
+        if not self._query:
+            self.status_label.setText("Type a word or phrase to search the TM.")
+            self._update_paging()
+            return
+        # One extra row tells whether a next page exists without a COUNT(*).
+        hits = self._search(self._query, self._side, self._offset, PAGE_SIZE + 1)
+        if hits is None:
+            self.status_label.setText("Open a file to search its locale TM.")
+            self._update_paging()
+            return
+        self._has_more = len(hits) > PAGE_SIZE
+        page = list(hits[:PAGE_SIZE])
+        for hit in page:
+            self._add_hit(hit)
+        if not page:
+            self.status_label.setText("No TM entries contain this text.")
+        else:
+            first = self._offset + 1
+            last = self._offset + len(page)
+            more = "+" if self._has_more else ""
+            self.status_label.setText(f"Showing {first}–{last}{more}.")
+        self._update_paging()
+
+    def _add_hit(self, hit: TMConcordanceHit) -> None:
+        origin = hit.tm_name or hit.origin
+        if hit.origin == "project" and hit.key:
+            origin = f"{hit.origin} · {hit.key}"
+        label = QLabel(
+            f"{highlight_html(hit.source_text, hit.source_spans)}"
+            f"<br>→ {highlight_html(hit.target_text, hit.target_spans)}"
+            f'<br><span style="color:gray;">{html.escape(origin)}</span>',
+            self.results_list,
+        )
+        label.setTextFormat(Qt.RichText)
+        label.setWordWrap(True)
+        label.setContentsMargins(4, 2, 4, 2)
+        item = QListWidgetItem(self.results_list)
+        item.setData(Qt.UserRole, hit)
+        item.setToolTip(f"{hit.source_text}\n→ {hit.target_text}")
+        item.setSizeHint(label.sizeHint())
+        self.results_list.setItemWidget(item, label)
+
+    def _update_paging(self) -> None:
+        self.prev_btn.setEnabled(self._offset > 0)
+        self.next_btn.setEnabled(self._has_more)
+        page = self._offset // PAGE_SIZE + 1
+        self.page_label.setText(f"Page {page}" if self._query else "")
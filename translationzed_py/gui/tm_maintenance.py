@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import contextlib
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtWidgets import QMessageBox
+
+from translationzed_py.core.tm_store import (
+    TMMaintenanceReport,
+    TMStore,
+    format_maintenance_report,
+)
+
+
+def _maintain_project_tm(root: Path) -> TMMaintenanceReport:
+    # Connections are thread-bound, so the worker opens its own store.
+    store = TMStore(root)
+    try:
+        return store.maintain()
+    finally:
+        store.close()
+
+
+def _build_concordance_index(
+    root: Path, source_locale: str, target_locale: str, stop: threading.Event
+) -> str:
+    store = TMStore(root)
+    try:
+        ready = store.build_concordance_index(
+            source_locale=source_locale,
+            target_locale=target_locale,
+            should_stop=stop.is_set,
+        )
+    finally:
+        store.close()
+    return "TM concordance index ready." if ready else ""
+
+
+def _backfill_tokens(root: Path, stop: threading.Event) -> str:
+    store = TMStore(root)
+    try:
+        store.backfill_tokens(should_stop=stop.is_set)
+    finally:
+        store.close()
+    return ""
+
+
+def _maintain_pool(win: Any) -> ThreadPoolExecutor:
+    # One worker for maintenance and index builds, so they never both write.
+    if win._tm_maintain_pool is None:
+        win._tm_maintain_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tzp-tm-maintain"
+        )
+    return win._tm_maintain_pool
+
+
+def start_tm_maintenance(win: Any) -> None:
+    """Run `TMStore.maintain()` off the GUI thread; the first full VACUUM
+    can take minutes on a large TM."""
+    if win._tm_maintain_future is not None and not win._tm_maintain_future.done():
+        win.statusBar().showMessage("TM maintenance already running.", 3000)
+        return
+    win.statusBar().showMessage("Maintaining TM…", 0)
+    win._set_tm_progress_visible(True)
+    win._tm_maintain_future = _maintain_pool(win).submit(
+        _maintain_project_tm, win._root
+    )
+    win._tm_maintain_timer.start()
+
+
+def _start_index_job(win: Any, job: Callable[..., str], *args: object) -> None:
+    win._tm_index_stop = threading.Event()
+    win._tm_index_future = _maintain_pool(win).submit(job, *args, win._tm_index_stop)
+    win._tm_index_timer.start()
+
+
+def start_tm_token_backfill(win: Any) -> None:
+    """Tokenise rows stored before the token index in the background; the
+    store is usable meanwhile and queries tokenise those rows on the fly."""
+    store = win._tm_store
+    if store is None or not store.token_backfill_pending():
+        return
+    if win._tm_index_future is not None and not win._tm_index_future.done():
+        return
+    _start_index_job(win, _backfill_tokens, win._root)
+
+
+def ensure_tm_concordance_index(
+    win: Any, *, source_locale: str, target_locale: str
+) -> None:
+    """Build the pair's concordance index in the background on first use;
+    concordance answers with a scan until it is ready."""
+    store = win._tm_store
+    if store is None or store.concordance_ready(
+        source_locale=source_locale, target_locale=target_locale
+    ):
+        return
+    if win._tm_index_future is not None and not win._tm_index_future.done():
+        return
+    _start_index_job(
+        win, _build_concordance_index, win._root, source_locale, target_locale
+    )
+    win.statusBar().showMessage(
+        "Indexing TM for concordance; results use a slower scan until it is ready.",
+        5000,
+    )
+
+
+def poll_tm_index(win: Any) -> None:
+    future = win._tm_index_future
+    if future is not None and not future.done():
+        return
+    win._tm_index_timer.stop()
+    win._tm_index_future = None
+    if future is None or future.cancelled():
+        return
+    try:
+        message = future.result()
+    except Exception as exc:
+        win.statusBar().showMessage(f"TM indexing failed: {exc}", 5000)
+        return
+    if message:
+        win.statusBar().showMessage(message, 3000)
+
+
+def poll_tm_maintenance(win: Any) -> None:
+    future = win._tm_maintain_future
+    if future is not None and not future.done():
+        return
+    win._tm_maintain_timer.stop()
+    win._tm_maintain_future = None
+    win._set_tm_progress_visible(
+        win._tm_query_future is not None or win._tm_rebuild_future is not None
+    )
+    if future is None:
+        return
+    win.statusBar().clearMessage()
+    try:
+        report = future.result()
+    except Exception as exc:
+        QMessageBox.warning(win, "TM maintenance failed", str(exc))
+        return
+    win._tm_workflow.clear_cache()
+    QMessageBox.information(
+        win, "TM maintenance complete", format_maintenance_report(report)
+    )
+
+
+def shutdown_tm_maintenance(win: Any) -> None:
+    # A running VACUUM is not interrupted; the worker finishes on its own.
+    # Index jobs stop after their current batch and resume on next use.
+    if win._tm_index_stop is not None:
+        win._tm_index_stop.set()
+    win._tm_index_future = None
+    win._tm_maintain_future = None
+    if win._tm_maintain_pool is not None:
+        with contextlib.suppress(Exception):
+            win._tm_maintain_pool.shutdown(wait=False, cancel_futures=True)
+    win._tm_maintain_pool = None